@@ -0,0 +1,70 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+"""
+End to end benchmark of a stateless map/filter pipeline of Python functions.
+
+It runs the same job with the Python functions executed in a separate Python worker process
+(python.execution-mode: process) and embedded in the JVM (python.execution-mode: thread).
+Run it from the flink-python directory with a built PyFlink:
+
+    python dev/benchmarks/embedded_stateless_benchmark.py [--records N] [--repeat R]
+"""
+import argparse
+import timeit
+
+from pyflink.common.typeinfo import Types
+from pyflink.common.watermark_strategy import WatermarkStrategy
+from pyflink.datastream import StreamExecutionEnvironment
+from pyflink.datastream.connectors import NumberSequenceSource
+from pyflink.datastream.functions import SinkFunction
+from pyflink.util.java_utils import get_j_env_configuration
+
+DISCARDING_SINK = "org.apache.flink.streaming.api.functions.sink.DiscardingSink"
+
+
+def run_job(execution_mode, records):
+    env = StreamExecutionEnvironment.get_execution_environment()
+    get_j_env_configuration(env._j_stream_execution_environment).setString(
+        "python.execution-mode", execution_mode)
+    env.set_parallelism(1)
+    ds = env.from_source(NumberSequenceSource(1, records),
+                         WatermarkStrategy.no_watermarks(),
+                         "numbers")
+    ds.map(lambda i: (i, str(i)),
+           output_type=Types.TUPLE([Types.LONG(), Types.STRING()])) \
+      .filter(lambda i: i[0] % 2 == 0) \
+      .map(lambda i: i[1], output_type=Types.STRING()) \
+      .add_sink(SinkFunction(DISCARDING_SINK))
+    env.execute("embedded_stateless_benchmark_%s" % execution_mode)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--records', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for execution_mode in ['process', 'thread']:
+        best = min(timeit.repeat(lambda: run_job(execution_mode, args.records),
+                                 number=1, repeat=args.repeat))
+        print("%-8s %10.3f s for %d records, %10.0f records/s" % (
+            execution_mode, best, args.records, args.records / best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+"""
+Micro benchmark of looking up many keys of a map state in the Python worker.
+
+It compares looking up the keys one by one with MapState.get against looking them up with
+MapState.get_all, against a simulated state service which answers the GET requests of the map
+state from memory after the given round trip latency. Run it from the flink-python directory:
+
+    python dev/benchmarks/map_state_get_all_benchmark.py [--keys N] [--latency-us L] [--repeat R]
+"""
+import argparse
+import time
+import timeit
+
+from apache_beam.coders import coder_impl, StrUtf8Coder, VarIntCoder
+from apache_beam.portability.api import beam_fn_api_pb2
+
+from pyflink.fn_execution.state_impl import CachingMapStateHandler, \
+    InternalSynchronousMapRuntimeState
+
+
+class DisabledStateCache(object):
+
+    def is_cache_enabled(self):
+        return False
+
+
+class SimulatedStateHandler(object):
+    """
+    Serves the GET requests of a single map state whose map keys are the encoded map keys.
+    """
+
+    def __init__(self, data, latency):
+        self._data = data
+        self._latency = latency
+        self._state_cache = DisabledStateCache()
+        self._underlying = self
+        self._context = None
+        self.requests = 0
+
+    def get_raw(self, state_key, continuation_token):
+        self.requests += 1
+        time.sleep(self._latency)
+        input_stream = coder_impl.create_InputStream(continuation_token)
+        output_stream = coder_impl.create_OutputStream()
+        flag = input_stream.read_byte()
+        if flag == CachingMapStateHandler.GET_FLAG:
+            self._write_value(output_stream, input_stream.read_all(False), False)
+        elif flag == CachingMapStateHandler.GET_ALL_FLAG:
+            for _ in range(input_stream.read_bigendian_int32()):
+                key = input_stream.read(input_stream.read_bigendian_int32())
+                self._write_value(output_stream, key, True)
+        else:
+            raise Exception("Unsupported flag: %s" % flag)
+        return output_stream.get(), b''
+
+    def _write_value(self, output_stream, key, length_prefixed):
+        if key not in self._data:
+            output_stream.write_byte(CachingMapStateHandler.NOT_EXIST_FLAG)
+            return
+        output_stream.write_byte(CachingMapStateHandler.EXIST_FLAG)
+        value = self._data[key]
+        if length_prefixed:
+            output_stream.write_bigendian_int32(len(value))
+        output_stream.write(value)
+
+
+def encode(coder, value):
+    output_stream = coder_impl.create_OutputStream()
+    coder.get_impl().encode_to_stream(value, output_stream, True)
+    return output_stream.get()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keys', type=int, default=50)
+    parser.add_argument('--latency-us', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    key_coder, value_coder = VarIntCoder(), StrUtf8Coder()
+    keys = list(range(args.keys))
+    # half of the looked up keys exist
+    data = {encode(key_coder, key): encode(value_coder, str(key)) for key in keys[::2]}
+    state_handler = SimulatedStateHandler(data, args.latency_us / 1e6)
+    map_state = InternalSynchronousMapRuntimeState(
+        CachingMapStateHandler(state_handler, 0),
+        beam_fn_api_pb2.StateKey(),
+        key_coder,
+        value_coder,
+        1000)
+
+    def per_key_get():
+        return {key: map_state.get(key) for key in keys}
+
+    def get_all():
+        return map_state.get_all(keys)
+
+    assert per_key_get() == get_all()
+    for name, benchmark in [('MapState.get per key', per_key_get),
+                            ('MapState.get_all', get_all)]:
+        state_handler.requests = 0
+        best = min(timeit.repeat(benchmark, number=1, repeat=args.repeat))
+        print("%-24s %10.1f us/lookup of %d keys, %d requests" % (
+            name, best * 1e6, args.keys, state_handler.requests // args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+"""
+Micro benchmark of the window assignment of the Python DataStream API and Table API.
+
+It measures the time to assign the windows of an element and to look them up in a dict keyed by
+the windows, which is what the window operators do for each element, e.g. to look up the state of
+a window. Run it from the flink-python directory:
+
+    python dev/benchmarks/window_assignment_benchmark.py [--elements N] [--repeat R]
+"""
+import argparse
+import timeit
+
+from pyflink.datastream.window import TumblingEventTimeWindows, SlidingEventTimeWindows, \
+    TimeWindow
+from pyflink.fn_execution.table.window_assigner import TumblingWindowAssigner, \
+    SlidingWindowAssigner
+
+
+def datastream_assign(assigner, timestamps):
+    def run():
+        windows = {}
+        for timestamp in timestamps:
+            for window in assigner.assign_windows(None, timestamp, None):
+                windows[window] = windows.get(window, 0) + 1
+    return run
+
+
+def table_assign(assigner, timestamps):
+    def run():
+        windows = {}
+        for timestamp in timestamps:
+            for window in assigner.assign_windows(None, timestamp):
+                windows[window] = windows.get(window, 0) + 1
+    return run
+
+
+def new_windows(size, timestamps):
+    def run():
+        windows = {}
+        for timestamp in timestamps:
+            start = TimeWindow.get_window_start_with_offset(timestamp, 0, size)
+            window = TimeWindow(start, start + size)
+            windows[window] = windows.get(window, 0) + 1
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--elements', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # realistic epoch milliseconds, about 1000 elements per second
+    timestamps = [1600000000000 + i for i in range(args.elements)]
+    size, slide = 60 * 1000, 10 * 1000
+    benchmarks = [
+        ('TimeWindow per element (reference)', new_windows(size, timestamps)),
+        ('TumblingEventTimeWindows', datastream_assign(
+            TumblingEventTimeWindows(size, 0), timestamps)),
+        ('SlidingEventTimeWindows', datastream_assign(
+            SlidingEventTimeWindows(size, slide, 0), timestamps)),
+        ('Table TumblingWindowAssigner', table_assign(
+            TumblingWindowAssigner(size, 0, True), timestamps)),
+        ('Table SlidingWindowAssigner', table_assign(
+            SlidingWindowAssigner(size, slide, 0, True), timestamps)),
+    ]
+    for name, benchmark in benchmarks:
+        best = min(timeit.repeat(benchmark, number=1, repeat=args.repeat))
+        print("%-40s %8.1f ns/element" % (name, best * 1e9 / args.elements))
+
+
+if __name__ == '__main__':
+    main()
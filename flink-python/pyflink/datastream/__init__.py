@@ -35,6 +35,13 @@ Entry point classes of Flink DataStream API:
       Represent two connected streams of (possibly) different data types. Connected
       streams are useful for cases where operations on one stream directly affect the operations on
       the other stream, usually via shared state between the streams.
+    - :class:`BroadcastStream`:
+      Represents a stream with broadcast state(s), which is created by
+      :func:`DataStream.broadcast` with the descriptors of the broadcast states.
+    - :class:`BroadcastConnectedStream`:
+      Represents the result of connecting a non-keyed :class:`DataStream` with a
+      :class:`BroadcastStream`. The broadcast states are replicated to every parallel instance and
+      are kept in the memory of the Python worker.
 
 Functions used to transform a :class:`DataStream` into another :class:`DataStream`:
 
@@ -63,6 +70,9 @@ Functions used to transform a :class:`DataStream` into another :class:`DataStrea
     - :class:`KeyedCoProcessFunction`:
       Similar to :class:`CoProcessFunction`, except that it was applied to a keyed
       :class:`ConnectedStreams` and could register event-time and processing-time timers.
+    - :class:`BroadcastProcessFunction`:
+      Processes the elements of a :class:`BroadcastConnectedStream`. The broadcast side updates the
+      broadcast state, which the non-broadcast side could only read.
     - :class:`WindowFunction`:
       Base interface for functions that are evaluated over keyed (grouped) windows.
     - :class:`ProcessWindowFunction`:
@@ -133,12 +143,18 @@ Classes for state operations:
     - :class:`state.MapState`:
       Interface for partitioned key-value state. The key-value pair can be added, updated and
       retrieved.
+    - :class:`state.ReadOnlyBroadcastState`:
+      Read-only view of a broadcast state, which is handed to the non-broadcast side of a
+      :class:`BroadcastProcessFunction`.
     - :class:`state.ReducingState`:
       Interface for reducing state. Elements can be added to the state, they will be combined using
       a :class:`ReduceFunction`. The current state can be inspected.
     - :class:`state.AggregatingState`:
       Interface for aggregating state, based on an :class:`AggregateFunction`. Elements that are
       added to this type of state will be eagerly pre-aggregated using a given AggregateFunction.
+    - :class:`state.TemporalListState`:
+      Interface for partitioned list state whose elements are kept sorted by their timestamps.
+      The elements up to a timestamp can be removed without accessing the remaining elements.
     - :class:`state.StateTtlConfig`:
       Configuration of state TTL logic.
 
@@ -184,32 +200,97 @@ Other important classes:
     - :class:`SourceFunction`:
       Interface for implementing user defined source functionality.
 """
-from pyflink.datastream.checkpoint_config import CheckpointConfig, ExternalizedCheckpointCleanup
-from pyflink.datastream.checkpointing_mode import CheckpointingMode
-from pyflink.datastream.data_stream import DataStream, KeyedStream, WindowedStream, \
-    ConnectedStreams, DataStreamSink
-from pyflink.datastream.execution_mode import RuntimeExecutionMode
-from pyflink.datastream.functions import (MapFunction, CoMapFunction, FlatMapFunction,
-                                          CoFlatMapFunction, ReduceFunction, RuntimeContext,
-                                          KeySelector, FilterFunction, Partitioner, SourceFunction,
-                                          SinkFunction, CoProcessFunction, KeyedProcessFunction,
-                                          KeyedCoProcessFunction, AggregateFunction, WindowFunction,
-                                          ProcessWindowFunction)
-from pyflink.datastream.slot_sharing_group import SlotSharingGroup, MemorySize
-from pyflink.datastream.state_backend import (StateBackend, MemoryStateBackend, FsStateBackend,
-                                              RocksDBStateBackend, CustomStateBackend,
-                                              PredefinedOptions, HashMapStateBackend,
-                                              EmbeddedRocksDBStateBackend)
-from pyflink.datastream.checkpoint_storage import (CheckpointStorage, JobManagerCheckpointStorage,
-                                                   FileSystemCheckpointStorage,
-                                                   CustomCheckpointStorage)
-from pyflink.datastream.stream_execution_environment import StreamExecutionEnvironment
-from pyflink.datastream.time_characteristic import TimeCharacteristic
-from pyflink.datastream.time_domain import TimeDomain
-from pyflink.datastream.functions import ProcessFunction
-from pyflink.datastream.timerservice import TimerService
-from pyflink.datastream.window import Window, TimeWindow, CountWindow, WindowAssigner, \
-    MergingWindowAssigner, TriggerResult, Trigger
+from typing import TYPE_CHECKING
+
+from pyflink.util.lazy_import import lazy_import_attributes
+
+if TYPE_CHECKING:
+    from pyflink.datastream.checkpoint_config import CheckpointConfig, ExternalizedCheckpointCleanup
+    from pyflink.datastream.checkpointing_mode import CheckpointingMode
+    from pyflink.datastream.data_stream import DataStream, KeyedStream, WindowedStream, \
+        ConnectedStreams, DataStreamSink, BroadcastStream, BroadcastConnectedStream
+    from pyflink.datastream.execution_mode import RuntimeExecutionMode
+    from pyflink.datastream.functions import (MapFunction, CoMapFunction, FlatMapFunction,
+                                              CoFlatMapFunction, ReduceFunction, RuntimeContext,
+                                              KeySelector, FilterFunction, Partitioner,
+                                              SourceFunction, SinkFunction, CoProcessFunction,
+                                              KeyedProcessFunction, KeyedCoProcessFunction,
+                                              AggregateFunction, WindowFunction,
+                                              ProcessWindowFunction, BroadcastProcessFunction)
+    from pyflink.datastream.slot_sharing_group import SlotSharingGroup, MemorySize
+    from pyflink.datastream.state_backend import (StateBackend, MemoryStateBackend, FsStateBackend,
+                                                  RocksDBStateBackend, CustomStateBackend,
+                                                  PredefinedOptions, HashMapStateBackend,
+                                                  EmbeddedRocksDBStateBackend)
+    from pyflink.datastream.checkpoint_storage import (CheckpointStorage,
+                                                       JobManagerCheckpointStorage,
+                                                       FileSystemCheckpointStorage,
+                                                       CustomCheckpointStorage)
+    from pyflink.datastream.stream_execution_environment import StreamExecutionEnvironment
+    from pyflink.datastream.time_characteristic import TimeCharacteristic
+    from pyflink.datastream.time_domain import TimeDomain
+    from pyflink.datastream.functions import ProcessFunction
+    from pyflink.datastream.timerservice import TimerService
+    from pyflink.datastream.window import Window, TimeWindow, CountWindow, WindowAssigner, \
+        MergingWindowAssigner, TriggerResult, Trigger
+
+lazy_import_attributes(__name__, globals(), {
+    'CheckpointConfig': 'pyflink.datastream.checkpoint_config',
+    'ExternalizedCheckpointCleanup': 'pyflink.datastream.checkpoint_config',
+    'CheckpointingMode': 'pyflink.datastream.checkpointing_mode',
+    'DataStream': 'pyflink.datastream.data_stream',
+    'KeyedStream': 'pyflink.datastream.data_stream',
+    'WindowedStream': 'pyflink.datastream.data_stream',
+    'ConnectedStreams': 'pyflink.datastream.data_stream',
+    'DataStreamSink': 'pyflink.datastream.data_stream',
+    'BroadcastStream': 'pyflink.datastream.data_stream',
+    'BroadcastConnectedStream': 'pyflink.datastream.data_stream',
+    'RuntimeExecutionMode': 'pyflink.datastream.execution_mode',
+    'MapFunction': 'pyflink.datastream.functions',
+    'CoMapFunction': 'pyflink.datastream.functions',
+    'FlatMapFunction': 'pyflink.datastream.functions',
+    'CoFlatMapFunction': 'pyflink.datastream.functions',
+    'ReduceFunction': 'pyflink.datastream.functions',
+    'RuntimeContext': 'pyflink.datastream.functions',
+    'KeySelector': 'pyflink.datastream.functions',
+    'FilterFunction': 'pyflink.datastream.functions',
+    'Partitioner': 'pyflink.datastream.functions',
+    'SourceFunction': 'pyflink.datastream.functions',
+    'SinkFunction': 'pyflink.datastream.functions',
+    'CoProcessFunction': 'pyflink.datastream.functions',
+    'KeyedProcessFunction': 'pyflink.datastream.functions',
+    'KeyedCoProcessFunction': 'pyflink.datastream.functions',
+    'BroadcastProcessFunction': 'pyflink.datastream.functions',
+    'AggregateFunction': 'pyflink.datastream.functions',
+    'WindowFunction': 'pyflink.datastream.functions',
+    'ProcessWindowFunction': 'pyflink.datastream.functions',
+    'SlotSharingGroup': 'pyflink.datastream.slot_sharing_group',
+    'MemorySize': 'pyflink.datastream.slot_sharing_group',
+    'StateBackend': 'pyflink.datastream.state_backend',
+    'MemoryStateBackend': 'pyflink.datastream.state_backend',
+    'FsStateBackend': 'pyflink.datastream.state_backend',
+    'RocksDBStateBackend': 'pyflink.datastream.state_backend',
+    'CustomStateBackend': 'pyflink.datastream.state_backend',
+    'PredefinedOptions': 'pyflink.datastream.state_backend',
+    'HashMapStateBackend': 'pyflink.datastream.state_backend',
+    'EmbeddedRocksDBStateBackend': 'pyflink.datastream.state_backend',
+    'CheckpointStorage': 'pyflink.datastream.checkpoint_storage',
+    'JobManagerCheckpointStorage': 'pyflink.datastream.checkpoint_storage',
+    'FileSystemCheckpointStorage': 'pyflink.datastream.checkpoint_storage',
+    'CustomCheckpointStorage': 'pyflink.datastream.checkpoint_storage',
+    'StreamExecutionEnvironment': 'pyflink.datastream.stream_execution_environment',
+    'TimeCharacteristic': 'pyflink.datastream.time_characteristic',
+    'TimeDomain': 'pyflink.datastream.time_domain',
+    'ProcessFunction': 'pyflink.datastream.functions',
+    'TimerService': 'pyflink.datastream.timerservice',
+    'Window': 'pyflink.datastream.window',
+    'TimeWindow': 'pyflink.datastream.window',
+    'CountWindow': 'pyflink.datastream.window',
+    'WindowAssigner': 'pyflink.datastream.window',
+    'MergingWindowAssigner': 'pyflink.datastream.window',
+    'TriggerResult': 'pyflink.datastream.window',
+    'Trigger': 'pyflink.datastream.window',
+})
 
 __all__ = [
     'StreamExecutionEnvironment',
@@ -218,6 +299,8 @@ __all__ = [
     'WindowedStream',
     'ConnectedStreams',
     'DataStreamSink',
+    'BroadcastStream',
+    'BroadcastConnectedStream',
     'MapFunction',
     'CoMapFunction',
     'FlatMapFunction',
@@ -228,6 +311,7 @@ __all__ = [
     'KeyedProcessFunction',
     'CoProcessFunction',
     'KeyedCoProcessFunction',
+    'BroadcastProcessFunction',
     'WindowFunction',
     'ProcessWindowFunction',
     'AggregateFunction',
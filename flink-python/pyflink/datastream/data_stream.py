@@ -34,10 +34,11 @@ from pyflink.datastream.functions import (_get_python_env, FlatMapFunction, MapF
                                           InternalIterableProcessWindowFunction, CoProcessFunction,
                                           InternalSingleValueWindowFunction,
                                           InternalSingleValueProcessWindowFunction,
-                                          PassThroughWindowFunction)
+                                          PassThroughWindowFunction, BroadcastProcessFunction,
+                                          InternalBroadcastProcessFunction)
 from pyflink.datastream.slot_sharing_group import SlotSharingGroup
 from pyflink.datastream.state import ValueStateDescriptor, ValueState, ListStateDescriptor, \
-    StateDescriptor, ReducingStateDescriptor
+    StateDescriptor, ReducingStateDescriptor, MapStateDescriptor
 from pyflink.datastream.utils import convert_to_python_obj
 from pyflink.datastream.window import (CountTumblingWindowAssigner, CountSlidingWindowAssigner,
                                        CountWindowSerializer, TimeWindowSerializer, Trigger,
@@ -45,7 +46,7 @@ from pyflink.datastream.window import (CountTumblingWindowAssigner, CountSliding
 from pyflink.java_gateway import get_gateway
 
 __all__ = ['CloseableIterator', 'DataStream', 'KeyedStream', 'ConnectedStreams', 'WindowedStream',
-           'DataStreamSink', 'CloseableIterator']
+           'DataStreamSink', 'CloseableIterator', 'BroadcastStream', 'BroadcastConnectedStream']
 
 WINDOW_STATE_NAME = 'window-contents'
 
@@ -461,15 +462,21 @@ class DataStream(object):
         j_united_stream = self._j_data_stream.union(j_data_stream_arr)
         return DataStream(j_data_stream=j_united_stream)
 
-    def connect(self, ds: 'DataStream') -> 'ConnectedStreams':
+    def connect(self, ds: Union['DataStream', 'BroadcastStream']) \
+            -> Union['ConnectedStreams', 'BroadcastConnectedStream']:
         """
         Creates a new 'ConnectedStreams' by connecting 'DataStream' outputs of (possible)
         different types with each other. The DataStreams connected using this operator can
         be used with CoFunctions to apply joint transformations.
 
-        :param ds: The DataStream with which this stream will be connected.
-        :return: The `ConnectedStreams`.
+        If a :class:`BroadcastStream` is given, a :class:`BroadcastConnectedStream` is created
+        instead, which can be used with a :class:`BroadcastProcessFunction`.
+
+        :param ds: The DataStream or BroadcastStream with which this stream will be connected.
+        :return: The `ConnectedStreams` or the `BroadcastConnectedStream`.
         """
+        if isinstance(ds, BroadcastStream):
+            return BroadcastConnectedStream(self, ds.stream, ds.broadcast_state_descriptors)
         return ConnectedStreams(self, ds)
 
     def shuffle(self) -> 'DataStream':
@@ -538,13 +545,35 @@ class DataStream(object):
         """
         return DataStream(self._j_data_stream.forward())
 
-    def broadcast(self) -> 'DataStream':
+    def broadcast(self, *broadcast_state_descriptors: MapStateDescriptor) \
+            -> Union['DataStream', 'BroadcastStream']:
         """
         Sets the partitioning of the DataStream so that the output elements are broadcasted to every
         parallel instance of the next operation.
 
-        :return: The DataStream with broadcast partitioning set.
-        """
+        If broadcast state descriptors are given, a :class:`BroadcastStream` is returned instead,
+        which can be connected to a non-keyed DataStream via :func:`connect` and processed with a
+        :class:`BroadcastProcessFunction` having access to the given broadcast states.
+
+        Example:
+        ::
+
+            >>> rule_state_descriptor = MapStateDescriptor(
+            ...     'rules', Types.STRING(), Types.PICKLED_BYTE_ARRAY())
+            >>> ds.connect(rule_ds.broadcast(rule_state_descriptor)) \\
+            ...     .process(MyBroadcastProcessFunction())
+
+        :param broadcast_state_descriptors: The descriptors of the broadcast states to create.
+        :return: The DataStream with broadcast partitioning set, or the BroadcastStream when
+                 broadcast state descriptors are given.
+        """
+        if broadcast_state_descriptors:
+            for state_descriptor in broadcast_state_descriptors:
+                if not isinstance(state_descriptor, MapStateDescriptor):
+                    raise TypeError("The broadcast state descriptor must be a "
+                                    "MapStateDescriptor, got %s." % type(state_descriptor))
+            return BroadcastStream(
+                DataStream(self._j_data_stream.broadcast()), list(broadcast_state_descriptors))
         return DataStream(self._j_data_stream.broadcast())
 
     def process(self, func: ProcessFunction, output_type: TypeInformation = None) -> 'DataStream':
@@ -1255,7 +1284,7 @@ class KeyedStream(DataStream):
     def forward(self) -> 'DataStream':
         raise Exception('Cannot override partitioning for KeyedStream.')
 
-    def broadcast(self) -> 'DataStream':
+    def broadcast(self, *broadcast_state_descriptors: MapStateDescriptor) -> 'DataStream':
         raise Exception('Cannot override partitioning for KeyedStream.')
 
     def partition_custom(self, partitioner: Union[Callable, Partitioner],
@@ -1684,6 +1713,67 @@ class ConnectedStreams(object):
         return isinstance(self.stream1, KeyedStream) and isinstance(self.stream2, KeyedStream)
 
 
+class BroadcastStream(object):
+    """
+    A BroadcastStream is a stream with broadcast state(s). This can be created by any stream using
+    :func:`DataStream.broadcast` with the descriptors of the broadcast states, and implicitly
+    creates the states where the user can store the elements of the created BroadcastStream.
+
+    Note that no further operation can be applied to these streams. The only available option is
+    to connect them with a non-keyed stream, using :func:`DataStream.connect`. This will return a
+    :class:`BroadcastConnectedStream` for further processing.
+
+    .. versionadded:: 1.16.0
+    """
+
+    def __init__(self,
+                 stream: DataStream,
+                 broadcast_state_descriptors: List[MapStateDescriptor]):
+        self.stream = stream
+        self.broadcast_state_descriptors = broadcast_state_descriptors
+
+
+class BroadcastConnectedStream(object):
+    """
+    A BroadcastConnectedStream represents the result of connecting a non-keyed
+    :class:`DataStream` with a :class:`BroadcastStream` with broadcast state(s). The elements of
+    the broadcast stream are delivered to every parallel instance of the operator, which keeps the
+    broadcast states in the memory of the Python worker. The elements of the non-broadcast stream
+    could therefore look up the broadcast states without accessing the state backend.
+
+    .. versionadded:: 1.16.0
+    """
+
+    def __init__(self,
+                 non_broadcast_stream: DataStream,
+                 broadcast_stream: DataStream,
+                 broadcast_state_descriptors: List[MapStateDescriptor]):
+        self.non_broadcast_stream = non_broadcast_stream
+        self.broadcast_stream = broadcast_stream
+        self.broadcast_state_descriptors = broadcast_state_descriptors
+
+    def process(self,
+                func: BroadcastProcessFunction,
+                output_type: TypeInformation = None) -> 'DataStream':
+        """
+        Applies the given :class:`BroadcastProcessFunction` on the connected streams, thereby
+        creating a transformed output stream.
+
+        :param func: The BroadcastProcessFunction that is called for each element in the streams.
+        :param output_type: TypeInformation for the result type of the function.
+        :return: The transformed DataStream.
+        """
+        if not isinstance(func, BroadcastProcessFunction):
+            raise TypeError("The input must be a BroadcastProcessFunction!")
+        if isinstance(self.non_broadcast_stream, KeyedStream):
+            raise Exception("Connecting a KeyedStream with a BroadcastStream is not supported yet.")
+
+        return ConnectedStreams(self.non_broadcast_stream, self.broadcast_stream) \
+            .process(InternalBroadcastProcessFunction(func, self.broadcast_state_descriptors),
+                     output_type) \
+            .name("Broadcast-Process")
+
+
 def _get_one_input_stream_operator(data_stream: DataStream,
                                    func: Union[Function,
                                                FunctionWrapper,
@@ -1723,7 +1813,10 @@ def _get_one_input_stream_operator(data_stream: DataStream,
 
     from pyflink.fn_execution.flink_fn_execution_pb2 import UserDefinedDataStreamFunction
     if func_type == UserDefinedDataStreamFunction.PROCESS:  # type: ignore
-        JDataStreamPythonFunctionOperator = gateway.jvm.PythonProcessOperator
+        if _is_in_thread_mode(data_stream):
+            JDataStreamPythonFunctionOperator = gateway.jvm.EmbeddedPythonProcessOperator
+        else:
+            JDataStreamPythonFunctionOperator = gateway.jvm.PythonProcessOperator
     elif func_type == UserDefinedDataStreamFunction.KEYED_PROCESS:  # type: ignore
         JDataStreamPythonFunctionOperator = gateway.jvm.PythonKeyedProcessOperator
     elif func_type == UserDefinedDataStreamFunction.WINDOW:  # type: ignore
@@ -1756,6 +1849,16 @@ def _get_one_input_stream_operator(data_stream: DataStream,
     return j_python_function_operator, j_output_type_info
 
 
+def _is_in_thread_mode(data_stream: DataStream) -> bool:
+    """
+    Whether the Python functions are executed in the embedded Python environment, i.e. whether
+    'python.execution-mode' is configured as 'thread'.
+    """
+    from pyflink.util.java_utils import get_j_env_configuration
+    j_configuration = get_j_env_configuration(data_stream._j_data_stream.getExecutionEnvironment())
+    return j_configuration.getString('python.execution-mode', 'process').lower() == 'thread'
+
+
 def _get_two_input_stream_operator(connected_streams: ConnectedStreams,
                                    func: Union[Function, FunctionWrapper],
                                    func_type: int,
@@ -16,14 +16,16 @@
 # limitations under the License.
 ################################################################################
 
+import mmap
 from abc import ABC, abstractmethod
-from typing import Union, Any, Generic, TypeVar, Iterable
+from typing import Union, Any, Callable, Generic, TypeVar, Iterable, List, Dict, Tuple
 
 from py4j.java_gateway import JavaObject
 
 from pyflink.datastream.state import ValueState, ValueStateDescriptor, ListStateDescriptor, \
     ListState, MapStateDescriptor, MapState, ReducingStateDescriptor, ReducingState, \
-    AggregatingStateDescriptor, AggregatingState
+    AggregatingStateDescriptor, AggregatingState, TemporalListStateDescriptor, TemporalListState, \
+    ReadOnlyBroadcastState
 from pyflink.datastream.time_domain import TimeDomain
 from pyflink.datastream.timerservice import TimerService
 from pyflink.java_gateway import get_gateway
@@ -46,6 +48,7 @@ __all__ = [
     'CoProcessFunction',
     'KeyedProcessFunction',
     'KeyedCoProcessFunction',
+    'BroadcastProcessFunction',
     'TimerService',
     'WindowFunction',
     'ProcessWindowFunction']
@@ -118,6 +121,21 @@ class KeyedStateStore(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_temporal_list_state(
+            self, state_descriptor: TemporalListStateDescriptor) -> TemporalListState:
+        """
+        Gets a handle to the system's key/value temporal list state. This state is similar to the
+        list state, but keeps the elements sorted by their timestamps, so that the elements up to a
+        timestamp, e.g. the current watermark, could be removed without accessing the remaining
+        elements.
+
+        This state is only accessible if the function is executed on a KeyedStream.
+
+        .. versionadded:: 1.16.0
+        """
+        pass
+
 
 class RuntimeContext(KeyedStateStore):
     """
@@ -186,6 +204,66 @@ class RuntimeContext(KeyedStateStore):
         """
         pass
 
+    @abstractmethod
+    def get_operator_list_state(self, state_descriptor: ListStateDescriptor) -> ListState:
+        """
+        Gets a handle to the operator list state, i.e. a list state which is scoped to the parallel
+        instance of the operator instead of a key. The elements are redistributed among the parallel
+        instances when the parallelism changes.
+
+        This state is only accessible by the functions which are not executed on a KeyedStream,
+        e.g. a :class:`ProcessFunction` or a :class:`CoProcessFunction`. The state is kept in the
+        memory of the Python worker and is written back to the state backend when it has been
+        modified, at the latest before a checkpoint is taken.
+
+        .. versionadded:: 1.16.0
+        """
+        pass
+
+    @abstractmethod
+    def get_broadcast_state(self, state_descriptor: MapStateDescriptor) -> MapState:
+        """
+        Gets a handle to the broadcast map state, i.e. a map state which is scoped to the parallel
+        instance of the operator instead of a key. All the parallel instances are expected to hold
+        the same contents, every parallel instance is restored with them when the parallelism
+        changes.
+
+        This state is only accessible by the functions which are not executed on a KeyedStream,
+        e.g. a :class:`ProcessFunction` or a :class:`CoProcessFunction`. The state is kept in the
+        memory of the Python worker and is written back to the state backend when it has been
+        modified, at the latest before a checkpoint is taken.
+
+        .. versionadded:: 1.16.0
+        """
+        pass
+
+    @abstractmethod
+    def get_shared_resource(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the resource registered under the given name, which is shared by all the functions
+        executed in the same Python worker process, e.g. a machine learning model or a large
+        dictionary. The resource is loaded with the given loader when it is accessed for the first
+        time and is released after the last function using it has been closed. The ``close``
+        method of the resource, if any, is called when it is released.
+
+        The resource should be treated as read-only, as it may be accessed concurrently.
+
+        .. versionadded:: 1.16.0
+        """
+        pass
+
+    @abstractmethod
+    def get_memory_mapped_file(self, path: str) -> mmap.mmap:
+        """
+        Returns a read-only memory map of the given local file, which is shared by all the
+        functions executed in the same Python worker process. Relative paths are resolved against
+        the working directory of the Python worker, into which the archives added via
+        ``add_python_archive`` are extracted.
+
+        .. versionadded:: 1.16.0
+        """
+        pass
+
 
 class Function(ABC):
     """
@@ -710,6 +788,48 @@ class KeyedProcessFunction(Function):
         """
         pass
 
+    def process_elements(self, key, values: Iterable, ctx: 'KeyedProcessFunction.Context'):
+        """
+        Process the elements of the current bundle which belong to the same key.
+
+        This method is only invoked if it's overridden. The elements of a bundle are then grouped
+        by key and each key is processed once with its elements, which saves switching the
+        current key and loading the state of the key for each element. The elements of the same
+        key are passed in arrival order, however, the elements of different keys are no longer
+        processed in arrival order. Overriding it is therefore only suitable for the functions
+        which only rely on the ordering of the elements of the same key.
+
+        Example:
+        ::
+
+            >>> class CountFunction(KeyedProcessFunction):
+            ...     def open(self, runtime_context):
+            ...         self.count = runtime_context.get_state(
+            ...             ValueStateDescriptor('count', Types.LONG()))
+            ...
+            ...     def process_element(self, value, ctx):
+            ...         yield from self.process_elements(ctx.get_current_key(), [value], ctx)
+            ...
+            ...     def process_elements(self, key, values, ctx):
+            ...         count = self.count.value() or 0
+            ...         for value in values:
+            ...             count += 1
+            ...             yield key, count
+            ...         self.count.update(count)
+
+        :param key: The key of the elements.
+        :param values: An iterable of the elements of the key. The timestamp returned by the
+                       Context is the one of the element which has been taken last, it should be
+                       iterated only once and within the invocation of this method.
+        :param ctx: A Context that allows querying the timestamp of the element and getting a
+                    TimerService for registering timers and querying the time. The context is only
+                    valid during the invocation of this method, do not store it.
+        """
+        for value in values:
+            results = self.process_element(value, ctx)
+            if results:
+                yield from results
+
     def on_timer(self, timestamp: int, ctx: 'KeyedProcessFunction.OnTimerContext'):
         """
         Called when a timer set using TimerService fires.
@@ -791,6 +911,111 @@ class CoProcessFunction(Function):
         pass
 
 
+class BroadcastProcessFunction(Function):
+    """
+    A function to be applied to a :class:`~pyflink.datastream.BroadcastConnectedStream` that
+    connects a non-keyed :class:`~pyflink.datastream.DataStream` with a
+    :class:`~pyflink.datastream.BroadcastStream`, i.e. a stream with broadcast state(s).
+
+    The broadcast state is replicated to every parallel instance of the function and is kept in the
+    memory of the Python worker, so the elements of the non-broadcast side can look it up without
+    accessing the state backend. The elements of the broadcast side are delivered to every parallel
+    instance, which is expected to update the broadcast state with them in the same way, so that
+    all the parallel instances hold the same contents. This is why the non-broadcast side only has
+    read-only access to the broadcast state.
+
+    An example use-case is the application of a set of rules that change over time (the broadcast
+    side) to the elements contained in another stream (the non-broadcast side).
+
+    .. versionadded:: 1.16.0
+    """
+
+    class BaseContext(ABC):
+
+        @abstractmethod
+        def timestamp(self) -> int:
+            """
+            Timestamp of the element currently being processed.
+
+            This might be None, for example if the time characteristic of your program is set to
+            TimeCharacteristic.ProcessTime.
+            """
+            pass
+
+        @abstractmethod
+        def current_processing_time(self) -> int:
+            """
+            Returns the current processing time.
+            """
+            pass
+
+        @abstractmethod
+        def current_watermark(self) -> int:
+            """
+            Returns the current event-time watermark.
+            """
+            pass
+
+    class Context(BaseContext):
+        """
+        A context available to the broadcast side of the function. It gives read and write access
+        to the broadcast state.
+        """
+
+        @abstractmethod
+        def get_broadcast_state(self, state_descriptor: MapStateDescriptor) -> MapState:
+            """
+            Fetches the broadcast state with the specified descriptor, which must have been passed
+            to :func:`~pyflink.datastream.DataStream.broadcast`.
+            """
+            pass
+
+    class ReadOnlyContext(BaseContext):
+        """
+        A context available to the non-broadcast side of the function. It only gives read access
+        to the broadcast state.
+        """
+
+        @abstractmethod
+        def get_broadcast_state(
+                self, state_descriptor: MapStateDescriptor) -> ReadOnlyBroadcastState:
+            """
+            Fetches a read-only view of the broadcast state with the specified descriptor, which
+            must have been passed to :func:`~pyflink.datastream.DataStream.broadcast`.
+            """
+            pass
+
+    @abstractmethod
+    def process_element(self, value, ctx: 'BroadcastProcessFunction.ReadOnlyContext'):
+        """
+        This method is called for each element in the non-broadcast stream.
+
+        This function can output zero or more elements and query the broadcast state using the
+        ReadOnlyContext parameter.
+
+        :param value: The input value.
+        :param ctx: A ReadOnlyContext that allows querying the timestamp of the element, the
+                    current time and the broadcast state. The context is only valid during the
+                    invocation of this method, do not store it.
+        """
+        pass
+
+    @abstractmethod
+    def process_broadcast_element(self, value, ctx: 'BroadcastProcessFunction.Context'):
+        """
+        This method is called for each element in the broadcast stream.
+
+        This function can output zero or more elements and update the broadcast state using the
+        Context parameter.
+
+        :param value: The input value.
+        :param ctx: A Context that allows querying the timestamp of the element, the current time
+                    and updating the broadcast state. The context is only valid during the
+                    invocation of this method, do not store it.
+        """
+        pass
+
+
 class KeyedCoProcessFunction(Function):
     """
 A function that processes elements of two keyed streams and produces a single output one.
@@ -1140,3 +1365,90 @@ class InternalIterableProcessWindowFunction(InternalWindowFunction[Iterable[IN],
         self._internal_context._window = window
         self._internal_context._underlying = context
         self._wrapped_function.clear(self._internal_context)
+
+
+class InternalReadOnlyBroadcastState(ReadOnlyBroadcastState[KEY, OUT]):
+
+    def __init__(self, broadcast_state: MapState):
+        self._broadcast_state = broadcast_state
+
+    def get(self, key: KEY) -> OUT:
+        return self._broadcast_state.get(key)
+
+    def contains(self, key: KEY) -> bool:
+        return self._broadcast_state.contains(key)
+
+    def items(self) -> Iterable[Tuple[KEY, OUT]]:
+        return self._broadcast_state.items()
+
+    def keys(self) -> Iterable[KEY]:
+        return self._broadcast_state.keys()
+
+    def values(self) -> Iterable[OUT]:
+        return self._broadcast_state.values()
+
+    def is_empty(self) -> bool:
+        return self._broadcast_state.is_empty()
+
+
+class InternalBroadcastProcessContext(BroadcastProcessFunction.Context,
+                                      BroadcastProcessFunction.ReadOnlyContext):
+
+    def __init__(self, broadcast_states: Dict[str, Any]):
+        self._broadcast_states = broadcast_states
+        self._underlying = None  # type: CoProcessFunction.Context
+
+    def timestamp(self) -> int:
+        return self._underlying.timestamp()
+
+    def current_processing_time(self) -> int:
+        return self._underlying.timer_service().current_processing_time()
+
+    def current_watermark(self) -> int:
+        return self._underlying.timer_service().current_watermark()
+
+    def get_broadcast_state(self, state_descriptor: MapStateDescriptor):
+        if state_descriptor.name not in self._broadcast_states:
+            raise Exception("The broadcast state '%s' has not been passed to "
+                            "DataStream.broadcast." % state_descriptor.name)
+        return self._broadcast_states[state_descriptor.name]
+
+
+class InternalBroadcastProcessFunction(CoProcessFunction):
+    """
+    Executes a :class:`BroadcastProcessFunction` as a :class:`CoProcessFunction` whose first input
+    is the non-broadcast stream and whose second input is the broadcast stream. The broadcast
+    states are fetched once when the function is opened, they are kept in the memory of the Python
+    worker afterwards.
+    """
+
+    def __init__(self,
+                 wrapped_function: BroadcastProcessFunction,
+                 broadcast_state_descriptors: List[MapStateDescriptor]):
+        self._wrapped_function = wrapped_function
+        self._broadcast_state_descriptors = broadcast_state_descriptors
+        self._context = None  # type: InternalBroadcastProcessContext
+        self._read_only_context = None  # type: InternalBroadcastProcessContext
+
+    def open(self, runtime_context: RuntimeContext):
+        broadcast_states = {}
+        read_only_broadcast_states = {}
+        for state_descriptor in self._broadcast_state_descriptors:
+            broadcast_state = runtime_context.get_broadcast_state(state_descriptor)
+            broadcast_states[state_descriptor.name] = broadcast_state
+            read_only_broadcast_states[state_descriptor.name] = \
+                InternalReadOnlyBroadcastState(broadcast_state)
+        self._context = InternalBroadcastProcessContext(broadcast_states)
+        self._read_only_context = InternalBroadcastProcessContext(read_only_broadcast_states)
+        self._wrapped_function.open(runtime_context)
+
+    def close(self):
+        self._wrapped_function.close()
+
+    def process_element1(self, value, ctx: CoProcessFunction.Context):
+        self._read_only_context._underlying = ctx
+        return self._wrapped_function.process_element(value, self._read_only_context)
+
+    def process_element2(self, value, ctx: CoProcessFunction.Context):
+        self._context._underlying = ctx
+        return self._wrapped_function.process_broadcast_element(value, self._context)
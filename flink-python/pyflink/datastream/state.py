@@ -30,10 +30,13 @@ __all__ = [
     'ListState',
     'MapStateDescriptor',
     'MapState',
+    'ReadOnlyBroadcastState',
     'ReducingStateDescriptor',
     'ReducingState',
     'AggregatingStateDescriptor',
     'AggregatingState',
+    'TemporalListStateDescriptor',
+    'TemporalListState',
     'StateTtlConfig'
 ]
 
@@ -209,6 +212,16 @@ class MapState(State, Generic[K, V]):
         """
         pass
 
+    def get_all(self, keys: Iterable[K]) -> Dict[K, V]:
+        """
+        Returns the current values associated with the given keys. The values of the keys which
+        don't exist are None. Compared to calling :func:`get` for each key, it looks up all the
+        keys with a single request to the state backend.
+
+        .. versionadded:: 1.16.0
+        """
+        return {key: self.get(key) for key in keys}
+
     @abstractmethod
     def put(self, key: K, value: V) -> None:
         """
@@ -237,6 +250,14 @@ class MapState(State, Generic[K, V]):
         """
         pass
 
+    def contains_all(self, keys: Iterable[K]) -> bool:
+        """
+        Returns whether there exist the mappings of all the given keys.
+
+        .. versionadded:: 1.16.0
+        """
+        return all(value is not None for value in self.get_all(keys).values())
+
     @abstractmethod
     def items(self) -> Iterable[Tuple[K, V]]:
         """
@@ -281,6 +302,115 @@ class MapState(State, Generic[K, V]):
         return iter(self.keys())
 
 
+class ReadOnlyBroadcastState(ABC, Generic[K, V]):
+    """
+    A read-only view of the broadcast state, i.e. of a :class:`MapState` which holds the same
+    contents in all the parallel instances of an operator. It is handed to the non-broadcast side
+    of a :class:`~pyflink.datastream.BroadcastProcessFunction`, which must not modify the broadcast
+    state as the parallel instances would otherwise diverge.
+
+    .. versionadded:: 1.16.0
+    """
+
+    @abstractmethod
+    def get(self, key: K) -> V:
+        """
+        Returns the current value associated with the given key.
+        """
+        pass
+
+    @abstractmethod
+    def contains(self, key: K) -> bool:
+        """
+        Returns whether there exists the given mapping.
+        """
+        pass
+
+    @abstractmethod
+    def items(self) -> Iterable[Tuple[K, V]]:
+        """
+        Returns all the mappings in the state.
+        """
+        pass
+
+    @abstractmethod
+    def keys(self) -> Iterable[K]:
+        """
+        Returns all the keys in the state.
+        """
+        pass
+
+    @abstractmethod
+    def values(self) -> Iterable[V]:
+        """
+        Returns all the values in the state.
+        """
+        pass
+
+    @abstractmethod
+    def is_empty(self) -> bool:
+        """
+        Returns true if this state contains no key-value mappings, otherwise false.
+        """
+        pass
+
+    def __getitem__(self, key: K) -> V:
+        return self.get(key)
+
+    def __contains__(self, key: K) -> bool:
+        return self.contains(key)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self.keys())
+
+
+class TemporalListState(State, Generic[T]):
+    """
+    :class:`State` interface for partitioned list state whose elements are associated with
+    timestamps and kept sorted by them, e.g. to buffer elements until the watermark passes them.
+    The elements are stored as separate entries keyed by their timestamps, so that draining the
+    elements up to a timestamp only accesses the elements which are due instead of reading,
+    sorting and rewriting the whole list.
+
+    The state key is automatically supplied by the system, so the function always sees the
+    elements mapped to the key of the current element. That way, the system can handle stream and
+    state partitioning consistently together.
+
+    .. versionadded:: 1.16.0
+    """
+
+    @abstractmethod
+    def add(self, timestamp: int, value: T) -> None:
+        """
+        Adds the given value with the given timestamp to this state.
+        """
+        pass
+
+    @abstractmethod
+    def pop_until(self, timestamp: int) -> List[Tuple[int, T]]:
+        """
+        Removes all the elements whose timestamps are less than or equal to the given timestamp
+        from this state and returns them as (timestamp, value) tuples, sorted by timestamp. The
+        elements with the same timestamp are returned in the order they were added.
+        """
+        pass
+
+    @abstractmethod
+    def range(self, start: int, end: int) -> List[Tuple[int, T]]:
+        """
+        Returns the elements whose timestamps are in the range [start, end) as (timestamp, value)
+        tuples, sorted by timestamp, without removing them from this state.
+        """
+        pass
+
+    @abstractmethod
+    def is_empty(self) -> bool:
+        """
+        Returns true if this state contains no elements, otherwise false.
+        """
+        pass
+
+
 class StateDescriptor(ABC):
     """
     Base class for state descriptors. A StateDescriptor is used for creating partitioned State in
@@ -367,6 +497,28 @@ class MapStateDescriptor(StateDescriptor):
         super(MapStateDescriptor, self).__init__(name, Types.MAP(key_type_info, value_type_info))
 
 
+class TemporalListStateDescriptor(StateDescriptor):
+    """
+    StateDescriptor for TemporalListState. This can be used to create state where the type is a
+    list of elements sorted by their timestamps using
+    RuntimeContext.get_temporal_list_state(TemporalListStateDescriptor).
+
+    .. versionadded:: 1.16.0
+    """
+
+    def __init__(self, name: str, elem_type_info: TypeInformation):
+        """
+        Constructor of the TemporalListStateDescriptor.
+
+        :param name: The name of the state.
+        :param elem_type_info: the type information of the state element.
+        """
+        # the elements are stored in a map state keyed by the timestamps and the sequence numbers
+        # of the elements with the same timestamp
+        super(TemporalListStateDescriptor, self).__init__(
+            name, Types.MAP(Types.TUPLE([Types.LONG(), Types.LONG()]), elem_type_info))
+
+
 class ReducingStateDescriptor(StateDescriptor):
     """
     StateDescriptor for ReducingState. This can be used to create partitioned reducing state using
@@ -18,8 +18,11 @@
 import datetime
 import decimal
 import os
+import sys
 import uuid
 
+import pytest
+
 from pyflink.common import Row, Configuration
 from pyflink.common.time import Time
 from pyflink.common.typeinfo import Types
@@ -29,10 +32,12 @@ from pyflink.datastream.data_stream import DataStream
 from pyflink.datastream.functions import (AggregateFunction, CoMapFunction, CoFlatMapFunction,
                                           MapFunction, FilterFunction, FlatMapFunction,
                                           KeyedCoProcessFunction, KeyedProcessFunction, KeySelector,
-                                          ProcessFunction, ReduceFunction)
+                                          ProcessFunction, ReduceFunction,
+                                          BroadcastProcessFunction)
 from pyflink.datastream.state import (ValueStateDescriptor, ListStateDescriptor, MapStateDescriptor,
                                       ReducingStateDescriptor, ReducingState, AggregatingState,
-                                      AggregatingStateDescriptor, StateTtlConfig)
+                                      AggregatingStateDescriptor, StateTtlConfig, MapState,
+                                      TemporalListStateDescriptor, TemporalListState, ListState)
 from pyflink.datastream.tests.test_util import DataStreamTestSinkFunction
 from pyflink.java_gateway import get_gateway
 from pyflink.testing.test_case_utils import PyFlinkBatchTestCase, PyFlinkStreamingTestCase
@@ -585,6 +590,136 @@ class DataStreamTests(object):
                     "-9223372036854775808, current_value: Row(f0=4, f1='1603708289000')"]
         self.assert_equals_sorted(expected, results)
 
+    def test_process_function_with_operator_state(self):
+        self.env.set_parallelism(1)
+        data_stream = self.env.from_collection([(1, 'hi'), (2, 'hello'), (3, 'hi')],
+                                               type_info=Types.ROW([Types.INT(), Types.STRING()]))
+
+        class MyProcessFunction(ProcessFunction):
+
+            def __init__(self):
+                self.list_state = None  # type: ListState
+                self.broadcast_state = None  # type: MapState
+
+            def open(self, runtime_context: RuntimeContext):
+                self.list_state = runtime_context.get_operator_list_state(
+                    ListStateDescriptor('list_state', Types.INT()))
+                self.broadcast_state = runtime_context.get_broadcast_state(
+                    MapStateDescriptor('broadcast_state', Types.STRING(), Types.INT()))
+
+            def process_element(self, value, ctx):
+                self.list_state.add(value[0])
+                count = self.broadcast_state.get(value[1])
+                self.broadcast_state.put(value[1], 1 if count is None else count + 1)
+                yield "%s %s %s" % (value[0], list(self.list_state.get()),
+                                    self.broadcast_state.get(value[1]))
+
+        data_stream.process(MyProcessFunction(), output_type=Types.STRING()) \
+            .add_sink(self.test_sink)
+        self.env.execute('test process function with operator state')
+        results = self.test_sink.get_results()
+        expected = ["1 [1] 1", "2 [1, 2] 1", "3 [1, 2, 3] 2"]
+        self.assert_equals_sorted(expected, results)
+
+    def test_process_function_with_operator_state_and_process_pool(self):
+        from pyflink.util.java_utils import get_j_env_configuration
+        from pyflink.common import Configuration
+        config = Configuration(
+            j_configuration=get_j_env_configuration(self.env._j_stream_execution_environment))
+        config.set_integer("python.fn-execution.process-pool.size", 2)
+        self.env.set_parallelism(1)
+        data_stream = self.env.from_collection([1, 2, 3, 4], type_info=Types.INT())
+
+        class MyProcessFunction(ProcessFunction):
+
+            def __init__(self):
+                self.list_state = None  # type: ListState
+
+            def open(self, runtime_context: RuntimeContext):
+                self.list_state = runtime_context.get_operator_list_state(
+                    ListStateDescriptor('list_state', Types.INT()))
+
+            def process_element(self, value, ctx):
+                self.list_state.add(value)
+                yield "%s %s" % (value, sorted(self.list_state.get()))
+
+        # the function isn't processed in the forked processes as it uses the operator state
+        data_stream.process(MyProcessFunction(), output_type=Types.STRING()) \
+            .add_sink(self.test_sink)
+        self.env.execute('test process function with operator state and process pool')
+        results = self.test_sink.get_results()
+        expected = ["1 [1]", "2 [1, 2]", "3 [1, 2, 3]", "4 [1, 2, 3, 4]"]
+        self.assert_equals_sorted(expected, results)
+
+    def test_operator_state_obtained_after_open_with_process_pool(self):
+        from pyflink.util.java_utils import get_j_env_configuration
+        from pyflink.common import Configuration
+        config = Configuration(
+            j_configuration=get_j_env_configuration(self.env._j_stream_execution_environment))
+        config.set_integer("python.fn-execution.process-pool.size", 2)
+        data_stream = self.env.from_collection([1, 2, 3], type_info=Types.INT())
+
+        class MyProcessFunction(ProcessFunction):
+
+            def __init__(self):
+                self.runtime_context = None
+
+            def open(self, runtime_context: RuntimeContext):
+                self.runtime_context = runtime_context
+
+            def process_element(self, value, ctx):
+                self.runtime_context.get_operator_list_state(
+                    ListStateDescriptor('list_state', Types.INT())).add(value)
+                yield value
+
+        data_stream.process(MyProcessFunction(), output_type=Types.INT()) \
+            .add_sink(self.test_sink)
+        with self.assertRaisesRegex(Exception, "must be obtained in the open method"):
+            self.env.execute('test operator state obtained after open with process pool')
+
+    def test_broadcast_process_function(self):
+        self.env.set_parallelism(1)
+        data_stream = self.env.from_collection([('a', 1), ('b', 2), ('a', 3), ('c', 4)],
+                                               type_info=Types.ROW([Types.STRING(), Types.INT()]))
+        rule_stream = self.env.from_collection([('a', 10), ('b', 20), ('c', 30)],
+                                               type_info=Types.ROW([Types.STRING(), Types.INT()]))
+        rule_state_descriptor = MapStateDescriptor('rules', Types.STRING(), Types.INT())
+
+        class MyBroadcastProcessFunction(BroadcastProcessFunction):
+
+            def __init__(self):
+                # the elements which arrived before the rule of their key, the order in which the
+                # two inputs are read is not deterministic
+                self.pending = {}
+
+            def process_element(self, value, ctx):
+                rules = ctx.get_broadcast_state(rule_state_descriptor)
+                try:
+                    rules.put(value[0], value[1])
+                except AttributeError:
+                    yield "read-only %s" % value[1]
+                if rules.contains(value[0]):
+                    yield "%s %s" % (value[0], value[1] * rules.get(value[0]))
+                else:
+                    self.pending.setdefault(value[0], []).append(value[1])
+
+            def process_broadcast_element(self, value, ctx):
+                rules = ctx.get_broadcast_state(rule_state_descriptor)
+                rules.put(value[0], value[1])
+                yield "rule %s %s" % (value[0], value[1])
+                for pending_value in self.pending.pop(value[0], []):
+                    yield "%s %s" % (value[0], pending_value * rules.get(value[0]))
+
+        data_stream.connect(rule_stream.broadcast(rule_state_descriptor)) \
+            .process(MyBroadcastProcessFunction(), output_type=Types.STRING()) \
+            .add_sink(self.test_sink)
+        self.env.execute('test broadcast process function')
+        results = self.test_sink.get_results()
+        expected = ["read-only 1", "read-only 2", "read-only 3", "read-only 4",
+                    "rule a 10", "rule b 20", "rule c 30",
+                    "a 10", "b 40", "a 30", "c 120"]
+        self.assert_equals_sorted(expected, results)
+
     def test_keyed_process_function_with_state(self):
         self.env.get_config().set_auto_watermark_interval(2000)
         self.env.set_stream_time_characteristic(TimeCharacteristic.EventTime)
@@ -674,6 +809,39 @@ class DataStreamTests(object):
                     "f1='hello', f2='1603708293000')"]
         self.assert_equals_sorted(expected, results)
 
+    def test_keyed_process_function_process_elements(self):
+        self.env.set_parallelism(1)
+        data_stream = self.env.from_collection([
+            (1, 'hi'), (2, 'hello'), (3, 'hi'), (4, 'hello'), (5, 'hi'), (6, 'hello')],
+            type_info=Types.TUPLE([Types.INT(), Types.STRING()]))
+
+        class MyProcessFunction(KeyedProcessFunction):
+
+            def __init__(self):
+                self.sum_state = None
+
+            def open(self, runtime_context: RuntimeContext):
+                self.sum_state = runtime_context.get_state(
+                    ValueStateDescriptor('sum_state', Types.INT()))
+
+            def process_element(self, value, ctx):
+                yield from self.process_elements(ctx.get_current_key(), [value], ctx)
+
+            def process_elements(self, key, values, ctx):
+                current_sum = self.sum_state.value() or 0
+                for value in values:
+                    current_sum += value[0]
+                    yield "{}: {}".format(key, current_sum)
+                self.sum_state.update(current_sum)
+
+        data_stream.key_by(lambda x: x[1], key_type=Types.STRING()) \
+            .process(MyProcessFunction(), output_type=Types.STRING()) \
+            .add_sink(self.test_sink)
+        self.env.execute('test keyed process function process elements')
+        results = self.test_sink.get_results()
+        expected = ['hi: 1', 'hi: 4', 'hi: 9', 'hello: 2', 'hello: 6', 'hello: 12']
+        self.assert_equals_sorted(expected, results)
+
     def test_reducing_state(self):
         self.env.set_parallelism(2)
         data_stream = self.env.from_collection([
@@ -704,6 +872,76 @@ class DataStreamTests(object):
         expected_result.sort()
         self.assertEqual(expected_result, result)
 
+    def test_map_state_get_all(self):
+        self.env.set_parallelism(2)
+        data_stream = self.env.from_collection([
+            (1, 'hi'), (2, 'hello'), (3, 'hi'), (4, 'hello'), (5, 'hi')],
+            type_info=Types.TUPLE([Types.INT(), Types.STRING()]))
+
+        class MyProcessFunction(KeyedProcessFunction):
+
+            def __init__(self):
+                self.map_state = None  # type: MapState
+
+            def open(self, runtime_context: RuntimeContext):
+                self.map_state = runtime_context.get_map_state(
+                    MapStateDescriptor('map_state', Types.INT(), Types.STRING()))
+
+            def process_element(self, value, ctx):
+                values = self.map_state.get_all([1, 2, 3])
+                contains_all = self.map_state.contains_all([1, 3])
+                self.map_state.put_all({value[0]: value[1]})
+                yield "%s %s %s" % (value[0], sorted(values.items()), contains_all)
+
+        data_stream.key_by(lambda x: x[1], key_type=Types.STRING()) \
+            .process(MyProcessFunction(), output_type=Types.STRING()) \
+            .add_sink(self.test_sink)
+        self.env.execute('test_map_state_get_all')
+        result = self.test_sink.get_results()
+        expected_result = ["1 [(1, None), (2, None), (3, None)] False",
+                           "2 [(1, None), (2, None), (3, None)] False",
+                           "3 [(1, 'hi'), (2, None), (3, None)] False",
+                           "4 [(1, None), (2, 'hello'), (3, None)] False",
+                           "5 [(1, 'hi'), (2, None), (3, 'hi')] True"]
+        result.sort()
+        expected_result.sort()
+        self.assertEqual(expected_result, result)
+
+    def test_temporal_list_state(self):
+        self.env.set_parallelism(2)
+        data_stream = self.env.from_collection([
+            (3, 'hi'), (1, 'hi'), (2, 'hello'), (5, 'hi'), (4, 'hello')],
+            type_info=Types.TUPLE([Types.INT(), Types.STRING()]))
+
+        class MyProcessFunction(KeyedProcessFunction):
+
+            def __init__(self):
+                self.temporal_list_state = None  # type: TemporalListState
+
+            def open(self, runtime_context: RuntimeContext):
+                self.temporal_list_state = runtime_context.get_temporal_list_state(
+                    TemporalListStateDescriptor('temporal_list_state', Types.INT()))
+
+            def process_element(self, value, ctx):
+                self.temporal_list_state.add(value[0], value[0] * 10)
+                popped = self.temporal_list_state.pop_until(value[0] - 2)
+                remaining = self.temporal_list_state.range(0, 10)
+                yield "%s %s %s" % (value[0], popped, remaining)
+
+        data_stream.key_by(lambda x: x[1], key_type=Types.STRING()) \
+            .process(MyProcessFunction(), output_type=Types.STRING()) \
+            .add_sink(self.test_sink)
+        self.env.execute('test_temporal_list_state')
+        result = self.test_sink.get_results()
+        expected_result = ["1 [] [(1, 10), (3, 30)]",
+                           "2 [] [(2, 20)]",
+                           "3 [] [(3, 30)]",
+                           "4 [(2, 20)] [(4, 40)]",
+                           "5 [(1, 10), (3, 30)] [(5, 50)]"]
+        result.sort()
+        expected_result.sort()
+        self.assertEqual(expected_result, result)
+
     def test_aggregating_state(self):
         self.env.set_parallelism(2)
         data_stream = self.env.from_collection([
@@ -1179,6 +1417,102 @@ class BatchModeDataStreamTests(DataStreamTests, PyFlinkBatchTestCase):
         self.assert_equals_sorted(expected, results)
 
 
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python3.7")
+class EmbeddedThreadDataStreamTests(PyFlinkStreamingTestCase):
+
+    def setUp(self) -> None:
+        super(EmbeddedThreadDataStreamTests, self).setUp()
+        config = get_j_env_configuration(self.env._j_stream_execution_environment)
+        config.setString("python.execution-mode", "thread")
+        self.test_sink = DataStreamTestSinkFunction()
+
+    def tearDown(self) -> None:
+        self.test_sink.clear()
+
+    def assert_equals_sorted(self, expected, actual):
+        expected.sort()
+        actual.sort()
+        self.assertEqual(expected, actual)
+
+    def test_basic_operations(self):
+        ds = self.env.from_collection(
+            [('ab', 1), ('bdc', 2), ('cfgs', 3), ('deeefg', 4)],
+            type_info=Types.ROW([Types.STRING(), Types.INT()]))
+
+        class MyMapFunction(MapFunction):
+            def map(self, value):
+                return Row(value[0], value[1] + 1, value[2])
+
+        class MyFlatMapFunction(FlatMapFunction):
+            def flat_map(self, value):
+                if value[1] % 2 == 0:
+                    yield value
+
+        class MyFilterFunction(FilterFunction):
+            def filter(self, value):
+                return value[1] > 2
+
+        (ds.map(lambda i: (i[0], len(i[0]), i[1]),
+                output_type=Types.TUPLE([Types.STRING(), Types.INT(), Types.INT()]))
+           .flat_map(MyFlatMapFunction(),
+                     output_type=Types.TUPLE([Types.STRING(), Types.INT(), Types.INT()]))
+           .filter(MyFilterFunction())
+           .map(MyMapFunction(),
+                output_type=Types.ROW([Types.STRING(), Types.INT(), Types.INT()]))
+           .add_sink(self.test_sink))
+        self.env.execute('test_basic_operations_in_thread_mode')
+        results = self.test_sink.get_results()
+        expected = ["+I[cfgs, 5, 3]",
+                    "+I[deeefg, 7, 4]"]
+        self.assert_equals_sorted(expected, results)
+
+    def test_process_function(self):
+        self.env.set_parallelism(1)
+        self.env.get_config().set_auto_watermark_interval(2000)
+        self.env.set_stream_time_characteristic(TimeCharacteristic.EventTime)
+        data_stream = self.env.from_collection([(1, '1603708211000'),
+                                                (2, '1603708224000'),
+                                                (3, '1603708226000')],
+                                               type_info=Types.ROW([Types.INT(), Types.STRING()]))
+
+        class MyProcessFunction(ProcessFunction):
+
+            def process_element(self, value, ctx):
+                yield "current timestamp: {}, current_value: {}".format(
+                    str(ctx.timestamp()), str(value))
+
+        watermark_strategy = WatermarkStrategy.for_monotonous_timestamps() \
+            .with_timestamp_assigner(SecondColumnTimestampAssigner())
+        data_stream.assign_timestamps_and_watermarks(watermark_strategy) \
+            .process(MyProcessFunction(), output_type=Types.STRING()).add_sink(self.test_sink)
+        self.env.execute('test process function in thread mode')
+        results = self.test_sink.get_results()
+        expected = ["current timestamp: 1603708211000, current_value: "
+                    "Row(f0=1, f1='1603708211000')",
+                    "current timestamp: 1603708224000, current_value: "
+                    "Row(f0=2, f1='1603708224000')",
+                    "current timestamp: 1603708226000, current_value: "
+                    "Row(f0=3, f1='1603708226000')"]
+        self.assert_equals_sorted(expected, results)
+
+    def test_operator_state_not_supported(self):
+        data_stream = self.env.from_collection([1, 2, 3], type_info=Types.INT())
+
+        class MyProcessFunction(ProcessFunction):
+
+            def open(self, runtime_context: RuntimeContext):
+                runtime_context.get_operator_list_state(
+                    ListStateDescriptor('list_state', Types.INT()))
+
+            def process_element(self, value, ctx):
+                yield value
+
+        data_stream.process(MyProcessFunction(), output_type=Types.INT()) \
+            .add_sink(self.test_sink)
+        with self.assertRaisesRegex(Exception, "not supported in the 'thread' execution mode"):
+            self.env.execute('test operator state in thread mode')
+
+
 class MyKeySelector(KeySelector):
     def get_key(self, value):
         return value[1]
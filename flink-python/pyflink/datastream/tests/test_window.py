@@ -26,9 +26,10 @@ from pyflink.datastream.functions import (ProcessWindowFunction, WindowFunction)
 from pyflink.datastream.window import (TumblingEventTimeWindows,
                                        SlidingEventTimeWindows, EventTimeSessionWindows,
                                        CountSlidingWindowAssigner, SessionWindowTimeGapExtractor,
-                                       CountWindow)
+                                       CountWindow, TimeWindow)
 from pyflink.datastream.tests.test_util import DataStreamTestSinkFunction
 from pyflink.testing.test_case_utils import PyFlinkStreamingTestCase
+from pyflink.util.java_utils import get_j_env_configuration
 
 
 class WindowTests(PyFlinkStreamingTestCase):
@@ -78,6 +79,25 @@ class WindowTests(PyFlinkStreamingTestCase):
         expected = ['(hi,9)', '(hello,12)']
         self.assert_equals_sorted(expected, results)
 
+    def test_count_tumbling_window_with_paged_list_state(self):
+        config = get_j_env_configuration(self.env._j_stream_execution_environment)
+        # read the window contents from the list state in multiple pages
+        config.setString("python.fn-execution.bundle.size", "1")
+        config.setString("python.list-state.iterate-response-batch-size", "2")
+        data_stream = self.env.from_collection([
+            (1, 'hi'), (2, 'hello'), (3, 'hi'), (4, 'hello'), (5, 'hi'), (6, 'hello'),
+            (7, 'hi'), (8, 'hello'), (9, 'hi'), (10, 'hello'), (11, 'hi')],
+            type_info=Types.TUPLE([Types.INT(), Types.STRING()]))  # type: DataStream
+        data_stream.key_by(lambda x: x[1], key_type=Types.STRING()) \
+            .count_window(5) \
+            .apply(SumWindowFunction(), Types.TUPLE([Types.STRING(), Types.INT()])) \
+            .add_sink(self.test_sink)
+
+        self.env.execute('test_count_tumbling_window_with_paged_list_state')
+        results = self.test_sink.get_results()
+        expected = ['(hi,25)', '(hello,30)']
+        self.assert_equals_sorted(expected, results)
+
     def test_event_time_sliding_window(self):
         data_stream = self.env.from_collection([
             ('hi', 1), ('hi', 2), ('hi', 3), ('hi', 4), ('hi', 5), ('hi', 8), ('hi', 9),
@@ -219,6 +239,17 @@ class WindowTests(PyFlinkStreamingTestCase):
         expected = ['(hi,3)']
         self.assert_equals_sorted(expected, results)
 
+    def test_window_assigners_share_windows(self):
+        assigner = SlidingEventTimeWindows(10, 5, 0)
+        windows = assigner.assign_windows(None, 7, None)
+        self.assertEqual([TimeWindow(5, 15), TimeWindow(0, 10)], windows)
+        # the elements of the same window share the window object
+        for window, other in zip(windows, assigner.assign_windows(None, 8, None)):
+            self.assertIs(window, other)
+        self.assertEqual(hash(TimeWindow(5, 15)), hash(windows[0]))
+        self.assertNotEqual(hash(TimeWindow(0, 10)), hash(TimeWindow(0, 15)))
+        self.assertEqual({CountWindow(1): 'a'}, {CountWindow(1): 'a'})
+
 
 class SecondColumnTimestampAssigner(TimestampAssigner):
 
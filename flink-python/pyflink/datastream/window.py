@@ -54,18 +54,24 @@ __all__ = ['Window',
            'SessionWindowTimeGapExtractor']
 
 
+# the hashes are computed on 64 bits, which avoids the arbitrary-precision arithmetic of Python ints
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
 def long_to_int_with_bit_mixing(x: int) -> int:
-    x = (x ^ (x >> 30)) * 0xbf58476d1ce4e5b9
-    x = (x ^ (x >> 27)) * 0x94d049bb133111eb
+    x &= _MASK_64
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & _MASK_64
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & _MASK_64
     x = x ^ (x >> 31)
     return x
 
 
 def mod_inverse(x: int) -> int:
-    inverse = x * x * x
-    inverse *= 2 - x * inverse
-    inverse *= 2 - x * inverse
-    inverse *= 2 - x * inverse
+    x &= _MASK_64
+    inverse = (x * x * x) & _MASK_64
+    inverse = (inverse * (2 - x * inverse)) & _MASK_64
+    inverse = (inverse * (2 - x * inverse)) & _MASK_64
+    inverse = (inverse * (2 - x * inverse)) & _MASK_64
     return inverse
 
 
@@ -75,6 +81,8 @@ class Window(ABC):
     which means that, at some point, all elements that go into one window will have arrived.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def max_timestamp(self) -> int:
         pass
@@ -85,10 +93,12 @@ class TimeWindow(Window):
     Window that represents a time interval from start (inclusive) to end (exclusive).
     """
 
+    __slots__ = ('start', 'end', '_hash')
+
     def __init__(self, start: int, end: int):
-        super(TimeWindow, self).__init__()
         self.start = start
         self.end = end
+        self._hash = (start + mod_inverse((end << 1) + 1)) & _MASK_64
 
     def max_timestamp(self) -> int:
         return self.end - 1
@@ -150,11 +160,11 @@ class TimeWindow(Window):
                 callback.merge(merge_set, merge_key)
 
     def __hash__(self):
-        return self.start + mod_inverse((self.end << 1) + 1)
+        return self._hash
 
     def __eq__(self, other):
-        return self.__class__ == other.__class__ and self.end == other.end \
-            and self.start == other.start
+        return self is other or (self.__class__ == other.__class__ and self.end == other.end
+                                 and self.start == other.start)
 
     def __lt__(self, other: 'TimeWindow'):
         if not isinstance(other, TimeWindow):
@@ -176,23 +186,60 @@ class CountWindow(Window):
     different CountWindow.
     """
 
+    __slots__ = ('id', '_hash')
+
     def __init__(self, id: int):
-        super(CountWindow, self).__init__()
         self.id = id
+        self._hash = long_to_int_with_bit_mixing(id)
 
     def max_timestamp(self) -> int:
         return MAX_LONG_VALUE
 
     def __hash__(self):
-        return long_to_int_with_bit_mixing(self.id)
+        return self._hash
 
     def __eq__(self, other):
-        return self.__class__ == other.__class__ and self.id == other.id
+        return self is other or (self.__class__ == other.__class__ and self.id == other.id)
 
     def __repr__(self):
         return "CountWindow(id={})".format(self.id)
 
 
+class _WindowTable(object):
+    """
+    A small table of the windows which are currently active in an operator, keyed by the window
+    start for time windows of a fixed size and by the window id for count windows. Window assigners
+    look the windows up in it instead of creating a new window for each element, so that all the
+    elements of a window share one window object and its precomputed hash.
+    """
+
+    MAX_SIZE = 1000
+
+    def __init__(self, window_size: int = None):
+        self._window_size = window_size
+        self._windows = {}
+
+    def time_window(self, start: int) -> TimeWindow:
+        window = self._windows.get(start)
+        if window is None:
+            window = TimeWindow(start, start + self._window_size)
+            self._put(start, window)
+        return window
+
+    def count_window(self, id: int) -> CountWindow:
+        window = self._windows.get(id)
+        if window is None:
+            window = CountWindow(id)
+            self._put(id, window)
+        return window
+
+    def _put(self, key: int, window: Window):
+        if len(self._windows) >= self.MAX_SIZE:
+            # windows are mostly assigned in increasing order, so the old ones are not needed
+            self._windows.clear()
+        self._windows[key] = window
+
+
 class TimeWindowSerializer(TypeSerializer[TimeWindow]):
     """
     The serializer used to write the TimeWindow type.
@@ -740,6 +787,7 @@ class CountTumblingWindowAssigner(WindowAssigner[T, CountWindow]):
         """
         self._window_size = window_size
         self._count_descriptor = ValueStateDescriptor('tumble-count-assigner', Types.LONG())
+        self._windows = _WindowTable()
 
     @staticmethod
     def of(window_size: int) -> 'CountTumblingWindowAssigner':
@@ -756,7 +804,7 @@ class CountTumblingWindowAssigner(WindowAssigner[T, CountWindow]):
         else:
             current_count = count_value
         count_state.update(current_count + 1)
-        return [CountWindow(current_count // self._window_size)]
+        return [self._windows.count_window(current_count // self._window_size)]
 
     def get_default_trigger(self, env) -> Trigger[T, CountWindow]:
         return CountTrigger(self._window_size)
@@ -785,6 +833,7 @@ class CountSlidingWindowAssigner(WindowAssigner[T, CountWindow]):
         self._window_size = window_size
         self._window_slide = window_slide
         self._count_descriptor = ValueStateDescriptor('slide-count-assigner', Types.LONG())
+        self._windows = _WindowTable()
 
     @staticmethod
     def of(window_size: int, window_slide: int) -> 'CountSlidingWindowAssigner':
@@ -807,7 +856,7 @@ class CountSlidingWindowAssigner(WindowAssigner[T, CountWindow]):
         windows = []
         while last_id >= 0 and last_start <= current_count <= last_end:
             if last_start <= current_count <= last_end:
-                windows.append(CountWindow(last_id))
+                windows.append(self._windows.count_window(last_id))
             last_id -= 1
             last_start -= self._window_slide
             last_end -= self._window_slide
@@ -845,6 +894,7 @@ class TumblingProcessingTimeWindows(WindowAssigner[T, TimeWindow]):
 
         self._size = size
         self._offset = offset
+        self._windows = _WindowTable(size)
 
     @staticmethod
     def of(size: Time, offset: Time = None) -> 'TumblingProcessingTimeWindows':
@@ -877,7 +927,7 @@ class TumblingProcessingTimeWindows(WindowAssigner[T, TimeWindow]):
         current_processing_time = context.get_current_processing_time()
         start = TimeWindow.get_window_start_with_offset(current_processing_time, self._offset,
                                                         self._size)
-        return [TimeWindow(start, start + self._size)]
+        return [self._windows.time_window(start)]
 
     def get_default_trigger(self, env) -> Trigger[T, TimeWindow]:
         return ProcessingTimeTrigger()
@@ -911,6 +961,7 @@ class TumblingEventTimeWindows(WindowAssigner[T, TimeWindow]):
 
         self._size = size
         self._offset = offset
+        self._windows = _WindowTable(size)
 
     @staticmethod
     def of(size: Time, offset: Time = None) -> 'TumblingEventTimeWindows':
@@ -933,7 +984,7 @@ class TumblingEventTimeWindows(WindowAssigner[T, TimeWindow]):
                        context: WindowAssigner.WindowAssignerContext) -> Collection[TimeWindow]:
         if timestamp > MIN_LONG_VALUE:
             start = TimeWindow.get_window_start_with_offset(timestamp, self._offset, self._size)
-            return [TimeWindow(start, start + self._size)]
+            return [self._windows.time_window(start)]
         else:
             raise Exception("Record has Java Long.MIN_VALUE timestamp (= no timestamp marker). "
                             + "Is the time characteristic set to 'ProcessingTime', "
@@ -975,6 +1026,7 @@ class SlidingProcessingTimeWindows(WindowAssigner[T, TimeWindow]):
         self._slide = slide
         self._offset = offset
         self._pane_size = math.gcd(size, slide)
+        self._windows = _WindowTable(size)
 
     @staticmethod
     def of(size: Time, slide: Time, offset: Time = None) -> 'SlidingProcessingTimeWindows':
@@ -1009,7 +1061,7 @@ class SlidingProcessingTimeWindows(WindowAssigner[T, TimeWindow]):
         current_processing_time = context.get_current_processing_time()
         last_start = TimeWindow.get_window_start_with_offset(
             current_processing_time, self._offset, self._slide)
-        windows = [TimeWindow(start, start + self._size)
+        windows = [self._windows.time_window(start)
                    for start in range(last_start,
                                       current_processing_time - self._size, -self._slide)]
         return windows
@@ -1049,6 +1101,7 @@ class SlidingEventTimeWindows(WindowAssigner[T, TimeWindow]):
         self._slide = slide
         self._offset = offset
         self._pane_size = math.gcd(size, slide)
+        self._windows = _WindowTable(size)
 
     @staticmethod
     def of(size: Time, slide: Time, offset: Time = None) -> 'SlidingEventTimeWindows':
@@ -1083,7 +1136,7 @@ class SlidingEventTimeWindows(WindowAssigner[T, TimeWindow]):
         if timestamp > MIN_LONG_VALUE:
             last_start = TimeWindow.get_window_start_with_offset(timestamp,
                                                                  self._offset, self._slide)
-            windows = [TimeWindow(start, start + self._size)
+            windows = [self._windows.time_window(start)
                        for start in range(last_start, timestamp - self._size, -self._slide)]
             return windows
         else:
@@ -15,6 +15,8 @@
 #  See the License for the specific language governing permissions and
 # limitations under the License.
 ################################################################################
+import functools
+
 from apache_beam.portability import common_urns
 from apache_beam.portability.api import beam_runner_api_pb2
 from apache_beam.runners.worker import bundle_processor, operation_specs
@@ -23,118 +25,196 @@ from apache_beam.utils import proto_utils
 from pyflink.fn_execution import flink_fn_execution_pb2
 from pyflink.fn_execution.coders import from_proto, from_type_info_proto, TimeWindowCoder, \
     CountWindowCoder, FlattenRowCoder
-from pyflink.fn_execution.state_impl import RemoteKeyedStateBackend
-
-import pyflink.fn_execution.datastream.operations as datastream_operations
-import pyflink.fn_execution.table.operations as table_operations
+from pyflink.fn_execution.decode_ahead import get_decode_ahead_size
+from pyflink.fn_execution.state_impl import RemoteKeyedStateBackend, RemoteOperatorStateBackend
 
 try:
     import pyflink.fn_execution.beam.beam_operations_fast as beam_operations
 except ImportError:
     import pyflink.fn_execution.beam.beam_operations_slow as beam_operations
 
+# The operations of the Table API and the DataStream API are only imported when a transform of the
+# corresponding API is created, so that a worker only loads the API used by the job.
 
 # ----------------- UDF --------------------
 
+SCALAR_FUNCTION_URN = "flink:transform:scalar_function:v1"
+
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.SCALAR_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
+    SCALAR_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
 def create_scalar_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import ScalarFunctionOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatelessFunctionOperation,
-        table_operations.ScalarFunctionOperation)
+        ScalarFunctionOperation)
 
 
 # ----------------- UDTF --------------------
 
+TABLE_FUNCTION_URN = "flink:transform:table_function:v1"
+
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.TABLE_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
+    TABLE_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
 def create_table_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import TableFunctionOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatelessFunctionOperation,
-        table_operations.TableFunctionOperation)
+        TableFunctionOperation)
+
+
+# ----------------- Pandas UDTF --------------------
+
+PANDAS_TABLE_FUNCTION_URN = "flink:transform:table_function:arrow:v1"
+
+
+@bundle_processor.BeamTransformFactory.register_urn(
+    PANDAS_TABLE_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
+def create_pandas_table_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import PandasTableFunctionOperation
+    return _create_user_defined_function_operation(
+        factory, transform_proto, consumers, parameter,
+        beam_operations.StatelessFunctionOperation,
+        PandasTableFunctionOperation)
 
 
 # ----------------- UDAF --------------------
 
+STREAM_GROUP_AGGREGATE_URN = "flink:transform:stream_group_aggregate:v1"
+STREAM_GROUP_TABLE_AGGREGATE_URN = "flink:transform:stream_group_table_aggregate:v1"
+STREAM_GROUP_WINDOW_AGGREGATE_URN = "flink:transform:stream_group_window_aggregate:v1"
+STREAM_LOCAL_GROUP_AGGREGATE_URN = "flink:transform:stream_local_group_aggregate:v1"
+STREAM_GLOBAL_GROUP_AGGREGATE_URN = "flink:transform:stream_global_group_aggregate:v1"
+
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.STREAM_GROUP_AGGREGATE_URN,
+    STREAM_GROUP_AGGREGATE_URN,
     flink_fn_execution_pb2.UserDefinedAggregateFunctions)
 def create_aggregate_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import StreamGroupAggregateOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatefulFunctionOperation,
-        table_operations.StreamGroupAggregateOperation)
+        StreamGroupAggregateOperation)
 
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.STREAM_GROUP_TABLE_AGGREGATE_URN,
+    STREAM_GROUP_TABLE_AGGREGATE_URN,
     flink_fn_execution_pb2.UserDefinedAggregateFunctions)
 def create_table_aggregate_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import StreamGroupTableAggregateOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatefulFunctionOperation,
-        table_operations.StreamGroupTableAggregateOperation)
+        StreamGroupTableAggregateOperation)
 
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.STREAM_GROUP_WINDOW_AGGREGATE_URN,
+    STREAM_GROUP_WINDOW_AGGREGATE_URN,
     flink_fn_execution_pb2.UserDefinedAggregateFunctions)
 def create_group_window_aggregate_function(factory, transform_id, transform_proto, parameter,
                                            consumers):
+    from pyflink.fn_execution.table.operations import StreamGroupWindowAggregateOperation
+    return _create_user_defined_function_operation(
+        factory, transform_proto, consumers, parameter,
+        beam_operations.StatefulFunctionOperation,
+        StreamGroupWindowAggregateOperation)
+
+
+@bundle_processor.BeamTransformFactory.register_urn(
+    STREAM_LOCAL_GROUP_AGGREGATE_URN,
+    flink_fn_execution_pb2.UserDefinedAggregateFunctions)
+def create_local_aggregate_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import StreamLocalGroupAggregateOperation
+    return _create_user_defined_function_operation(
+        factory, transform_proto, consumers, parameter,
+        beam_operations.StatelessFunctionOperation,
+        StreamLocalGroupAggregateOperation)
+
+
+@bundle_processor.BeamTransformFactory.register_urn(
+    STREAM_GLOBAL_GROUP_AGGREGATE_URN,
+    flink_fn_execution_pb2.UserDefinedAggregateFunctions)
+def create_global_aggregate_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import StreamGlobalGroupAggregateOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatefulFunctionOperation,
-        table_operations.StreamGroupWindowAggregateOperation)
+        StreamGlobalGroupAggregateOperation)
 
 
 # ----------------- Pandas UDAF --------------------
 
+PANDAS_AGGREGATE_FUNCTION_URN = "flink:transform:aggregate_function:arrow:v1"
+PANDAS_BATCH_OVER_WINDOW_AGGREGATE_FUNCTION_URN = \
+    "flink:transform:batch_over_window_aggregate_function:arrow:v1"
+PANDAS_INCREMENTAL_AGGREGATE_FUNCTION_URN = \
+    "flink:transform:incremental_aggregate_function:arrow:v1"
+
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.PANDAS_AGGREGATE_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
+    PANDAS_AGGREGATE_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
 def create_pandas_aggregate_function(factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import PandasAggregateFunctionOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatelessFunctionOperation,
-        table_operations.PandasAggregateFunctionOperation)
+        PandasAggregateFunctionOperation)
 
 
 @bundle_processor.BeamTransformFactory.register_urn(
-    table_operations.PANDAS_BATCH_OVER_WINDOW_AGGREGATE_FUNCTION_URN,
+    PANDAS_INCREMENTAL_AGGREGATE_FUNCTION_URN, flink_fn_execution_pb2.UserDefinedFunctions)
+def create_pandas_incremental_aggregate_function(
+        factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import PandasIncrementalAggregateFunctionOperation
+    return _create_user_defined_function_operation(
+        factory, transform_proto, consumers, parameter,
+        beam_operations.StatelessFunctionOperation,
+        PandasIncrementalAggregateFunctionOperation)
+
+
+@bundle_processor.BeamTransformFactory.register_urn(
+    PANDAS_BATCH_OVER_WINDOW_AGGREGATE_FUNCTION_URN,
     flink_fn_execution_pb2.UserDefinedFunctions)
 def create_pandas_over_window_aggregate_function(
         factory, transform_id, transform_proto, parameter, consumers):
+    from pyflink.fn_execution.table.operations import \
+        PandasBatchOverWindowAggregateFunctionOperation
     return _create_user_defined_function_operation(
         factory, transform_proto, consumers, parameter,
         beam_operations.StatelessFunctionOperation,
-        table_operations.PandasBatchOverWindowAggregateFunctionOperation)
+        PandasBatchOverWindowAggregateFunctionOperation)
 
 
 # ----------------- DataStream --------------------
 
+DATA_STREAM_STATELESS_FUNCTION_URN = "flink:transform:ds:stateless_function:v1"
+DATA_STREAM_STATEFUL_FUNCTION_URN = "flink:transform:ds:stateful_function:v1"
+
 
 @bundle_processor.BeamTransformFactory.register_urn(
     common_urns.primitives.PAR_DO.urn, beam_runner_api_pb2.ParDoPayload)
 def create_data_stream_keyed_process_function(factory, transform_id, transform_proto, parameter,
                                               consumers):
+    from pyflink.fn_execution.datastream.operations import StatelessOperation, StatefulOperation
     urn = parameter.do_fn.urn
     payload = proto_utils.parse_Bytes(
         parameter.do_fn.payload, flink_fn_execution_pb2.UserDefinedDataStreamFunction)
-    if urn == datastream_operations.DATA_STREAM_STATELESS_FUNCTION_URN:
+    if urn == DATA_STREAM_STATELESS_FUNCTION_URN:
+        # the operator states are only requested when they are accessed
+        operator_state_backend = RemoteOperatorStateBackend(factory.state_handler)
         return _create_user_defined_function_operation(
             factory, transform_proto, consumers, payload,
             beam_operations.StatelessFunctionOperation,
-            datastream_operations.StatelessOperation)
+            functools.partial(StatelessOperation, operator_state_backend=operator_state_backend))
     else:
         return _create_user_defined_function_operation(
             factory, transform_proto, consumers, payload,
             beam_operations.StatefulFunctionOperation,
-            datastream_operations.StatefulOperation)
+            StatefulOperation)
 
 
 # ----------------- Utilities --------------------
@@ -152,7 +232,8 @@ def _create_user_defined_function_operation(factory, transform_proto, consumers,
         output_coders=[output_coders[tag] for tag in output_tags])
 
     serialized_fn = spec.serialized_fn
-    if hasattr(serialized_fn, "key_type"):
+    if hasattr(serialized_fn, "key_type") and \
+            beam_operation_cls == beam_operations.StatefulFunctionOperation:
         # keyed operation, need to create the KeyedStateBackend.
         row_schema = serialized_fn.key_type.row_schema
         key_row_coder = FlattenRowCoder([from_proto(f.type) for f in row_schema.fields])
@@ -171,7 +252,7 @@ def _create_user_defined_function_operation(factory, transform_proto, consumers,
             serialized_fn.map_state_read_cache_size,
             serialized_fn.map_state_write_cache_size)
 
-        return beam_operation_cls(
+        operation = beam_operation_cls(
             transform_proto.unique_name,
             spec,
             factory.counter_factory,
@@ -179,7 +260,8 @@ def _create_user_defined_function_operation(factory, transform_proto, consumers,
             consumers,
             internal_operation_cls,
             keyed_state_backend)
-    elif internal_operation_cls == datastream_operations.StatefulOperation:
+    elif beam_operation_cls == beam_operations.StatefulFunctionOperation:
+        # stateful operation of the DataStream API
         key_row_coder = from_type_info_proto(serialized_fn.key_type_info)
         keyed_state_backend = RemoteKeyedStateBackend(
             factory.state_handler,
@@ -188,7 +270,7 @@ def _create_user_defined_function_operation(factory, transform_proto, consumers,
             1000,
             1000,
             1000)
-        return beam_operation_cls(
+        operation = beam_operation_cls(
             transform_proto.unique_name,
             spec,
             factory.counter_factory,
@@ -197,10 +279,27 @@ def _create_user_defined_function_operation(factory, transform_proto, consumers,
             internal_operation_cls,
             keyed_state_backend)
     else:
-        return beam_operation_cls(
+        operation = beam_operation_cls(
             transform_proto.unique_name,
             spec,
             factory.counter_factory,
             factory.state_sampler,
             consumers,
             internal_operation_cls)
+
+    decode_ahead_size = get_decode_ahead_size()
+    if decode_ahead_size > 0 and _is_network_input(factory, transform_proto):
+        operation.enable_decode_ahead(decode_ahead_size)
+    return operation
+
+
+def _is_network_input(factory, transform_proto):
+    """
+    Whether the input of the transform is received from the Java operator instead of being the
+    output of another operation of the Python worker.
+    """
+    input_pcollection = next(iter(transform_proto.inputs.values()), None)
+    for transform in factory.descriptor.transforms.values():
+        if input_pcollection in transform.outputs.values():
+            return transform.spec.urn == bundle_processor.DATA_INPUT_URN
+    return False
@@ -48,10 +48,12 @@ cdef class IntermediateOutputProcessor(OutputProcessor):
 cdef class FunctionOperation(Operation):
     cdef OutputProcessor _output_processor
     cdef bint _is_python_coder
+    cdef bint _is_batch_operation
     cdef object process_element
     cdef object operation
     cdef object operation_cls
     cdef object _profiler
+    cdef object _decode_ahead_reader
     cdef object generate_operation(self)
 
 cdef class StatelessFunctionOperation(FunctionOperation):
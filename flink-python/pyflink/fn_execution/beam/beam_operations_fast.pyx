@@ -29,7 +29,8 @@ from pyflink.fn_execution.coder_impl_fast cimport InputStreamWrapper
 
 from apache_beam.runners.worker.bundle_processor import DataOutputOperation
 from pyflink.fn_execution.beam.beam_coder_impl_fast import FlinkLengthPrefixCoderBeamWrapper
-from pyflink.fn_execution.table.operations import BundleOperation
+from pyflink.fn_execution.decode_ahead import DecodeAheadReader
+from pyflink.fn_execution.operations import BundleOperation, BatchOperation
 from pyflink.fn_execution.profiler import Profiler
 
 
@@ -128,11 +129,20 @@ cdef class FunctionOperation(Operation):
         self.operation_cls = operation_cls
         self.operation = self.generate_operation()
         self.process_element = self.operation.process_element
+        self._is_batch_operation = isinstance(self.operation, BatchOperation) and \
+            self.operation.is_batched()
         self.operation.open()
         if spec.serialized_fn.profile_enabled:
             self._profiler = Profiler()
         else:
             self._profiler = None
+        self._decode_ahead_reader = None
+
+    def enable_decode_ahead(self, size):
+        self._decode_ahead_reader = DecodeAheadReader(size)
+        if self.operation.base_metric_group is not None:
+            self.operation.base_metric_group.add_group("decodeAhead").gauge(
+                "queueOccupancyPercentage", self._decode_ahead_reader.occupancy_percentage)
 
     cpdef start(self):
         with self.scoped_start_state:
@@ -149,6 +159,8 @@ cdef class FunctionOperation(Operation):
 
     cpdef teardown(self):
         with self.scoped_finish_state:
+            if self._decode_ahead_reader is not None:
+                self._decode_ahead_reader.close()
             self.operation.close()
             self._output_processor.close()
 
@@ -157,17 +169,38 @@ cdef class FunctionOperation(Operation):
         cdef InputProcessor input_processor
         with self.scoped_process_state:
             if self._is_python_coder:
-                for value in o.value:
-                    self._output_processor.process_outputs(o, self.process_element(value))
+                if self._decode_ahead_reader is not None:
+                    values = self._decode_ahead_reader.read(o.value)
+                else:
+                    values = o.value
+                if self._is_batch_operation:
+                    for result in self.operation.process_batch([value for value in values]):
+                        self._output_processor.process_outputs(o, result)
+                else:
+                    for value in values:
+                        self._output_processor.process_outputs(o, self.process_element(value))
             else:
                 if isinstance(o.value, InputStreamWrapper):
                     input_processor = NetworkInputProcessor(o.value)
                 else:
                     input_processor = IntermediateInputProcessor(o.value)
+                if self._decode_ahead_reader is not None:
+                    input_processor = IntermediateInputProcessor(
+                        self._decode_ahead_reader.read(_copied_values(input_processor)))
                 if isinstance(self.operation, BundleOperation):
                     while input_processor.has_next():
                         self.process_element(input_processor.next())
                     self._output_processor.process_outputs(o, self.operation.finish_bundle())
+                elif self._is_batch_operation:
+                    values = []
+                    while input_processor.has_next():
+                        value = input_processor.next()
+                        # the decoded flatten row is reused by the coder, copy it before buffering
+                        if isinstance(value, list):
+                            value = list(value)
+                        values.append(value)
+                    for result in self.operation.process_batch(values):
+                        self._output_processor.process_outputs(o, result)
                 else:
                     while input_processor.has_next():
                         result = self.process_element(input_processor.next())
@@ -223,3 +256,12 @@ cdef class StatefulFunctionOperation(FunctionOperation):
             self._reusable_windowed_value,
             # the field user_key holds the timer data
             self.operation.process_timer(timer_data.user_key))
+
+
+def _copied_values(InputProcessor input_processor):
+    while input_processor.has_next():
+        value = input_processor.next()
+        # the decoded flatten row is reused by the coder, copy it before it's buffered
+        if isinstance(value, list):
+            value = list(value)
+        yield value
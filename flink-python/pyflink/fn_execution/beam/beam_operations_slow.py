@@ -24,7 +24,8 @@ from apache_beam.runners.worker.operations import Operation
 from apache_beam.utils import windowed_value
 from apache_beam.utils.windowed_value import WindowedValue
 
-from pyflink.fn_execution.table.operations import BundleOperation
+from pyflink.fn_execution.decode_ahead import DecodeAheadReader
+from pyflink.fn_execution.operations import BundleOperation, BatchOperation
 from pyflink.fn_execution.profiler import Profiler
 
 
@@ -79,11 +80,20 @@ class FunctionOperation(Operation):
         self.operation_cls = operation_cls
         self.operation = self.generate_operation()
         self.process_element = self.operation.process_element
+        self._is_batch_operation = isinstance(self.operation, BatchOperation) and \
+            self.operation.is_batched()
         self.operation.open()
         if spec.serialized_fn.profile_enabled:
             self._profiler = Profiler()
         else:
             self._profiler = None
+        self._decode_ahead_reader = None
+
+    def enable_decode_ahead(self, size: int):
+        self._decode_ahead_reader = DecodeAheadReader(size)
+        if self.operation.base_metric_group is not None:
+            self.operation.base_metric_group.add_group("decodeAhead").gauge(
+                "queueOccupancyPercentage", self._decode_ahead_reader.occupancy_percentage)
 
     def setup(self):
         super(FunctionOperation, self).setup()
@@ -109,6 +119,8 @@ class FunctionOperation(Operation):
 
     def teardown(self):
         with self.scoped_finish_state:
+            if self._decode_ahead_reader is not None:
+                self._decode_ahead_reader.close()
             self.operation.close()
             self._output_processor.close()
 
@@ -123,12 +135,19 @@ class FunctionOperation(Operation):
 
     def process(self, o: WindowedValue):
         with self.scoped_process_state:
+            if self._decode_ahead_reader is not None:
+                values = self._decode_ahead_reader.read(o.value)
+            else:
+                values = o.value
             if isinstance(self.operation, BundleOperation):
-                for value in o.value:
+                for value in values:
                     self.process_element(value)
                 self._output_processor.process_outputs(o, self.operation.finish_bundle())
+            elif self._is_batch_operation:
+                for result in self.operation.process_batch([value for value in values]):
+                    self._output_processor.process_outputs(o, result)
             else:
-                for value in o.value:
+                for value in values:
                     self._output_processor.process_outputs(o, self.process_element(value))
 
     def monitoring_infos(self, transform_id, tag_to_pcollection_id):
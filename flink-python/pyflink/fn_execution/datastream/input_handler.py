@@ -16,8 +16,9 @@
 # limitations under the License.
 ################################################################################
 from abc import ABC
-from collections import Iterable
 from enum import Enum
+from itertools import groupby
+from typing import Iterable, List
 
 from pyflink.common import Row
 from pyflink.fn_execution.datastream.timerservice_impl import InternalTimerServiceImpl
@@ -50,6 +51,42 @@ class RunnerInputHandler(ABC):
         self._internal_timer_service.advance_watermark(watermark)
 
 
+class KeyGroupedInputHandler(ABC):
+    """
+    Handler which handles the normal input data of a bundle grouped by key.
+    """
+
+    def __init__(self,
+                 internal_timer_service: InternalTimerServiceImpl,
+                 ctx,
+                 process_elements_func):
+        self._internal_timer_service = internal_timer_service
+        self._ctx = ctx
+        self._process_elements_func = process_elements_func
+        self._timestamp = None
+        self._watermark = None
+
+    def process_batch(self, values: List) -> List:
+        return [self._process_groups(values)] if values else []
+
+    def _process_groups(self, values) -> Iterable:
+        # the elements are reordered across keys, advances the watermark to the latest one of
+        # the batch at once to prevent it from going backwards
+        self._watermark = values[-1][1]
+        self._internal_timer_service.advance_watermark(self._watermark)
+        for key, grouped_values in _group_by_key(values):
+            results = self._process_elements_func(key, self._elements(grouped_values))
+            if results:
+                for result in results:
+                    yield Row(self._timestamp, self._watermark, result)
+
+    def _elements(self, values) -> Iterable:
+        for value in values:
+            self._timestamp = value[0]
+            self._ctx.set_timestamp(self._timestamp)
+            yield value[2][1]
+
+
 class TimerHandler(ABC):
     """
     Handler which handles normal input data.
@@ -96,6 +133,26 @@ class TimerHandler(ABC):
         self._internal_timer_service.advance_watermark(watermark)
 
 
+def _group_by_key(values) -> Iterable:
+    """
+    Groups VALUE[CURRENT_TIMESTAMP, CURRENT_WATERMARK, NORMAL_DATA[KEY, DATA]] by key and keeps
+    the arrival order of the elements of the same key.
+    """
+    groups = {}
+    try:
+        for value in values:
+            key = value[2][0]
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [value]
+            else:
+                group.append(value)
+        return groups.items()
+    except TypeError:
+        # the keys are not hashable, only groups the consecutive elements of the same key
+        return [(key, list(group)) for key, group in groupby(values, lambda v: v[2][0])]
+
+
 def _emit_results(timestamp, watermark, results):
     if results:
         for result in results:
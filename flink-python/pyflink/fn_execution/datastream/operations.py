@@ -15,12 +15,15 @@
 #  See the License for the specific language governing permissions and
 # limitations under the License.
 ################################################################################
-import abc
+from typing import List
 
 from pyflink.common import Row
 from pyflink.common.serializer import VoidNamespaceSerializer
-from pyflink.datastream import TimeDomain, RuntimeContext
+from pyflink.datastream import TimeDomain, RuntimeContext, KeyedProcessFunction
 from pyflink.fn_execution import pickle
+from pyflink.fn_execution.operations import Operation, BatchOperation
+from pyflink.fn_execution.process_pool import ProcessPool, PROCESS_POOL_SIZE, \
+    get_process_pool_size
 from pyflink.fn_execution.datastream.process_function import \
     InternalKeyedProcessFunctionOnTimerContext, InternalKeyedProcessFunctionContext, \
     InternalProcessFunctionContext
@@ -29,93 +32,115 @@ from pyflink.fn_execution.datastream.window.window_operator import WindowOperato
 from pyflink.fn_execution.datastream.timerservice_impl import (
     TimerServiceImpl, InternalTimerServiceImpl, NonKeyedTimerServiceImpl)
 from pyflink.fn_execution.datastream.input_handler import (RunnerInputHandler, TimerHandler,
-                                                           _emit_results)
-from pyflink.metrics.metricbase import GenericMetricGroup
+                                                           KeyGroupedInputHandler, _emit_results)
 
 
-DATA_STREAM_STATELESS_FUNCTION_URN = "flink:transform:ds:stateless_function:v1"
-DATA_STREAM_STATEFUL_FUNCTION_URN = "flink:transform:ds:stateful_function:v1"
+class StatelessOperation(Operation, BatchOperation):
 
-
-class Operation(abc.ABC):
-
-    def __init__(self, serialized_fn):
-        if serialized_fn.metric_enabled:
-            self.base_metric_group = GenericMetricGroup(None, None)
-        else:
-            self.base_metric_group = None
-
-    def finish(self):
-        self._update_gauge(self.base_metric_group)
-
-    def _update_gauge(self, base_metric_group):
-        if base_metric_group is not None:
-            for name in base_metric_group._flink_gauge:
-                flink_gauge = base_metric_group._flink_gauge[name]
-                beam_gauge = base_metric_group._beam_gauge[name]
-                beam_gauge.set(flink_gauge())
-            for sub_group in base_metric_group._sub_groups:
-                self._update_gauge(sub_group)
-
-    def process_element(self, value):
-        raise NotImplementedError
-
-    def open(self) -> None:
-        pass
-
-    def close(self) -> None:
-        pass
-
-
-class StatelessOperation(Operation):
-
-    def __init__(self, serialized_fn):
+    def __init__(self, serialized_fn, operator_state_backend=None):
         super(StatelessOperation, self).__init__(serialized_fn)
+        self.operator_state_backend = operator_state_backend
+        from pyflink.fn_execution import flink_fn_execution_pb2
+        # only the functions of a single input are processed in parallel, the functions of two
+        # inputs, e.g. the broadcast process functions, usually rely on the operator state
+        if serialized_fn.function_type == \
+                flink_fn_execution_pb2.UserDefinedDataStreamFunction.PROCESS:
+            self._process_pool_size = get_process_pool_size()
+        else:
+            self._process_pool_size = 1
+        self._process_pool = None
         self.open_func, self.close_func, self.process_element_func = \
             extract_stateless_function(
                 user_defined_function_proto=serialized_fn,
                 runtime_context=StreamingRuntimeContext.of(
                     serialized_fn.runtime_context,
-                    self.base_metric_group))
+                    self.base_metric_group,
+                    operator_state_backend=self.operator_state_backend,
+                    shared_resources=self.shared_resources))
+
+    def finish(self):
+        if self.operator_state_backend is not None:
+            self.operator_state_backend.commit()
+        super().finish()
 
     def open(self):
         self.open_func()
+        if self._process_pool_size > 1:
+            if self.operator_state_backend is not None:
+                if self.operator_state_backend.has_states():
+                    # the changes of the operator states in the child processes would be lost,
+                    # so the batches are only processed in the current process
+                    return
+                self.operator_state_backend.reject_new_states(
+                    "the operator states must be obtained in the open method of the function "
+                    "when '%s' is larger than 1, the function is then processed in a single "
+                    "process." % PROCESS_POOL_SIZE)
+            # forks the child processes after the function has been opened
+            self._process_pool = ProcessPool(self._process_pool_size, self._process_batch)
 
     def close(self):
+        if self._process_pool is not None:
+            self._process_pool.close()
+            self._process_pool = None
         self.close_func()
+        super().close()
+
+    def is_batched(self) -> bool:
+        return self._process_pool_size > 1
 
     def process_element(self, value):
         return self.process_element_func(value)
 
+    def process_batch(self, values: List) -> List:
+        if self._process_pool is not None:
+            return self._process_pool.process_batch(values)
+        return self._process_batch(values)
+
+    def _process_batch(self, values: List) -> List:
+        # the results are materialized to send them back from the child processes
+        return [list(self.process_element_func(value)) for value in values]
+
 
-class StatefulOperation(Operation):
+class StatefulOperation(Operation, BatchOperation):
 
     def __init__(self, serialized_fn, keyed_state_backend):
         super(StatefulOperation, self).__init__(serialized_fn)
         self.keyed_state_backend = keyed_state_backend
+        if self.base_metric_group is not None:
+            self.keyed_state_backend.register_metrics(self.base_metric_group)
         self.open_func, self.close_func, self.process_element_func, self.process_timer_func, \
-            self.internal_timer_service = \
+            self.internal_timer_service, self.process_batch_func = \
             extract_stateful_function(
                 user_defined_function_proto=serialized_fn,
                 runtime_context=StreamingRuntimeContext.of(
                     serialized_fn.runtime_context,
                     self.base_metric_group,
-                    self.keyed_state_backend),
+                    self.keyed_state_backend,
+                    shared_resources=self.shared_resources),
                 keyed_state_backend=self.keyed_state_backend)
 
     def finish(self):
-        super().finish()
+        # commit before updating the gauges to report the commit of the current bundle
         self.keyed_state_backend.commit()
+        self.keyed_state_backend.clear_cached_iterators()
+        super().finish()
 
     def open(self):
         self.open_func()
 
     def close(self):
         self.close_func()
+        super().close()
+
+    def is_batched(self) -> bool:
+        return self.process_batch_func is not None
 
     def process_element(self, value):
         return self.process_element_func(value)
 
+    def process_batch(self, values: List) -> List:
+        return self.process_batch_func(values)
+
     def process_timer(self, timer_data):
         return self.process_timer_func(timer_data)
 
@@ -213,6 +238,8 @@ def extract_stateful_function(user_defined_function_proto,
     func_type = user_defined_function_proto.function_type
     user_defined_func = pickle.loads(user_defined_function_proto.payload)
     internal_timer_service = InternalTimerServiceImpl(keyed_state_backend)
+    # processes the elements of a bundle grouped by key if not None
+    process_batch_func = None
 
     def state_key_selector(normal_data):
         return Row(normal_data[0])
@@ -265,6 +292,17 @@ def extract_stateful_function(user_defined_function_proto,
                 keyed_state_backend.set_current_key(state_key_selector(normal_data))
                 return process_function.process_element(input_selector(normal_data), ctx)
 
+            if type(process_function).process_elements is not \
+                    KeyedProcessFunction.process_elements:
+
+                def process_elements(user_current_key, values):
+                    ctx.set_current_key(user_current_key)
+                    keyed_state_backend.set_current_key(Row(user_current_key))
+                    return process_function.process_elements(user_current_key, values, ctx)
+
+                process_batch_func = KeyGroupedInputHandler(
+                    internal_timer_service, ctx, process_elements).process_batch
+
         elif func_type == UserDefinedDataStreamFunction.KEYED_CO_PROCESS:
 
             def process_element(normal_data, timestamp: int):
@@ -340,4 +378,5 @@ def extract_stateful_function(user_defined_function_proto,
         keyed_state_backend._namespace_coder_impl)
     process_timer_func = timer_handler.process_timer
 
-    return open_func, close_func, process_element_func, process_timer_func, internal_timer_service
+    return open_func, close_func, process_element_func, process_timer_func, \
+        internal_timer_service, process_batch_func
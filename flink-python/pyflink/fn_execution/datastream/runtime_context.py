@@ -15,12 +15,13 @@
 #  See the License for the specific language governing permissions and
 # limitations under the License.
 ################################################################################
-from typing import Dict
+import mmap
+from typing import Any, Callable, Dict
 
 from pyflink.datastream import RuntimeContext
 from pyflink.datastream.state import ValueStateDescriptor, ValueState, ListStateDescriptor, \
     ListState, MapStateDescriptor, MapState, ReducingStateDescriptor, ReducingState, \
-    AggregatingStateDescriptor, AggregatingState
+    AggregatingStateDescriptor, AggregatingState, TemporalListStateDescriptor, TemporalListState
 from pyflink.fn_execution.coders import from_type_info, MapCoder, GenericArrayCoder
 from pyflink.metrics import MetricGroup
 
@@ -37,7 +38,9 @@ class StreamingRuntimeContext(RuntimeContext):
                  job_parameters: Dict[str, str],
                  metric_group: MetricGroup,
                  keyed_state_backend,
-                 in_batch_execution_mode: bool):
+                 in_batch_execution_mode: bool,
+                 operator_state_backend=None,
+                 shared_resources=None):
         self._task_name = task_name
         self._task_name_with_subtasks = task_name_with_subtasks
         self._number_of_parallel_subtasks = number_of_parallel_subtasks
@@ -48,6 +51,8 @@ class StreamingRuntimeContext(RuntimeContext):
         self._metric_group = metric_group
         self._keyed_state_backend = keyed_state_backend
         self._in_batch_execution_mode = in_batch_execution_mode
+        self._operator_state_backend = operator_state_backend
+        self._shared_resources = shared_resources
 
     def get_task_name(self) -> str:
         """
@@ -154,8 +159,58 @@ class StreamingRuntimeContext(RuntimeContext):
         else:
             raise Exception("This state is only accessible by functions executed on a KeyedStream.")
 
+    def get_temporal_list_state(
+            self, state_descriptor: TemporalListStateDescriptor) -> TemporalListState:
+        if self._keyed_state_backend:
+            map_coder = from_type_info(state_descriptor.type_info)  # type: MapCoder
+            return self._keyed_state_backend.get_temporal_list_state(
+                state_descriptor.get_name(),
+                map_coder._key_coder,
+                map_coder._value_coder,
+                state_descriptor._ttl_config)
+        else:
+            raise Exception("This state is only accessible by functions executed on a KeyedStream.")
+
+    def get_operator_list_state(self, state_descriptor: ListStateDescriptor) -> ListState:
+        if self._operator_state_backend:
+            array_coder = from_type_info(state_descriptor.type_info)  # type: GenericArrayCoder
+            return self._operator_state_backend.get_list_state(
+                state_descriptor.name, array_coder._elem_coder)
+        else:
+            self._raise_operator_state_not_accessible()
+
+    def get_broadcast_state(self, state_descriptor: MapStateDescriptor) -> MapState:
+        if self._operator_state_backend:
+            map_coder = from_type_info(state_descriptor.type_info)  # type: MapCoder
+            return self._operator_state_backend.get_broadcast_state(
+                state_descriptor.name, map_coder._key_coder, map_coder._value_coder)
+        else:
+            self._raise_operator_state_not_accessible()
+
+    def _raise_operator_state_not_accessible(self):
+        if self._keyed_state_backend:
+            raise Exception("This state is only accessible by functions which are not executed on "
+                            "a KeyedStream.")
+        else:
+            # the non-keyed functions are only executed without an operator state backend in the
+            # thread mode
+            raise Exception("The operator state is not supported in the 'thread' execution mode, "
+                            "please set 'python.execution-mode' to 'process' to use it.")
+
+    def get_shared_resource(self, name: str, loader: Callable[[], Any]) -> Any:
+        return self._get_shared_resources().get(name, loader)
+
+    def get_memory_mapped_file(self, path: str) -> mmap.mmap:
+        return self._get_shared_resources().get_memory_mapped_file(path)
+
+    def _get_shared_resources(self):
+        if self._shared_resources is None:
+            raise Exception("The shared resources are not accessible in this context.")
+        return self._shared_resources
+
     @staticmethod
-    def of(runtime_context_proto, metric_group, keyed_state_backend=None):
+    def of(runtime_context_proto, metric_group, keyed_state_backend=None,
+           operator_state_backend=None, shared_resources=None):
         return StreamingRuntimeContext(
             runtime_context_proto.task_name,
             runtime_context_proto.task_name_with_subtasks,
@@ -166,4 +221,6 @@ class StreamingRuntimeContext(RuntimeContext):
             {p.key: p.value for p in runtime_context_proto.job_parameters},
             metric_group,
             keyed_state_backend,
-            runtime_context_proto.in_batch_execution_mode)
+            runtime_context_proto.in_batch_execution_mode,
+            operator_state_backend,
+            shared_resources)
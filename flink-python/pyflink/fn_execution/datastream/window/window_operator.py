@@ -15,15 +15,17 @@
 #  See the License for the specific language governing permissions and
 # limitations under the License.
 ################################################################################
+import itertools
 import typing
-from typing import TypeVar, Iterable, Collection
+from typing import TypeVar, Iterable, Collection, Iterator, Optional
 
 from pyflink.common.constants import MAX_LONG_VALUE
 from pyflink.datastream import WindowAssigner, Trigger, MergingWindowAssigner, TriggerResult
 from pyflink.datastream.functions import KeyedStateStore, RuntimeContext, InternalWindowFunction
 from pyflink.datastream.state import StateDescriptor, ListStateDescriptor, \
     ReducingStateDescriptor, AggregatingStateDescriptor, ValueStateDescriptor, MapStateDescriptor, \
-    State, AggregatingState, ReducingState, MapState, ListState, ValueState, AppendingState
+    State, AggregatingState, ReducingState, MapState, ListState, ValueState, AppendingState, \
+    TemporalListStateDescriptor, TemporalListState
 from pyflink.fn_execution.datastream.timerservice import InternalTimerService
 from pyflink.fn_execution.datastream.window.merging_window_set import MergingWindowSet
 from pyflink.fn_execution.internal_state import InternalMergingState, InternalKvState, \
@@ -37,6 +39,35 @@ KEY = TypeVar("KEY")
 W = TypeVar("W")
 
 
+class _ListStateContents(Iterable[T]):
+    """
+    The contents of a window backed by a ListState, which are read and decoded lazily. The first
+    iteration continues with the iterator which was used to check whether the window is empty.
+    """
+
+    def __init__(self, contents: Iterable[T], first: T, rest: Iterator[T]):
+        self._contents = contents
+        self._first = first
+        self._rest = rest
+
+    def __iter__(self) -> Iterator[T]:
+        if self._rest is not None:
+            rest, self._rest = self._rest, None
+            return itertools.chain((self._first,), rest)
+        return iter(self._contents)
+
+
+def _non_empty_contents(contents: Iterable[T]) -> Optional[Iterable[T]]:
+    """
+    Returns the given contents of a ListState, or None if they are empty, without materializing
+    them.
+    """
+    iterator = iter(contents)
+    for first in iterator:
+        return _ListStateContents(contents, first, iterator)
+    return None
+
+
 def get_or_create_keyed_state(runtime_context, state_descriptor):
     if isinstance(state_descriptor, ListStateDescriptor):
         state = runtime_context.get_list_state(state_descriptor)
@@ -48,6 +79,8 @@ def get_or_create_keyed_state(runtime_context, state_descriptor):
         state = runtime_context.get_state(state_descriptor)
     elif isinstance(state_descriptor, MapStateDescriptor):
         state = runtime_context.get_map_state(state_descriptor)
+    elif isinstance(state_descriptor, TemporalListStateDescriptor):
+        state = runtime_context.get_temporal_list_state(state_descriptor)
     else:
         raise Exception("Unsupported state descriptor: %s" % type(state_descriptor))
     return state
@@ -74,6 +107,10 @@ class MergingWindowStateStore(KeyedStateStore):
             self, state_descriptor: AggregatingStateDescriptor) -> AggregatingState:
         raise Exception("Per-window state is not allowed when using merging windows.")
 
+    def get_temporal_list_state(
+            self, state_descriptor: TemporalListStateDescriptor) -> TemporalListState:
+        raise Exception("Per-window state is not allowed when using merging windows.")
+
 
 class PerWindowStateStore(KeyedStateStore):
 
@@ -97,6 +134,11 @@ class PerWindowStateStore(KeyedStateStore):
             self, state_descriptor: AggregatingStateDescriptor) -> AggregatingState:
         return self._set_namespace(self._runtime_context.get_aggregating_state(state_descriptor))
 
+    def get_temporal_list_state(
+            self, state_descriptor: TemporalListStateDescriptor) -> TemporalListState:
+        return self._set_namespace(
+            self._runtime_context.get_temporal_list_state(state_descriptor))
+
     def _set_namespace(self, state):
         state.set_current_namespace(self.window)
         return state
@@ -366,9 +408,7 @@ class WindowOperator(object):
                     contents = self.window_state.get()
                     # for list state the iterable will never be none
                     if isinstance(self.window_state, ListState):
-                        contents = [i for i in contents]
-                        if len(contents) == 0:
-                            contents = None
+                        contents = _non_empty_contents(contents)
                     if contents is None:
                         continue
                     yield from self.emit_window_contents(actual_window, contents)
@@ -396,9 +436,7 @@ class WindowOperator(object):
                     contents = self.window_state.get()
                     # for list state the iterable will never be none
                     if isinstance(self.window_state, ListState):
-                        contents = [i for i in contents]
-                        if len(contents) == 0:
-                            contents = None
+                        contents = _non_empty_contents(contents)
                     if contents is None:
                         continue
                     yield from self.emit_window_contents(window, contents)
@@ -434,9 +472,7 @@ class WindowOperator(object):
             contents = self.window_state.get()
             # for list state the iterable will never be none
             if isinstance(self.window_state, ListState):
-                contents = [i for i in contents]
-                if len(contents) == 0:
-                    contents = None
+                contents = _non_empty_contents(contents)
             if contents is not None:
                 yield from self.emit_window_contents(self.trigger_context.window, contents)
 
@@ -474,9 +510,7 @@ class WindowOperator(object):
             contents = self.window_state.get()
             # for list state the iterable will never be none
             if isinstance(self.window_state, ListState):
-                contents = [i for i in contents]
-                if len(contents) == 0:
-                    contents = None
+                contents = _non_empty_contents(contents)
             if contents is not None:
                 yield from self.emit_window_contents(self.trigger_context.window, contents)
 
@@ -0,0 +1,134 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import os
+import queue
+import threading
+from typing import Iterable, Iterator
+
+DECODE_AHEAD_SIZE = "python.fn-execution.decode-ahead.size"
+
+# the decoded elements are handed over in chunks to amortize the synchronization of the queue
+_MAX_CHUNKS = 4
+
+_JOIN_TIMEOUT_SECS = 5
+
+_END = object()
+
+
+def get_decode_ahead_size() -> int:
+    """
+    Returns the configured maximum number of input elements decoded ahead of the element being
+    processed, 0 if decoding ahead is disabled. The job options are passed to the Python worker
+    as environment variables.
+    """
+    return int(os.environ.get(DECODE_AHEAD_SIZE, 0))
+
+
+class _Failure(object):
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+class DecodeAheadReader(object):
+    """
+    Decodes the input elements of an operation on a helper thread into a bounded queue while the
+    elements decoded before are processed by the current thread. The decoding only overlaps with
+    the processing while the user-defined functions release the GIL, e.g. while waiting for I/O
+    or calling native libraries such as NumPy.
+    """
+
+    def __init__(self, size: int):
+        self._chunk_size = max(1, size // _MAX_CHUNKS)
+        self._chunks = queue.Queue(max(1, size // self._chunk_size))
+        self._inputs = queue.Queue()
+        self._cancelled = False
+        self._occupancy_sum = 0
+        self._occupancy_samples = 0
+        self._thread = threading.Thread(
+            target=self._decode, name="pyflink-decode-ahead", daemon=True)
+        self._thread.start()
+
+    def read(self, values: Iterable) -> Iterator:
+        """
+        Returns the elements of the given lazily decoded input in order. The elements are decoded
+        on the helper thread.
+        """
+        self._inputs.put(values)
+        finished = False
+        try:
+            while True:
+                self._occupancy_sum += self._chunks.qsize()
+                self._occupancy_samples += 1
+                chunk = self._chunks.get()
+                if chunk is _END:
+                    finished = True
+                    return
+                if isinstance(chunk, _Failure):
+                    finished = True
+                    raise chunk.exception
+                yield from chunk
+        finally:
+            if not finished:
+                # the elements were not consumed completely, e.g. because the processing failed.
+                # Stops decoding the remaining elements so that the next input starts cleanly
+                self._cancelled = True
+                while True:
+                    chunk = self._chunks.get()
+                    if chunk is _END or isinstance(chunk, _Failure):
+                        break
+                self._cancelled = False
+
+    def occupancy_percentage(self) -> int:
+        """
+        Returns the average percentage of the queue which was filled with decoded chunks when
+        the next chunk was requested since the last call. A low value means that the decoding
+        can't keep up with the processing.
+        """
+        if self._occupancy_samples == 0:
+            result = 0
+        else:
+            result = int(100 * self._occupancy_sum /
+                         (self._occupancy_samples * self._chunks.maxsize))
+        self._occupancy_sum = 0
+        self._occupancy_samples = 0
+        return result
+
+    def close(self):
+        self._inputs.put(None)
+        self._thread.join(_JOIN_TIMEOUT_SECS)
+
+    def _decode(self):
+        while True:
+            values = self._inputs.get()
+            if values is None:
+                return
+            try:
+                chunk = []
+                for value in values:
+                    chunk.append(value)
+                    if len(chunk) == self._chunk_size:
+                        self._chunks.put(chunk)
+                        chunk = []
+                        if self._cancelled:
+                            break
+                if chunk and not self._cancelled:
+                    self._chunks.put(chunk)
+                self._chunks.put(_END)
+            except BaseException as e:
+                self._chunks.put(_Failure(e))
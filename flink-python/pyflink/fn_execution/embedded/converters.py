@@ -0,0 +1,161 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+from abc import ABC, abstractmethod
+
+import cloudpickle
+
+from pyflink.common import Row
+from pyflink.fn_execution import pickle
+
+
+class DataConverter(ABC):
+    """
+    Converts the data passed between Java and Python by PemJa in the embedded (thread) mode. The
+    external data is the data as converted by PemJa, e.g. a list for a Java Row, and the internal
+    data is the data expected by the Python user-defined functions, e.g. a :class:`Row`.
+    """
+
+    @abstractmethod
+    def to_internal(self, value):
+        pass
+
+    @abstractmethod
+    def to_external(self, value):
+        pass
+
+
+class IdentityDataConverter(DataConverter):
+
+    def to_internal(self, value):
+        return value
+
+    def to_external(self, value):
+        return value
+
+
+class PickleDataConverter(DataConverter):
+
+    def to_internal(self, value):
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def to_external(self, value):
+        if value is None:
+            return None
+        return cloudpickle.dumps(value)
+
+
+class RowDataConverter(DataConverter):
+
+    def __init__(self, field_data_converters, field_names):
+        self._field_data_converters = field_data_converters
+        self._field_names = field_names
+
+    def to_internal(self, value):
+        if value is None:
+            return None
+        row = Row(*[c.to_internal(item) for c, item in zip(self._field_data_converters, value)])
+        row.set_field_names(self._field_names)
+        return row
+
+    def to_external(self, value):
+        if value is None:
+            return None
+        return [c.to_external(item) for c, item in zip(self._field_data_converters, value)]
+
+
+class TupleDataConverter(DataConverter):
+
+    def __init__(self, field_data_converters):
+        self._field_data_converters = field_data_converters
+
+    def to_internal(self, value):
+        if value is None:
+            return None
+        return tuple(c.to_internal(item) for c, item in zip(self._field_data_converters, value))
+
+    def to_external(self, value):
+        if value is None:
+            return None
+        return [c.to_external(item) for c, item in zip(self._field_data_converters, value)]
+
+
+class ListDataConverter(DataConverter):
+
+    def __init__(self, element_data_converter):
+        self._element_data_converter = element_data_converter
+
+    def to_internal(self, value):
+        if value is None:
+            return None
+        return [self._element_data_converter.to_internal(item) for item in value]
+
+    def to_external(self, value):
+        if value is None:
+            return None
+        return [self._element_data_converter.to_external(item) for item in value]
+
+
+class DictDataConverter(DataConverter):
+
+    def __init__(self, key_data_converter, value_data_converter):
+        self._key_data_converter = key_data_converter
+        self._value_data_converter = value_data_converter
+
+    def to_internal(self, value):
+        if value is None:
+            return None
+        return {self._key_data_converter.to_internal(k): self._value_data_converter.to_internal(v)
+                for k, v in value.items()}
+
+    def to_external(self, value):
+        if value is None:
+            return None
+        return {self._key_data_converter.to_external(k): self._value_data_converter.to_external(v)
+                for k, v in value.items()}
+
+
+def from_type_info_proto(type_info):
+    """
+    Creates the :class:`DataConverter` of the data stream type information, which is the
+    counterpart of the Java data converters in PythonTypeUtils.
+    """
+    from pyflink.fn_execution import flink_fn_execution_pb2
+
+    type_info_name = flink_fn_execution_pb2.TypeInfo
+    field_type_name = type_info.type_name
+    if field_type_name == type_info_name.PICKLED_BYTES:
+        return PickleDataConverter()
+    elif field_type_name == type_info_name.ROW:
+        return RowDataConverter(
+            [from_type_info_proto(f.field_type) for f in type_info.row_type_info.fields],
+            [f.field_name for f in type_info.row_type_info.fields])
+    elif field_type_name == type_info_name.TUPLE:
+        return TupleDataConverter([from_type_info_proto(field_type)
+                                   for field_type in type_info.tuple_type_info.field_types])
+    elif field_type_name in (type_info_name.BASIC_ARRAY,
+                             type_info_name.OBJECT_ARRAY,
+                             type_info_name.LIST):
+        return ListDataConverter(from_type_info_proto(type_info.collection_element_type))
+    elif field_type_name == type_info_name.MAP:
+        return DictDataConverter(from_type_info_proto(type_info.map_type_info.key_type),
+                                 from_type_info_proto(type_info.map_type_info.value_type))
+    else:
+        # the basic types are converted by PemJa directly
+        return IdentityDataConverter()
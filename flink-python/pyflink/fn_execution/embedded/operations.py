@@ -0,0 +1,59 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+from pyflink.fn_execution.datastream.operations import StatelessOperation
+from pyflink.fn_execution.embedded.converters import DataConverter
+from pyflink.fn_execution.table import operations as table_operations
+
+
+class OneInputOperation(object):
+    """
+    Executes a stateless Python function of a non-keyed DataStream in the embedded (thread) mode.
+    It reuses the :class:`StatelessOperation` of the process mode and only converts the records
+    from and to the objects passed between Java and Python by PemJa.
+    """
+
+    def __init__(self,
+                 serialized_fn,
+                 input_data_converter: DataConverter,
+                 output_data_converter: DataConverter):
+        self._operation = StatelessOperation(serialized_fn)
+        self._input_data_converter = input_data_converter
+        self._output_data_converter = output_data_converter
+
+    def open(self):
+        self._operation.open()
+
+    def close(self):
+        self._operation.close()
+
+    def process_element(self, timestamp, watermark, value):
+        # the results are in the format of Row(CURRENT_TIMESTAMP, CURRENT_WATERMARK, RESULT)
+        results = self._operation.process_element(
+            [timestamp, watermark, self._input_data_converter.to_internal(value)])
+        to_external = self._output_data_converter.to_external
+        return [to_external(result[2]) for result in results]
+
+
+class TableFunctionOperation(table_operations.TableFunctionOperation):
+    """
+    Executes a Python :class:`TableFunction` in the embedded (thread) mode. The results of an
+    input row are returned as a list, as PemJa could not iterate over a Python generator.
+    """
+
+    def process_element(self, value):
+        return list(super(TableFunctionOperation, self).process_element(value))
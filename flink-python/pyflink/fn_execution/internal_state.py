@@ -19,7 +19,7 @@ from abc import ABC, abstractmethod
 from typing import Generic, TypeVar, List, Iterable, Collection
 
 from pyflink.datastream.state import State, ValueState, AppendingState, MergingState, ListState, \
-    AggregatingState, ReducingState, MapState
+    AggregatingState, ReducingState, MapState, TemporalListState
 
 N = TypeVar('N')
 T = TypeVar('T')
@@ -111,3 +111,10 @@ class InternalMapState(InternalKvState[N], MapState[K, V], ABC):
     The peer to the :class:MapState in the internal state type hierarchy.
     """
     pass
+
+
+class InternalTemporalListState(InternalKvState[N], TemporalListState[T], ABC):
+    """
+    The peer to the :class:TemporalListState in the internal state type hierarchy.
+    """
+    pass
@@ -0,0 +1,70 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import abc
+from typing import List
+
+from pyflink.fn_execution.shared_resources import SharedResources
+from pyflink.metrics.metricbase import GenericMetricGroup
+
+
+class Operation(abc.ABC):
+
+    def __init__(self, serialized_fn):
+        if serialized_fn.metric_enabled:
+            self.base_metric_group = GenericMetricGroup(None, None)
+        else:
+            self.base_metric_group = None
+        self.shared_resources = SharedResources()
+
+    def finish(self):
+        self._update_gauge(self.base_metric_group)
+
+    def _update_gauge(self, base_metric_group):
+        if base_metric_group is not None:
+            for name in base_metric_group._flink_gauge:
+                flink_gauge = base_metric_group._flink_gauge[name]
+                beam_gauge = base_metric_group._beam_gauge[name]
+                beam_gauge.set(flink_gauge())
+            for sub_group in base_metric_group._sub_groups:
+                self._update_gauge(sub_group)
+
+    def process_element(self, value):
+        raise NotImplementedError
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.shared_resources.release_all()
+
+
+class BundleOperation(object):
+    def finish_bundle(self):
+        raise NotImplementedError
+
+
+class BatchOperation(object):
+    """
+    Operation which is able to process all the elements of an input batch with one single call.
+    """
+
+    def is_batched(self) -> bool:
+        return True
+
+    def process_batch(self, values: List) -> List:
+        raise NotImplementedError
@@ -0,0 +1,153 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import mmap
+import multiprocessing
+import os
+import pickle
+import traceback
+from typing import Callable, List
+
+PROCESS_POOL_SIZE = "python.fn-execution.process-pool.size"
+
+# the size of the shared memory buffer of a child process. The chunks and the results which
+# don't fit into it are sent through the pipe instead
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+
+_JOIN_TIMEOUT_SECS = 5
+
+
+def get_process_pool_size() -> int:
+    """
+    Returns the configured number of processes which process the batches of a stateless
+    operation. The job options are passed to the Python worker as environment variables.
+    """
+    return int(os.environ.get(PROCESS_POOL_SIZE, 1))
+
+
+class ProcessPool(object):
+    """
+    A pool of child processes forked from the Python worker which process the chunks of a batch
+    in parallel. It's used by the stateless operations to make use of multiple cores for
+    CPU-bound functions.
+
+    The child processes are forked after the operation has been opened, so that they already
+    hold the opened user-defined functions. The chunks and the results are exchanged through
+    anonymous shared memory buffers which are also inherited by the child processes, only
+    their lengths are sent through the pipes.
+    """
+
+    def __init__(self,
+                 size: int,
+                 process_batch_func: Callable[[List], List],
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self._process_batch_func = process_batch_func
+        # (process, connection, buffer) of the child processes. The current process takes part
+        # in processing the batches, so one child process less than the size is forked
+        self._workers = []
+        context = multiprocessing.get_context('fork')
+        try:
+            for _ in range(size - 1):
+                buffer = mmap.mmap(-1, buffer_size)
+                parent_conn, child_conn = context.Pipe()
+                process = context.Process(
+                    target=_run_worker,
+                    args=(child_conn, buffer, process_batch_func),
+                    daemon=True)
+                process.start()
+                child_conn.close()
+                self._workers.append((process, parent_conn, buffer))
+        except BaseException:
+            self.close()
+            raise
+
+    def process_batch(self, values: List) -> List:
+        """
+        Splits the values into one contiguous chunk per process and returns the results of the
+        values in the order of the values.
+        """
+        if len(values) < 2 or not self._workers:
+            return list(self._process_batch_func(values))
+
+        chunk_size = -(-len(values) // (len(self._workers) + 1))
+        chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+        dispatched = [worker for worker, _ in zip(self._workers, chunks[1:])]
+        for (_, conn, buffer), chunk in zip(dispatched, chunks[1:]):
+            _send(conn, buffer, chunk)
+
+        try:
+            results = list(self._process_batch_func(chunks[0]))
+        finally:
+            # always consumes the responses to keep the pipes in sync
+            responses = [_receive(conn, buffer) for _, conn, buffer in dispatched]
+
+        for succeeded, chunk_results in responses:
+            if not succeeded:
+                raise RuntimeError(
+                    "Failed to process the values in a child process:\n%s" % chunk_results)
+            results.extend(chunk_results)
+        return results
+
+    def close(self):
+        workers = self._workers
+        self._workers = []
+        for _, conn, _ in workers:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for process, conn, buffer in workers:
+            process.join(_JOIN_TIMEOUT_SECS)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+            buffer.close()
+
+
+def _run_worker(conn, buffer, process_batch_func):
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        try:
+            results = list(process_batch_func(_read(buffer, message)))
+            _send(conn, buffer, (True, results))
+        except BaseException:
+            _send(conn, buffer, (False, traceback.format_exc()))
+
+
+def _send(conn, buffer, obj):
+    data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    if len(data) <= len(buffer):
+        buffer[:len(data)] = data
+        conn.send(len(data))
+    else:
+        conn.send(data)
+
+
+def _receive(conn, buffer):
+    return _read(buffer, conn.recv())
+
+
+def _read(buffer, message):
+    if isinstance(message, int):
+        return pickle.loads(buffer[:message])
+    else:
+        return pickle.loads(message)
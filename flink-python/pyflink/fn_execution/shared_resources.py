@@ -0,0 +1,119 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import mmap
+import os
+import threading
+from typing import Any, Callable, Dict
+
+
+class _SharedResource(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = None
+        self.loaded = False
+        self.reference_count = 0
+
+
+class SharedResourceRegistry(object):
+    """
+    The registry of the resources shared by all the operators of a Python worker process.
+
+    A resource is loaded lazily when it is acquired for the first time and is reference counted
+    afterwards. It is released once the last operator which acquired it has been closed. The
+    ``close`` method of the resource, if any, is called at that time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resources = {}  # type: Dict[str, _SharedResource]
+
+    def acquire(self, name: str, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            resource = self._resources.get(name)
+            if resource is None:
+                resource = _SharedResource()
+                self._resources[name] = resource
+            resource.reference_count += 1
+
+        try:
+            # loads the resource outside of the global lock, so that loading a large resource
+            # doesn't block the operators acquiring the other resources
+            with resource.lock:
+                if not resource.loaded:
+                    resource.value = loader()
+                    resource.loaded = True
+                return resource.value
+        except BaseException:
+            self.release(name)
+            raise
+
+    def release(self, name: str):
+        with self._lock:
+            resource = self._resources.get(name)
+            if resource is None:
+                return
+            resource.reference_count -= 1
+            if resource.reference_count > 0:
+                return
+            del self._resources[name]
+
+        if resource.loaded and callable(getattr(resource.value, 'close', None)):
+            resource.value.close()
+
+    def reference_count(self, name: str) -> int:
+        with self._lock:
+            resource = self._resources.get(name)
+            return 0 if resource is None else resource.reference_count
+
+
+_registry = SharedResourceRegistry()
+
+
+class SharedResources(object):
+    """
+    The shared resources acquired by a single operator. All of them are released when the
+    operator is closed.
+    """
+
+    FILE_PREFIX = "file:"
+
+    def __init__(self, registry: SharedResourceRegistry = None):
+        self._registry = _registry if registry is None else registry
+        self._acquired = {}  # type: Dict[str, Any]
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        if name not in self._acquired:
+            self._acquired[name] = self._registry.acquire(name, loader)
+        return self._acquired[name]
+
+    def get_memory_mapped_file(self, path: str) -> mmap.mmap:
+        path = os.path.abspath(path)
+        return self.get(self.FILE_PREFIX + path, lambda: _memory_map(path))
+
+    def release_all(self):
+        acquired = self._acquired
+        self._acquired = {}
+        for name in acquired:
+            self._registry.release(name)
+
+
+def _memory_map(path: str) -> mmap.mmap:
+    with open(path, 'rb') as f:
+        # the mapping stays valid after the file has been closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
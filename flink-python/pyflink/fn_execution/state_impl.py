@@ -16,7 +16,11 @@
 # limitations under the License.
 ################################################################################
 import base64
+import bisect
 import collections
+import itertools
+import math
+import time
 from abc import ABC, abstractmethod
 from enum import Enum
 from functools import partial
@@ -26,16 +30,16 @@ from apache_beam.coders import coder_impl
 from apache_beam.portability.api import beam_fn_api_pb2
 from apache_beam.runners.worker.bundle_processor import SynchronousBagRuntimeState
 from apache_beam.transforms import userstate
-from typing import List, Tuple, Any, Dict, Collection
+from typing import List, Tuple, Any, Dict, Collection, Optional
 
 from pyflink.datastream import ReduceFunction
 from pyflink.datastream.functions import AggregateFunction
-from pyflink.datastream.state import StateTtlConfig
+from pyflink.datastream.state import StateTtlConfig, ListState, MapState
 from pyflink.fn_execution.beam.beam_coders import FlinkCoder
 from pyflink.fn_execution.coders import FieldCoder
 from pyflink.fn_execution.internal_state import InternalKvState, N, InternalValueState, \
     InternalListState, InternalReducingState, InternalMergingState, InternalAggregatingState, \
-    InternalMapState
+    InternalMapState, InternalTemporalListState
 
 
 class LRUCache(object):
@@ -88,6 +92,142 @@ class LRUCache(object):
         return iter(self._cache.values())
 
 
+class CountMinSketch(object):
+    """
+    A count-min sketch which estimates the number of recent occurrences of the keys added to it in
+    constant memory. The counters are halved after every ``decay_interval`` additions, so that the
+    keys which were frequent long ago fade out.
+    """
+
+    def __init__(self, width=2048, depth=4, decay_interval=100000):
+        # the width is rounded up to a power of two so that the indexes could be masked
+        self._mask = (1 << (width - 1).bit_length()) - 1
+        self._depth = depth
+        self._counters = [[0] * (self._mask + 1) for _ in range(depth)]
+        self._decay_interval = decay_interval
+        self._additions = 0
+
+    def add(self, key) -> int:
+        """
+        Adds an occurrence of the given key and returns the estimated number of its recent
+        occurrences, which is never less than the actual number.
+        """
+        h1 = hash(key)
+        # double hashing, see "Less Hashing, Same Performance: Building a Better Bloom Filter"
+        h2 = (h1 >> 32) | 1
+        estimate = None
+        for i, row in enumerate(self._counters):
+            index = (h1 + i * h2) & self._mask
+            count = row[index] + 1
+            row[index] = count
+            if estimate is None or count < estimate:
+                estimate = count
+        self._additions += 1
+        if self._additions >= self._decay_interval:
+            self._decay()
+        return estimate
+
+    def get_decay_interval(self) -> int:
+        return self._decay_interval
+
+    def _decay(self):
+        self._additions = 0
+        for row in self._counters:
+            for i, count in enumerate(row):
+                if count:
+                    row[i] = count >> 1
+
+
+class SegmentedLRUCache(object):
+    """
+    A segmented LRUCache used to manage the internal runtime states. The new entries are put into
+    a probationary segment and promoted to a protected segment, which holds most of the capacity,
+    once they are accessed again, so that the entries of the frequently accessed keys are not
+    evicted by a long tail of keys which are accessed only once. The entries of the keys which are
+    known to be hot could be put into the protected segment directly. The least recently used
+    entries of a full protected segment are demoted to the probationary segment, which may also
+    use the capacity not used by the protected segment. Only the entries evicted from the
+    probationary segment are passed to the eviction callback.
+    """
+
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, max_entries):
+        self._max_entries = max_entries
+        self._max_protected_entries = int(max_entries * self.PROTECTED_RATIO)
+        self._protected = collections.OrderedDict()
+        self._probation = collections.OrderedDict()
+        self._on_evict = None
+
+    def get_max_protected_entries(self):
+        return self._max_protected_entries
+
+    def get(self, key):
+        value = self._protected.get(key)
+        if value is not None:
+            self._protected.move_to_end(key)
+            return value
+        value = self._probation.pop(key, None)
+        if value is not None:
+            self._promote(key, value)
+        return value
+
+    def put(self, key, value, protected=False):
+        if key in self._protected:
+            self._protected[key] = value
+            self._protected.move_to_end(key)
+        elif protected:
+            self._probation.pop(key, None)
+            self._promote(key, value)
+        else:
+            self._probation[key] = value
+            self._probation.move_to_end(key)
+            self._evict_overflow()
+
+    def evict(self, key):
+        value = self._protected.pop(key, None)
+        if value is None:
+            value = self._probation.pop(key, None)
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    def evict_all(self):
+        if self._on_evict is not None:
+            for item in itertools.chain(self._probation.items(), self._protected.items()):
+                self._on_evict(*item)
+        self._probation.clear()
+        self._protected.clear()
+
+    def set_on_evict(self, func):
+        self._on_evict = func
+
+    def _promote(self, key, value):
+        if self._max_protected_entries > 0:
+            self._protected[key] = value
+            while len(self._protected) > self._max_protected_entries:
+                # the demoted entry becomes the most recently used one of the probationary segment
+                name, demoted_value = self._protected.popitem(last=False)
+                self._probation[name] = demoted_value
+        else:
+            self._probation[key] = value
+        self._evict_overflow()
+
+    def _evict_overflow(self):
+        while len(self._protected) + len(self._probation) > self._max_entries:
+            name, value = self._probation.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(name, value)
+
+    def __len__(self):
+        return len(self._protected) + len(self._probation)
+
+    def __iter__(self):
+        return itertools.chain(self._protected.values(), self._probation.values())
+
+    def __contains__(self, key):
+        return key in self._protected or key in self._probation
+
+
 class SynchronousKvRuntimeState(InternalKvState, ABC):
     """
     Base Class for partitioned State implementation.
@@ -104,7 +244,7 @@ class SynchronousKvRuntimeState(InternalKvState, ABC):
     def set_current_namespace(self, namespace: N) -> None:
         if namespace == self.namespace:
             return
-        if self.namespace is not None:
+        if self._internal_state is not None:
             self._remote_state_backend.cache_internal_state(
                 self._remote_state_backend._encoded_current_key, self)
         self.namespace = namespace
@@ -118,8 +258,9 @@ class SynchronousKvRuntimeState(InternalKvState, ABC):
             self._cache_type = SynchronousKvRuntimeState.CacheType.ENABLE_WRITE_CACHE
 
         if self._cache_type != SynchronousKvRuntimeState.CacheType.ENABLE_READ_WRITE_CACHE:
-            # disable read cache
-            self._remote_state_backend._state_handler._state_cache._cache._max_entries = 0
+            # the reads of this state could not be served by the read cache blindly, the read
+            # cache of the other states is not affected
+            self._remote_state_backend.enable_ttl_aware_read_cache(self)
 
     @abstractmethod
     def get_internal_state(self):
@@ -147,9 +288,29 @@ class SynchronousBagKvRuntimeState(SynchronousKvRuntimeState, ABC):
 
     def _maybe_clear_write_cache(self):
         if self._cache_type == SynchronousKvRuntimeState.CacheType.DISABLE_CACHE:
-            self._internal_state.commit()
-            self._internal_state._cleared = False
-            self._internal_state._added_elements = []
+            self._remote_state_backend.commit_internal_state(self._internal_state)
+
+    def _get_single_value(self):
+        """
+        Returns the value of a bag state which holds a single value. Once the value has been set in
+        the current bundle, it's served from memory until the state is committed.
+        """
+        internal_state = self.get_internal_state()
+        if internal_state._cleared:
+            added_elements = internal_state._added_elements
+            return added_elements[0] if added_elements else None
+        for i in internal_state.read():
+            return i
+        return None
+
+    def _set_single_value(self, value):
+        """
+        Sets the value of a bag state which holds a single value. The value is only kept in memory,
+        any number of updates result in a single write request when the state is committed.
+        """
+        internal_state = self.get_internal_state()
+        internal_state._cleared = True
+        internal_state._added_elements = [value]
 
 
 class SynchronousValueRuntimeState(SynchronousBagKvRuntimeState, InternalValueState):
@@ -231,18 +392,14 @@ class SynchronousReducingRuntimeState(SynchronousMergingRuntimeState, InternalRe
         self._reduce_function = reduce_function
 
     def add(self, v):
-        current_value = self.get()
+        current_value = self._get_single_value()
         if current_value is None:
-            self._internal_state.add(v)
+            self._set_single_value(v)
         else:
-            self._internal_state.clear()
-            self._internal_state.add(self._reduce_function.reduce(current_value, v))
-        self._maybe_clear_write_cache()
+            self._set_single_value(self._reduce_function.reduce(current_value, v))
 
     def get(self):
-        for i in self.get_internal_state().read():
-            return i
-        return None
+        return self._get_single_value()
 
     def clear(self):
         self.get_internal_state().clear()
@@ -266,26 +423,18 @@ class SynchronousAggregatingRuntimeState(SynchronousMergingRuntimeState, Interna
         if v is None:
             self.clear()
             return
-        accumulator = self._get_accumulator()
+        accumulator = self._get_single_value()
         if accumulator is None:
             accumulator = self._agg_function.create_accumulator()
-        accumulator = self._agg_function.add(v, accumulator)
-        self._internal_state.clear()
-        self._internal_state.add(accumulator)
-        self._maybe_clear_write_cache()
+        self._set_single_value(self._agg_function.add(v, accumulator))
 
     def get(self):
-        accumulator = self._get_accumulator()
+        accumulator = self._get_single_value()
         if accumulator is None:
             return None
         else:
             return self._agg_function.get_result(accumulator)
 
-    def _get_accumulator(self):
-        for i in self.get_internal_state().read():
-            return i
-        return None
-
     def clear(self):
         self.get_internal_state().clear()
 
@@ -355,11 +504,238 @@ def create_cache_iterator(cache_dict, iterate_type, iterated_keys=None):
         raise Exception("Unsupported iterate type: %s" % iterate_type)
 
 
+class _TtlCachedValue(object):
+    """
+    The cached elements of a bag state with time-to-live, along with the processing time in
+    milliseconds at which the oldest of them was last written or, if the time-to-live is updated
+    on read, accessed at the latest.
+    """
+
+    __slots__ = ('values', 'timestamp')
+
+    def __init__(self, values, timestamp):
+        self.values = values
+        self.timestamp = timestamp
+
+
+class CachingBagStateHandler(object):
+    """
+    The state handler of the bag states, which reads the bag states in pages. A bag state which
+    fits into a single page is cached, the elements of larger bag states are streamed page by page
+    and decoded lazily, so that they never need to fit into memory at once.
+
+    The bag states with a time-to-live which expires the cached elements are cached along with the
+    time they were last written or accessed, and are only read from the cache while they are
+    within their time-to-live. If the time-to-live is updated on read, the accesses served by the
+    cache are buffered and sent to refresh the time-to-live of the states in a single request per
+    state when the states are committed.
+    """
+
+    UPDATE_MARK = "update"
+    TOUCH_MARK = "touch"
+
+    def __init__(self, caching_state_handler):
+        self._state_cache = caching_state_handler._state_cache
+        self._underlying = caching_state_handler._underlying
+        self._context = caching_state_handler._context
+        self._cached_iterator_num = 0
+        # user state id -> (time-to-live in milliseconds, whether it's updated on read)
+        self._ttl_states = {}  # type: Dict[str, Tuple[int, bool]]
+        # user state id -> cache key -> state key, of the accesses served by the cache
+        self._pending_touches = {}  # type: Dict[str, Dict[bytes, Any]]
+
+    def enable_ttl(self, user_state_id, ttl_config: StateTtlConfig):
+        self._ttl_states[user_state_id] = (
+            ttl_config.get_ttl().to_milliseconds(),
+            ttl_config.get_update_type() == StateTtlConfig.UpdateType.OnReadAndWrite)
+
+    def _get_cache_token(self):
+        if not self._state_cache.is_cache_enabled():
+            return None
+        if self._context.user_state_cache_token:
+            return self._context.user_state_cache_token
+        else:
+            return self._context.bundle_cache_token
+
+    def blocking_get(self, state_key, coder):
+        cache_token = self._get_cache_token()
+        ttl_state = self._ttl_states.get(state_key.bag_user_state.user_state_id)
+        if cache_token:
+            # lookup cache first
+            cache_state_key = self._convert_to_cache_key(state_key)
+            cached_value = self._state_cache.get(cache_state_key, cache_token)
+            if cached_value is not None:
+                if ttl_state is None:
+                    return cached_value
+                ttl, update_on_read = ttl_state
+                if self._is_alive(cached_value, ttl):
+                    if update_on_read:
+                        self._pending_touches.setdefault(
+                            state_key.bag_user_state.user_state_id, {})[cache_state_key] = \
+                            state_key
+                    return cached_value.values
+                self._state_cache.evict(cache_state_key, cache_token)
+
+        # request from remote
+        read_time = self._current_time_millis()
+        data, continuation_token = self._underlying.get_raw(state_key, None)
+        if not continuation_token:
+            # all the data of the bag state is contained in the first page
+            values = []
+            input_stream = coder_impl.create_InputStream(data)
+            while input_stream.size() > 0:
+                values.append(coder.decode_from_stream(input_stream, True))
+            if cache_token:
+                if ttl_state is None:
+                    self._state_cache.put(cache_state_key, cache_token, values)
+                elif ttl_state[1]:
+                    # the read has refreshed the time-to-live of all the elements, the time the
+                    # elements were written is unknown otherwise
+                    self._state_cache.put(
+                        cache_state_key, cache_token, _TtlCachedValue(values, read_time))
+            return values
+
+        # The continuation token represents an iterator which has been created and cached at Java
+        # side.
+        self._cached_iterator_num += 1
+        return self._lazy_iterator(state_key, coder, data, continuation_token)
+
+    def _lazy_iterator(self, state_key, coder, data, continuation_token):
+        while True:
+            input_stream = coder_impl.create_InputStream(data)
+            while input_stream.size() > 0:
+                yield coder.decode_from_stream(input_stream, True)
+            if not continuation_token:
+                break
+            data, continuation_token = self._underlying.get_raw(state_key, continuation_token)
+            if not continuation_token:
+                # The cached iterator at Java side has been removed as the iteration has
+                # finished.
+                self._cached_iterator_num -= 1
+
+    def extend(self, state_key, coder, elements):
+        cache_token = self._get_cache_token()
+        if cache_token:
+            cache_state_key = self._convert_to_cache_key(state_key)
+            cached_value = self._state_cache.get(cache_state_key, cache_token)
+            # only the bag states which are fully cached are extended, the others are read from
+            # remote the next time
+            if isinstance(cached_value, _TtlCachedValue):
+                ttl = self._ttl_states[state_key.bag_user_state.user_state_id][0]
+                if not self._is_alive(cached_value, ttl):
+                    self._state_cache.evict(cache_state_key, cache_token)
+                else:
+                    elements = list(elements)
+                    if not cached_value.values:
+                        cached_value.timestamp = self._current_time_millis()
+                    cached_value.values.extend(elements)
+            elif cached_value is not None:
+                elements = list(elements)
+                cached_value.extend(elements)
+        output_stream = coder_impl.create_OutputStream()
+        for element in elements:
+            coder.encode_to_stream(element, output_stream, True)
+        return self._underlying.append_raw(state_key, output_stream.get())
+
+    def update(self, state_key, coder, elements):
+        """
+        Replaces the elements of the bag state with the given elements in a single request.
+        """
+        elements = list(elements)
+        cache_token = self._get_cache_token()
+        if cache_token:
+            cache_state_key = self._convert_to_cache_key(state_key)
+            if state_key.bag_user_state.user_state_id in self._ttl_states:
+                self._state_cache.put(
+                    cache_state_key,
+                    cache_token,
+                    _TtlCachedValue(elements, self._current_time_millis()))
+            else:
+                self._state_cache.put(cache_state_key, cache_token, elements)
+        update_state_key = beam_fn_api_pb2.StateKey()
+        update_state_key.CopyFrom(state_key)
+        update_state_key.bag_user_state.transform_id = self.UPDATE_MARK
+        output_stream = coder_impl.create_OutputStream()
+        for element in elements:
+            coder.encode_to_stream(element, output_stream, True)
+        return self._underlying.append_raw(update_state_key, output_stream.get())
+
+    def clear(self, state_key):
+        cache_token = self._get_cache_token()
+        if cache_token:
+            cache_state_key = self._convert_to_cache_key(state_key)
+            if state_key.bag_user_state.user_state_id in self._ttl_states:
+                self._state_cache.put(
+                    cache_state_key, cache_token, _TtlCachedValue([], self._current_time_millis()))
+            else:
+                self._state_cache.clear(cache_state_key, cache_token)
+        return self._underlying.clear(state_key)
+
+    def flush_touches(self):
+        """
+        Sends the buffered accesses of the states whose time-to-live is updated on read, in a
+        single request per state, without waiting for them to complete. Returns the futures of the
+        requests.
+        """
+        if not self._pending_touches:
+            return []
+        cache_token = self._get_cache_token()
+        touch_time = self._current_time_millis()
+        to_awaits = []
+        for user_state_id, touches in self._pending_touches.items():
+            output_stream = coder_impl.create_OutputStream()
+            output_stream.write_bigendian_int32(len(touches))
+            for state_key in touches.values():
+                output_stream.write_bigendian_int32(len(state_key.bag_user_state.key))
+                output_stream.write(state_key.bag_user_state.key)
+                output_stream.write_bigendian_int32(len(state_key.bag_user_state.window))
+                output_stream.write(state_key.bag_user_state.window)
+            touch_state_key = beam_fn_api_pb2.StateKey()
+            touch_state_key.CopyFrom(state_key)
+            touch_state_key.bag_user_state.transform_id = self.TOUCH_MARK
+            to_awaits.append(self._underlying.append_raw(touch_state_key, output_stream.get()))
+
+            if cache_token:
+                ttl = self._ttl_states[user_state_id][0]
+                for cache_state_key in touches:
+                    cached_value = self._state_cache.get(cache_state_key, cache_token)
+                    if not isinstance(cached_value, _TtlCachedValue):
+                        continue
+                    if self._is_alive(cached_value, ttl, touch_time):
+                        # the state is accessed after the touch time at the remote side
+                        cached_value.timestamp = touch_time
+                    else:
+                        # the state may have expired before it's accessed at the remote side
+                        self._state_cache.evict(cache_state_key, cache_token)
+        self._pending_touches = {}
+        return [to_await for to_await in to_awaits if to_await]
+
+    def get_cached_iterators_num(self):
+        return self._cached_iterator_num
+
+    def reset_cached_iterators_num(self):
+        self._cached_iterator_num = 0
+
+    def _is_alive(self, cached_value, ttl, current_time=None):
+        if current_time is None:
+            current_time = self._current_time_millis()
+        return current_time - cached_value.timestamp < ttl
+
+    @staticmethod
+    def _current_time_millis():
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def _convert_to_cache_key(state_key):
+        return state_key.SerializeToString()
+
+
 class CachingMapStateHandler(object):
     # GET request flags
     GET_FLAG = 0
     ITERATE_FLAG = 1
     CHECK_EMPTY_FLAG = 2
+    GET_ALL_FLAG = 3
     # GET response flags
     EXIST_FLAG = 0
     IS_NONE_FLAG = 1
@@ -370,6 +746,7 @@ class CachingMapStateHandler(object):
     DELETE = 0
     SET_NONE = 1
     SET_VALUE = 2
+    CLEAR = 3
 
     def __init__(self, caching_state_handler, max_cached_map_key_entries):
         self._state_cache = caching_state_handler._state_cache
@@ -377,17 +754,24 @@ class CachingMapStateHandler(object):
         self._context = caching_state_handler._context
         self._max_cached_map_key_entries = max_cached_map_key_entries
         self._cached_iterator_num = 0
+        # the ids of the map states which are always read from remote
+        self._read_cache_disabled_states = set()
 
-    def _get_cache_token(self):
+    def disable_read_cache(self, state_id):
+        self._read_cache_disabled_states.add(state_id)
+
+    def _get_cache_token(self, state_key):
         if not self._state_cache.is_cache_enabled():
             return None
+        if state_key.multimap_side_input.side_input_id in self._read_cache_disabled_states:
+            return None
         if self._context.user_state_cache_token:
             return self._context.user_state_cache_token
         else:
             return self._context.bundle_cache_token
 
     def blocking_get(self, state_key, map_key, map_key_encoder, map_value_decoder):
-        cache_token = self._get_cache_token()
+        cache_token = self._get_cache_token(state_key)
         if not cache_token:
             # cache disabled / no cache token, request from remote directly
             return self._get_raw(state_key, map_key, map_key_encoder, map_value_decoder)
@@ -416,9 +800,46 @@ class CachingMapStateHandler(object):
             else:
                 return cached_value
 
+    def blocking_get_all(self, state_key, map_keys, map_key_encoder, map_value_decoder):
+        """
+        Looks up the given map keys, all the keys which are not cached are requested from remote
+        with a single request. Returns a dict of the map keys to the (exists, value) tuples.
+        """
+        cache_token = self._get_cache_token(state_key)
+        if not cache_token:
+            # cache disabled / no cache token, request from remote directly
+            return self._get_all_raw(state_key, map_keys, map_key_encoder, map_value_decoder)
+
+        # lookup cache first
+        cache_state_key = self._convert_to_cache_key(state_key)
+        cached_map_state = self._state_cache.get(cache_state_key, cache_token)
+        if cached_map_state is None:
+            cached_map_state = CachedMapState(self._max_cached_map_key_entries)
+            self._state_cache.put(cache_state_key, cache_token, cached_map_state)
+
+        results = {}
+        missing_keys = []
+        for map_key in map_keys:
+            cached_value = cached_map_state.get(map_key)
+            if cached_value is not None:
+                results[map_key] = cached_value
+            elif cached_map_state.is_all_data_cached():
+                results[map_key] = (False, None)
+            else:
+                missing_keys.append(map_key)
+
+        if missing_keys:
+            # request from remote
+            fetched = self._get_all_raw(
+                state_key, missing_keys, map_key_encoder, map_value_decoder)
+            for map_key, exists_and_value in fetched.items():
+                cached_map_state.put(map_key, exists_and_value)
+            results.update(fetched)
+        return results
+
     def lazy_iterator(self, state_key, iterate_type, map_key_decoder, map_value_decoder,
                       iterated_keys):
-        cache_token = self._get_cache_token()
+        cache_token = self._get_cache_token(state_key)
         if cache_token:
             # check if the data in the read cache can be used
             cache_state_key = self._convert_to_cache_key(state_key)
@@ -513,7 +934,7 @@ class CachingMapStateHandler(object):
 
     def extend(self, state_key, items: List[Tuple[int, Any, Any]],
                map_key_encoder, map_value_encoder):
-        cache_token = self._get_cache_token()
+        cache_token = self._get_cache_token(state_key)
         if cache_token:
             # Cache lookup
             cache_state_key = self._convert_to_cache_key(state_key)
@@ -522,7 +943,10 @@ class CachingMapStateHandler(object):
                 cached_map_state = CachedMapState(self._max_cached_map_key_entries)
                 self._state_cache.put(cache_state_key, cache_token, cached_map_state)
             for request_flag, map_key, map_value in items:
-                if request_flag == self.DELETE:
+                if request_flag == self.CLEAR:
+                    cached_map_state = CachedMapState(self._max_cached_map_key_entries)
+                    self._state_cache.put(cache_state_key, cache_token, cached_map_state)
+                elif request_flag == self.DELETE:
                     cached_map_state.put(map_key, (False, None))
                 elif request_flag == self.SET_NONE:
                     cached_map_state.put(map_key, (True, None))
@@ -537,7 +961,7 @@ class CachingMapStateHandler(object):
             map_value_encoder)
 
     def check_empty(self, state_key):
-        cache_token = self._get_cache_token()
+        cache_token = self._get_cache_token(state_key)
         if cache_token:
             # Cache lookup
             cache_state_key = self._convert_to_cache_key(state_key)
@@ -555,7 +979,7 @@ class CachingMapStateHandler(object):
         return self._underlying.clear(state_key)
 
     def clear_read_cache(self, state_key):
-        cache_token = self._get_cache_token()
+        cache_token = self._get_cache_token(state_key)
         if cache_token:
             cache_key = self._convert_to_cache_key(state_key)
             self._state_cache.evict(cache_key, cache_token)
@@ -601,6 +1025,36 @@ class CachingMapStateHandler(object):
         else:
             raise Exception("Unknown response flag: " + str(result_flag))
 
+    def _get_all_raw(self, state_key, map_keys, map_key_encoder, map_value_decoder):
+        output_stream = coder_impl.create_OutputStream()
+        output_stream.write_byte(self.GET_ALL_FLAG)
+        output_stream.write_bigendian_int32(len(map_keys))
+        for map_key in map_keys:
+            # The map keys are length-prefixed as not all the coder impls serialize the length
+            # of bytes, see _append_raw.
+            tmp_out = coder_impl.create_OutputStream()
+            map_key_encoder(map_key, tmp_out)
+            serialized_data = tmp_out.get()
+            output_stream.write_bigendian_int32(len(serialized_data))
+            output_stream.write(serialized_data)
+        continuation_token = output_stream.get()
+        data, response_token = self._underlying.get_raw(state_key, continuation_token)
+        input_stream = coder_impl.create_InputStream(data)
+        results = {}
+        for map_key in map_keys:
+            result_flag = input_stream.read_byte()
+            if result_flag == self.EXIST_FLAG:
+                value_length = input_stream.read_bigendian_int32()
+                value_stream = coder_impl.create_InputStream(input_stream.read(value_length))
+                results[map_key] = (True, map_value_decoder(value_stream))
+            elif result_flag == self.IS_NONE_FLAG:
+                results[map_key] = (True, None)
+            elif result_flag == self.NOT_EXIST_FLAG:
+                results[map_key] = (False, None)
+            else:
+                raise Exception("Unknown response flag: " + str(result_flag))
+        return results
+
     def _iterate_raw(self, state_key, iterate_type, iterator_token,
                      map_key_decoder, map_value_decoder):
         output_stream = coder_impl.create_OutputStream()
@@ -654,6 +1108,8 @@ class CachingMapStateHandler(object):
         output_stream.write_bigendian_int32(len(items))
         for request_flag, map_key, map_value in items:
             output_stream.write_byte(request_flag)
+            if request_flag == self.CLEAR:
+                continue
             # Not all the coder impls will serialize the length of bytes when we set the "nested"
             # param to "True", so we need to encode the length of bytes manually.
             tmp_out = coder_impl.create_OutputStream()
@@ -772,6 +1228,24 @@ class InternalSynchronousMapRuntimeState(object):
         else:
             return None
 
+    def get_all(self, map_keys):
+        results = {}
+        remote_keys = []
+        for map_key in map_keys:
+            if map_key in self._write_cache:
+                exists, value = self._write_cache[map_key]
+                results[map_key] = value if exists else None
+            elif self._is_empty or self._cleared:
+                results[map_key] = None
+            else:
+                remote_keys.append(map_key)
+        if remote_keys:
+            fetched = self._map_state_handler.blocking_get_all(
+                self._state_key, remote_keys, self._map_key_encoder, self._map_value_decoder)
+            for map_key, (exists, value) in fetched.items():
+                results[map_key] = value if exists else None
+        return results
+
     def put(self, map_key, map_value):
         self._write_cache[map_key] = (True, map_value)
         self._is_empty = False
@@ -780,10 +1254,13 @@ class InternalSynchronousMapRuntimeState(object):
             self.commit()
 
     def put_all(self, dict_value):
-        for map_key, map_value in dict_value:
+        if not dict_value:
+            return
+        for map_key, map_value in dict_value.items():
             self._write_cache[map_key] = (True, map_value)
         self._is_empty = False
         self._mod_count += 1
+        # the mappings are sent together with the other pending writes in a single request
         if len(self._write_cache) >= self._max_write_cache_entries:
             self.commit()
 
@@ -809,6 +1286,9 @@ class InternalSynchronousMapRuntimeState(object):
         else:
             return True
 
+    def contains_all(self, map_keys):
+        return all(value is not None for value in self.get_all(map_keys).values())
+
     def is_empty(self):
         if self._is_empty is None:
             if len(self._write_cache) > 0:
@@ -841,28 +1321,35 @@ class InternalSynchronousMapRuntimeState(object):
             self.remote_data_iterator(IterateType.VALUES))
 
     def commit(self):
+        to_await = self.flush()
+        if to_await:
+            to_await.get()
+
+    def flush(self):
+        """
+        Issues the pending write requests without waiting for them to complete. The clear and the
+        writes are merged into a single request. Returns the future of the request, if any.
+        """
         to_await = None
+        append_items = []
         if self._cleared:
-            to_await = self._map_state_handler.clear(self._state_key)
-        if self._write_cache:
-            append_items = []
-            for map_key, (exists, value) in self._write_cache.items():
-                if exists:
-                    if value is not None:
-                        append_items.append(
-                            (CachingMapStateHandler.SET_VALUE, map_key, value))
-                    else:
-                        append_items.append((CachingMapStateHandler.SET_NONE, map_key, None))
+            append_items.append((CachingMapStateHandler.CLEAR, None, None))
+        for map_key, (exists, value) in self._write_cache.items():
+            if exists:
+                if value is not None:
+                    append_items.append(
+                        (CachingMapStateHandler.SET_VALUE, map_key, value))
                 else:
-                    append_items.append((CachingMapStateHandler.DELETE, map_key, None))
-            self._write_cache.clear()
+                    append_items.append((CachingMapStateHandler.SET_NONE, map_key, None))
+            else:
+                append_items.append((CachingMapStateHandler.DELETE, map_key, None))
+        if append_items:
             to_await = self._map_state_handler.extend(
                 self._state_key, append_items, self._map_key_encoder, self._map_value_encoder)
-        if to_await:
-            to_await.get()
         self._write_cache.clear()
         self._cleared = False
         self._mod_count += 1
+        return to_await
 
     def write_cache_iterator(self, iterate_type):
         return create_cache_iterator(self._write_cache, iterate_type)
@@ -913,6 +1400,9 @@ class SynchronousMapRuntimeState(SynchronousKvRuntimeState, InternalMapState):
     def put(self, key, value):
         self.get_internal_state().put(key, value)
 
+    def get_all(self, keys):
+        return self.get_internal_state().get_all(keys)
+
     def put_all(self, dict_value):
         self.get_internal_state().put_all(dict_value)
 
@@ -922,6 +1412,9 @@ class SynchronousMapRuntimeState(SynchronousKvRuntimeState, InternalMapState):
     def contains(self, key):
         return self.get_internal_state().contains(key)
 
+    def contains_all(self, keys):
+        return self.get_internal_state().contains_all(keys)
+
     def items(self):
         return self.get_internal_state().items()
 
@@ -938,6 +1431,88 @@ class SynchronousMapRuntimeState(SynchronousKvRuntimeState, InternalMapState):
         self.get_internal_state().clear()
 
 
+class SynchronousTemporalListRuntimeState(InternalTemporalListState):
+    """
+    The runtime TemporalListState implementation backed by a :class:`SynchronousMapRuntimeState`
+    of the (timestamp, sequence number) of each element to the element. The sorted map keys of the
+    recently accessed keys are kept in memory, so that adding an element is a single write into the
+    write cache of the map state and only the elements in the requested range are read.
+    """
+
+    def __init__(self,
+                 map_state: SynchronousMapRuntimeState,
+                 remote_state_backend: 'RemoteKeyedStateBackend'):
+        self._map_state = map_state
+        self._remote_state_backend = remote_state_backend
+        # (encoded key, encoded namespace) -> the sorted (timestamp, sequence number) map keys.
+        # The index of the current key is always kept, even if the state cache is disabled.
+        self._indexes = LRUCache(max(1, remote_state_backend._state_cache_size), None)
+
+    def set_current_namespace(self, namespace: N) -> None:
+        self._map_state.set_current_namespace(namespace)
+
+    def add(self, timestamp, value):
+        index = self._get_index()
+        pos = bisect.bisect_right(index, (timestamp, math.inf))
+        if pos > 0 and index[pos - 1][0] == timestamp:
+            map_key = (timestamp, index[pos - 1][1] + 1)
+        else:
+            map_key = (timestamp, 0)
+        index.insert(pos, map_key)
+        self._map_state.put(map_key, value)
+
+    def pop_until(self, timestamp):
+        index = self._get_index()
+        end = bisect.bisect_right(index, (timestamp, math.inf))
+        if end == 0:
+            return []
+        due_keys = index[:end]
+        del index[:end]
+        values = self._map_state.get_all(due_keys)
+        for due_key in due_keys:
+            self._map_state.remove(due_key)
+        return self._to_elements(due_keys, values)
+
+    def range(self, start, end):
+        index = self._get_index()
+        map_keys = index[bisect.bisect_left(index, (start,)):bisect.bisect_left(index, (end,))]
+        if not map_keys:
+            return []
+        return self._to_elements(map_keys, self._map_state.get_all(map_keys))
+
+    def is_empty(self):
+        if self._map_state._ttl_config is not None:
+            # the elements may have expired, which is only known by the state backend
+            if self._map_state.is_empty():
+                self._indexes.put(self._get_index_key(), [])
+                return True
+            return False
+        return not self._get_index()
+
+    def clear(self):
+        self._map_state.clear()
+        self._indexes.put(self._get_index_key(), [])
+
+    def _get_index(self):
+        index_key = self._get_index_key()
+        index = self._indexes.get(index_key)
+        if index is None:
+            index = sorted(self._map_state.keys())
+            self._indexes.put(index_key, index)
+        return index
+
+    def _get_index_key(self):
+        return (self._remote_state_backend._encoded_current_key,
+                self._remote_state_backend._encode_namespace(self._map_state.namespace))
+
+    def _to_elements(self, map_keys, values):
+        if self._map_state._ttl_config is not None:
+            # the expired elements are skipped
+            return [(map_key[0], values[map_key]) for map_key in map_keys
+                    if values[map_key] is not None]
+        return [(map_key[0], values[map_key]) for map_key in map_keys]
+
+
 class RemoteKeyedStateBackend(object):
     """
     A keyed state backend provides methods for managing keyed state.
@@ -953,6 +1528,10 @@ class RemoteKeyedStateBackend(object):
                  map_state_read_cache_size,
                  map_state_write_cache_size):
         self._state_handler = state_handler
+        self._bag_state_handler = CachingBagStateHandler(state_handler)
+        # the duration in milliseconds and the number of write requests of the last commit
+        self._commit_time = 0
+        self._commit_requests = 0
         self._map_state_handler = CachingMapStateHandler(
             state_handler, map_state_read_cache_size)
         self._key_coder_impl = key_coder.get_impl()
@@ -964,9 +1543,27 @@ class RemoteKeyedStateBackend(object):
         self._state_cache_size = state_cache_size
         self._map_state_write_cache_size = map_state_write_cache_size
         self._all_states = {}  # type: Dict[str, SynchronousKvRuntimeState]
-        self._internal_state_cache = LRUCache(self._state_cache_size, None)
+        self._temporal_list_states = {}  # type: Dict[str, SynchronousTemporalListRuntimeState]
+        self._internal_state_cache = SegmentedLRUCache(self._state_cache_size)
         self._internal_state_cache.set_on_evict(
             lambda key, value: self.commit_internal_state(value))
+        # the internal states of the keys which are estimated to be accessed more often than their
+        # share of the protected segment of the internal state cache are put into it directly
+        self._hot_key_sketch = CountMinSketch(
+            decay_interval=max(100000, 10 * self._state_cache_size))
+        self._hot_key_threshold = max(
+            2,
+            self._hot_key_sketch.get_decay_interval() //
+            max(1, self._internal_state_cache.get_max_protected_entries()))
+        self._current_key_hot = False
+        # the numbers of the lookups of the internal state cache which hit or missed, of the hot
+        # keys and of the other keys respectively
+        self._hot_key_cache_hits = 0
+        self._hot_key_cache_misses = 0
+        self._cold_key_cache_hits = 0
+        self._cold_key_cache_misses = 0
+        # namespace -> encoded namespace
+        self._encoded_namespaces = {}  # type: Dict[Any, bytes]
         self._current_key = None
         self._encoded_current_key = None
         self._clear_iterator_mark = beam_fn_api_pb2.StateKey(
@@ -1001,6 +1598,15 @@ class RemoteKeyedStateBackend(object):
         self._all_states[name] = map_state
         return map_state
 
+    def get_temporal_list_state(self, name, map_key_coder, map_value_coder, ttl_config=None):
+        if name in self._temporal_list_states:
+            self.validate_map_state(name, map_key_coder, map_value_coder)
+            return self._temporal_list_states[name]
+        temporal_list_state = SynchronousTemporalListRuntimeState(
+            self.get_map_state(name, map_key_coder, map_value_coder, ttl_config), self)
+        self._temporal_list_states[name] = temporal_list_state
+        return temporal_list_state
+
     def get_reducing_state(self, name, coder, reduce_function, ttl_config=None):
         return self._wrap_internal_bag_state(
             name,
@@ -1049,8 +1655,7 @@ class RemoteKeyedStateBackend(object):
 
     def _get_internal_bag_state(self, name, namespace, element_coder, ttl_config):
         encoded_namespace = self._encode_namespace(namespace)
-        cached_state = self._internal_state_cache.get(
-            (name, self._encoded_current_key, encoded_namespace))
+        cached_state = self._get_cached_internal_state(name, encoded_namespace)
         if cached_state is not None:
             return cached_state
         # The created internal state would not be put into the internal state cache
@@ -1066,8 +1671,7 @@ class RemoteKeyedStateBackend(object):
     def _get_internal_map_state(
             self, name, namespace, map_key_coder, map_value_coder, ttl_config, cache_type):
         encoded_namespace = self._encode_namespace(namespace)
-        cached_state = self._internal_state_cache.get(
-            (name, self._encoded_current_key, encoded_namespace))
+        cached_state = self._get_cached_internal_state(name, encoded_namespace)
         if cached_state is not None:
             return cached_state
         internal_map_state = self._create_internal_map_state(
@@ -1078,7 +1682,7 @@ class RemoteKeyedStateBackend(object):
             -> userstate.AccumulatingRuntimeState:
         if isinstance(state_spec, userstate.BagStateSpec):
             bag_state = SynchronousBagRuntimeState(
-                self._state_handler,
+                self._bag_state_handler,
                 state_key=self.get_bag_state_key(
                     state_spec.name, self._encoded_current_key, encoded_namespace, ttl_config),
                 value_coder=state_spec.coder)
@@ -1090,16 +1694,11 @@ class RemoteKeyedStateBackend(object):
             self, name, encoded_namespace, map_key_coder, map_value_coder, ttl_config, cache_type):
         # Currently the `beam_fn_api.proto` does not support MapState, so we use the
         # the `MultimapSideInput` message to mark the state as a MapState for now.
-        from pyflink.fn_execution.flink_fn_execution_pb2 import StateDescriptor
-        state_proto = StateDescriptor()
-        state_proto.state_name = name
-        if ttl_config is not None:
-            state_proto.state_ttl_config.CopyFrom(ttl_config._to_proto())
         state_key = beam_fn_api_pb2.StateKey(
             multimap_side_input=beam_fn_api_pb2.StateKey.MultimapSideInput(
                 transform_id="",
                 window=encoded_namespace,
-                side_input_id=base64.b64encode(state_proto.SerializeToString()),
+                side_input_id=self._get_state_id(name, ttl_config),
                 key=self._encoded_current_key))
         if cache_type == SynchronousKvRuntimeState.CacheType.DISABLE_CACHE:
             write_cache_size = 0
@@ -1113,53 +1712,130 @@ class RemoteKeyedStateBackend(object):
             write_cache_size)
 
     def _encode_namespace(self, namespace):
-        if namespace is not None:
+        if namespace is None:
+            return b''
+        # the namespaces are usually windows, which are shared by the elements of a window and
+        # whose hashes are precomputed, so that looking up the encoded namespace is cheap
+        try:
+            encoded_namespace = self._encoded_namespaces.get(namespace)
+        except TypeError:
+            # unhashable namespace
+            return self._namespace_coder_impl.encode(namespace)
+        if encoded_namespace is None:
             encoded_namespace = self._namespace_coder_impl.encode(namespace)
-        else:
-            encoded_namespace = b''
+            if len(self._encoded_namespaces) >= self._state_cache_size:
+                self._encoded_namespaces.clear()
+            self._encoded_namespaces[namespace] = encoded_namespace
         return encoded_namespace
 
+    def _get_cached_internal_state(self, name, encoded_namespace):
+        cached_state = self._internal_state_cache.get(
+            (name, self._encoded_current_key, encoded_namespace))
+        if self._current_key_hot:
+            if cached_state is None:
+                self._hot_key_cache_misses += 1
+            else:
+                self._hot_key_cache_hits += 1
+        elif cached_state is None:
+            self._cold_key_cache_misses += 1
+        else:
+            self._cold_key_cache_hits += 1
+        return cached_state
+
     def cache_internal_state(self, encoded_key, internal_kv_state: SynchronousKvRuntimeState):
         encoded_old_namespace = self._encode_namespace(internal_kv_state.namespace)
         self._internal_state_cache.put(
             (internal_kv_state.name, encoded_key, encoded_old_namespace),
-            internal_kv_state.get_internal_state())
+            internal_kv_state.get_internal_state(),
+            self._current_key_hot)
 
     def set_current_key(self, key):
         if key == self._current_key:
             return
         encoded_old_key = self._encoded_current_key
-        for state_name, state_obj in self._all_states.items():
+        for state_obj in self._all_states.values():
+            if state_obj._internal_state is None:
+                # the state has not been accessed with the old key, there is nothing to keep
+                state_obj.namespace = None
+                continue
             if self._state_cache_size > 0:
                 # cache old internal state
                 self.cache_internal_state(encoded_old_key, state_obj)
+            else:
+                # the pending writes of the old internal state can't be kept
+                self.commit_internal_state(state_obj._internal_state)
             state_obj.namespace = None
             state_obj._internal_state = None
         self._current_key = key
         self._encoded_current_key = self._key_coder_impl.encode(self._current_key)
+        if self._state_cache_size > 0:
+            self._current_key_hot = \
+                self._hot_key_sketch.add(self._encoded_current_key) >= self._hot_key_threshold
 
     def get_current_key(self):
         return self._current_key
 
     def commit(self):
-        for internal_state in self._internal_state_cache:
-            self.commit_internal_state(internal_state)
+        start_time = time.time()
+        # issue the write requests of all the states at once and then wait for them together
+        to_awaits = [self.flush_internal_state(internal_state)
+                     for internal_state in self._internal_state_cache]
         for name, state in self._all_states.items():
             if (name, self._encoded_current_key, self._encode_namespace(state.namespace)) \
                     not in self._internal_state_cache:
-                self.commit_internal_state(state._internal_state)
+                to_awaits.append(self.flush_internal_state(state._internal_state))
+        to_awaits = [to_await for to_await in to_awaits if to_await]
+        to_awaits.extend(self._bag_state_handler.flush_touches())
+        for to_await in to_awaits:
+            to_await.get()
+        self._commit_time = int((time.time() - start_time) * 1000)
+        self._commit_requests = len(to_awaits)
+
+    def enable_ttl_aware_read_cache(self, state: SynchronousKvRuntimeState):
+        """
+        Makes sure that the reads of the given state with time-to-live are not served by the read
+        cache once the state may have expired or when they are expected to refresh the
+        time-to-live. The bag based states are cached along with the time they were last written or
+        accessed, the map states are always read from remote.
+        """
+        state_id = self._get_state_id(state.name, state._ttl_config)
+        if isinstance(state, SynchronousMapRuntimeState):
+            self._map_state_handler.disable_read_cache(state_id)
+        else:
+            self._bag_state_handler.enable_ttl(state_id, state._ttl_config)
+
+    def register_metrics(self, metric_group):
+        """
+        Registers the duration in milliseconds and the number of write requests of the last commit,
+        i.e. of the last finished bundle, as gauges of the given metric group. The numbers of the
+        hits and the misses of the internal state cache for the hot keys and the other keys are
+        also registered, which help to size the state cache.
+        """
+        metric_group.gauge("stateCommitTime", lambda: self._commit_time)
+        metric_group.gauge("numStateCommitRequests", lambda: self._commit_requests)
+        metric_group.gauge("numHotKeyStateCacheHits", lambda: self._hot_key_cache_hits)
+        metric_group.gauge("numHotKeyStateCacheMisses", lambda: self._hot_key_cache_misses)
+        metric_group.gauge("numColdKeyStateCacheHits", lambda: self._cold_key_cache_hits)
+        metric_group.gauge("numColdKeyStateCacheMisses", lambda: self._cold_key_cache_misses)
 
     def clear_cached_iterators(self):
-        if self._map_state_handler.get_cached_iterators_num() > 0:
+        if self._map_state_handler.get_cached_iterators_num() > 0 or \
+                self._bag_state_handler.get_cached_iterators_num() > 0:
             self._clear_iterator_mark.multimap_side_input.key = self._encoded_current_key
             self._map_state_handler.clear(self._clear_iterator_mark)
+            self._map_state_handler.reset_cached_iterators_num()
+            self._bag_state_handler.reset_cached_iterators_num()
 
     def merge_namespaces(self, state: SynchronousMergingRuntimeState, target, sources, ttl_config):
+        to_awaits = []
         for source in sources:
             state.set_current_namespace(source)
-            self.commit_internal_state(state.get_internal_state())
+            to_awaits.append(self.flush_internal_state(state.get_internal_state()))
         state.set_current_namespace(target)
-        self.commit_internal_state(state.get_internal_state())
+        to_awaits.append(self.flush_internal_state(state.get_internal_state()))
+        for to_await in to_awaits:
+            if to_await:
+                to_await.get()
         encoded_target_namespace = self._encode_namespace(target)
         encoded_namespaces = [self._encode_namespace(source) for source in sources]
         self.clear_state_cache(state, [encoded_target_namespace] + encoded_namespaces)
@@ -1186,29 +1862,291 @@ class RemoteKeyedStateBackend(object):
                     (name, self._encoded_current_key, encoded_namespace))
                 # currently all the SynchronousMergingRuntimeState is based on bag state
                 state_key = self.get_bag_state_key(
-                    name, self._encoded_current_key, encoded_namespace, None)
+                    name, self._encoded_current_key, encoded_namespace, state._ttl_config)
                 # clear the read cache, the read cache is shared between map state handler and bag
                 # state handler. So we can use the map state handler instead.
                 self._map_state_handler.clear_read_cache(state_key)
 
     def get_bag_state_key(self, name, encoded_key, encoded_namespace, ttl_config):
-        from pyflink.fn_execution.flink_fn_execution_pb2 import StateDescriptor
-        state_proto = StateDescriptor()
-        state_proto.state_name = name
-        if ttl_config is not None:
-            state_proto.state_ttl_config.CopyFrom(ttl_config._to_proto())
         return beam_fn_api_pb2.StateKey(
             bag_user_state=beam_fn_api_pb2.StateKey.BagUserState(
                 transform_id="",
                 window=encoded_namespace,
-                user_state_id=base64.b64encode(state_proto.SerializeToString()),
+                user_state_id=self._get_state_id(name, ttl_config),
                 key=encoded_key))
 
+    @staticmethod
+    def _get_state_id(name, ttl_config):
+        from pyflink.fn_execution.flink_fn_execution_pb2 import StateDescriptor
+        state_proto = StateDescriptor()
+        state_proto.state_name = name
+        if ttl_config is not None:
+            state_proto.state_ttl_config.CopyFrom(ttl_config._to_proto())
+        return base64.b64encode(state_proto.SerializeToString()).decode('utf-8')
+
     @staticmethod
     def commit_internal_state(internal_state):
-        if internal_state is not None:
-            internal_state.commit()
+        to_await = RemoteKeyedStateBackend.flush_internal_state(internal_state)
+        if to_await:
+            to_await.get()
+
+    @staticmethod
+    def flush_internal_state(internal_state):
+        """
+        Issues the pending write requests of the given internal state without waiting for them to
+        complete. The clear and the appends of a bag state are merged into a single request.
+        Returns the future of the request, if any.
+        """
+        if internal_state is None:
+            return None
+        if not isinstance(internal_state, SynchronousBagRuntimeState):
+            return internal_state.flush()
+
+        state_handler = internal_state._state_handler
+        state_key = internal_state._state_key
+        to_await = None
+        if internal_state._cleared:
+            if internal_state._added_elements:
+                to_await = state_handler.update(
+                    state_key,
+                    internal_state._value_coder.get_impl(),
+                    internal_state._added_elements)
+            else:
+                to_await = state_handler.clear(state_key)
+        elif internal_state._added_elements:
+            to_await = state_handler.extend(
+                state_key, internal_state._value_coder.get_impl(), internal_state._added_elements)
         # reset the status of the internal state to reuse the object cross bundle
-        if isinstance(internal_state, SynchronousBagRuntimeState):
-            internal_state._cleared = False
-            internal_state._added_elements = []
+        internal_state._cleared = False
+        internal_state._added_elements = []
+        return to_await
+
+
+class SynchronousOperatorListRuntimeState(ListState):
+    """
+    The runtime operator ListState implementation. The elements are read from remote when the
+    state is accessed for the first time and kept in memory afterwards, only the modified state is
+    written back when the operator state backend is committed.
+    """
+
+    def __init__(self, name: str, element_coder, operator_state_backend):
+        self.name = name
+        self._element_coder_impl = element_coder.get_impl()
+        self._operator_state_backend = operator_state_backend
+        self._values = None  # type: List
+        self._modified = False
+
+    def get(self):
+        return list(self._get_values())
+
+    def add(self, value):
+        self._get_values().append(value)
+        self._modified = True
+
+    def add_all(self, values):
+        self._get_values().extend(values)
+        self._modified = True
+
+    def update(self, values):
+        self._values = list(values)
+        self._modified = True
+
+    def clear(self):
+        self.update([])
+
+    def _get_values(self):
+        if self._values is None:
+            input_stream = self._operator_state_backend.read(self)
+            self._values = [self._element_coder_impl.decode(
+                input_stream.read(input_stream.read_bigendian_int32()))
+                for _ in range(input_stream.read_bigendian_int32())]
+        return self._values
+
+    @staticmethod
+    def _get_state_key(state_id, transform_id=""):
+        return beam_fn_api_pb2.StateKey(
+            bag_user_state=beam_fn_api_pb2.StateKey.BagUserState(
+                transform_id=transform_id, window=b'', user_state_id=state_id, key=b''))
+
+    def _encode(self, output_stream):
+        output_stream.write_bigendian_int32(len(self._values))
+        for value in self._values:
+            encoded_value = self._element_coder_impl.encode(value)
+            output_stream.write_bigendian_int32(len(encoded_value))
+            output_stream.write(encoded_value)
+
+
+class SynchronousBroadcastRuntimeState(MapState):
+    """
+    The runtime broadcast MapState implementation. The entries are read from remote when the state
+    is accessed for the first time and kept in memory afterwards, only the modified state is
+    written back when the operator state backend is committed.
+    """
+
+    NONE_VALUE_LENGTH = -1
+
+    def __init__(self, name: str, map_key_coder, map_value_coder, operator_state_backend):
+        self.name = name
+        self._map_key_coder = map_key_coder
+        self._map_value_coder = map_value_coder
+        self._map_key_coder_impl = map_key_coder.get_impl()
+        self._map_value_coder_impl = map_value_coder.get_impl()
+        self._operator_state_backend = operator_state_backend
+        self._entries = None  # type: Dict
+        self._modified = False
+
+    def get(self, key):
+        return self._get_entries().get(key)
+
+    def put(self, key, value):
+        self._get_entries()[key] = value
+        self._modified = True
+
+    def put_all(self, dict_value):
+        self._get_entries().update(dict_value)
+        self._modified = True
+
+    def remove(self, key):
+        self._get_entries().pop(key, None)
+        self._modified = True
+
+    def contains(self, key):
+        return key in self._get_entries()
+
+    def items(self):
+        return list(self._get_entries().items())
+
+    def keys(self):
+        return list(self._get_entries().keys())
+
+    def values(self):
+        return list(self._get_entries().values())
+
+    def is_empty(self):
+        return not self._get_entries()
+
+    def clear(self):
+        self._entries = {}
+        self._modified = True
+
+    def _get_entries(self):
+        if self._entries is None:
+            input_stream = self._operator_state_backend.read(self)
+            entries = {}
+            for _ in range(input_stream.read_bigendian_int32()):
+                key = self._map_key_coder_impl.decode(
+                    input_stream.read(input_stream.read_bigendian_int32()))
+                value_length = input_stream.read_bigendian_int32()
+                if value_length == self.NONE_VALUE_LENGTH:
+                    entries[key] = None
+                else:
+                    entries[key] = self._map_value_coder_impl.decode(
+                        input_stream.read(value_length))
+            self._entries = entries
+        return self._entries
+
+    @staticmethod
+    def _get_state_key(state_id, transform_id=""):
+        return beam_fn_api_pb2.StateKey(
+            multimap_side_input=beam_fn_api_pb2.StateKey.MultimapSideInput(
+                transform_id=transform_id, window=b'', side_input_id=state_id, key=b''))
+
+    def _encode(self, output_stream):
+        output_stream.write_bigendian_int32(len(self._entries))
+        for key, value in self._entries.items():
+            encoded_key = self._map_key_coder_impl.encode(key)
+            output_stream.write_bigendian_int32(len(encoded_key))
+            output_stream.write(encoded_key)
+            if value is None:
+                output_stream.write_bigendian_int32(self.NONE_VALUE_LENGTH)
+            else:
+                encoded_value = self._map_value_coder_impl.encode(value)
+                output_stream.write_bigendian_int32(len(encoded_value))
+                output_stream.write(encoded_value)
+
+
+class RemoteOperatorStateBackend(object):
+    """
+    An operator state backend provides methods for managing the operator states, i.e. the states
+    which are scoped to a parallel instance of an operator instead of a key. The operator states
+    are kept in the memory of the Python worker and the modified states are written back to the
+    operator state backend of the Java operator when a bundle finishes, which always happens
+    before a checkpoint is taken.
+    """
+
+    UPDATE_MARK = "update"
+
+    def __init__(self, state_handler):
+        # the operator states are kept in memory, so the state cache is bypassed
+        self._underlying = state_handler._underlying
+        self._all_states = {}  # type: Dict[str, Any]
+        self._new_states_rejection = None  # type: Optional[str]
+
+    def get_list_state(self, name, element_coder):
+        return self._get_or_create_state(
+            name,
+            SynchronousOperatorListRuntimeState,
+            lambda: SynchronousOperatorListRuntimeState(name, element_coder, self))
+
+    def get_broadcast_state(self, name, map_key_coder, map_value_coder):
+        state = self._get_or_create_state(
+            name,
+            SynchronousBroadcastRuntimeState,
+            lambda: SynchronousBroadcastRuntimeState(name, map_key_coder, map_value_coder, self))
+        if state._map_key_coder != map_key_coder or state._map_value_coder != map_value_coder:
+            raise Exception("State name corrupted: %s" % name)
+        return state
+
+    def has_states(self) -> bool:
+        """
+        Returns whether any operator state has been created.
+        """
+        return bool(self._all_states)
+
+    def reject_new_states(self, reason: str):
+        """
+        Makes the creation of the operator states which don't exist yet fail with the given
+        reason, e.g. once the function is processed in multiple processes whose state changes
+        could not be written back.
+        """
+        self._new_states_rejection = reason
+
+    def _get_or_create_state(self, name, expected_type, create_state):
+        if name in self._all_states:
+            state = self._all_states[name]
+            if not isinstance(state, expected_type):
+                raise Exception("The state name '%s' is already in use and not a %s."
+                                % (name, expected_type))
+            return state
+        if self._new_states_rejection is not None:
+            raise Exception("Failed to create the operator state '%s': %s"
+                            % (name, self._new_states_rejection))
+        state = create_state()
+        self._all_states[name] = state
+        return state
+
+    def read(self, state):
+        """
+        Reads the contents of the given state from remote and returns them as an input stream.
+        """
+        state_key = state._get_state_key(RemoteKeyedStateBackend._get_state_id(state.name, None))
+        data, _ = self._underlying.get_raw(state_key, None)
+        return coder_impl.create_InputStream(data)
+
+    def commit(self):
+        """
+        Writes back the states which have been modified since the last commit.
+        """
+        to_awaits = []
+        for state in self._all_states.values():
+            if not state._modified:
+                continue
+            state_key = state._get_state_key(
+                RemoteKeyedStateBackend._get_state_id(state.name, None), self.UPDATE_MARK)
+            output_stream = coder_impl.create_OutputStream()
+            state._encode(output_stream)
+            to_awaits.append(self._underlying.append_raw(state_key, output_stream.get()))
+            state._modified = False
+        for to_await in to_awaits:
+            if to_await:
+                to_await.get()
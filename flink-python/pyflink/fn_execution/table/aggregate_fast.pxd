@@ -94,3 +94,13 @@ cdef class GroupAggFunction(GroupAggFunctionBase):
 
 cdef class GroupTableAggFunction(GroupAggFunctionBase):
     pass
+
+cdef class LocalGroupAggFunction:
+    cdef AggsHandleFunctionBase aggs_handle
+    cdef RowKeySelector key_selector
+    cdef dict buffer
+
+    cpdef void open(self, function_context)
+    cpdef void close(self)
+    cpdef void process_element(self, InternalRow input_data)
+    cpdef list finish_bundle(self)
@@ -22,6 +22,8 @@
 from libc.stdlib cimport free, malloc
 from typing import List, Dict
 
+import cloudpickle
+
 from pyflink.common import Row
 from pyflink.fn_execution.coders import PickleCoder
 from pyflink.fn_execution.table.state_data_view import DataViewSpec, ListViewSpec, MapViewSpec, \
@@ -658,3 +660,39 @@ cdef class GroupTableAggFunction(GroupAggFunctionBase):
                 aggs_handle.cleanup()
         self.buffer = {}
         return results
+
+cdef class LocalGroupAggFunction:
+    def __init__(self,
+                 aggs_handle: AggsHandleFunctionBase,
+                 key_selector: RowKeySelector):
+        self.aggs_handle = aggs_handle
+        self.key_selector = key_selector
+        self.buffer = {}
+
+    cpdef void open(self, object function_context):
+        self.aggs_handle.open(PerKeyStateDataViewStore(function_context, None))
+
+    cpdef void close(self):
+        self.aggs_handle.close()
+
+    cpdef void process_element(self, InternalRow input_data):
+        cdef tuple key
+        cdef list accumulators
+        key = tuple(self.key_selector.get_key(input_data.values))
+        accumulators = self.buffer.get(key)
+        if accumulators is None:
+            accumulators = self.aggs_handle.create_accumulators()
+            self.buffer[key] = accumulators
+        self.aggs_handle.set_accumulators(accumulators)
+        self.aggs_handle.accumulate(input_data)
+
+    cpdef list finish_bundle(self):
+        cdef list results = []
+        cdef tuple current_key
+        cdef list accumulators
+        for current_key, accumulators in self.buffer.items():
+            results.append(join_row(list(current_key),
+                                    [cloudpickle.dumps(acc) for acc in accumulators],
+                                    InternalRowKind.INSERT))
+        self.buffer = {}
+        return results
@@ -18,6 +18,8 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Iterable
 
+import cloudpickle
+
 from pyflink.common import Row, RowKind
 from pyflink.fn_execution.coders import PickleCoder
 from pyflink.fn_execution.table.state_data_view import DataViewSpec, ListViewSpec, MapViewSpec, \
@@ -606,3 +608,40 @@ class GroupTableAggFunction(GroupAggFunctionBase):
                 # cleanup dataview under current key
                 self.aggs_handle.cleanup()
         self.buffer = {}
+
+
+class LocalGroupAggFunction(object):
+    """
+    Pre-aggregates the input rows of each key within a bundle for the local phase of a two-phase
+    group aggregation. At the end of the bundle, the grouping keys are emitted together with the
+    pickled accumulators, which are merged by the global phase after the shuffle. It doesn't access
+    any state.
+    """
+
+    def __init__(self,
+                 aggs_handle: AggsHandleFunction,
+                 key_selector: RowKeySelector):
+        self.aggs_handle = aggs_handle
+        self.key_selector = key_selector
+        self.buffer = {}
+
+    def open(self, function_context: FunctionContext):
+        self.aggs_handle.open(PerKeyStateDataViewStore(function_context, None))
+
+    def close(self):
+        self.aggs_handle.close()
+
+    def process_element(self, input_data: Row):
+        key = tuple(self.key_selector.get_key(input_data._values))
+        accumulators = self.buffer.get(key)
+        if accumulators is None:
+            accumulators = self.aggs_handle.create_accumulators()
+            self.buffer[key] = accumulators
+        self.aggs_handle.set_accumulators(accumulators)
+        self.aggs_handle.accumulate(input_data)
+
+    def finish_bundle(self):
+        for current_key, accumulators in self.buffer.items():
+            yield join_row(
+                list(current_key), [cloudpickle.dumps(acc) for acc in accumulators])
+        self.buffer = {}
@@ -18,11 +18,15 @@
 import abc
 from functools import reduce
 from itertools import chain
-from typing import Tuple
+from typing import Tuple, List
 
+import cloudpickle
+
+from pyflink.fn_execution import pickle
 from pyflink.fn_execution.coders import DataViewFilterCoder, PickleCoder
 from pyflink.fn_execution.datastream.timerservice import InternalTimer
-from pyflink.fn_execution.datastream.operations import Operation
+from pyflink.fn_execution.operations import Operation, BundleOperation, BatchOperation
+from pyflink.fn_execution.process_pool import ProcessPool, get_process_pool_size
 from pyflink.fn_execution.datastream.timerservice_impl import TimerOperandType, InternalTimerImpl
 from pyflink.fn_execution.table.state_data_view import extract_data_view_specs
 
@@ -37,7 +41,7 @@ from pyflink.fn_execution.utils.operation_utils import extract_user_defined_aggr
 try:
     from pyflink.fn_execution.table.aggregate_fast import RowKeySelector, \
         SimpleAggsHandleFunction, GroupAggFunction, DistinctViewDescriptor, \
-        SimpleTableAggsHandleFunction, GroupTableAggFunction
+        SimpleTableAggsHandleFunction, GroupTableAggFunction, LocalGroupAggFunction
     from pyflink.fn_execution.table.window_aggregate_fast import \
         SimpleNamespaceAggsHandleFunction, GroupWindowAggFunction
     from pyflink.fn_execution.coder_impl_fast import InternalRow
@@ -45,33 +49,14 @@ try:
 except ImportError:
     from pyflink.fn_execution.table.aggregate_slow import RowKeySelector, \
         SimpleAggsHandleFunction, GroupAggFunction, DistinctViewDescriptor, \
-        SimpleTableAggsHandleFunction, GroupTableAggFunction
+        SimpleTableAggsHandleFunction, GroupTableAggFunction, LocalGroupAggFunction
     from pyflink.fn_execution.table.window_aggregate_slow import \
         SimpleNamespaceAggsHandleFunction, GroupWindowAggFunction
     has_cython = False
 
 from pyflink.table import FunctionContext, Row
-
-# UDF
-SCALAR_FUNCTION_URN = "flink:transform:scalar_function:v1"
-
-# UDTF
-TABLE_FUNCTION_URN = "flink:transform:table_function:v1"
-
-# UDAF
-STREAM_GROUP_AGGREGATE_URN = "flink:transform:stream_group_aggregate:v1"
-STREAM_GROUP_TABLE_AGGREGATE_URN = "flink:transform:stream_group_table_aggregate:v1"
-STREAM_GROUP_WINDOW_AGGREGATE_URN = "flink:transform:stream_group_window_aggregate:v1"
-
-# Pandas UDAF
-PANDAS_AGGREGATE_FUNCTION_URN = "flink:transform:aggregate_function:arrow:v1"
-PANDAS_BATCH_OVER_WINDOW_AGGREGATE_FUNCTION_URN = \
-    "flink:transform:batch_over_window_aggregate_function:arrow:v1"
-
-
-class BundleOperation(object):
-    def finish_bundle(self):
-        raise NotImplementedError
+from pyflink.table.udf import IncrementalPandasAggregateFunctionWrapper, \
+    MergingAggregateFunctionWrapper
 
 
 class BaseOperation(Operation):
@@ -85,24 +70,73 @@ class BaseOperation(Operation):
     def open(self):
         for user_defined_func in self.user_defined_funcs:
             if hasattr(user_defined_func, 'open'):
-                user_defined_func.open(FunctionContext(self.base_metric_group))
+                user_defined_func.open(
+                    FunctionContext(self.base_metric_group, self.shared_resources))
 
     def close(self):
         for user_defined_func in self.user_defined_funcs:
             if hasattr(user_defined_func, 'close'):
                 user_defined_func.close()
+        super().close()
 
     @abc.abstractmethod
     def generate_func(self, serialized_fn) -> Tuple:
         pass
 
 
-class ScalarFunctionOperation(BaseOperation):
+class ScalarFunctionOperation(BaseOperation, BatchOperation):
     def __init__(self, serialized_fn, one_arg_optimization=False, one_result_optimization=False):
         self._one_arg_optimization = one_arg_optimization
         self._one_result_optimization = one_result_optimization
+        self._batch_func = None
+        self._process_pool_size = get_process_pool_size()
+        self._process_pool = None
         super(ScalarFunctionOperation, self).__init__(serialized_fn)
 
+    def is_batched(self) -> bool:
+        return self._batch_func is not None or self._process_pool_size > 1
+
+    def open(self):
+        super(ScalarFunctionOperation, self).open()
+        # the calls which only take constant arguments are evaluated once the udfs are opened
+        for name, constant_expression in self._constant_expressions:
+            self._variable_dict[name] = eval(constant_expression, self._variable_dict)
+        if self._process_pool_size > 1:
+            # forks the child processes after the udfs have been opened
+            self._process_pool = ProcessPool(self._process_pool_size, self._process_batch)
+
+    def close(self):
+        if self._process_pool is not None:
+            self._process_pool.close()
+            self._process_pool = None
+        super(ScalarFunctionOperation, self).close()
+
+    def process_element(self, value):
+        if self._batch_func is not None:
+            return self._process_batch([value])[0]
+        return self.func(value)
+
+    def process_batch(self, values: List) -> List:
+        if self._process_pool is not None:
+            return self._process_pool.process_batch(values)
+        return self._process_batch(values)
+
+    def _process_batch(self, values: List) -> List:
+        n = len(values)
+        if n == 0:
+            return []
+        if self._batch_func is None:
+            return [self.func(value) for value in values]
+        if self._one_arg_optimization:
+            columns = None
+        else:
+            columns = [list(column) for column in zip(*values)]
+        results = self._batch_func(values, columns, n)
+        if self._one_result_optimization:
+            return results
+        else:
+            return [list(row) for row in zip(*results)]
+
     def generate_func(self, serialized_fn):
         """
         Generates a lambda function based on udfs.
@@ -110,21 +144,59 @@ class ScalarFunctionOperation(BaseOperation):
                               representation of the Python :class:`ScalarFunction`
         :return: the generated lambda function
         """
+        expression_context = operation_utils.ExpressionContext(serialized_fn.udfs)
         scalar_functions, variable_dict, user_defined_funcs = reduce(
             lambda x, y: (
                 ','.join([x[0], y[0]]),
                 dict(chain(x[1].items(), y[1].items())),
                 x[2] + y[2]),
             [operation_utils.extract_user_defined_function(
-                udf, one_arg_optimization=self._one_arg_optimization)
+                udf, one_arg_optimization=self._one_arg_optimization,
+                expression_context=expression_context)
                 for udf in serialized_fn.udfs])
         if self._one_result_optimization:
-            func_str = 'lambda value: %s' % scalar_functions
+            result_str = scalar_functions
         else:
-            func_str = 'lambda value: [%s]' % scalar_functions
-        generate_func = eval(func_str, variable_dict)
+            result_str = '[%s]' % scalar_functions
+        if expression_context.local_expressions:
+            # the common calls are evaluated only once per row and held by local variables, e.g.
+            # def scalar_function(value):
+            #     e1 = f1(value[0])
+            #     return [f2(e1), f3(e1)]
+            func_str = 'def scalar_function(value):\n%s\n    return %s' % (
+                '\n'.join('    %s = %s' % local_expression
+                          for local_expression in expression_context.local_expressions),
+                result_str)
+            exec(func_str, variable_dict)
+            generate_func = variable_dict['scalar_function']
+        else:
+            generate_func = eval('lambda value: %s' % result_str, variable_dict)
+        self._variable_dict = variable_dict
+        self._constant_expressions = expression_context.constant_expressions
+        if any(operation_utils.is_batch_mode_function(f) for f in user_defined_funcs):
+            self._batch_func, user_defined_funcs = self._generate_batch_func(serialized_fn)
+            self._constant_expressions = []
         return generate_func, user_defined_funcs
 
+    def _generate_batch_func(self, serialized_fn):
+        """
+        Generates a lambda function which evaluates the udfs over all the rows of a batch. It's
+        used when there are udfs declared with batch_mode='auto'.
+        """
+        scalar_functions, variable_dict, user_defined_funcs = reduce(
+            lambda x, y: (
+                ','.join([x[0], y[0]]),
+                dict(chain(x[1].items(), y[1].items())),
+                x[2] + y[2]),
+            [operation_utils.extract_batched_user_defined_function(
+                udf, one_arg_optimization=self._one_arg_optimization)
+                for udf in serialized_fn.udfs])
+        if self._one_result_optimization:
+            func_str = 'lambda values, columns, n: %s' % scalar_functions
+        else:
+            func_str = 'lambda values, columns, n: [%s]' % scalar_functions
+        return eval(func_str, variable_dict), user_defined_funcs
+
 
 class TableFunctionOperation(BaseOperation):
     def __init__(self, serialized_fn):
@@ -146,8 +218,32 @@ class TableFunctionOperation(BaseOperation):
         return generate_func, user_defined_funcs
 
 
-class PandasAggregateFunctionOperation(BaseOperation):
+class PandasTableFunctionOperation(BaseOperation):
     def __init__(self, serialized_fn):
+        super(PandasTableFunctionOperation, self).__init__(serialized_fn)
+
+    def generate_func(self, serialized_fn):
+        """
+        Generates a lambda function based on the Pandas udtf, which is called once per batch of
+        rows and returns the result columns followed by the positions of the input rows within
+        the batch the result rows belong to.
+        :param serialized_fn: serialized function which contains the proto representation of
+                              the Python :class:`TableFunction`
+        :return: the generated lambda function
+        """
+        table_function, variable_dict, user_defined_funcs = \
+            operation_utils.extract_user_defined_function(serialized_fn.udfs[0])
+        variable_dict['normalize_pandas_table_function_result'] = \
+            operation_utils.normalize_pandas_table_function_result
+        generate_func = eval(
+            'lambda value: normalize_pandas_table_function_result(%s, len(value[0]))'
+            % table_function, variable_dict)
+        return generate_func, user_defined_funcs
+
+
+class PandasAggregateFunctionOperation(BaseOperation):
+    def __init__(self, serialized_fn, incremental=False):
+        self._incremental = incremental
         super(PandasAggregateFunctionOperation, self).__init__(serialized_fn)
 
     def generate_func(self, serialized_fn):
@@ -156,7 +252,8 @@ class PandasAggregateFunctionOperation(BaseOperation):
                 ','.join([x[0], y[0]]),
                 dict(chain(x[1].items(), y[1].items())),
                 x[2] + y[2]),
-            [operation_utils.extract_user_defined_function(udf, True)
+            [operation_utils.extract_user_defined_function(
+                udf, True, incremental=self._incremental)
              for udf in serialized_fn.udfs])
         variable_dict['normalize_pandas_result'] = operation_utils.normalize_pandas_result
         generate_func = eval('lambda value: normalize_pandas_result([%s])' %
@@ -164,6 +261,34 @@ class PandasAggregateFunctionOperation(BaseOperation):
         return generate_func, user_defined_funcs
 
 
+class PandasIncrementalAggregateFunctionOperation(PandasAggregateFunctionOperation):
+    """
+    Aggregates the input of the Pandas UDAFs incrementally. The last input column holds the
+    pickled accumulators the input is aggregated into, which are only set in the first row, and
+    the pickled accumulators after the aggregation are returned as the last result column.
+    """
+
+    def __init__(self, serialized_fn):
+        super(PandasIncrementalAggregateFunctionOperation, self).__init__(
+            serialized_fn, incremental=True)
+        self.wrappers = [func for func in self.user_defined_funcs
+                         if isinstance(func, IncrementalPandasAggregateFunctionWrapper)]
+
+    def process_element(self, value):
+        import pandas as pd
+        accumulators = value[-1].iloc[0]
+        if accumulators is None:
+            accumulators = [None] * len(self.wrappers)
+        else:
+            accumulators = pickle.loads(accumulators)
+        for wrapper, accumulator in zip(self.wrappers, accumulators):
+            wrapper.accumulator = accumulator
+        results = self.func(value)
+        results.append(
+            pd.Series([cloudpickle.dumps([wrapper.accumulator for wrapper in self.wrappers])]))
+        return results
+
+
 class PandasBatchOverWindowAggregateFunctionOperation(BaseOperation):
     def __init__(self, serialized_fn):
         super(PandasBatchOverWindowAggregateFunctionOperation, self).__init__(serialized_fn)
@@ -279,11 +404,15 @@ class BaseStatefulOperation(BaseOperation, abc.ABC):
     def __init__(self, serialized_fn, keyed_state_backend):
         self.keyed_state_backend = keyed_state_backend
         super(BaseStatefulOperation, self).__init__(serialized_fn)
+        if self.keyed_state_backend and self.base_metric_group is not None:
+            self.keyed_state_backend.register_metrics(self.base_metric_group)
 
     def finish(self):
-        super().finish()
+        # commit before updating the gauges to report the commit of the current bundle
         if self.keyed_state_backend:
             self.keyed_state_backend.commit()
+            self.keyed_state_backend.clear_cached_iterators()
+        super().finish()
 
 
 NORMAL_RECORD = 0
@@ -310,10 +439,12 @@ class AbstractStreamGroupAggregateOperation(BaseStatefulOperation):
             serialized_fn, keyed_state_backend)
 
     def open(self):
-        self.group_agg_function.open(FunctionContext(self.base_metric_group))
+        self.group_agg_function.open(
+            FunctionContext(self.base_metric_group, self.shared_resources))
 
     def close(self):
         self.group_agg_function.close()
+        super().close()
 
     def generate_func(self, serialized_fn):
         user_defined_aggs = []
@@ -409,6 +540,59 @@ class StreamGroupAggregateOperation(AbstractStreamGroupAggregateOperation, Bundl
             self.index_of_count_star)
 
 
+class StreamLocalGroupAggregateOperation(AbstractStreamGroupAggregateOperation, BundleOperation):
+    """
+    The local phase of a two-phase group aggregation. The input rows are pre-aggregated per key
+    within the bundle without accessing any state, and the grouping keys are emitted with the
+    pickled accumulators at the end of the bundle.
+    """
+
+    def __init__(self, serialized_fn):
+        super(StreamLocalGroupAggregateOperation, self).__init__(serialized_fn, None)
+
+    def process_element(self, value):
+        if has_cython:
+            value = InternalRow.from_row(value)
+        self.group_agg_function.process_element(value)
+
+    def finish_bundle(self):
+        return self.group_agg_function.finish_bundle()
+
+    def create_process_function(self, user_defined_aggs, input_extractors, filter_args,
+                                distinct_indexes, distinct_view_descriptors, key_selector,
+                                state_value_coder):
+        aggs_handler_function = SimpleAggsHandleFunction(
+            user_defined_aggs,
+            input_extractors,
+            -1,
+            False,
+            self.data_view_specs,
+            filter_args,
+            distinct_indexes,
+            distinct_view_descriptors)
+
+        return LocalGroupAggFunction(aggs_handler_function, key_selector)
+
+
+class StreamGlobalGroupAggregateOperation(StreamGroupAggregateOperation):
+    """
+    The global phase of a two-phase group aggregation. The input of each function is the pickled
+    accumulator emitted by the local phase, which is merged into the accumulator of the key.
+    """
+
+    def __init__(self, serialized_fn, keyed_state_backend):
+        super(StreamGlobalGroupAggregateOperation, self).__init__(
+            serialized_fn, keyed_state_backend)
+
+    def create_process_function(self, user_defined_aggs, input_extractors, filter_args,
+                                distinct_indexes, distinct_view_descriptors, key_selector,
+                                state_value_coder):
+        return super(StreamGlobalGroupAggregateOperation, self).create_process_function(
+            [MergingAggregateFunctionWrapper(agg) for agg in user_defined_aggs],
+            input_extractors, filter_args, distinct_indexes, distinct_view_descriptors,
+            key_selector, state_value_coder)
+
+
 class StreamGroupTableAggregateOperation(AbstractStreamGroupAggregateOperation, BundleOperation):
     def __init__(self, serialized_fn, keyed_state_backend):
         super(StreamGroupTableAggregateOperation, self).__init__(serialized_fn, keyed_state_backend)
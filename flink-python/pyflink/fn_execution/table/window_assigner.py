@@ -21,7 +21,7 @@ from typing import Generic, List, Any, Iterable, Set
 
 from pyflink.common.typeinfo import Types
 from pyflink.datastream.state import ValueStateDescriptor, ValueState
-from pyflink.datastream.window import TimeWindow, CountWindow
+from pyflink.datastream.window import TimeWindow, CountWindow, _WindowTable
 from pyflink.fn_execution.table.window_context import Context, W
 
 
@@ -121,10 +121,11 @@ class TumblingWindowAssigner(WindowAssigner[TimeWindow]):
         self._size = size
         self._offset = offset
         self._is_event_time = is_event_time
+        self._windows = _WindowTable(size)
 
     def assign_windows(self, element: List, timestamp: int) -> Iterable[TimeWindow]:
         start = TimeWindow.get_window_start_with_offset(timestamp, self._offset, self._size)
-        return [TimeWindow(start, start + self._size)]
+        return [self._windows.time_window(start)]
 
     def is_event_time(self) -> bool:
         return self._is_event_time
@@ -142,6 +143,7 @@ class CountTumblingWindowAssigner(WindowAssigner[CountWindow]):
     def __init__(self, size: int):
         self._size = size
         self._count = None  # type: ValueState
+        self._windows = _WindowTable()
 
     def open(self, ctx: Context[Any, CountWindow]):
         value_state_descriptor = ValueStateDescriptor('tumble-count-assigner', Types.LONG())
@@ -155,7 +157,7 @@ class CountTumblingWindowAssigner(WindowAssigner[CountWindow]):
             current_count = count_value
         id = current_count // self._size
         self._count.update(current_count + 1)
-        return [CountWindow(id)]
+        return [self._windows.count_window(id)]
 
     def is_event_time(self) -> bool:
         return False
@@ -177,24 +179,26 @@ class SlidingWindowAssigner(PanedWindowAssigner[TimeWindow]):
         self._is_event_time = is_event_time
         self._pane_size = math.gcd(size, slide)
         self._num_panes_per_window = size // self._pane_size
+        self._windows = _WindowTable(size)
+        self._panes = _WindowTable(self._pane_size)
 
     def assign_pane(self, element, timestamp: int) -> TimeWindow:
         start = TimeWindow.get_window_start_with_offset(timestamp, self._offset, self._pane_size)
-        return TimeWindow(start, start + self._pane_size)
+        return self._panes.time_window(start)
 
     def split_into_panes(self, window: W) -> Iterable[TimeWindow]:
         start = window.start
         for i in range(self._num_panes_per_window):
-            yield TimeWindow(start, start + self._pane_size)
+            yield self._panes.time_window(start)
             start += self._pane_size
 
     def get_last_window(self, pane: W) -> TimeWindow:
         last_start = TimeWindow.get_window_start_with_offset(pane.start, self._offset, self._slide)
-        return TimeWindow(last_start, last_start + self._size)
+        return self._windows.time_window(last_start)
 
     def assign_windows(self, element: List, timestamp: int) -> Iterable[TimeWindow]:
         last_start = TimeWindow.get_window_start_with_offset(timestamp, self._offset, self._slide)
-        windows = [TimeWindow(start, start + self._size)
+        windows = [self._windows.time_window(start)
                    for start in range(last_start, timestamp - self._size, -self._slide)]
         return windows
 
@@ -215,6 +219,7 @@ class CountSlidingWindowAssigner(WindowAssigner[CountWindow]):
         self._size = size
         self._slide = slide
         self._count = None  # type: ValueState
+        self._windows = _WindowTable()
 
     def open(self, ctx: Context[Any, CountWindow]):
         count_descriptor = ValueStateDescriptor('slide-count-assigner', Types.LONG())
@@ -233,7 +238,7 @@ class CountSlidingWindowAssigner(WindowAssigner[CountWindow]):
         windows = []
         while last_id >= 0 and last_start <= current_count <= last_end:
             if last_start <= current_count <= last_end:
-                windows.append(CountWindow(last_id))
+                windows.append(self._windows.count_window(last_id))
             last_id -= 1
             last_start -= self._slide
             last_end -= self._slide
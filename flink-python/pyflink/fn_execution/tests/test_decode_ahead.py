@@ -0,0 +1,65 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import logging
+import threading
+import unittest
+
+from pyflink.fn_execution.decode_ahead import DecodeAheadReader
+from pyflink.testing.test_case_utils import PyFlinkTestCase
+
+
+class DecodeAheadReaderTests(PyFlinkTestCase):
+
+    def setUp(self):
+        self.reader = DecodeAheadReader(8)
+
+    def tearDown(self):
+        self.reader.close()
+
+    def test_read(self):
+        decoding_threads = set()
+
+        def decode(n):
+            for i in range(n):
+                decoding_threads.add(threading.current_thread())
+                yield i
+
+        self.assertEqual(list(range(100)), list(self.reader.read(decode(100))))
+        self.assertEqual([], list(self.reader.read(decode(0))))
+        self.assertNotIn(threading.current_thread(), decoding_threads)
+        self.assertTrue(0 <= self.reader.occupancy_percentage() <= 100)
+
+    def test_decoding_failure(self):
+        def decode():
+            yield 1
+            raise ValueError("corrupted")
+
+        with self.assertRaisesRegex(ValueError, "corrupted"):
+            list(self.reader.read(decode()))
+        self.assertEqual([1, 2], list(self.reader.read(iter([1, 2]))))
+
+    def test_partially_consumed_input(self):
+        values = self.reader.read(iter(range(1000)))
+        self.assertEqual(0, next(values))
+        values.close()
+        self.assertEqual([1, 2, 3], list(self.reader.read(iter([1, 2, 3]))))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    unittest.main()
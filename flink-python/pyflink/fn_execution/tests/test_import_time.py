@@ -0,0 +1,84 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import subprocess
+import sys
+import unittest
+
+
+class ImportTimeTests(unittest.TestCase):
+    """
+    Tests the modules loaded when PyFlink is imported, e.g. when a Python worker starts up, and the
+    time spent doing so as reported by ``python -X importtime``.
+
+    The time budget is generous so that the tests are stable on slow machines, it is meant to catch
+    regressions such as importing the whole Table API eagerly again, not small fluctuations.
+    """
+
+    # the budget of the cumulative import time in microseconds
+    IMPORT_TIME_BUDGET_US = 3 * 1000 * 1000
+
+    def test_import_table(self):
+        modules = self._import_and_check_budget('pyflink.table')
+        self.assertNotIn('pyflink.table.table_environment', modules)
+        self.assertNotIn('pyflink.datastream.stream_execution_environment', modules)
+
+    def test_import_datastream(self):
+        modules = self._import_and_check_budget('pyflink.datastream')
+        self.assertNotIn('pyflink.datastream.stream_execution_environment', modules)
+        self.assertNotIn('pyflink.table.table_environment', modules)
+
+    def test_import_python_worker_operations(self):
+        modules = self._import_and_check_budget('pyflink.fn_execution.beam.beam_operations')
+        # the operations of the Table API and the DataStream API are loaded on demand
+        self.assertNotIn('pyflink.fn_execution.table.operations', modules)
+        self.assertNotIn('pyflink.fn_execution.datastream.operations', modules)
+        self.assertNotIn('pyflink.table.table_environment', modules)
+        self.assertNotIn('pyflink.datastream.stream_execution_environment', modules)
+
+    def _import_and_check_budget(self, module_name):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             'import sys, %s; print("\\n".join(sys.modules))' % module_name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True)
+        self.assertEqual(0, process.returncode, process.stderr)
+
+        cumulative_time = None
+        for line in process.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            fields = line.split('|')
+            if line.startswith('import time:') and len(fields) == 3 and \
+                    fields[2].strip() == module_name:
+                cumulative_time = int(fields[1])
+        self.assertIsNotNone(cumulative_time, process.stderr)
+        self.assertLess(
+            cumulative_time,
+            self.IMPORT_TIME_BUDGET_US,
+            "Importing %s took %d us, which exceeds the budget of %d us."
+            % (module_name, cumulative_time, self.IMPORT_TIME_BUDGET_US))
+        return set(process.stdout.splitlines())
+
+
+if __name__ == '__main__':
+    try:
+        import xmlrunner
+        testRunner = xmlrunner.XMLTestRunner(output='target/test-reports')
+    except ImportError:
+        testRunner = None
+    unittest.main(testRunner=testRunner, verbosity=2)
@@ -0,0 +1,109 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import logging
+import unittest
+
+from pyflink.common import Row
+from pyflink.fn_execution.datastream.input_handler import KeyGroupedInputHandler, \
+    _group_by_key
+from pyflink.testing.test_case_utils import PyFlinkTestCase
+
+
+class TestInternalTimerService(object):
+
+    def __init__(self):
+        self.watermarks = []
+
+    def advance_watermark(self, watermark):
+        self.watermarks.append(watermark)
+
+
+class TestContext(object):
+
+    def __init__(self):
+        self.timestamp = None
+
+    def set_timestamp(self, timestamp):
+        self.timestamp = timestamp
+
+
+def _value(timestamp, watermark, key, data):
+    return Row(timestamp, watermark, Row(key, data))
+
+
+class GroupByKeyTests(PyFlinkTestCase):
+
+    def test_interleaved_keys(self):
+        values = [_value(1, 0, 'a', 1), _value(2, 0, 'b', 2), _value(3, 0, 'a', 3),
+                  _value(4, 0, 'c', 4), _value(5, 0, 'b', 5)]
+        groups = [(key, [value[2][1] for value in group])
+                  for key, group in _group_by_key(values)]
+        # the keys are in the order of their first element and the elements of a key keep their
+        # arrival order
+        self.assertEqual([('a', [1, 3]), ('b', [2, 5]), ('c', [4])], groups)
+
+    def test_unhashable_keys(self):
+        values = [_value(1, 0, ['a'], 1), _value(2, 0, ['a'], 2), _value(3, 0, ['b'], 3),
+                  _value(4, 0, ['a'], 4)]
+        groups = [(key, [value[2][1] for value in group])
+                  for key, group in _group_by_key(values)]
+        # only the consecutive elements of the same key are grouped
+        self.assertEqual([(['a'], [1, 2]), (['b'], [3]), (['a'], [4])], groups)
+
+
+class KeyGroupedInputHandlerTests(PyFlinkTestCase):
+
+    def setUp(self):
+        self.timer_service = TestInternalTimerService()
+        self.ctx = TestContext()
+        self.invocations = []
+
+        def process_elements(key, elements):
+            elements = list(elements)
+            self.invocations.append((key, elements, self.ctx.timestamp))
+            return ['%s:%s' % (key, element) for element in elements]
+
+        self.handler = KeyGroupedInputHandler(self.timer_service, self.ctx, process_elements)
+
+    def test_process_batch(self):
+        values = [_value(1, 5, 'a', 1), _value(2, 6, 'b', 2), _value(3, 7, 'a', 3)]
+        results = [list(result) for result in self.handler.process_batch(values)]
+
+        # the function is called once per key with the elements in their arrival order and the
+        # timestamp of the context is the one of the current element
+        self.assertEqual([('a', [1, 3], 3), ('b', [2], 2)], self.invocations)
+        self.assertEqual(
+            [[Row(3, 7, 'a:1'), Row(3, 7, 'a:3'), Row(2, 7, 'b:2')]], results)
+
+    def test_watermark_of_batch(self):
+        values = [_value(1, 5, 'a', 1), _value(2, 6, 'b', 2), _value(3, 4, 'a', 3)]
+        results = [list(result) for result in self.handler.process_batch(values)]
+
+        # the watermark of the last element is applied to the whole batch at once
+        self.assertEqual([4], self.timer_service.watermarks)
+        self.assertEqual({4}, {row[1] for result in results for row in result})
+
+    def test_empty_batch(self):
+        self.assertEqual([], self.handler.process_batch([]))
+        self.assertEqual([], self.timer_service.watermarks)
+        self.assertEqual([], self.invocations)
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    unittest.main()
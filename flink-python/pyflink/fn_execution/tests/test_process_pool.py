@@ -0,0 +1,69 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import logging
+import os
+import unittest
+
+from pyflink.fn_execution.process_pool import ProcessPool
+from pyflink.testing.test_case_utils import PyFlinkTestCase
+
+
+def double(values):
+    return [(value * 2, os.getpid()) for value in values]
+
+
+def fail_on_seven(values):
+    if 7 in values:
+        raise ValueError("seven")
+    return values
+
+
+class ProcessPoolTests(PyFlinkTestCase):
+
+    def test_results_keep_the_order_of_the_values(self):
+        pool = ProcessPool(3, double)
+        try:
+            results = pool.process_batch(list(range(10)))
+            self.assertEqual([value * 2 for value in range(10)], [r[0] for r in results])
+            self.assertEqual(3, len(set(r[1] for r in results)))
+            self.assertEqual([], pool.process_batch([]))
+        finally:
+            pool.close()
+
+    def test_values_exceeding_the_shared_memory_buffer(self):
+        pool = ProcessPool(2, lambda values: [value.upper() for value in values], buffer_size=16)
+        try:
+            values = ['a' * 100, 'b' * 100, 'c' * 100]
+            self.assertEqual([value.upper() for value in values], pool.process_batch(values))
+        finally:
+            pool.close()
+
+    def test_failure_in_child_process(self):
+        pool = ProcessPool(2, fail_on_seven)
+        try:
+            with self.assertRaisesRegex(RuntimeError, "ValueError: seven"):
+                pool.process_batch(list(range(10)))
+            # the pool is still usable after a failed batch
+            self.assertEqual(list(range(4)), pool.process_batch(list(range(4))))
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    unittest.main()
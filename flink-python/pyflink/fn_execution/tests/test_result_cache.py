@@ -0,0 +1,73 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import logging
+import unittest
+
+from pyflink.fn_execution.utils.operation_utils import ResultCache
+from pyflink.testing.test_case_utils import PyFlinkTestCase
+
+
+class ResultCacheTests(PyFlinkTestCase):
+
+    def setUp(self):
+        self.invocations = []
+
+        def add_one(i):
+            self.invocations.append(i)
+            return i + 1
+
+        self.cache = ResultCache(add_one, 2, 'add_one')
+
+    def test_hits(self):
+        self.assertEqual([2, 2, 3, 2, 3], [self.cache(i) for i in [1, 1, 2, 1, 2]])
+        # the function is only called for the first occurrence of each input
+        self.assertEqual([1, 2], self.invocations)
+        self.assertEqual(60, self.cache.hit_rate_percentage())
+
+    def test_eviction(self):
+        self.assertEqual([2, 3, 2, 4, 3], [self.cache(i) for i in [1, 2, 1, 3, 2]])
+        # 2 is the least recently used input when 3 is added
+        self.assertEqual([1, 2, 3, 2], self.invocations)
+        self.assertEqual(2, self.cache._evictions)
+        self.assertEqual(20, self.cache.hit_rate_percentage())
+
+    def test_size_bound(self):
+        for i in range(100):
+            self.cache(i)
+            self.assertLessEqual(len(self.cache._cache), 2)
+        self.assertEqual([(98,), (99,)], list(self.cache._cache.keys()))
+        self.assertEqual(98, self.cache._evictions)
+
+    def test_unhashable_arguments(self):
+        cache = ResultCache(lambda l: len(l), 2, 'len')
+        self.assertEqual(2, cache([1, 2]))
+        self.assertEqual(2, cache([1, 2]))
+        self.assertEqual(0, len(cache._cache))
+        self.assertEqual(0, cache.hit_rate_percentage())
+
+    def test_close(self):
+        self.cache(1)
+        self.cache.close()
+        self.assertEqual(0, len(self.cache._cache))
+        self.assertEqual(2, self.cache(1))
+        self.assertEqual([1, 1], self.invocations)
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    unittest.main()
@@ -0,0 +1,99 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import logging
+import os
+import tempfile
+import unittest
+
+from pyflink.fn_execution.shared_resources import SharedResourceRegistry, SharedResources
+from pyflink.testing.test_case_utils import PyFlinkTestCase
+
+
+class Resource(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class SharedResourcesTests(PyFlinkTestCase):
+
+    def test_resource_is_loaded_once(self):
+        registry = SharedResourceRegistry()
+        loaded = []
+
+        def loader():
+            loaded.append(1)
+            return Resource()
+
+        operator1 = SharedResources(registry)
+        operator2 = SharedResources(registry)
+        resource = operator1.get('model', loader)
+        self.assertIs(resource, operator1.get('model', loader))
+        self.assertIs(resource, operator2.get('model', loader))
+        self.assertEqual(1, len(loaded))
+        self.assertEqual(2, registry.reference_count('model'))
+
+        operator1.release_all()
+        self.assertFalse(resource.closed)
+        operator2.release_all()
+        self.assertTrue(resource.closed)
+        self.assertEqual(0, registry.reference_count('model'))
+
+        # the resource is loaded again after it has been released
+        self.assertIsNot(resource, operator1.get('model', loader))
+        self.assertEqual(2, len(loaded))
+
+    def test_failed_loading(self):
+        registry = SharedResourceRegistry()
+        operator = SharedResources(registry)
+
+        def loader():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            operator.get('model', loader)
+        self.assertEqual(0, registry.reference_count('model'))
+        self.assertEqual('model', operator.get('model', lambda: 'model'))
+
+    def test_memory_mapped_file(self):
+        registry = SharedResourceRegistry()
+        operator1 = SharedResources(registry)
+        operator2 = SharedResources(registry)
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b'shared content')
+            mapped_file = operator1.get_memory_mapped_file(path)
+            self.assertIs(mapped_file, operator2.get_memory_mapped_file(path))
+            self.assertEqual(b'shared content', mapped_file[:])
+            with self.assertRaises(TypeError):
+                mapped_file[0] = 0
+
+            operator1.release_all()
+            operator2.release_all()
+            self.assertTrue(mapped_file.closed)
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    unittest.main()
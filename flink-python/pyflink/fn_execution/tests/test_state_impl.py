@@ -0,0 +1,224 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import logging
+import unittest
+
+from pyflink.fn_execution.coders import PickleCoder
+from pyflink.fn_execution.state_impl import CachingMapStateHandler, CountMinSketch, \
+    InternalSynchronousMapRuntimeState, SegmentedLRUCache, SynchronousTemporalListRuntimeState
+from pyflink.testing.test_case_utils import PyFlinkTestCase
+
+
+class CountMinSketchTests(PyFlinkTestCase):
+
+    def test_estimate(self):
+        sketch = CountMinSketch(width=64, depth=4, decay_interval=1000)
+        for i in range(100):
+            sketch.add(b'hot')
+            sketch.add(('cold-%d' % i).encode('utf-8'))
+        self.assertGreaterEqual(sketch.add(b'hot'), 101)
+        self.assertLess(sketch.add(b'another'), 101)
+
+    def test_decay(self):
+        sketch = CountMinSketch(width=64, depth=4, decay_interval=10)
+        for _ in range(9):
+            sketch.add(b'key')
+        # the counters are halved after the 10th addition
+        sketch.add(b'key')
+        self.assertEqual(6, sketch.add(b'key'))
+
+
+class SegmentedLRUCacheTests(PyFlinkTestCase):
+
+    def test_protected_entries_survive_cold_keys(self):
+        evicted = []
+        cache = SegmentedLRUCache(10)
+        cache.set_on_evict(lambda key, value: evicted.append(key))
+        cache.put('hot', 'hot_value', True)
+        for i in range(100):
+            cache.put(i, i)
+        self.assertEqual('hot_value', cache.get('hot'))
+        self.assertIn('hot', cache)
+        self.assertEqual(list(range(91)), evicted)
+        self.assertEqual(10, len(cache))
+
+    def test_promote_entries_accessed_again(self):
+        evicted = []
+        cache = SegmentedLRUCache(10)
+        cache.set_on_evict(lambda key, value: evicted.append(key))
+        cache.put('warm', 'warm_value')
+        self.assertEqual('warm_value', cache.get('warm'))
+        for i in range(100):
+            cache.put(i, i)
+        self.assertEqual('warm_value', cache.get('warm'))
+        self.assertEqual(list(range(91)), evicted)
+
+    def test_uniform_working_set_not_evicted(self):
+        evicted = []
+        cache = SegmentedLRUCache(1000)
+        cache.set_on_evict(lambda key, value: evicted.append(key))
+        for _ in range(3):
+            for i in range(900):
+                if cache.get(i) is None:
+                    cache.put(i, i)
+        self.assertEqual([], evicted)
+        self.assertEqual(900, len(cache))
+
+    def test_demote_protected_entries(self):
+        evicted = []
+        cache = SegmentedLRUCache(5)
+        cache.set_on_evict(lambda key, value: evicted.append(key))
+        for i in range(6):
+            cache.put(i, i, True)
+        # the least recently used protected entries are demoted to the probationary segment
+        self.assertEqual([0], evicted)
+        self.assertEqual(5, len(cache))
+        self.assertEqual(1, cache.get(1))
+
+        cache.evict_all()
+        self.assertEqual([0, 2, 3, 4, 5, 1], evicted)
+        self.assertEqual(0, len(cache))
+
+
+class RecordingMapStateHandler(object):
+
+    def __init__(self):
+        self.requests = []
+
+    def extend(self, state_key, items, map_key_encoder, map_value_encoder):
+        self.requests.append(list(items))
+
+
+class InternalSynchronousMapRuntimeStateTests(PyFlinkTestCase):
+
+    def setUp(self):
+        self.handler = RecordingMapStateHandler()
+        self.state = InternalSynchronousMapRuntimeState(
+            self.handler, None, PickleCoder(), PickleCoder(), 10)
+
+    def test_put_all_is_written_at_commit(self):
+        self.state.put('a', 0)
+        self.state.put_all({'a': 1, 'b': None})
+        # no request is sent before the commit
+        self.assertEqual([], self.handler.requests)
+        self.assertEqual(1, self.state.get('a'))
+        self.assertIsNone(self.state.get('b'))
+        self.state.commit()
+        self.assertEqual(
+            [[(CachingMapStateHandler.SET_VALUE, 'a', 1),
+              (CachingMapStateHandler.SET_NONE, 'b', None)]],
+            self.handler.requests)
+
+    def test_put_all_after_clear(self):
+        self.state.clear()
+        self.state.put_all({'a': 1})
+        self.state.commit()
+        self.assertEqual(
+            [[(CachingMapStateHandler.CLEAR, None, None),
+              (CachingMapStateHandler.SET_VALUE, 'a', 1)]],
+            self.handler.requests)
+
+    def test_put_all_exceeding_write_cache(self):
+        self.state.put_all({i: i for i in range(10)})
+        self.assertEqual(1, len(self.handler.requests))
+        self.assertEqual(10, len(self.handler.requests[0]))
+
+
+class InMemoryMapState(object):
+
+    def __init__(self, ttl_config=None):
+        self.namespace = None
+        self._ttl_config = ttl_config
+        self.data = {}
+        self.reads = 0
+
+    def put(self, key, value):
+        self.data[key] = value
+
+    def get_all(self, keys):
+        self.reads += 1
+        return {key: self.data.get(key) for key in keys}
+
+    def remove(self, key):
+        self.data.pop(key, None)
+
+    def keys(self):
+        return list(self.data.keys())
+
+    def is_empty(self):
+        return not self.data
+
+    def clear(self):
+        self.data.clear()
+
+
+class InMemoryKeyedStateBackend(object):
+
+    def __init__(self):
+        self._state_cache_size = 10
+        self._encoded_current_key = b'key'
+
+    @staticmethod
+    def _encode_namespace(namespace):
+        return namespace
+
+
+class SynchronousTemporalListRuntimeStateTests(PyFlinkTestCase):
+
+    def test_add_and_pop(self):
+        map_state = InMemoryMapState()
+        state = SynchronousTemporalListRuntimeState(map_state, InMemoryKeyedStateBackend())
+        for timestamp, value in [(3, 'a'), (1, 'b'), (3, 'c'), (2, 'd'), (3, 'e')]:
+            state.add(timestamp, value)
+        # the elements are added without reading the existing elements
+        self.assertEqual(0, map_state.reads)
+        self.assertEqual({(1, 0), (2, 0), (3, 0), (3, 1), (3, 2)}, set(map_state.data.keys()))
+        self.assertEqual([(2, 'd'), (3, 'a'), (3, 'c'), (3, 'e')], state.range(2, 4))
+        self.assertEqual([(1, 'b'), (2, 'd')], state.pop_until(2))
+        self.assertEqual([(3, 'a'), (3, 'c'), (3, 'e')], state.pop_until(3))
+        self.assertTrue(state.is_empty())
+        self.assertEqual({}, map_state.data)
+
+    def test_index_kept_without_state_cache(self):
+        map_state = InMemoryMapState()
+        remote_state_backend = InMemoryKeyedStateBackend()
+        remote_state_backend._state_cache_size = 0
+        state = SynchronousTemporalListRuntimeState(map_state, remote_state_backend)
+        state.add(1, 'a')
+        map_state.data[(5, 0)] = 'b'
+        state.add(2, 'c')
+        # the index of the current key is reused rather than rebuilt from the map state keys
+        self.assertEqual([(1, 'a'), (2, 'c')], state.range(0, 10))
+
+    def test_is_empty_with_ttl(self):
+        map_state = InMemoryMapState(ttl_config=object())
+        state = SynchronousTemporalListRuntimeState(map_state, InMemoryKeyedStateBackend())
+        state.add(1, 'a')
+        state.add(2, 'b')
+        self.assertFalse(state.is_empty())
+        # the element of timestamp 1 expires
+        map_state.remove((1, 0))
+        self.assertEqual([(2, 'b')], state.range(0, 10))
+        map_state.remove((2, 0))
+        self.assertTrue(state.is_empty())
+        self.assertEqual([], state.pop_until(10))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    unittest.main()
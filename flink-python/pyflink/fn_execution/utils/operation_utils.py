@@ -15,6 +15,7 @@
 #  See the License for the specific language governing permissions and
 # limitations under the License.
 ################################################################################
+import collections
 import datetime
 import threading
 import time
@@ -29,10 +30,12 @@ from pyflink.fn_execution import pickle
 from pyflink.serializers import PickleSerializer
 from pyflink.table import functions
 from pyflink.table.udf import DelegationTableFunction, DelegatingScalarFunction, \
-    ImperativeAggregateFunction, PandasAggregateFunctionWrapper
+    ImperativeAggregateFunction, PandasAggregateFunctionWrapper, \
+    IncrementalPandasAggregateFunctionWrapper, PandasGroupAggregateFunctionWrapper
 
 _func_num = 0
 _constant_num = 0
+_expression_num = 0
 
 
 def normalize_table_function_result(it):
@@ -71,6 +74,33 @@ def normalize_pandas_result(it):
     return arrays
 
 
+def normalize_pandas_table_function_result(result, input_length):
+    """
+    Converts the result of a Pandas UDTF, whose index holds the positions of the input rows the
+    result rows belong to, into the result columns followed by the column of these positions. The
+    result rows are ordered by the positions of the input rows they belong to.
+    """
+    import pandas as pd
+    if isinstance(result, pd.Series):
+        result = result.to_frame()
+    if not isinstance(result, pd.DataFrame):
+        raise TypeError(
+            "The result type of Pandas UDTF must be pandas.Series or pandas.DataFrame, got %s"
+            % type(result))
+    if len(result) > 0:
+        if not pd.api.types.is_integer_dtype(result.index):
+            raise TypeError(
+                "The index of the result of Pandas UDTF must hold the positions of the input "
+                "rows, got %s" % result.index.dtype)
+        if result.index.min() < 0 or result.index.max() >= input_length:
+            raise ValueError(
+                "The index of the result of Pandas UDTF must be in the range [0, %d)"
+                % input_length)
+        result = result.sort_index(kind='mergesort')
+    return [result[column] for column in result.columns] + \
+        [pd.Series(result.index, dtype='int32')]
+
+
 def wrap_input_series_as_dataframe(*args):
     import pandas as pd
     return pd.concat(args, axis=1)
@@ -93,17 +123,80 @@ def extract_over_window_user_defined_function(user_defined_function_proto):
     return (*extract_user_defined_function(user_defined_function_proto, True), window_index)
 
 
+class ExpressionContext(object):
+    """
+    Context shared by all the user-defined functions of one operation during code generation. It
+    makes sure that:
+
+        - the identical deterministic calls, i.e. the same function with the same inputs, are
+          evaluated only once per row. They are hoisted into local variables of the generated
+          function which are stored in `local_expressions`.
+        - the deterministic calls which only take constant arguments are evaluated only once when
+          the operation is opened. They are stored in `constant_expressions`.
+    """
+
+    def __init__(self, user_defined_function_protos):
+        self.local_expressions = []  # type: List[Tuple[str, str]]
+        self.constant_expressions = []  # type: List[Tuple[str, str]]
+        # the generated expressions of the deterministic calls keyed by the serialized proto
+        self._expressions = {}  # type: Dict[bytes, str]
+        self._constant_calls = set()
+        self._call_counts = collections.Counter()
+        for user_defined_function_proto in user_defined_function_protos:
+            self._count_calls(user_defined_function_proto)
+
+    def get_expression(self, user_defined_function_proto):
+        return self._expressions.get(self._call_key(user_defined_function_proto))
+
+    def is_constant_call(self, user_defined_function_proto) -> bool:
+        return self._call_key(user_defined_function_proto) in self._constant_calls
+
+    def is_deterministic_call(self, user_defined_function_proto) -> bool:
+        return self._call_key(user_defined_function_proto) in self._expressions
+
+    def add_deterministic_call(self, user_defined_function_proto, func_str, is_constant) -> str:
+        global _constant_num, _expression_num
+        key = self._call_key(user_defined_function_proto)
+        if is_constant:
+            _constant_num = _constant_num + 1
+            name = 'c%s' % _constant_num
+            self.constant_expressions.append((name, func_str))
+            self._constant_calls.add(key)
+        elif self._call_counts[key] > 1:
+            _expression_num = _expression_num + 1
+            name = 'e%s' % _expression_num
+            self.local_expressions.append((name, func_str))
+        else:
+            name = func_str
+        self._expressions[key] = name
+        return name
+
+    def _count_calls(self, user_defined_function_proto):
+        self._call_counts[self._call_key(user_defined_function_proto)] += 1
+        for arg in user_defined_function_proto.inputs:
+            if arg.HasField("udf"):
+                self._count_calls(arg.udf)
+
+    @staticmethod
+    def _call_key(user_defined_function_proto) -> bytes:
+        return user_defined_function_proto.SerializeToString()
+
+
 def extract_user_defined_function(user_defined_function_proto, pandas_udaf=False,
-                                  one_arg_optimization=False)\
+                                  one_arg_optimization=False, expression_context=None,
+                                  incremental=False)\
         -> Tuple[str, Dict, List]:
     """
     Extracts user-defined-function from the proto representation of a
     :class:`UserDefinedFunction`.
 
     :param user_defined_function_proto: the proto representation of the Python
+    :class:`UserDefinedFunction`
     :param pandas_udaf: whether the user_defined_function_proto is pandas udaf
     :param one_arg_optimization: whether the optimization enabled
-    :class:`UserDefinedFunction`
+    :param expression_context: optional, the :class:`ExpressionContext` used to eliminate the
+                               common and constant deterministic calls
+    :param incremental: whether the pandas udaf aggregates the input incrementally
     """
 
     def _next_func_num():
@@ -111,6 +204,11 @@ def extract_user_defined_function(user_defined_function_proto, pandas_udaf=False
         _func_num = _func_num + 1
         return _func_num
 
+    if expression_context is not None:
+        extracted_expression = expression_context.get_expression(user_defined_function_proto)
+        if extracted_expression is not None:
+            return extracted_expression, {}, []
+
     def _extract_input(args) -> Tuple[str, Dict, List]:
         local_variable_dict = {}
         local_funcs = []
@@ -119,7 +217,8 @@ def extract_user_defined_function(user_defined_function_proto, pandas_udaf=False
             if arg.HasField("udf"):
                 # for chaining Python UDF input: the input argument is a Python ScalarFunction
                 udf_arg, udf_variable_dict, udf_funcs = extract_user_defined_function(
-                    arg.udf, one_arg_optimization=one_arg_optimization)
+                    arg.udf, one_arg_optimization=one_arg_optimization,
+                    expression_context=expression_context)
                 args_str.append(udf_arg)
                 local_variable_dict.update(udf_variable_dict)
                 local_funcs.extend(udf_funcs)
@@ -141,24 +240,28 @@ def extract_user_defined_function(user_defined_function_proto, pandas_udaf=False
     user_defined_funcs = []
 
     user_defined_func = pickle.loads(user_defined_function_proto.payload)
-    if pandas_udaf:
+    if pandas_udaf and incremental:
+        user_defined_func = IncrementalPandasAggregateFunctionWrapper(user_defined_func)
+    elif pandas_udaf:
         user_defined_func = PandasAggregateFunctionWrapper(user_defined_func)
     func_name = 'f%s' % _next_func_num()
     if isinstance(user_defined_func, DelegatingScalarFunction) \
             or isinstance(user_defined_func, DelegationTableFunction):
-        if user_defined_function_proto.is_pandas_udf:
+        if user_defined_function_proto.is_pandas_udf \
+                and isinstance(user_defined_func, DelegatingScalarFunction):
             variable_dict[func_name] = partial(check_pandas_udf_result, user_defined_func.func)
         else:
             variable_dict[func_name] = user_defined_func.func
     else:
         variable_dict[func_name] = user_defined_func.eval
     user_defined_funcs.append(user_defined_func)
+    _wrap_with_result_cache(func_name, user_defined_func, variable_dict, user_defined_funcs)
 
     func_args, input_variable_dict, input_funcs = _extract_input(user_defined_function_proto.inputs)
     variable_dict.update(input_variable_dict)
     user_defined_funcs.extend(input_funcs)
     if user_defined_function_proto.takes_row_as_input:
-        if input_variable_dict:
+        if any(not arg.HasField("inputOffset") for arg in user_defined_function_proto.inputs):
             # for constant or other udfs as input arguments.
             func_str = "%s(%s)" % (func_name, func_args)
         elif user_defined_function_proto.is_pandas_udf or pandas_udaf:
@@ -175,6 +278,178 @@ def extract_user_defined_function(user_defined_function_proto, pandas_udaf=False
             func_str = "%s(value)" % func_name
     else:
         func_str = "%s(%s)" % (func_name, func_args)
+
+    if expression_context is not None and not pandas_udaf \
+            and not user_defined_function_proto.is_pandas_udf \
+            and user_defined_func.is_deterministic() \
+            and all(expression_context.is_deterministic_call(arg.udf)
+                    for arg in user_defined_function_proto.inputs if arg.HasField("udf")):
+        is_constant = not user_defined_function_proto.takes_row_as_input and all(
+            not arg.HasField("inputOffset") and
+            (not arg.HasField("udf") or expression_context.is_constant_call(arg.udf))
+            for arg in user_defined_function_proto.inputs)
+        func_str = expression_context.add_deterministic_call(
+            user_defined_function_proto, func_str, is_constant)
+        if is_constant:
+            # the value will be filled when the operation is opened
+            variable_dict[func_str] = None
+    return func_str, variable_dict, user_defined_funcs
+
+
+class ResultCache(object):
+    """
+    Bounded LRU cache of the results of a deterministic function keyed by the input arguments.
+    The function is called directly if the input arguments are not hashable.
+    """
+
+    def __init__(self, func, max_size: int, name: str):
+        self._func = func
+        self._max_size = max_size
+        self._name = name
+        self._cache = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def open(self, function_context):
+        try:
+            metric_group = function_context.get_metric_group()
+        except RuntimeError:
+            # metric is disabled
+            return
+        cache_metric_group = metric_group.add_group("cache", self._name)
+        cache_metric_group.gauge("hits", lambda: self._hits)
+        cache_metric_group.gauge("misses", lambda: self._misses)
+        cache_metric_group.gauge("evictions", lambda: self._evictions)
+        cache_metric_group.gauge("size", lambda: len(self._cache))
+        cache_metric_group.gauge("hitRatePercentage", self.hit_rate_percentage)
+
+    def close(self):
+        self._cache.clear()
+
+    def hit_rate_percentage(self) -> int:
+        total = self._hits + self._misses
+        return self._hits * 100 // total if total > 0 else 0
+
+    def __call__(self, *args):
+        cache = self._cache
+        try:
+            result = cache[args]
+        except KeyError:
+            pass
+        except TypeError:
+            # the input arguments are not hashable
+            return self._func(*args)
+        else:
+            self._hits += 1
+            cache.move_to_end(args)
+            return result
+
+        self._misses += 1
+        result = self._func(*args)
+        cache[args] = result
+        if len(cache) > self._max_size:
+            cache.popitem(last=False)
+            self._evictions += 1
+        return result
+
+
+def _wrap_with_result_cache(func_name, user_defined_func, variable_dict, user_defined_funcs):
+    cache_size = getattr(user_defined_func, '_cache_size', None)
+    if cache_size:
+        cache_name = getattr(user_defined_func, '_cache_name', func_name)
+        result_cache = ResultCache(variable_dict[func_name], cache_size, cache_name)
+        variable_dict[func_name] = result_cache
+        # the cache is opened and closed together with the functions to manage the metrics
+        user_defined_funcs.append(result_cache)
+
+
+def is_batch_mode_function(user_defined_func) -> bool:
+    return getattr(user_defined_func, '_batch_mode', None) == 'auto'
+
+
+def normalize_batch_result(result, n):
+    # numpy.ndarray and pandas.Series are converted to a list of Python objects
+    if hasattr(result, 'tolist'):
+        result = result.tolist()
+    else:
+        result = list(result)
+    assert len(result) == n, \
+        "The result length '%d' of the batch mode function is not equal to the input length " \
+        "'%d'" % (len(result), n)
+    return result
+
+
+def extract_batched_user_defined_function(user_defined_function_proto,
+                                          one_arg_optimization=False) -> Tuple[str, Dict, List]:
+    """
+    Extracts user-defined-function from the proto representation of a
+    :class:`UserDefinedFunction` and generates the columnar form of it. The generated expression
+    is evaluated once for all the rows of a batch and returns the list of results. It references
+    the following variables:
+
+        - values: the list of the input rows of the batch
+        - columns: the list of the input columns of the batch
+        - n: the number of the input rows of the batch
+
+    Functions declared with batch_mode='auto' are called once per batch with each argument as a
+    list, other functions are called once per row.
+
+    :param user_defined_function_proto: the proto representation of the Python
+    :class:`UserDefinedFunction`
+    :param one_arg_optimization: whether the optimization enabled
+    """
+
+    def _next_func_num():
+        global _func_num
+        _func_num = _func_num + 1
+        return _func_num
+
+    variable_dict = {'normalize_batch_result': normalize_batch_result}
+    user_defined_funcs = []
+
+    user_defined_func = pickle.loads(user_defined_function_proto.payload)
+    func_name = 'f%s' % _next_func_num()
+    if isinstance(user_defined_func, DelegatingScalarFunction):
+        variable_dict[func_name] = user_defined_func.func
+    else:
+        variable_dict[func_name] = user_defined_func.eval
+    user_defined_funcs.append(user_defined_func)
+    _wrap_with_result_cache(func_name, user_defined_func, variable_dict, user_defined_funcs)
+    batch_mode = is_batch_mode_function(user_defined_func)
+
+    args_str = []
+    has_complex_input = False
+    for arg in user_defined_function_proto.inputs:
+        if arg.HasField("udf"):
+            udf_arg, udf_variable_dict, udf_funcs = extract_batched_user_defined_function(
+                arg.udf, one_arg_optimization=one_arg_optimization)
+            args_str.append(udf_arg)
+            variable_dict.update(udf_variable_dict)
+            user_defined_funcs.extend(udf_funcs)
+            has_complex_input = True
+        elif arg.HasField("inputOffset"):
+            if one_arg_optimization:
+                args_str.append("values")
+            else:
+                args_str.append("columns[%s]" % arg.inputOffset)
+        else:
+            constant_value_name, parsed_constant_value = \
+                _parse_constant_value(arg.inputConstant)
+            args_str.append("[%s] * n" % constant_value_name)
+            variable_dict[constant_value_name] = parsed_constant_value
+            has_complex_input = True
+
+    if user_defined_function_proto.takes_row_as_input and not has_complex_input:
+        # the rows themselves are the only input argument
+        args_str = ["values"]
+
+    if batch_mode:
+        func_str = "normalize_batch_result(%s(%s), n)" % (func_name, ",".join(args_str))
+    elif args_str:
+        func_str = "list(map(%s, %s))" % (func_name, ",".join(args_str))
+    else:
+        func_str = "[%s() for _ in range(n)]" % func_name
     return func_str, variable_dict, user_defined_funcs
 
 
@@ -220,6 +495,8 @@ def extract_user_defined_aggregate_function(
         distinct_info_dict: Dict[Tuple[List[str]], Tuple[List[int], List[int]]]):
     user_defined_agg = load_aggregate_function(user_defined_function_proto.payload)
     assert isinstance(user_defined_agg, ImperativeAggregateFunction)
+    if getattr(user_defined_agg, '_func_type', None) == 'pandas':
+        user_defined_agg = PandasGroupAggregateFunctionWrapper(user_defined_agg)
     args_str = []
     local_variable_dict = {}
     for arg in user_defined_function_proto.inputs:
@@ -303,6 +580,30 @@ def create_scalar_operation_from_proto(proto, one_arg_optimization=False,
     return scalar_operation
 
 
+def create_table_operation_from_proto(proto):
+    from pyflink.fn_execution.embedded.operations import TableFunctionOperation
+
+    serialized_fn = parse_function_proto(proto)
+    return TableFunctionOperation(serialized_fn)
+
+
+def create_one_input_operation_from_proto(proto, input_type_info, output_type_info):
+    from pyflink.fn_execution import flink_fn_execution_pb2
+    from pyflink.fn_execution.embedded.converters import from_type_info_proto
+    from pyflink.fn_execution.embedded.operations import OneInputOperation
+
+    serialized_fn = flink_fn_execution_pb2.UserDefinedDataStreamFunction()
+    serialized_fn.ParseFromString(proto)
+    input_type_info_proto = flink_fn_execution_pb2.TypeInfo()
+    input_type_info_proto.ParseFromString(input_type_info)
+    output_type_info_proto = flink_fn_execution_pb2.TypeInfo()
+    output_type_info_proto.ParseFromString(output_type_info)
+    return OneInputOperation(
+        serialized_fn,
+        from_type_info_proto(input_type_info_proto),
+        from_type_info_proto(output_type_info_proto))
+
+
 def create_serialized_scalar_operation_from_proto(proto, one_arg_optimization=False,
                                                   one_result_optimization=False):
     """
@@ -110,28 +110,75 @@ Other important classes:
 """
 from __future__ import absolute_import
 
-from pyflink.table.changelog_mode import ChangelogMode
-from pyflink.table.data_view import DataView, ListView, MapView
-from pyflink.table.environment_settings import EnvironmentSettings
-from pyflink.table.explain_detail import ExplainDetail
-from pyflink.table.expression import Expression
-from pyflink.table.module import Module, ModuleEntry
-from pyflink.table.result_kind import ResultKind
-from pyflink.table.schema import Schema
-from pyflink.table.sinks import CsvTableSink, TableSink, WriteMode
-from pyflink.table.sources import CsvTableSource, TableSource
-from pyflink.table.sql_dialect import SqlDialect
-from pyflink.table.statement_set import StatementSet
-from pyflink.table.table import GroupWindowedTable, GroupedTable, OverWindowedTable, Table, \
-    WindowGroupedTable
-from pyflink.table.table_config import TableConfig
-from pyflink.table.table_descriptor import TableDescriptor, FormatDescriptor
-from pyflink.table.table_environment import (TableEnvironment, StreamTableEnvironment)
-from pyflink.table.table_result import TableResult
-from pyflink.table.table_schema import TableSchema
-from pyflink.table.types import DataTypes, UserDefinedType, Row, RowKind
-from pyflink.table.udf import FunctionContext, ScalarFunction, TableFunction, AggregateFunction, \
-    TableAggregateFunction
+from typing import TYPE_CHECKING
+
+from pyflink.util.lazy_import import lazy_import_attributes
+
+if TYPE_CHECKING:
+    from pyflink.table.changelog_mode import ChangelogMode
+    from pyflink.table.data_view import DataView, ListView, MapView
+    from pyflink.table.environment_settings import EnvironmentSettings
+    from pyflink.table.explain_detail import ExplainDetail
+    from pyflink.table.expression import Expression
+    from pyflink.table.module import Module, ModuleEntry
+    from pyflink.table.result_kind import ResultKind
+    from pyflink.table.schema import Schema
+    from pyflink.table.sinks import CsvTableSink, TableSink, WriteMode
+    from pyflink.table.sources import CsvTableSource, TableSource
+    from pyflink.table.sql_dialect import SqlDialect
+    from pyflink.table.statement_set import StatementSet
+    from pyflink.table.table import GroupWindowedTable, GroupedTable, OverWindowedTable, Table, \
+        WindowGroupedTable
+    from pyflink.table.table_config import TableConfig
+    from pyflink.table.table_descriptor import TableDescriptor, FormatDescriptor
+    from pyflink.table.table_environment import (TableEnvironment, StreamTableEnvironment)
+    from pyflink.table.table_result import TableResult
+    from pyflink.table.table_schema import TableSchema
+    from pyflink.table.types import DataTypes, UserDefinedType, Row, RowKind
+    from pyflink.table.udf import FunctionContext, ScalarFunction, TableFunction, \
+        AggregateFunction, TableAggregateFunction
+
+lazy_import_attributes(__name__, globals(), {
+    'ChangelogMode': 'pyflink.table.changelog_mode',
+    'DataView': 'pyflink.table.data_view',
+    'ListView': 'pyflink.table.data_view',
+    'MapView': 'pyflink.table.data_view',
+    'EnvironmentSettings': 'pyflink.table.environment_settings',
+    'ExplainDetail': 'pyflink.table.explain_detail',
+    'Expression': 'pyflink.table.expression',
+    'Module': 'pyflink.table.module',
+    'ModuleEntry': 'pyflink.table.module',
+    'ResultKind': 'pyflink.table.result_kind',
+    'Schema': 'pyflink.table.schema',
+    'CsvTableSink': 'pyflink.table.sinks',
+    'TableSink': 'pyflink.table.sinks',
+    'WriteMode': 'pyflink.table.sinks',
+    'CsvTableSource': 'pyflink.table.sources',
+    'TableSource': 'pyflink.table.sources',
+    'SqlDialect': 'pyflink.table.sql_dialect',
+    'StatementSet': 'pyflink.table.statement_set',
+    'GroupWindowedTable': 'pyflink.table.table',
+    'GroupedTable': 'pyflink.table.table',
+    'OverWindowedTable': 'pyflink.table.table',
+    'Table': 'pyflink.table.table',
+    'WindowGroupedTable': 'pyflink.table.table',
+    'TableConfig': 'pyflink.table.table_config',
+    'TableDescriptor': 'pyflink.table.table_descriptor',
+    'FormatDescriptor': 'pyflink.table.table_descriptor',
+    'TableEnvironment': 'pyflink.table.table_environment',
+    'StreamTableEnvironment': 'pyflink.table.table_environment',
+    'TableResult': 'pyflink.table.table_result',
+    'TableSchema': 'pyflink.table.table_schema',
+    'DataTypes': 'pyflink.table.types',
+    'UserDefinedType': 'pyflink.table.types',
+    'Row': 'pyflink.table.types',
+    'RowKind': 'pyflink.table.types',
+    'FunctionContext': 'pyflink.table.udf',
+    'ScalarFunction': 'pyflink.table.udf',
+    'TableFunction': 'pyflink.table.udf',
+    'AggregateFunction': 'pyflink.table.udf',
+    'TableAggregateFunction': 'pyflink.table.udf',
+})
 
 __all__ = [
     'TableEnvironment',
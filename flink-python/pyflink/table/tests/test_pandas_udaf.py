@@ -285,6 +285,36 @@ class BatchPandasUDAFITTests(PyFlinkBatchTableTestCase):
 
 
 class StreamPandasUDAFITTests(PyFlinkStreamTableTestCase):
+    def test_group_aggregate_function(self):
+        # trigger the finish bundle more frequently to aggregate a key in multiple bundles
+        self.t_env.get_config().get_configuration().set_string(
+            "python.fn-execution.bundle.size", "2")
+        mean = udaf(IncrementalMean(), result_type=DataTypes.DOUBLE(), func_type="pandas")
+        t = self.t_env.from_elements(
+            [(1, 'a'), (3, 'a'), (2, 'b'), (5, 'a'), (4, 'b'), (6, 'c')], ['v', 'k'])
+        # the second aggregation retracts the previous results of the first aggregation
+        result = t.group_by(t.k) \
+            .select(t.k, mean(t.v).alias('m')) \
+            .select(mean(col('m')).alias('m'), col('m').count.alias('c'))
+        self.assertEqual(result.to_pandas().values.tolist(), [[4.0, 3]])
+
+    def test_group_aggregate_function_with_accumulator_type(self):
+        accumulator_type = DataTypes.ROW([DataTypes.FIELD("sum", DataTypes.BIGINT()),
+                                          DataTypes.FIELD("count", DataTypes.BIGINT())])
+        mean = udaf(IncrementalMean(), result_type=DataTypes.DOUBLE(),
+                    accumulator_type=accumulator_type, func_type="pandas")
+        self.assertEqual(accumulator_type, mean._accumulator_type)
+        t = self.t_env.from_elements([(1, 'a'), (3, 'a'), (2, 'b')], ['v', 'k'])
+        result = t.group_by(t.k).select(t.k, mean(t.v).alias('m'))
+        self.assertEqual(sorted(result.to_pandas().values.tolist()), [['a', 2.0], ['b', 2.0]])
+
+    def test_group_aggregate_function_defined_with_python_function(self):
+        t = self.t_env.from_elements([(1, 'a'), (3, 'a'), (2, 'b')], ['v', 'k'])
+        result = t.group_by(t.k).select(t.k, mean_udaf(t.v))
+        from pyflink.util.exceptions import TableException
+        with self.assertRaisesRegex(TableException, "defined with a Python function"):
+            result.explain()
+
     def test_sliding_group_window_over_time(self):
         # create source file path
         import tempfile
@@ -516,6 +546,80 @@ class StreamPandasUDAFITTests(PyFlinkStreamTableTestCase):
         ])
         os.remove(source_path)
 
+    def test_incremental_tumbling_group_window_over_time(self):
+        # create source file path
+        import tempfile
+        import os
+        tmp_dir = tempfile.gettempdir()
+        data = [
+            '1,1,2,2018-03-11 03:10:00',
+            '3,3,2,2018-03-11 03:10:00',
+            '2,2,1,2018-03-11 03:10:00',
+            '1,1,3,2018-03-11 03:40:00',
+            '1,1,8,2018-03-11 04:20:00',
+            '2,2,3,2018-03-11 03:30:00',
+            '1,1,7,2018-03-11 03:50:00'
+        ]
+        source_path = tmp_dir + '/test_incremental_tumbling_group_window_over_time.csv'
+        with open(source_path, 'w') as fd:
+            for ele in data:
+                fd.write(ele + '\n')
+
+        from pyflink.table.window import Tumble
+        config = self.t_env.get_config().get_configuration()
+        config.set_string("pipeline.time-characteristic", "EventTime")
+        config.set_string("parallelism.default", "1")
+        # aggregates the rows into the accumulators every two rows
+        config.set_string("python.fn-execution.bundle.size", "2")
+        config.set_string(
+            "python.fn-execution.pandas.incremental-window-aggregate.enabled", "true")
+        incremental_mean_udaf = udaf(IncrementalMean(),
+                                     result_type=DataTypes.FLOAT(),
+                                     func_type="pandas")
+
+        source_table = """
+            create table source_table(
+                a TINYINT,
+                b SMALLINT,
+                c SMALLINT,
+                rowtime TIMESTAMP(3),
+                WATERMARK FOR rowtime AS rowtime - INTERVAL '60' MINUTE
+            ) with(
+                'connector.type' = 'filesystem',
+                'format.type' = 'csv',
+                'connector.path' = '%s',
+                'format.ignore-first-line' = 'false',
+                'format.field-delimiter' = ','
+            )
+        """ % source_path
+        self.t_env.execute_sql(source_table)
+        t = self.t_env.from_path("source_table")
+
+        table_sink = source_sink_utils.TestAppendSink(
+            ['a', 'b', 'c', 'd'],
+            [
+                DataTypes.TINYINT(),
+                DataTypes.TIMESTAMP(3),
+                DataTypes.TIMESTAMP(3),
+                DataTypes.FLOAT()])
+        self.t_env.register_table_sink("Results", table_sink)
+        t.window(Tumble.over(lit(1).hours).on(t.rowtime).alias("w")) \
+            .group_by(t.a, col("w")) \
+            .select(t.a,
+                    col("w").start,
+                    col("w").end,
+                    incremental_mean_udaf(t.c).alias("b")) \
+            .execute_insert("Results") \
+            .wait()
+        actual = source_sink_utils.results()
+        self.assert_equals(actual, [
+            "+I[1, 2018-03-11 03:00:00.0, 2018-03-11 04:00:00.0, 4.0]",
+            "+I[1, 2018-03-11 04:00:00.0, 2018-03-11 05:00:00.0, 8.0]",
+            "+I[2, 2018-03-11 03:00:00.0, 2018-03-11 04:00:00.0, 2.0]",
+            "+I[3, 2018-03-11 03:00:00.0, 2018-03-11 04:00:00.0, 2.0]",
+        ])
+        os.remove(source_path)
+
     def test_tumbling_group_window_over_count(self):
         self.t_env.get_config().get_configuration().set_string("parallelism.default", "1")
         # create source file path
@@ -854,6 +958,25 @@ def mean_udaf(v):
     return v.mean()
 
 
+class IncrementalMean(AggregateFunction):
+
+    def get_value(self, accumulator):
+        if accumulator[1] == 0:
+            return None
+        return accumulator[0] / accumulator[1]
+
+    def create_accumulator(self):
+        return [0, 0]
+
+    def accumulate(self, accumulator, *args):
+        accumulator[0] += args[0].sum()
+        accumulator[1] += len(args[0])
+
+    def retract(self, accumulator, *args):
+        accumulator[0] -= args[0].sum()
+        accumulator[1] -= len(args[0])
+
+
 class MaxAdd(AggregateFunction, unittest.TestCase):
 
     def open(self, function_context):
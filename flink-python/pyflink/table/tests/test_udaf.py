@@ -533,6 +533,28 @@ class StreamTableAggregateTests(PyFlinkStreamTableTestCase):
         t = self.t_env.from_path('test_source')
         t.select(call("my_count", t.a).alias("a")).to_pandas()
 
+    def test_two_phase_aggregate(self):
+        self.t_env.create_temporary_function("my_count", CountAggregateFunction())
+        self.t_env.create_temporary_function("my_sum", SumAggregateFunction())
+        config = self.t_env.get_config().get_configuration()
+        config.set_string("table.exec.mini-batch.enabled", "true")
+        config.set_string("table.exec.mini-batch.allow-latency", "1s")
+        config.set_string("table.exec.mini-batch.size", "1000")
+        config.set_string("python.fn-execution.bundle.size", "2")
+        t = self.t_env.from_elements([(1, 'Hi', 'Hello'),
+                                      (3, 'Hi', 'hi'),
+                                      (3, 'Hi2', 'hi'),
+                                      (3, 'Hi', 'hi'),
+                                      (2, 'Hi', 'Hello')], ['a', 'b', 'c'])
+        result = t.group_by(t.c) \
+            .select(t.c, call("my_count", t.a).alias("a"), call("my_sum", t.a).alias("b"))
+        plan = result.explain()
+        self.assertTrue(plan.find("PythonLocalGroupAggregate(groupBy=[c], ") >= 0)
+        self.assertTrue(plan.find("PythonGlobalGroupAggregate(groupBy=[c], ") >= 0)
+        assert_frame_equal(result.to_pandas().sort_values(by='c').reset_index(drop=True),
+                           pd.DataFrame([['Hello', 2, 3], ['hi', 3, 9]],
+                                        columns=['c', 'a', 'b']))
+
     def test_tumbling_group_window_over_time(self):
         # create source file path
         tmp_dir = self.tempdir
@@ -240,6 +240,65 @@ class UserDefinedFunctionTests(object):
         actual = source_sink_utils.results()
         self.assert_equals(actual, ["+I[1, 1]", "+I[2, 4]", "+I[3, 3]"])
 
+    def test_batch_mode_udf(self):
+        @udf(result_type=DataTypes.BIGINT(), batch_mode='auto')
+        def batch_add(i, j):
+            assert isinstance(i, list), 'i of wrong type %s !' % type(i)
+            return [x + y for x, y in zip(i, j)]
+
+        add_one = udf(lambda i: i + 1, result_type=DataTypes.BIGINT())
+
+        table_sink = source_sink_utils.TestAppendSink(
+            ['a', 'b', 'c'],
+            [DataTypes.BIGINT(), DataTypes.BIGINT(), DataTypes.BIGINT()])
+        self.t_env.register_table_sink("Results", table_sink)
+
+        t = self.t_env.from_elements([(1, 2, 3), (2, 5, 6), (3, 1, 9)], ['a', 'b', 'c'])
+        t.select(batch_add(add_one(t.a), t.b), batch_add(t.c, expr.lit(1)), add_one(t.a)) \
+            .execute_insert("Results").wait()
+        actual = source_sink_utils.results()
+        self.assert_equals(actual, ["+I[4, 4, 2]", "+I[8, 7, 3]", "+I[5, 10, 4]"])
+
+        with self.assertRaises(ValueError):
+            udf(lambda i: i, result_type=DataTypes.BIGINT(), batch_mode='invalid')
+        with self.assertRaises(ValueError):
+            udf(lambda i: i, result_type=DataTypes.BIGINT(), func_type='pandas',
+                batch_mode='auto')
+
+    def test_common_and_constant_udf_calls(self):
+        parse = udf(lambda i: {'x': i, 'y': i * 2},
+                    result_type=DataTypes.MAP(DataTypes.STRING(), DataTypes.BIGINT()))
+        get = udf(lambda m, k: m[k], result_type=DataTypes.BIGINT())
+        add_one = udf(lambda i: i + 1, result_type=DataTypes.BIGINT())
+
+        table_sink = source_sink_utils.TestAppendSink(
+            ['a', 'b', 'c'],
+            [DataTypes.BIGINT(), DataTypes.BIGINT(), DataTypes.BIGINT()])
+        self.t_env.register_table_sink("Results", table_sink)
+
+        t = self.t_env.from_elements([(1, 2), (2, 5), (3, 1)], ['a', 'b'])
+        t.select(get(parse(t.a), 'x'), get(parse(t.a), 'y'), add_one(add_one(expr.lit(1)))) \
+            .execute_insert("Results").wait()
+        actual = source_sink_utils.results()
+        self.assert_equals(actual, ["+I[1, 2, 3]", "+I[2, 4, 3]", "+I[3, 6, 3]"])
+
+    def test_udf_with_result_cache(self):
+        add_one = udf(lambda i: i + 1, result_type=DataTypes.BIGINT(), cache_size=2)
+
+        table_sink = source_sink_utils.TestAppendSink(
+            ['a', 'b'], [DataTypes.BIGINT(), DataTypes.BIGINT()])
+        self.t_env.register_table_sink("Results", table_sink)
+
+        t = self.t_env.from_elements([(1, 2), (1, 5), (2, 1), (3, 1), (1, 3)], ['a', 'b'])
+        t.select(add_one(t.a), t.b).execute_insert("Results").wait()
+        actual = source_sink_utils.results()
+        self.assert_equals(actual, ["+I[2, 2]", "+I[2, 5]", "+I[3, 1]", "+I[4, 1]", "+I[2, 3]"])
+
+        with self.assertRaises(ValueError):
+            udf(lambda i: i, result_type=DataTypes.BIGINT(), deterministic=False, cache_size=2)
+        with self.assertRaises(ValueError):
+            udf(lambda i: i, result_type=DataTypes.BIGINT(), cache_size=0)
+
     def test_udf_without_arguments(self):
         one = udf(lambda: 1, result_type=DataTypes.BIGINT(), deterministic=True)
         two = udf(lambda: 2, result_type=DataTypes.BIGINT(), deterministic=False)
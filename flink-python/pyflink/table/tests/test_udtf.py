@@ -15,14 +15,29 @@
 #  See the License for the specific language governing permissions and
 # limitations under the License.
 ################################################################################
+import sys
 import unittest
 
+import pytest
+
 from pyflink.table import DataTypes
 from pyflink.table.udf import TableFunction, udtf, ScalarFunction, udf
 from pyflink.table.expressions import col
 from pyflink.testing import source_sink_utils
 from pyflink.testing.test_case_utils import PyFlinkStreamTableTestCase, \
-    PyFlinkBatchTableTestCase
+    PyFlinkBatchTableTestCase, PyFlinkTestCase
+
+
+class PandasUDTFTests(PyFlinkTestCase):
+
+    def test_pandas_udtf_without_arguments(self):
+        with self.assertRaisesRegex(ValueError, "The Pandas UDTFs must take at least one argument"):
+            udtf(lambda: None, result_types=DataTypes.BIGINT(), func_type="pandas")
+        with self.assertRaisesRegex(ValueError, "The Pandas UDTFs must take at least one argument"):
+            udtf(lambda *args: None, input_types=[], result_types=DataTypes.BIGINT(),
+                 func_type="pandas")
+        # the general UDTFs could take no arguments
+        udtf(lambda: None, result_types=DataTypes.BIGINT())
 
 
 class UserDefinedTableFunctionTests(object):
@@ -63,6 +78,18 @@ class UserDefinedTableFunctionTests(object):
         actual = self._get_output(t)
         self.assert_equals(actual, ["+I[1, 1, 0]", "+I[2, 2, 0]", "+I[3, 3, 0]", "+I[3, 3, 1]"])
 
+    def test_pandas_table_function(self):
+        self._register_table_sink(
+            ['a', 'b', 'c'],
+            [DataTypes.BIGINT(), DataTypes.STRING(), DataTypes.BIGINT()])
+
+        t = self.t_env.from_elements([(1, 'a,bb'), (2, ''), (3, 'ccc')], ['a', 'b'])
+        t = t.left_outer_join_lateral(pandas_split(t.b).alias('word', 'length')) \
+            .select(t.a, col('word'), col('length'))
+        actual = self._get_output(t)
+        self.assert_equals(actual,
+                           ["+I[1, a, 1]", "+I[1, bb, 2]", "+I[2, null, null]", "+I[3, ccc, 3]"])
+
     def _register_table_sink(self, field_names: list, field_types: list):
         table_sink = source_sink_utils.TestAppendSink(field_names, field_types)
         self.t_env.register_table_sink("Results", table_sink)
@@ -132,6 +159,13 @@ class PyFlinkBatchUserDefinedFunctionTests(UserDefinedTableFunctionTests,
     pass
 
 
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python3.7")
+class PyFlinkEmbeddedThreadTests(UserDefinedTableFunctionTests, PyFlinkBatchTableTestCase):
+    def setUp(self):
+        super(PyFlinkEmbeddedThreadTests, self).setUp()
+        self.t_env.get_config().get_configuration().set_string("python.execution-mode", "thread")
+
+
 class MultiEmit(TableFunction, unittest.TestCase):
 
     def open(self, function_context):
@@ -161,6 +195,15 @@ def condition_multi_emit(x, y):
         return range(y, x)
 
 
+@udtf(result_types=[DataTypes.STRING(), DataTypes.BIGINT()], func_type="pandas")
+def pandas_split(s):
+    import pandas as pd
+    # the index of the exploded words refers to the input rows they belong to
+    words = s.str.split(',').explode()
+    words = words[words != '']
+    return pd.DataFrame({'word': words, 'length': words.str.len()})
+
+
 class MultiNum(ScalarFunction):
     def eval(self, x):
         return x * 2
@@ -17,9 +17,11 @@
 ################################################################################
 import abc
 import collections
+import copy
 import functools
 import inspect
-from typing import Union, List, Type, Callable, TypeVar, Generic, Iterable
+import mmap
+from typing import Any, Union, List, Type, Callable, TypeVar, Generic, Iterable
 
 from pyflink.java_gateway import get_gateway
 from pyflink.metrics import MetricGroup
@@ -38,8 +40,9 @@ class FunctionContext(object):
     and global job parameters, etc.
     """
 
-    def __init__(self, base_metric_group):
+    def __init__(self, base_metric_group, shared_resources=None):
         self._base_metric_group = base_metric_group
+        self._shared_resources = shared_resources
 
     def get_metric_group(self) -> MetricGroup:
         """
@@ -52,6 +55,53 @@ class FunctionContext(object):
                                "metric with the 'python.metric.enabled' configuration.")
         return self._base_metric_group
 
+    def get_shared_resource(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the resource registered under the given name, which is shared by all the
+        user-defined functions executed in the same Python worker process, e.g. a machine learning
+        model or a large dictionary. The resource is loaded with the given loader when it is
+        accessed for the first time and is released after the last function using it has been
+        closed. The ``close`` method of the resource, if any, is called when it is released.
+
+        The resource should be treated as read-only, as it may be accessed concurrently. Loading it
+        in the function instead of capturing it in the closure also keeps it out of the job graph.
+
+        Example:
+        ::
+
+            >>> class Predict(ScalarFunction):
+            ...     def open(self, function_context):
+            ...         self.model = function_context.get_shared_resource(
+            ...             'model', lambda: load_model('model.bin'))
+
+        :param name: The name of the resource.
+        :param loader: The function which loads the resource.
+        :return: The shared resource.
+
+        .. versionadded:: 1.16.0
+        """
+        return self._get_shared_resources().get(name, loader)
+
+    def get_memory_mapped_file(self, path: str) -> mmap.mmap:
+        """
+        Returns a read-only memory map of the given local file, which is shared by all the
+        user-defined functions executed in the same Python worker process. The file could be for
+        example a file of an archive added via ``add_python_archive``, which is extracted into the
+        working directory of the Python worker.
+
+        :param path: The path of the file, relative paths are resolved against the working
+                     directory of the Python worker.
+        :return: The read-only memory map of the file.
+
+        .. versionadded:: 1.16.0
+        """
+        return self._get_shared_resources().get_memory_mapped_file(path)
+
+    def _get_shared_resources(self):
+        if self._shared_resources is None:
+            raise RuntimeError("The shared resources are only accessible in the Python worker.")
+        return self._shared_resources
+
 
 class UserDefinedFunction(abc.ABC):
     """
@@ -249,12 +299,16 @@ class DelegatingScalarFunction(ScalarFunction):
     internal use only.
     """
 
-    def __init__(self, func):
+    def __init__(self, func, deterministic=True):
         self.func = func
+        self._deterministic = deterministic
 
     def eval(self, *args):
         return self.func(*args)
 
+    def is_deterministic(self) -> bool:
+        return self._deterministic
+
 
 class DelegationTableFunction(TableFunction):
     """
@@ -307,6 +361,119 @@ class PandasAggregateFunctionWrapper(object):
         self.func.close()
 
 
+class IncrementalPandasAggregateFunctionWrapper(PandasAggregateFunctionWrapper):
+    """
+    Wrapper for Pandas Aggregate function which aggregates the input incrementally, i.e. the
+    accumulator is kept across the calls of eval, and each call accumulates the given input into
+    it and returns the result of all the input accumulated so far.
+    """
+    def __init__(self, func: AggregateFunction):
+        if isinstance(func, DelegatingPandasAggregateFunction):
+            raise TypeError(
+                "Only the Pandas UDAFs which are AggregateFunctions could be aggregated "
+                "incrementally, the Pandas UDAFs defined with a Python function are not "
+                "supported.")
+        super(IncrementalPandasAggregateFunctionWrapper, self).__init__(func)
+        self.accumulator = None
+
+    def eval(self, *args):
+        if self.accumulator is None:
+            self.accumulator = self.func.create_accumulator()
+        self.func.accumulate(self.accumulator, *args)
+        return self.func.get_value(self.accumulator)
+
+
+class PandasGroupAggregateFunctionWrapper(AggregateFunction):
+    """
+    Wrapper for Pandas Aggregate function used in the streaming group aggregation, where the input
+    rows are accumulated into the accumulators one by one. The input rows of a key which are
+    accumulated or retracted consecutively are buffered and passed to the Pandas Aggregate function
+    at once as pandas.Series when the accumulator is accessed.
+    """
+    def __init__(self, func: AggregateFunction):
+        if isinstance(func, DelegatingPandasAggregateFunction):
+            raise TypeError(
+                "Only the Pandas UDAFs which are AggregateFunctions could be used in the streaming "
+                "group aggregation, the Pandas UDAFs defined with a Python function are not "
+                "supported.")
+        self.func = func
+        self._accumulator = None
+        self._is_retract = False
+        self._buffer = []
+
+    def open(self, function_context: FunctionContext):
+        self.func.open(function_context)
+
+    def create_accumulator(self):
+        return self.func.create_accumulator()
+
+    def accumulate(self, accumulator, *args):
+        self._add(accumulator, False, args)
+
+    def retract(self, accumulator, *args):
+        self._add(accumulator, True, args)
+
+    def merge(self, accumulator, accumulators):
+        self._flush()
+        self.func.merge(accumulator, accumulators)
+
+    def get_value(self, accumulator):
+        self._flush()
+        return self.func.get_value(accumulator)
+
+    def close(self):
+        self.func.close()
+
+    def _add(self, accumulator, is_retract, args):
+        if self._buffer and (
+                accumulator is not self._accumulator or is_retract != self._is_retract):
+            self._flush()
+        self._accumulator = accumulator
+        self._is_retract = is_retract
+        self._buffer.append(args)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        import pandas as pd
+        columns = [pd.Series(column) for column in zip(*self._buffer)]
+        if self._is_retract:
+            self.func.retract(self._accumulator, *columns)
+        else:
+            self.func.accumulate(self._accumulator, *columns)
+        self._accumulator = None
+        self._buffer = []
+
+
+class MergingAggregateFunctionWrapper(AggregateFunction):
+    """
+    Wrapper for Aggregate function used in the global phase of a two-phase streaming group
+    aggregation. The input of the wrapper is the pickled accumulator emitted by the local phase,
+    which is merged into the accumulator of the key with the merge method of the Aggregate function.
+    """
+    def __init__(self, func: AggregateFunction):
+        self.func = func
+
+    def open(self, function_context: FunctionContext):
+        self.func.open(function_context)
+
+    def create_accumulator(self):
+        return self.func.create_accumulator()
+
+    def accumulate(self, accumulator, serialized_accumulator):
+        from pyflink.fn_execution import pickle
+        self.func.merge(accumulator, [pickle.loads(serialized_accumulator)])
+
+    def merge(self, accumulator, accumulators):
+        self.func.merge(accumulator, accumulators)
+
+    def get_value(self, accumulator):
+        return self.func.get_value(accumulator)
+
+    def close(self):
+        self.func.close()
+
+
 class UserDefinedFunctionWrapper(object):
     """
     Base Wrapper for Python user-defined function. It handles things like converting lambda
@@ -385,6 +552,7 @@ class UserDefinedFunctionWrapper(object):
             func = self._func
             if not isinstance(self._func, UserDefinedFunction):
                 func = self._create_delegate_function()
+            func = self._attach_execution_options(func)
 
             import cloudpickle
             serialized_func = cloudpickle.dumps(func)
@@ -395,6 +563,14 @@ class UserDefinedFunctionWrapper(object):
     def _create_delegate_function(self) -> UserDefinedFunction:
         pass
 
+    def _attach_execution_options(self, func: UserDefinedFunction) -> UserDefinedFunction:
+        """
+        Attaches the options which take effect in the Python worker, e.g. the batch mode, to the
+        function which will be serialized. The function defined by users will be copied before
+        the options are attached to avoid modifying it.
+        """
+        return func
+
     def _create_judf(self, serialized_func, j_input_types, j_function_kind):
         pass
 
@@ -404,16 +580,40 @@ class UserDefinedScalarFunctionWrapper(UserDefinedFunctionWrapper):
     Wrapper for Python user-defined scalar function.
     """
 
-    def __init__(self, func, input_types, result_type, func_type, deterministic, name):
+    def __init__(self, func, input_types, result_type, func_type, deterministic, name,
+                 batch_mode=None, cache_size=None):
         super(UserDefinedScalarFunctionWrapper, self).__init__(
             func, input_types, func_type, deterministic, name)
 
         if not isinstance(result_type, DataType):
             raise TypeError(
                 "Invalid returnType: returnType should be DataType but is {}".format(result_type))
+        if cache_size is not None:
+            if not isinstance(cache_size, int) or cache_size <= 0:
+                raise ValueError(
+                    "Invalid cache_size: cache_size should be a positive integer but is {}"
+                    .format(cache_size))
+            if not self._deterministic:
+                raise ValueError("The results of a non-deterministic function can't be cached.")
+            if batch_mode is not None:
+                raise ValueError("The cache_size is not supported for batch mode functions.")
         self._result_type = result_type
+        self._batch_mode = batch_mode
+        self._cache_size = cache_size
         self._judf_placeholder = None
 
+    def _attach_execution_options(self, func: UserDefinedFunction) -> UserDefinedFunction:
+        if self._batch_mode is None and self._cache_size is None:
+            return func
+        if func is self._func:
+            func = copy.copy(func)
+        if self._batch_mode is not None:
+            func._batch_mode = self._batch_mode
+        if self._cache_size is not None:
+            func._cache_size = self._cache_size
+            func._cache_name = self._name
+        return func
+
     def _create_judf(self, serialized_func, j_input_types, j_function_kind):
         gateway = get_gateway()
         j_result_type = _to_java_type(self._result_type)
@@ -431,7 +631,7 @@ class UserDefinedScalarFunctionWrapper(UserDefinedFunctionWrapper):
         return j_scalar_function
 
     def _create_delegate_function(self) -> UserDefinedFunction:
-        return DelegatingScalarFunction(self._func)
+        return DelegatingScalarFunction(self._func, self._deterministic)
 
 
 class UserDefinedTableFunctionWrapper(UserDefinedFunctionWrapper):
@@ -439,9 +639,17 @@ class UserDefinedTableFunctionWrapper(UserDefinedFunctionWrapper):
     Wrapper for Python user-defined table function.
     """
 
-    def __init__(self, func, input_types, result_types, deterministic=None, name=None):
+    def __init__(self, func, input_types, result_types, deterministic=None, name=None,
+                 func_type="general"):
         super(UserDefinedTableFunctionWrapper, self).__init__(
-            func, input_types, "general", deterministic, name)
+            func, input_types, func_type, deterministic, name)
+
+        if func_type == "pandas" and self._takes_no_arguments():
+            # the input rows of a batch are passed as the columns of the arguments, so the
+            # number of the rows is unknown without any argument
+            raise ValueError(
+                "The Pandas UDTF '%s' takes no arguments, which is not supported. The Pandas "
+                "UDTFs must take at least one argument." % self._name)
 
         from pyflink.table.types import RowType
         if not isinstance(result_types, collections.abc.Iterable) \
@@ -477,6 +685,16 @@ class UserDefinedTableFunctionWrapper(UserDefinedFunctionWrapper):
     def _create_delegate_function(self) -> UserDefinedFunction:
         return DelegationTableFunction(self._func)
 
+    def _takes_no_arguments(self):
+        if self._input_types is not None:
+            return len(self._input_types) == 0
+        func = self._func.eval if isinstance(self._func, TableFunction) else self._func
+        try:
+            return len(inspect.signature(func).parameters) == 0
+        except (TypeError, ValueError):
+            # the signature of some callables, e.g. the builtins, could not be inspected
+            return False
+
 
 class UserDefinedAggregateFunctionWrapper(UserDefinedFunctionWrapper):
     """
@@ -487,7 +705,7 @@ class UserDefinedAggregateFunctionWrapper(UserDefinedFunctionWrapper):
         super(UserDefinedAggregateFunctionWrapper, self).__init__(
             func, input_types, func_type, deterministic, name)
 
-        if accumulator_type is None and func_type == "general":
+        if accumulator_type is None and isinstance(func, ImperativeAggregateFunction):
             accumulator_type = func.get_accumulator_type()
         if result_type is None:
             result_type = func.get_result_type()
@@ -507,8 +725,20 @@ class UserDefinedAggregateFunctionWrapper(UserDefinedFunctionWrapper):
         self._accumulator_type = accumulator_type
         self._is_table_aggregate = is_table_aggregate
 
+    def _attach_execution_options(self, func: UserDefinedFunction) -> UserDefinedFunction:
+        if self._func_type != "pandas":
+            return func
+        if func is self._func:
+            func = copy.copy(func)
+        # the operations which don't receive the input in Arrow format, e.g. the streaming group
+        # aggregation, need to know that the function should be called with pandas.Series
+        func._func_type = self._func_type
+        return func
+
     def _create_judf(self, serialized_func, j_input_types, j_function_kind):
-        if self._func_type == "pandas":
+        if self._func_type == "pandas" and self._accumulator_type is None:
+            # the accumulators of the Pandas UDAFs are only accessed in the Python worker, where
+            # they are pickled, so the declared accumulator type is only used in the planner
             from pyflink.table.types import DataTypes
             self._accumulator_type = DataTypes.ARRAY(self._result_type)
 
@@ -521,23 +751,46 @@ class UserDefinedAggregateFunctionWrapper(UserDefinedFunctionWrapper):
 
         gateway = get_gateway()
         if self._is_table_aggregate:
-            PythonAggregateFunction = gateway.jvm \
+            PythonTableAggregateFunction = gateway.jvm \
                 .org.apache.flink.table.functions.python.PythonTableAggregateFunction
+            j_aggregate_function = PythonTableAggregateFunction(
+                self._name,
+                bytearray(serialized_func),
+                j_input_types,
+                j_result_type,
+                j_accumulator_type,
+                j_function_kind,
+                self._deterministic,
+                self._takes_row_as_input,
+                _get_python_env())
         else:
             PythonAggregateFunction = gateway.jvm \
                 .org.apache.flink.table.functions.python.PythonAggregateFunction
-        j_aggregate_function = PythonAggregateFunction(
-            self._name,
-            bytearray(serialized_func),
-            j_input_types,
-            j_result_type,
-            j_accumulator_type,
-            j_function_kind,
-            self._deterministic,
-            self._takes_row_as_input,
-            _get_python_env())
+            j_aggregate_function = PythonAggregateFunction(
+                self._name,
+                bytearray(serialized_func),
+                j_input_types,
+                j_result_type,
+                j_accumulator_type,
+                j_function_kind,
+                self._deterministic,
+                self._takes_row_as_input,
+                self._supports_merge(),
+                self._supports_incremental_aggregation(),
+                _get_python_env())
         return j_aggregate_function
 
+    def _supports_merge(self) -> bool:
+        # the planner only splits the aggregation into a local and a global phase for the
+        # functions which override merge
+        return self._func_type == "general" and \
+            isinstance(self._func, ImperativeAggregateFunction) and \
+            type(self._func).merge is not ImperativeAggregateFunction.merge
+
+    def _supports_incremental_aggregation(self) -> bool:
+        # the Pandas UDAFs defined with a Python function could only aggregate all the input at once
+        return self._func_type == "general" or isinstance(self._func, AggregateFunction)
+
     def _create_delegate_function(self) -> UserDefinedFunction:
         assert self._func_type == 'pandas'
         return DelegatingPandasAggregateFunction(self._func)
@@ -550,13 +803,15 @@ def _get_python_env():
     return gateway.jvm.org.apache.flink.table.functions.python.PythonEnv(exec_type)
 
 
-def _create_udf(f, input_types, result_type, func_type, deterministic, name):
+def _create_udf(f, input_types, result_type, func_type, deterministic, name, batch_mode=None,
+                cache_size=None):
     return UserDefinedScalarFunctionWrapper(
-        f, input_types, result_type, func_type, deterministic, name)
+        f, input_types, result_type, func_type, deterministic, name, batch_mode, cache_size)
 
 
-def _create_udtf(f, input_types, result_types, deterministic, name):
-    return UserDefinedTableFunctionWrapper(f, input_types, result_types, deterministic, name)
+def _create_udtf(f, input_types, result_types, deterministic, name, func_type="general"):
+    return UserDefinedTableFunctionWrapper(
+        f, input_types, result_types, deterministic, name, func_type)
 
 
 def _create_udaf(f, input_types, result_type, accumulator_type, func_type, deterministic, name):
@@ -572,7 +827,8 @@ def _create_udtaf(f, input_types, result_type, accumulator_type, func_type, dete
 def udf(f: Union[Callable, ScalarFunction, Type] = None,
         input_types: Union[List[DataType], DataType] = None, result_type: DataType = None,
         deterministic: bool = None, name: str = None, func_type: str = "general",
-        udf_type: str = None) -> Union[UserDefinedScalarFunctionWrapper, Callable]:
+        udf_type: str = None, batch_mode: str = None, cache_size: int = None) \
+        -> Union[UserDefinedScalarFunctionWrapper, Callable]:
     """
     Helper method for creating a user-defined function.
 
@@ -591,6 +847,12 @@ def udf(f: Union[Callable, ScalarFunction, Type] = None,
             ...         return i - 1
             >>> subtract_one = udf(SubtractOne(), DataTypes.BIGINT(), DataTypes.BIGINT())
 
+            >>> # The function is called once per batch of rows with each argument as a list.
+            >>> @udf(result_type=DataTypes.DOUBLE(), batch_mode='auto')
+            ... def log1p(values):
+            ...     import numpy as np
+            ...     return np.log1p(values)
+
     :param f: lambda function or user-defined function.
     :param input_types: optional, the input data types.
     :param result_type: the result data type.
@@ -602,6 +864,17 @@ def udf(f: Union[Callable, ScalarFunction, Type] = None,
                      (default: general)
     :param udf_type: the type of the python function, available value: general, pandas,
                     (default: general)
+    :param batch_mode: optional, only supported for general python functions, available value:
+                       auto. If set, the rows of a bundle are collected and the function is
+                       called once per batch. Each argument is passed as a list holding the
+                       values of all the rows of the batch and the function should return a
+                       list-like result, e.g. list, numpy.ndarray or pandas.Series, of the same
+                       length. (default: None)
+    :param cache_size: optional, only supported for deterministic general python functions. If
+                       set, the results of the function are cached in a bounded LRU cache of the
+                       given size in each Python worker and looked up by the input arguments
+                       before calling the function. It's useful for functions which are called
+                       repeatedly with the same arguments, e.g. user agent parsing. (default: None)
     :return: UserDefinedScalarFunctionWrapper or function.
 
     .. versionadded:: 1.10.0
@@ -615,19 +888,32 @@ def udf(f: Union[Callable, ScalarFunction, Type] = None,
         raise ValueError("The func_type must be one of 'general, pandas', got %s."
                          % func_type)
 
+    if batch_mode is not None:
+        if batch_mode != 'auto':
+            raise ValueError("The batch_mode must be 'auto', got %s." % batch_mode)
+        if func_type != 'general':
+            raise ValueError("The batch_mode is only supported for general python functions, "
+                             "got func_type %s." % func_type)
+
+    if cache_size is not None and func_type != 'general':
+        raise ValueError("The cache_size is only supported for general python functions, "
+                         "got func_type %s." % func_type)
+
     # decorator
     if f is None:
         return functools.partial(_create_udf, input_types=input_types, result_type=result_type,
                                  func_type=func_type, deterministic=deterministic,
-                                 name=name)
+                                 name=name, batch_mode=batch_mode, cache_size=cache_size)
     else:
-        return _create_udf(f, input_types, result_type, func_type, deterministic, name)
+        return _create_udf(f, input_types, result_type, func_type, deterministic, name,
+                           batch_mode, cache_size)
 
 
 def udtf(f: Union[Callable, TableFunction, Type] = None,
          input_types: Union[List[DataType], DataType] = None,
          result_types: Union[List[DataType], DataType] = None, deterministic: bool = None,
-         name: str = None) -> Union[UserDefinedTableFunctionWrapper, Callable]:
+         name: str = None, func_type: str = "general") \
+        -> Union[UserDefinedTableFunctionWrapper, Callable]:
     """
     Helper method for creating a user-defined table function.
 
@@ -645,6 +931,12 @@ def udtf(f: Union[Callable, TableFunction, Type] = None,
             ...         return range(i)
             >>> multi_emit = udtf(MultiEmit(), DataTypes.BIGINT(), DataTypes.BIGINT())
 
+            >>> # The function is called once per batch of rows with each argument as a
+            >>> # pandas.Series and the index of the result refers to the input rows.
+            >>> @udtf(result_types=DataTypes.STRING(), func_type="pandas")
+            ... def split(s):
+            ...     return s.str.split(",").explode()
+
     :param f: user-defined table function.
     :param input_types: optional, the input data types.
     :param result_types: the result data types.
@@ -652,16 +944,28 @@ def udtf(f: Union[Callable, TableFunction, Type] = None,
     :param deterministic: the determinism of the function's results. True if and only if a call to
                           this function is guaranteed to always return the same result given the
                           same parameters. (default True)
+    :param func_type: the type of the python function, available value: general, pandas. A pandas
+                      table function is called once per batch of rows with each argument as a
+                      pandas.Series and should return a pandas.DataFrame, or a pandas.Series if
+                      there is only one result column, holding the result rows of the whole
+                      batch. The index of the result holds for each result row the position of
+                      the input row within the batch it belongs to, as produced by e.g.
+                      pandas.Series.explode. A pandas table function must take at least one
+                      argument. (default: general)
     :return: UserDefinedTableFunctionWrapper or function.
 
     .. versionadded:: 1.11.0
     """
+    if func_type not in ('general', 'pandas'):
+        raise ValueError("The func_type must be one of 'general, pandas', got %s."
+                         % func_type)
+
     # decorator
     if f is None:
         return functools.partial(_create_udtf, input_types=input_types, result_types=result_types,
-                                 deterministic=deterministic, name=name)
+                                 deterministic=deterministic, name=name, func_type=func_type)
     else:
-        return _create_udtf(f, input_types, result_types, deterministic, name)
+        return _create_udtf(f, input_types, result_types, deterministic, name, func_type)
 
 
 def udaf(f: Union[Callable, AggregateFunction, Type] = None,
@@ -0,0 +1,68 @@
+################################################################################
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+import importlib
+import sys
+from typing import Any, Dict
+
+
+def lazy_import_attributes(package_name: str,
+                           package_globals: Dict[str, Any],
+                           attributes: Dict[str, str]):
+    """
+    Defers importing the public attributes of a package until they are accessed for the first
+    time, using a module level ``__getattr__`` (see PEP 562). This keeps ``import pyflink.table``
+    and ``import pyflink.datastream`` cheap for the Python workers, which only need a small part
+    of the API.
+
+    Submodules of the package which have not been imported yet are also imported on first access,
+    so that ``pyflink.table.types`` keeps working after a bare ``import pyflink.table``.
+
+    Module level ``__getattr__`` is only supported since Python 3.7, the attributes are imported
+    eagerly for older versions.
+
+    :param package_name: The name of the package, i.e. ``__name__`` of its ``__init__`` module.
+    :param package_globals: The ``globals()`` of the ``__init__`` module of the package.
+    :param attributes: The attribute names mapped to the modules they are defined in.
+    """
+    if sys.version_info < (3, 7):
+        for name, module_name in attributes.items():
+            package_globals[name] = getattr(importlib.import_module(module_name), name)
+        return
+
+    def __getattr__(name):
+        if name in attributes:
+            value = getattr(importlib.import_module(attributes[name]), name)
+        elif name.startswith('_'):
+            raise AttributeError("module '%s' has no attribute '%s'" % (package_name, name))
+        else:
+            submodule_name = '%s.%s' % (package_name, name)
+            try:
+                value = importlib.import_module(submodule_name)
+            except ModuleNotFoundError as e:
+                if e.name != submodule_name:
+                    raise
+                raise AttributeError(
+                    "module '%s' has no attribute '%s'" % (package_name, name)) from None
+        package_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(package_globals) | set(attributes))
+
+    package_globals['__getattr__'] = __getattr__
+    package_globals['__dir__'] = __dir__
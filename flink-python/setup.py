@@ -274,6 +274,7 @@ try:
                 'pyflink.fn_execution.beam',
                 'pyflink.fn_execution.datastream',
                 'pyflink.fn_execution.datastream.window',
+                'pyflink.fn_execution.embedded',
                 'pyflink.fn_execution.table',
                 'pyflink.fn_execution.utils',
                 'pyflink.metrics',
@@ -41,6 +41,9 @@ public class PythonConfig implements Serializable {
     /** Max duration of a bundle. */
     private final long maxBundleTimeMills;
 
+    /** The target latency of a bundle which the bundle size is adapted to. */
+    @Nullable private final Long bundleTargetLatencyMills;
+
     /** Max number of elements to include in an arrow batch. */
     private final int maxArrowBatchSize;
 
@@ -92,10 +95,15 @@ public class PythonConfig implements Serializable {
     /** Execution Mode. */
     private final String executionMode;
 
+    /** The directory of the node-local cache of the Python environment. */
+    @Nullable private final String environmentCacheDir;
+
     public PythonConfig(Configuration config) {
         this.config = config;
         maxBundleSize = config.get(PythonOptions.MAX_BUNDLE_SIZE);
         maxBundleTimeMills = config.get(PythonOptions.MAX_BUNDLE_TIME_MILLS);
+        bundleTargetLatencyMills =
+                config.getOptional(PythonOptions.BUNDLE_TARGET_LATENCY_MILLS).orElse(null);
         maxArrowBatchSize = config.get(PythonOptions.MAX_ARROW_BATCH_SIZE);
         pythonFilesInfo =
                 config.getOptional(PythonDependencyUtils.PYTHON_FILES).orElse(new HashMap<>());
@@ -114,6 +122,7 @@ public class PythonConfig implements Serializable {
         isUsingManagedMemory = config.getBoolean(PythonOptions.USE_MANAGED_MEMORY);
         profileEnabled = config.getBoolean(PythonOptions.PYTHON_PROFILE_ENABLED);
         executionMode = config.getString(PythonOptions.PYTHON_EXECUTION_MODE);
+        environmentCacheDir = config.getString(PythonOptions.PYTHON_ENVIRONMENT_CACHE_DIR);
     }
 
     public int getMaxBundleSize() {
@@ -124,6 +133,10 @@ public class PythonConfig implements Serializable {
         return maxBundleTimeMills;
     }
 
+    public Optional<Long> getBundleTargetLatencyMills() {
+        return Optional.ofNullable(bundleTargetLatencyMills);
+    }
+
     public int getMaxArrowBatchSize() {
         return maxArrowBatchSize;
     }
@@ -152,6 +165,10 @@ public class PythonConfig implements Serializable {
         return executionMode;
     }
 
+    public Optional<String> getEnvironmentCacheDir() {
+        return Optional.ofNullable(environmentCacheDir);
+    }
+
     public boolean isMetricEnabled() {
         return metricEnabled;
     }
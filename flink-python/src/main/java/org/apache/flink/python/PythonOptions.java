@@ -50,6 +50,27 @@ public class PythonOptions {
                                     + "Python user-defined function execution. The timeout defines how long the elements of a bundle will be "
                                     + "buffered before being processed. Lower timeouts lead to lower tail latencies, but may affect throughput.");
 
+    /** The target latency of a bundle which the bundle size is adapted to (in milliseconds). */
+    @Experimental
+    public static final ConfigOption<Long> BUNDLE_TARGET_LATENCY_MILLS =
+            ConfigOptions.key("python.fn-execution.bundle.target-latency")
+                    .longType()
+                    .noDefaultValue()
+                    .withDescription(
+                            "The target latency (in milliseconds) of a bundle of the Python "
+                                    + "operators in process mode, i.e. the time from the end of "
+                                    + "the previous bundle until the results of a bundle have "
+                                    + "been emitted. If it is specified, the maximum number of "
+                                    + "elements of a bundle is adapted after each bundle to the "
+                                    + "observed latency of the bundles, between 1 and the value "
+                                    + "of 'python.fn-execution.bundle.size'. The bundle size is "
+                                    + "also shrunk when finishing a bundle, e.g. committing its "
+                                    + "state for a checkpoint barrier, takes longer than the "
+                                    + "target latency. The chosen bundle size and the latency of "
+                                    + "the last bundle are reported as metrics. Note that this is "
+                                    + "an experimental flag and might not be available in future "
+                                    + "releases.");
+
     /** The maximum number of elements to include in an arrow batch. */
     public static final ConfigOption<Integer> MAX_ARROW_BATCH_SIZE =
             ConfigOptions.key("python.fn-execution.arrow.batch.size")
@@ -224,6 +245,98 @@ public class PythonOptions {
                                     + "and might not be available "
                                     + "in future releases.");
 
+    /**
+     * The maximum number of elements sent to Python UDF worker per request when iterating a Python
+     * ListState.
+     */
+    @Experimental
+    public static final ConfigOption<Integer> LIST_STATE_ITERATE_RESPONSE_BATCH_SIZE =
+            ConfigOptions.key("python.list-state.iterate-response-batch-size")
+                    .intType()
+                    .defaultValue(1000)
+                    .withDescription(
+                            "The maximum number of the ListState elements sent to Python UDF worker "
+                                    + "in each batch when iterating a Python ListState. Note that this is an experimental flag "
+                                    + "and might not be available "
+                                    + "in future releases.");
+
+    /** Whether the Pandas UDAFs of the stream group window aggregations aggregate incrementally. */
+    @Experimental
+    public static final ConfigOption<Boolean> PANDAS_INCREMENTAL_WINDOW_AGGREGATE_ENABLED =
+            ConfigOptions.key("python.fn-execution.pandas.incremental-window-aggregate.enabled")
+                    .booleanType()
+                    .defaultValue(false)
+                    .withDescription(
+                            "Whether the Pandas UDAFs of the group window aggregations in "
+                                    + "streaming mode aggregate the rows of the windows "
+                                    + "incrementally. If enabled, the rows buffered for a window "
+                                    + "are aggregated into the accumulators of the Pandas UDAFs "
+                                    + "whenever a bundle is finished instead of all at once when "
+                                    + "the window fires, which bounds the rows kept in state and "
+                                    + "the work done at the firing time. The aggregations with "
+                                    + "Pandas UDAFs defined with a Python function instead of an "
+                                    + "AggregateFunction are still aggregated when the windows "
+                                    + "fire. The accumulate method of the AggregateFunctions must "
+                                    + "then be callable multiple times with consecutive parts of "
+                                    + "the rows of a window and their accumulators must be "
+                                    + "picklable. Only insert-only input is supported. Note that "
+                                    + "this is an experimental flag and might not be available in "
+                                    + "future releases.");
+
+    /** The number of processes which process the batches of a stateless Python operator. */
+    @Experimental
+    public static final ConfigOption<Integer> PROCESS_POOL_SIZE =
+            ConfigOptions.key("python.fn-execution.process-pool.size")
+                    .intType()
+                    .defaultValue(1)
+                    .withDescription(
+                            "The number of processes which process the batches of the Python "
+                                    + "scalar functions and the stateless Python DataStream "
+                                    + "functions of a single input in process mode. If it is "
+                                    + "greater than 1, the Python worker forks the remaining "
+                                    + "processes after the functions have been opened and splits "
+                                    + "each batch into chunks which are processed by them in "
+                                    + "parallel, which makes CPU-bound functions use multiple "
+                                    + "cores without increasing the parallelism. The functions "
+                                    + "which obtain operator state in their open method are "
+                                    + "still processed in a single process, the other functions "
+                                    + "must not access state or rely on side effects in the "
+                                    + "Python worker, e.g. the metrics of the child processes "
+                                    + "are not reported. Note that this is an experimental flag "
+                                    + "and might not be available in future releases.");
+
+    /** The maximum number of input elements decoded ahead by the Python worker. */
+    @Experimental
+    public static final ConfigOption<Integer> DECODE_AHEAD_SIZE =
+            ConfigOptions.key("python.fn-execution.decode-ahead.size")
+                    .intType()
+                    .defaultValue(0)
+                    .withDescription(
+                            "The maximum number of input elements which the Python worker decodes "
+                                    + "ahead of the element being processed in process mode. If "
+                                    + "it is greater than 0, the input elements received from "
+                                    + "the Java operator are decoded on a separate thread into a "
+                                    + "bounded queue, which overlaps the decoding with the "
+                                    + "Python functions while they release the GIL, e.g. while "
+                                    + "waiting for I/O. The average occupancy of the queue is "
+                                    + "reported as a metric if the metrics are enabled. Note that "
+                                    + "this is an experimental flag and might not be available in "
+                                    + "future releases.");
+
+    /** The directory of the node-local cache of the Python environment. */
+    public static final ConfigOption<String> PYTHON_ENVIRONMENT_CACHE_DIR =
+            ConfigOptions.key("python.environment.cache-dir")
+                    .stringType()
+                    .noDefaultValue()
+                    .withDescription(
+                            "The directory of the node-local cache of the Python environment. If it is "
+                                    + "specified, the archives specified via 'python.archives' are "
+                                    + "extracted and the requirements specified via 'python.requirements' "
+                                    + "are installed only once into this directory, keyed by the hash of "
+                                    + "their content. They are then shared by all the Python workers on "
+                                    + "the same node, across job restarts and across jobs. It should "
+                                    + "be a local directory which is not cleaned up when the jobs finish.");
+
     /** Specify the python runtime execution mode. */
     @Experimental
     public static final ConfigOption<String> PYTHON_EXECUTION_MODE =
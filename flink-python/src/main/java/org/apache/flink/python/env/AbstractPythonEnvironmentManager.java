@@ -94,6 +94,10 @@ public abstract class AbstractPythonEnvironmentManager implements PythonEnvironm
 
     @VisibleForTesting public static final String PYTHON_ARCHIVES_DIR = "python-archives";
 
+    @VisibleForTesting public static final String CACHED_ARCHIVES_CATEGORY = "archives";
+
+    @VisibleForTesting public static final String CACHED_REQUIREMENTS_CATEGORY = "requirements";
+
     @VisibleForTesting
     public static final String PYFLINK_GATEWAY_DISABLED = "PYFLINK_GATEWAY_DISABLED";
 
@@ -207,17 +211,37 @@ public abstract class AbstractPythonEnvironmentManager implements PythonEnvironm
 
     private void installRequirements(String baseDirectory, Map<String, String> env)
             throws IOException {
-        // Directory for storing the installation result of the requirements file.
-        String requirementsDirectory =
-                String.join(File.separator, baseDirectory, PYTHON_REQUIREMENTS_DIR);
         if (dependencyInfo.getRequirementsFilePath().isPresent()) {
-            LOG.info("Trying to pip install the Python requirements...");
-            PythonEnvironmentManagerUtils.pipInstallRequirements(
-                    dependencyInfo.getRequirementsFilePath().get(),
-                    dependencyInfo.getRequirementsCacheDir().orElse(null),
-                    requirementsDirectory,
-                    dependencyInfo.getPythonExec(),
-                    env);
+            // Directory for storing the installation result of the requirements file.
+            String requirementsDirectory = env.get(PYTHON_REQUIREMENTS_INSTALL_DIR);
+            if (dependencyInfo.getEnvironmentCacheDir().isPresent()) {
+                // the requirements are installed only once per node, the environment variables
+                // pointing to the installation directory are added below for both cache hits and
+                // cache misses
+                PythonEnvironmentCache.getOrCreate(
+                        dependencyInfo.getEnvironmentCacheDir().get(),
+                        CACHED_REQUIREMENTS_CATEGORY,
+                        new File(requirementsDirectory).getName(),
+                        installDir -> {
+                            LOG.info("Trying to pip install the Python requirements...");
+                            PythonEnvironmentManagerUtils.pipInstallRequirements(
+                                    dependencyInfo.getRequirementsFilePath().get(),
+                                    dependencyInfo.getRequirementsCacheDir().orElse(null),
+                                    installDir,
+                                    dependencyInfo.getPythonExec(),
+                                    new HashMap<>(env));
+                        });
+                PythonEnvironmentManagerUtils.addRequirementsToEnvironment(
+                        requirementsDirectory, dependencyInfo.getPythonExec(), env);
+            } else {
+                LOG.info("Trying to pip install the Python requirements...");
+                PythonEnvironmentManagerUtils.pipInstallRequirements(
+                        dependencyInfo.getRequirementsFilePath().get(),
+                        dependencyInfo.getRequirementsCacheDir().orElse(null),
+                        requirementsDirectory,
+                        dependencyInfo.getPythonExec(),
+                        env);
+            }
         }
     }
 
@@ -299,11 +323,23 @@ public abstract class AbstractPythonEnvironmentManager implements PythonEnvironm
 
     private void constructRequirementsDirectory(Map<String, String> env, String baseDirectory)
             throws IOException {
-        String requirementsDirectory =
-                String.join(File.separator, baseDirectory, PYTHON_REQUIREMENTS_DIR);
         if (dependencyInfo.getRequirementsFilePath().isPresent()) {
+            String requirementsDirectory;
+            if (dependencyInfo.getEnvironmentCacheDir().isPresent()) {
+                // the directory is created when the requirements are installed into the cache
+                requirementsDirectory =
+                        String.join(
+                                File.separator,
+                                dependencyInfo.getEnvironmentCacheDir().get(),
+                                CACHED_REQUIREMENTS_CATEGORY,
+                                computeRequirementsKey());
+            } else {
+                requirementsDirectory =
+                        String.join(File.separator, baseDirectory, PYTHON_REQUIREMENTS_DIR);
+            }
             File requirementsDirectoryFile = new File(requirementsDirectory);
-            if (!requirementsDirectoryFile.mkdirs()) {
+            if (!dependencyInfo.getEnvironmentCacheDir().isPresent()
+                    && !requirementsDirectoryFile.mkdirs()) {
                 throw new IOException(
                         String.format(
                                 "Creating the requirements target directory: %s failed!",
@@ -355,11 +391,71 @@ public abstract class AbstractPythonEnvironmentManager implements PythonEnvironm
 
                 String targetDirPath =
                         String.join(File.separator, archivesDirectory, targetDirName);
-                CompressionUtils.extractFile(srcFilePath, targetDirPath, originalFileName);
+                if (dependencyInfo.getEnvironmentCacheDir().isPresent()) {
+                    linkCachedArchive(srcFilePath, targetDirPath, originalFileName);
+                } else {
+                    CompressionUtils.extractFile(srcFilePath, targetDirPath, originalFileName);
+                }
             }
         }
     }
 
+    /**
+     * Extracts the archive into the node-local environment cache if it has not been extracted yet,
+     * and links the extracted directory to the target directory.
+     */
+    private void linkCachedArchive(
+            String srcFilePath, String targetDirPath, String originalFileName) throws IOException {
+        String cachedDirPath =
+                PythonEnvironmentCache.getOrCreate(
+                        dependencyInfo.getEnvironmentCacheDir().get(),
+                        CACHED_ARCHIVES_CATEGORY,
+                        PythonEnvironmentCache.computeKey(srcFilePath, originalFileName),
+                        entryDir ->
+                                CompressionUtils.extractFile(
+                                        srcFilePath, entryDir, originalFileName));
+
+        Path target = FileSystems.getDefault().getPath(targetDirPath);
+        if (!target.getParent().toFile().exists() && !target.getParent().toFile().mkdirs()) {
+            throw new IOException(
+                    String.format(
+                            "Could not create the directory: %s !", target.getParent().toString()));
+        }
+        Path src = FileSystems.getDefault().getPath(cachedDirPath);
+        try {
+            Files.createSymbolicLink(target, src);
+        } catch (IOException e) {
+            LOG.warn(
+                    String.format(
+                            "Could not create the symbolic link of: %s, the link path is %s, fallback to extract.",
+                            src, target),
+                    e);
+            CompressionUtils.extractFile(srcFilePath, targetDirPath, originalFileName);
+        }
+    }
+
+    /**
+     * Computes the key of the requirements installation in the node-local environment cache. The
+     * python interpreter may be provided by one of the archives, in which case their content is
+     * part of the key as well.
+     */
+    private String computeRequirementsKey() throws IOException {
+        List<String> parts = new ArrayList<>();
+        parts.add(dependencyInfo.getRequirementsFilePath().get());
+        parts.add(dependencyInfo.getRequirementsCacheDir().orElse(""));
+        parts.add(dependencyInfo.getPythonExec());
+        if (!new File(dependencyInfo.getPythonExec()).isAbsolute()) {
+            dependencyInfo.getArchives().entrySet().stream()
+                    .sorted(Map.Entry.comparingByValue())
+                    .forEach(
+                            entry -> {
+                                parts.add(entry.getValue());
+                                parts.add(entry.getKey());
+                            });
+        }
+        return PythonEnvironmentCache.computeKey(parts.toArray(new String[0]));
+    }
+
     private static void appendToPythonPath(
             Map<String, String> env, List<String> pythonDependencies) {
         if (pythonDependencies.isEmpty()) {
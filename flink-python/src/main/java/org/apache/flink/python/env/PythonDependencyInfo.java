@@ -73,6 +73,12 @@ public final class PythonDependencyInfo {
     /** Execution Mode. */
     @Nonnull private final String executionMode;
 
+    /**
+     * The directory of the node-local cache of the Python environment specified via
+     * "python.environment.cache-dir".
+     */
+    @Nullable private final String environmentCacheDir;
+
     public PythonDependencyInfo(
             @Nonnull Map<String, String> pythonFiles,
             @Nullable String requirementsFilePath,
@@ -95,12 +101,31 @@ public final class PythonDependencyInfo {
             @Nonnull Map<String, String> archives,
             @Nonnull String pythonExec,
             @Nonnull String executionMode) {
+        this(
+                pythonFiles,
+                requirementsFilePath,
+                requirementsCacheDir,
+                archives,
+                pythonExec,
+                executionMode,
+                null);
+    }
+
+    public PythonDependencyInfo(
+            @Nonnull Map<String, String> pythonFiles,
+            @Nullable String requirementsFilePath,
+            @Nullable String requirementsCacheDir,
+            @Nonnull Map<String, String> archives,
+            @Nonnull String pythonExec,
+            @Nonnull String executionMode,
+            @Nullable String environmentCacheDir) {
         this.pythonFiles = Objects.requireNonNull(pythonFiles);
         this.requirementsFilePath = requirementsFilePath;
         this.requirementsCacheDir = requirementsCacheDir;
         this.pythonExec = Objects.requireNonNull(pythonExec);
         this.archives = Objects.requireNonNull(archives);
         this.executionMode = Objects.requireNonNull(executionMode);
+        this.environmentCacheDir = environmentCacheDir;
     }
 
     public Map<String, String> getPythonFiles() {
@@ -127,6 +152,10 @@ public final class PythonDependencyInfo {
         return executionMode;
     }
 
+    public Optional<String> getEnvironmentCacheDir() {
+        return Optional.ofNullable(environmentCacheDir);
+    }
+
     /**
      * Creates PythonDependencyInfo from GlobalJobParameters and DistributedCache.
      *
@@ -174,6 +203,7 @@ public final class PythonDependencyInfo {
                 requirementsCacheDir,
                 archives,
                 pythonExec,
-                pythonConfig.getExecutionMode());
+                pythonConfig.getExecutionMode(),
+                pythonConfig.getEnvironmentCacheDir().orElse(null));
     }
 }
@@ -0,0 +1,177 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.python.env;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.util.FileUtils;
+import org.apache.flink.util.StringUtils;
+import org.apache.flink.util.function.ThrowingConsumer;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.channels.FileChannel;
+import java.nio.channels.FileLock;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.List;
+import java.util.concurrent.locks.ReentrantLock;
+import java.util.stream.Collectors;
+import java.util.stream.Stream;
+
+/**
+ * A node-local, content-addressed cache of the Python environment. Each entry is a directory
+ * identified by the hash of the content it is derived from (e.g. an archive or a requirements
+ * file), so that it is only prepared once per node and shared by all the Python workers, across
+ * job restarts and across jobs.
+ *
+ * <p>An entry is prepared while holding a file lock, which makes the cache safe to use from
+ * multiple processes on the same node. An entry is only visible after it has been prepared
+ * successfully, which is recorded via a marker file.
+ */
+@Internal
+public final class PythonEnvironmentCache {
+
+    private static final Logger LOG = LoggerFactory.getLogger(PythonEnvironmentCache.class);
+
+    private static final String LOCK_FILE_SUFFIX = ".lock";
+
+    private static final String COMPLETED_FILE_SUFFIX = ".completed";
+
+    /** File locks are held per JVM, so the threads of the same process are serialized here. */
+    private static final ReentrantLock lock = new ReentrantLock();
+
+    private PythonEnvironmentCache() {}
+
+    /**
+     * Returns the path of the cache entry identified by the given key, preparing it with the given
+     * initializer if it does not exist yet.
+     *
+     * @param cacheDir The root directory of the cache.
+     * @param category The category of the entry, e.g. "archives" or "requirements".
+     * @param key The content hash identifying the entry.
+     * @param initializer Prepares the entry in the directory passed to it.
+     * @return The absolute path of the prepared entry.
+     */
+    public static String getOrCreate(
+            String cacheDir,
+            String category,
+            String key,
+            ThrowingConsumer<String, IOException> initializer)
+            throws IOException {
+        File categoryDir = new File(cacheDir, category);
+        if (!categoryDir.isDirectory() && !categoryDir.mkdirs() && !categoryDir.isDirectory()) {
+            throw new IOException(
+                    String.format("Could not create the cache directory: %s !", categoryDir));
+        }
+
+        File entryDir = new File(categoryDir, key);
+        File completedFile = new File(categoryDir, key + COMPLETED_FILE_SUFFIX);
+        if (completedFile.exists()) {
+            return entryDir.getAbsolutePath();
+        }
+
+        lock.lock();
+        try (FileChannel channel =
+                        FileChannel.open(
+                                new File(categoryDir, key + LOCK_FILE_SUFFIX).toPath(),
+                                StandardOpenOption.CREATE,
+                                StandardOpenOption.WRITE);
+                FileLock ignored = channel.lock()) {
+            if (!completedFile.exists()) {
+                // clean up the leftover of a previous attempt which failed in the middle
+                if (entryDir.exists()) {
+                    FileUtils.deleteDirectory(entryDir);
+                }
+                LOG.info("Preparing the Python environment cache entry {}.", entryDir);
+                initializer.accept(entryDir.getAbsolutePath());
+                if (!completedFile.createNewFile() && !completedFile.exists()) {
+                    throw new IOException(
+                            String.format(
+                                    "Could not create the marker file: %s !", completedFile));
+                }
+            }
+        } finally {
+            lock.unlock();
+        }
+        return entryDir.getAbsolutePath();
+    }
+
+    /**
+     * Computes the key of a cache entry from the given parts. A part which is the path of an
+     * existing file or directory contributes its content, any other part contributes itself.
+     *
+     * @param parts The strings and paths the cache entry is derived from.
+     * @return The hex encoded SHA-256 hash of the given parts.
+     */
+    public static String computeKey(String... parts) throws IOException {
+        MessageDigest digest;
+        try {
+            digest = MessageDigest.getInstance("SHA-256");
+        } catch (NoSuchAlgorithmException e) {
+            throw new IOException(e);
+        }
+
+        byte[] buffer = new byte[64 * 1024];
+        for (String part : parts) {
+            File file = part == null ? null : new File(part);
+            if (file != null && file.isFile()) {
+                updateDigest(digest, file.toPath(), buffer);
+            } else if (file != null && file.isDirectory()) {
+                List<Path> children;
+                try (Stream<Path> stream = Files.walk(file.toPath())) {
+                    children =
+                            stream.filter(Files::isRegularFile)
+                                    .sorted()
+                                    .collect(Collectors.toList());
+                }
+                for (Path child : children) {
+                    digest.update(
+                            file.toPath()
+                                    .relativize(child)
+                                    .toString()
+                                    .getBytes(StandardCharsets.UTF_8));
+                    updateDigest(digest, child, buffer);
+                }
+            } else {
+                digest.update(String.valueOf(part).getBytes(StandardCharsets.UTF_8));
+            }
+            // separates the parts so that ("ab", "c") and ("a", "bc") are hashed differently
+            digest.update((byte) 0);
+        }
+        return StringUtils.byteToHexString(digest.digest());
+    }
+
+    private static void updateDigest(MessageDigest digest, Path file, byte[] buffer)
+            throws IOException {
+        try (InputStream in = Files.newInputStream(file)) {
+            int read;
+            while ((read = in.read(buffer)) != -1) {
+                digest.update(buffer, 0, read);
+            }
+        }
+    }
+}
@@ -98,11 +98,8 @@ public class PythonEnvironmentManagerUtils {
             String pythonExecutable,
             Map<String, String> environmentVariables)
             throws IOException {
-        String sitePackagesPath =
-                getSitePackagesPath(requirementsInstallDir, pythonExecutable, environmentVariables);
-        String path = String.join(File.pathSeparator, requirementsInstallDir, "bin");
-        appendToEnvironmentVariable("PYTHONPATH", sitePackagesPath, environmentVariables);
-        appendToEnvironmentVariable("PATH", path, environmentVariables);
+        addRequirementsToEnvironment(
+                requirementsInstallDir, pythonExecutable, environmentVariables);
 
         List<String> commands =
                 new ArrayList<>(
@@ -147,6 +144,26 @@ public class PythonEnvironmentManagerUtils {
         }
     }
 
+    /**
+     * Adds the site-packages directory and the bin directory of the requirements installed into the
+     * specified directory to the PYTHONPATH and PATH of the given environment variables.
+     *
+     * @param requirementsInstallDir The directory the requirements are installed into.
+     * @param pythonExecutable The python interpreter used to resolve the site-packages directory.
+     * @param environmentVariables The environment variables to update.
+     */
+    public static void addRequirementsToEnvironment(
+            String requirementsInstallDir,
+            String pythonExecutable,
+            Map<String, String> environmentVariables)
+            throws IOException {
+        String sitePackagesPath =
+                getSitePackagesPath(requirementsInstallDir, pythonExecutable, environmentVariables);
+        String path = String.join(File.pathSeparator, requirementsInstallDir, "bin");
+        appendToEnvironmentVariable("PYTHONPATH", sitePackagesPath, environmentVariables);
+        appendToEnvironmentVariable("PATH", path, environmentVariables);
+    }
+
     public static String getPythonUdfRunnerScript(
             String pythonExecutable, Map<String, String> environmentVariables) throws IOException {
         String runnerDir;
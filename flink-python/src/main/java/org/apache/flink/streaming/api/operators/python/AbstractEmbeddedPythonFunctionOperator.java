@@ -22,7 +22,6 @@ import org.apache.flink.annotation.Internal;
 import org.apache.flink.api.common.JobID;
 import org.apache.flink.api.java.tuple.Tuple2;
 import org.apache.flink.configuration.Configuration;
-import org.apache.flink.fnexecution.v1.FlinkFnApi;
 import org.apache.flink.python.PythonConfig;
 import org.apache.flink.python.env.PythonDependencyInfo;
 import org.apache.flink.python.env.embedded.EmbeddedPythonEnvironment;
@@ -68,6 +67,14 @@ public abstract class AbstractEmbeddedPythonFunctionOperator<OUT>
     public void open() throws Exception {
         super.open();
         pythonConfig = new PythonConfig(config);
+        createPythonInterpreter();
+    }
+
+    /**
+     * Creates the Python interpreter in the embedded Python environment and sets up the Python
+     * functions via {@link #openPythonInterpreter(String, Map)}.
+     */
+    protected void createPythonInterpreter() throws Exception {
         pythonEnvironmentManager = createPythonEnvironmentManager();
         pythonEnvironmentManager.open();
         EmbeddedPythonEnvironment environment =
@@ -156,7 +163,4 @@ public abstract class AbstractEmbeddedPythonFunctionOperator<OUT>
 
     /** Returns the {@link PythonEnv} used to create PythonEnvironmentManager. */
     public abstract PythonEnv getPythonEnv();
-
-    /** Gets the proto representation of the Python user-defined functions to be executed. */
-    public abstract FlinkFnApi.UserDefinedFunctions getUserDefinedFunctionsProto();
 }
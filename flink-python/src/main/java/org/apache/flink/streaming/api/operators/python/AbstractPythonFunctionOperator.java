@@ -20,6 +20,8 @@ package org.apache.flink.streaming.api.operators.python;
 
 import org.apache.flink.annotation.Internal;
 import org.apache.flink.configuration.Configuration;
+import org.apache.flink.metrics.Gauge;
+import org.apache.flink.metrics.MetricGroup;
 import org.apache.flink.python.PythonConfig;
 import org.apache.flink.python.PythonOptions;
 import org.apache.flink.python.env.PythonEnvironmentManager;
@@ -38,6 +40,7 @@ import java.lang.reflect.Field;
 import java.util.List;
 import java.util.Map;
 import java.util.Objects;
+import java.util.Optional;
 import java.util.concurrent.ScheduledFuture;
 
 import static org.apache.flink.streaming.api.utils.ClassLeakCleaner.cleanUpLeakingClasses;
@@ -75,6 +78,9 @@ public abstract class AbstractPythonFunctionOperator<OUT> extends AbstractStream
     /** Callback to be executed after the current bundle was finished. */
     protected transient Runnable bundleFinishedCallback;
 
+    /** Adapts the max bundle size to the target latency of the bundles if configured. */
+    private transient AdaptiveBundleSizeController bundleSizeController;
+
     public AbstractPythonFunctionOperator(Configuration config) {
         this.config = Preconditions.checkNotNull(config);
         this.chainingStrategy = ChainingStrategy.ALWAYS;
@@ -109,6 +115,25 @@ public abstract class AbstractPythonFunctionOperator<OUT> extends AbstractStream
                         this.maxBundleTimeMills);
             }
 
+            Optional<Long> bundleTargetLatencyMills = pythonConfig.getBundleTargetLatencyMills();
+            if (bundleTargetLatencyMills.isPresent() && bundleTargetLatencyMills.get() > 0L) {
+                this.bundleSizeController =
+                        new AdaptiveBundleSizeController(
+                                this.maxBundleSize, bundleTargetLatencyMills.get());
+                MetricGroup bundleMetricGroup = getMetricGroup().addGroup("bundle");
+                bundleMetricGroup.gauge(
+                        "size", (Gauge<Integer>) bundleSizeController::getBundleSize);
+                bundleMetricGroup.gauge(
+                        "latencyMills",
+                        (Gauge<Long>) bundleSizeController::getLastBundleLatencyMills);
+                bundleMetricGroup.gauge(
+                        "finishDurationMills",
+                        (Gauge<Long>) bundleSizeController::getLastFinishBundleDurationMills);
+                LOG.info(
+                        "The bundle size is adapted to the target latency of {} milliseconds.",
+                        bundleTargetLatencyMills.get());
+            }
+
             this.elementCount = 0;
             this.lastFinishBundleTime = getProcessingTimeService().getCurrentProcessingTime();
 
@@ -157,7 +182,7 @@ public abstract class AbstractPythonFunctionOperator<OUT> extends AbstractStream
     @Override
     public void prepareSnapshotPreBarrier(long checkpointId) throws Exception {
         try {
-            invokeFinishBundle();
+            finishBundleAndAdaptBundleSize(false);
         } finally {
             super.prepareSnapshotPreBarrier(checkpointId);
         }
@@ -276,7 +301,7 @@ public abstract class AbstractPythonFunctionOperator<OUT> extends AbstractStream
     /** Checks whether to invoke finishBundle by elements count. Called in processElement. */
     protected void checkInvokeFinishBundleByCount() throws Exception {
         if (elementCount >= maxBundleSize) {
-            invokeFinishBundle();
+            finishBundleAndAdaptBundleSize(true);
         }
     }
 
@@ -284,8 +309,29 @@ public abstract class AbstractPythonFunctionOperator<OUT> extends AbstractStream
     private void checkInvokeFinishBundleByTime() throws Exception {
         long now = getProcessingTimeService().getCurrentProcessingTime();
         if (now - lastFinishBundleTime >= maxBundleTimeMills) {
+            finishBundleAndAdaptBundleSize(false);
+        }
+    }
+
+    /**
+     * Finishes the current bundle and adapts the max bundle size to the observed latency of the
+     * bundle if the adaptive bundle size is enabled.
+     *
+     * @param full whether the bundle is finished because it reached the max bundle size
+     */
+    private void finishBundleAndAdaptBundleSize(boolean full) throws Exception {
+        if (bundleSizeController == null || elementCount == 0) {
             invokeFinishBundle();
+            return;
         }
+        int bundleElementCount = elementCount;
+        long bundleStartTime = lastFinishBundleTime;
+        long finishBundleStartTime = getProcessingTimeService().getCurrentProcessingTime();
+        invokeFinishBundle();
+        long now = getProcessingTimeService().getCurrentProcessingTime();
+        bundleSizeController.onBundleFinished(
+                bundleElementCount, now - bundleStartTime, now - finishBundleStartTime, full);
+        maxBundleSize = bundleSizeController.getBundleSize();
     }
 
     protected FlinkMetricContainer getFlinkMetricContainer() {
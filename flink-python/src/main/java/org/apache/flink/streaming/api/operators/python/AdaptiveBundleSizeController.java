@@ -0,0 +1,114 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.streaming.api.operators.python;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.annotation.VisibleForTesting;
+import org.apache.flink.util.Preconditions;
+
+/**
+ * Adapts the maximum size of the bundles of a Python operator to a target latency.
+ *
+ * <p>The latency of a bundle is the time from the end of the previous bundle until the results of
+ * the bundle have been emitted, which includes the processing of the elements in the Python worker
+ * and the commit of the state when finishing the bundle. The bundle size is scaled by the ratio of
+ * the target latency to the observed latency of the bundles which were finished because they were
+ * full. The bundles finished for other reasons, e.g. by the bundle timer or by a checkpoint
+ * barrier, only shrink the bundle size if finishing them alone took longer than the target
+ * latency, as it delays the checkpoint or the watermark. The size changes at most by a factor of 2
+ * per bundle and stays within [1, the configured maximum bundle size].
+ */
+@Internal
+public class AdaptiveBundleSizeController {
+
+    /** The maximum factor the bundle size changes by after a single bundle. */
+    private static final double MAX_CHANGE_FACTOR = 2.0;
+
+    private final int maxBundleSize;
+
+    private final long targetLatencyMills;
+
+    private int bundleSize;
+
+    private long lastBundleLatencyMills;
+
+    private long lastFinishBundleDurationMills;
+
+    public AdaptiveBundleSizeController(int maxBundleSize, long targetLatencyMills) {
+        Preconditions.checkArgument(maxBundleSize > 0, "The maximum bundle size must be positive.");
+        Preconditions.checkArgument(
+                targetLatencyMills > 0, "The target latency of the bundles must be positive.");
+        this.maxBundleSize = maxBundleSize;
+        this.targetLatencyMills = targetLatencyMills;
+        this.bundleSize = maxBundleSize;
+    }
+
+    /** Returns the maximum number of elements of the next bundle. */
+    public int getBundleSize() {
+        return bundleSize;
+    }
+
+    public long getLastBundleLatencyMills() {
+        return lastBundleLatencyMills;
+    }
+
+    public long getLastFinishBundleDurationMills() {
+        return lastFinishBundleDurationMills;
+    }
+
+    /**
+     * Adapts the bundle size after a bundle has been finished.
+     *
+     * @param elementCount the number of elements of the bundle
+     * @param latencyMills the time from the end of the previous bundle until the bundle was
+     *     finished
+     * @param finishBundleDurationMills the time spent waiting for the bundle to be finished
+     * @param full whether the bundle was finished because it reached the bundle size
+     */
+    public void onBundleFinished(
+            int elementCount, long latencyMills, long finishBundleDurationMills, boolean full) {
+        lastBundleLatencyMills = latencyMills;
+        lastFinishBundleDurationMills = finishBundleDurationMills;
+        if (elementCount <= 0) {
+            return;
+        }
+        if (full) {
+            scaleBundleSize(elementCount, latencyMills);
+        } else if (finishBundleDurationMills > targetLatencyMills) {
+            scaleBundleSize(elementCount, finishBundleDurationMills);
+        }
+    }
+
+    private void scaleBundleSize(int elementCount, long latencyMills) {
+        double desiredSize =
+                latencyMills <= 0
+                        ? bundleSize * MAX_CHANGE_FACTOR
+                        : (double) elementCount * targetLatencyMills / latencyMills;
+        desiredSize =
+                Math.max(
+                        bundleSize / MAX_CHANGE_FACTOR,
+                        Math.min(bundleSize * MAX_CHANGE_FACTOR, desiredSize));
+        setBundleSize((int) desiredSize);
+    }
+
+    @VisibleForTesting
+    void setBundleSize(int bundleSize) {
+        this.bundleSize = Math.max(1, Math.min(maxBundleSize, bundleSize));
+    }
+}
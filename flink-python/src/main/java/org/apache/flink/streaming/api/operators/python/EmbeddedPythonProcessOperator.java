@@ -0,0 +1,179 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.streaming.api.operators.python;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.api.common.typeinfo.TypeInformation;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.streaming.api.functions.python.DataStreamPythonFunctionInfo;
+import org.apache.flink.streaming.api.operators.BoundedOneInput;
+import org.apache.flink.streaming.api.operators.OneInputStreamOperator;
+import org.apache.flink.streaming.api.operators.TimestampedCollector;
+import org.apache.flink.streaming.api.utils.ProtoUtils;
+import org.apache.flink.streaming.api.utils.PythonTypeUtils;
+import org.apache.flink.streaming.api.watermark.Watermark;
+import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.table.functions.python.PythonEnv;
+import org.apache.flink.util.Preconditions;
+
+import java.util.Collections;
+import java.util.Map;
+
+import static org.apache.flink.streaming.api.utils.PythonOperatorUtils.inBatchExecutionMode;
+
+/**
+ * {@link EmbeddedPythonProcessOperator} is responsible for executing the user defined python
+ * ProcessFunction of a non-keyed DataStream in the embedded Python environment, i.e. in the same
+ * process as the JVM. The elements are passed between Java and Python as objects converted by
+ * PemJa instead of being serialized and transferred to a separate Python process.
+ */
+@Internal
+public class EmbeddedPythonProcessOperator<IN, OUT>
+        extends AbstractEmbeddedPythonFunctionOperator<OUT>
+        implements OneInputStreamOperator<IN, OUT>, BoundedOneInput {
+
+    private static final long serialVersionUID = 1L;
+
+    /** The python ProcessFunction to be executed. */
+    private final DataStreamPythonFunctionInfo pythonFunctionInfo;
+
+    /** The TypeInformation of input data. */
+    private final TypeInformation<IN> inputTypeInfo;
+
+    /** The TypeInformation of output data. */
+    private final TypeInformation<OUT> outputTypeInfo;
+
+    /** Converts the input elements to the objects passed to Python. */
+    private transient PythonTypeUtils.DataConverter<IN, Object> inputDataConverter;
+
+    /** Converts the objects returned by Python to the output elements. */
+    private transient PythonTypeUtils.DataConverter<OUT, Object> outputDataConverter;
+
+    /** The collector used to collect the results with the timestamp of the input element. */
+    private transient TimestampedCollector<OUT> collector;
+
+    /** We listen to this ourselves because we don't have an InternalTimerService. */
+    private transient long currentWatermark;
+
+    public EmbeddedPythonProcessOperator(
+            Configuration config,
+            DataStreamPythonFunctionInfo pythonFunctionInfo,
+            TypeInformation<IN> inputTypeInfo,
+            TypeInformation<OUT> outputTypeInfo) {
+        super(config);
+        this.pythonFunctionInfo = Preconditions.checkNotNull(pythonFunctionInfo);
+        this.inputTypeInfo = Preconditions.checkNotNull(inputTypeInfo);
+        this.outputTypeInfo = Preconditions.checkNotNull(outputTypeInfo);
+    }
+
+    @Override
+    public void open() throws Exception {
+        inputDataConverter =
+                PythonTypeUtils.TypeInfoToDataConverter.typeInfoDataConverter(inputTypeInfo);
+        outputDataConverter =
+                PythonTypeUtils.TypeInfoToDataConverter.typeInfoDataConverter(outputTypeInfo);
+        collector = new TimestampedCollector<>(output);
+        currentWatermark = Long.MIN_VALUE;
+        super.open();
+    }
+
+    @Override
+    public void openPythonInterpreter(String pythonExecutable, Map<String, String> env) {
+        LOG.info("Create Operation in multi-threads.");
+
+        interpreter.exec(
+                "from pyflink.fn_execution.utils.operation_utils import create_one_input_operation_from_proto");
+        interpreter.set("proto", getUserDefinedDataStreamFunctionProto().toByteArray());
+        interpreter.set(
+                "input_type_info",
+                PythonTypeUtils.TypeInfoToProtoConverter.toTypeInfoProto(inputTypeInfo)
+                        .toByteArray());
+        interpreter.set(
+                "output_type_info",
+                PythonTypeUtils.TypeInfoToProtoConverter.toTypeInfoProto(outputTypeInfo)
+                        .toByteArray());
+
+        interpreter.exec(
+                "operation = create_one_input_operation_from_proto("
+                        + "proto, input_type_info, output_type_info)");
+
+        // invoke `open` method of OneInputOperation.
+        interpreter.invokeMethod("operation", "open");
+    }
+
+    @Override
+    public void endInput() {
+        if (interpreter != null) {
+            // invoke `close` method of OneInputOperation.
+            interpreter.invokeMethod("operation", "close");
+        }
+    }
+
+    @Override
+    public PythonEnv getPythonEnv() {
+        return pythonFunctionInfo.getPythonFunction().getPythonEnv();
+    }
+
+    @Override
+    public void processElement(StreamRecord<IN> element) {
+        collector.setTimestamp(element);
+        Object[] results =
+                invokeProcessElement(
+                        element.getTimestamp(),
+                        currentWatermark,
+                        inputDataConverter.toExternal(element.getValue()));
+        for (Object result : results) {
+            collector.collect(outputDataConverter.toInternal(result));
+        }
+    }
+
+    /**
+     * Invokes the Python ProcessFunction with the converted input element and returns the results.
+     */
+    protected Object[] invokeProcessElement(long timestamp, long watermark, Object value) {
+        return (Object[])
+                interpreter.invokeMethod(
+                        "operation", "process_element", timestamp, watermark, value);
+    }
+
+    @Override
+    public void processWatermark(Watermark mark) throws Exception {
+        super.processWatermark(mark);
+        currentWatermark = mark.getTimestamp();
+    }
+
+    @Override
+    protected void invokeFinishBundle() throws Exception {
+        // the elements are processed synchronously and so there is no bundle to finish
+    }
+
+    /** Gets the proto representation of the Python ProcessFunction to be executed. */
+    public FlinkFnApi.UserDefinedDataStreamFunction getUserDefinedDataStreamFunctionProto() {
+        return ProtoUtils.createUserDefinedDataStreamFunctionProto(
+                        pythonFunctionInfo,
+                        getRuntimeContext(),
+                        Collections.emptyMap(),
+                        inBatchExecutionMode(getKeyedStateBackend()))
+                .toBuilder()
+                .setMetricEnabled(pythonConfig.isMetricEnabled())
+                .setProfileEnabled(pythonConfig.isProfileEnabled())
+                .build();
+    }
+}
@@ -77,6 +77,7 @@ public class PythonCoProcessOperator<IN1, IN2, OUT>
                 jobOptions,
                 getFlinkMetricContainer(),
                 null,
+                getOperatorStateBackend(),
                 null,
                 null,
                 null,
@@ -74,6 +74,7 @@ public class PythonProcessOperator<IN, OUT>
                 jobOptions,
                 getFlinkMetricContainer(),
                 null,
+                getOperatorStateBackend(),
                 null,
                 null,
                 null,
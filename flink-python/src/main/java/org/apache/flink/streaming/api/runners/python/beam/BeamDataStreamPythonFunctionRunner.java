@@ -25,6 +25,7 @@ import org.apache.flink.python.env.process.ProcessPythonEnvironmentManager;
 import org.apache.flink.python.metric.FlinkMetricContainer;
 import org.apache.flink.runtime.memory.MemoryManager;
 import org.apache.flink.runtime.state.KeyedStateBackend;
+import org.apache.flink.runtime.state.OperatorStateBackend;
 import org.apache.flink.streaming.api.operators.python.timer.TimerRegistration;
 import org.apache.flink.streaming.api.utils.ProtoUtils;
 import org.apache.flink.util.Preconditions;
@@ -82,12 +83,49 @@ public class BeamDataStreamPythonFunctionRunner extends BeamPythonFunctionRunner
             FlinkFnApi.CoderInfoDescriptor inputCoderDescriptor,
             FlinkFnApi.CoderInfoDescriptor outputCoderDescriptor,
             FlinkFnApi.CoderInfoDescriptor timerCoderDescriptor) {
+        this(
+                taskName,
+                environmentManager,
+                headOperatorFunctionUrn,
+                userDefinedDataStreamFunctions,
+                jobOptions,
+                flinkMetricContainer,
+                stateBackend,
+                null,
+                keySerializer,
+                namespaceSerializer,
+                timerRegistration,
+                memoryManager,
+                managedMemoryFraction,
+                inputCoderDescriptor,
+                outputCoderDescriptor,
+                timerCoderDescriptor);
+    }
+
+    public BeamDataStreamPythonFunctionRunner(
+            String taskName,
+            ProcessPythonEnvironmentManager environmentManager,
+            String headOperatorFunctionUrn,
+            List<FlinkFnApi.UserDefinedDataStreamFunction> userDefinedDataStreamFunctions,
+            Map<String, String> jobOptions,
+            @Nullable FlinkMetricContainer flinkMetricContainer,
+            @Nullable KeyedStateBackend<?> stateBackend,
+            @Nullable OperatorStateBackend operatorStateBackend,
+            TypeSerializer<?> keySerializer,
+            TypeSerializer<?> namespaceSerializer,
+            @Nullable TimerRegistration timerRegistration,
+            MemoryManager memoryManager,
+            double managedMemoryFraction,
+            FlinkFnApi.CoderInfoDescriptor inputCoderDescriptor,
+            FlinkFnApi.CoderInfoDescriptor outputCoderDescriptor,
+            FlinkFnApi.CoderInfoDescriptor timerCoderDescriptor) {
         super(
                 taskName,
                 environmentManager,
                 jobOptions,
                 flinkMetricContainer,
                 stateBackend,
+                operatorStateBackend,
                 keySerializer,
                 namespaceSerializer,
                 timerRegistration,
@@ -33,6 +33,7 @@ import org.apache.flink.python.metric.FlinkMetricContainer;
 import org.apache.flink.runtime.memory.MemoryManager;
 import org.apache.flink.runtime.memory.OpaqueMemoryResource;
 import org.apache.flink.runtime.state.KeyedStateBackend;
+import org.apache.flink.runtime.state.OperatorStateBackend;
 import org.apache.flink.streaming.api.operators.python.timer.TimerRegistration;
 import org.apache.flink.util.Preconditions;
 import org.apache.flink.util.function.LongFunctionWithException;
@@ -188,13 +189,47 @@ public abstract class BeamPythonFunctionRunner implements PythonFunctionRunner {
             double managedMemoryFraction,
             FlinkFnApi.CoderInfoDescriptor inputCoderDescriptor,
             FlinkFnApi.CoderInfoDescriptor outputCoderDescriptor) {
+        this(
+                taskName,
+                environmentManager,
+                jobOptions,
+                flinkMetricContainer,
+                keyedStateBackend,
+                null,
+                keySerializer,
+                namespaceSerializer,
+                timerRegistration,
+                memoryManager,
+                managedMemoryFraction,
+                inputCoderDescriptor,
+                outputCoderDescriptor);
+    }
+
+    public BeamPythonFunctionRunner(
+            String taskName,
+            ProcessPythonEnvironmentManager environmentManager,
+            Map<String, String> jobOptions,
+            @Nullable FlinkMetricContainer flinkMetricContainer,
+            @Nullable KeyedStateBackend keyedStateBackend,
+            @Nullable OperatorStateBackend operatorStateBackend,
+            @Nullable TypeSerializer keySerializer,
+            @Nullable TypeSerializer namespaceSerializer,
+            @Nullable TimerRegistration timerRegistration,
+            MemoryManager memoryManager,
+            double managedMemoryFraction,
+            FlinkFnApi.CoderInfoDescriptor inputCoderDescriptor,
+            FlinkFnApi.CoderInfoDescriptor outputCoderDescriptor) {
         this.taskName = Preconditions.checkNotNull(taskName);
         this.environmentManager = Preconditions.checkNotNull(environmentManager);
         this.jobOptions = Preconditions.checkNotNull(jobOptions);
         this.flinkMetricContainer = flinkMetricContainer;
         this.stateRequestHandler =
                 getStateRequestHandler(
-                        keyedStateBackend, keySerializer, namespaceSerializer, jobOptions);
+                        keyedStateBackend,
+                        operatorStateBackend,
+                        keySerializer,
+                        namespaceSerializer,
+                        jobOptions);
         this.timerRegistration = timerRegistration;
         this.memoryManager = memoryManager;
         this.managedMemoryFraction = managedMemoryFraction;
@@ -597,15 +632,18 @@ public abstract class BeamPythonFunctionRunner implements PythonFunctionRunner {
 
     private static StateRequestHandler getStateRequestHandler(
             KeyedStateBackend keyedStateBackend,
+            OperatorStateBackend operatorStateBackend,
             TypeSerializer keySerializer,
             TypeSerializer namespaceSerializer,
             Map<String, String> jobOptions) {
-        if (keyedStateBackend == null) {
-            return StateRequestHandler.unsupported();
-        } else {
+        if (keyedStateBackend != null) {
             assert keySerializer != null;
             return new SimpleStateRequestHandler(
                     keyedStateBackend, keySerializer, namespaceSerializer, jobOptions);
+        } else if (operatorStateBackend != null) {
+            return new OperatorStateRequestHandler(operatorStateBackend);
+        } else {
+            return StateRequestHandler.unsupported();
         }
     }
 }
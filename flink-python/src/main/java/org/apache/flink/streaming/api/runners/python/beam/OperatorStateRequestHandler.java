@@ -0,0 +1,237 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.streaming.api.runners.python.beam;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.api.common.state.BroadcastState;
+import org.apache.flink.api.common.state.ListState;
+import org.apache.flink.api.common.state.ListStateDescriptor;
+import org.apache.flink.api.common.state.MapStateDescriptor;
+import org.apache.flink.api.common.typeutils.base.array.BytePrimitiveArraySerializer;
+import org.apache.flink.core.memory.ByteArrayInputStreamWithPos;
+import org.apache.flink.core.memory.ByteArrayOutputStreamWithPos;
+import org.apache.flink.core.memory.DataInputViewStreamWrapper;
+import org.apache.flink.core.memory.DataOutputViewStreamWrapper;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.runtime.state.OperatorStateBackend;
+import org.apache.flink.streaming.api.utils.ByteArrayWrapper;
+import org.apache.flink.streaming.api.utils.ByteArrayWrapperSerializer;
+
+import org.apache.beam.model.fnexecution.v1.BeamFnApi;
+import org.apache.beam.runners.fnexecution.state.StateRequestHandler;
+import org.apache.beam.vendor.grpc.v1p26p0.com.google.protobuf.ByteString;
+
+import java.util.ArrayList;
+import java.util.Base64;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.CompletionStage;
+
+/**
+ * A state request handler which handles the operator state requests from Python side. The
+ * operator states are kept in the memory of the Python worker, which reads each state once and
+ * replaces it when it has been modified in a bundle, so that the operator state backend holds the
+ * latest state whenever a checkpoint is taken.
+ *
+ * <p>The list states are represented as {@link BeamFnApi.StateKey.BagUserState} and the broadcast
+ * states as {@link BeamFnApi.StateKey.MultimapSideInput}. The contents of a state are transferred
+ * as a count followed by the length-prefixed elements, or the length-prefixed keys and values
+ * where a length of -1 represents a None value.
+ */
+@Internal
+public class OperatorStateRequestHandler implements StateRequestHandler {
+
+    private static final String UPDATE_MARK = "update";
+    private static final String PYTHON_STATE_PREFIX = "python-state-";
+    private static final int NONE_VALUE_LENGTH = -1;
+
+    private final OperatorStateBackend operatorStateBackend;
+
+    /** Reusable InputStream used to holding the elements to be deserialized. */
+    private final ByteArrayInputStreamWithPos bais;
+
+    /** InputStream Wrapper. */
+    private final DataInputViewStreamWrapper baisWrapper;
+
+    /** Reusable OutputStream used to holding the serialized input elements. */
+    private final ByteArrayOutputStreamWithPos baos;
+
+    /** OutputStream Wrapper. */
+    private final DataOutputViewStreamWrapper baosWrapper;
+
+    OperatorStateRequestHandler(OperatorStateBackend operatorStateBackend) {
+        this.operatorStateBackend = operatorStateBackend;
+        bais = new ByteArrayInputStreamWithPos();
+        baisWrapper = new DataInputViewStreamWrapper(bais);
+        baos = new ByteArrayOutputStreamWithPos();
+        baosWrapper = new DataOutputViewStreamWrapper(baos);
+    }
+
+    @Override
+    public CompletionStage<BeamFnApi.StateResponse.Builder> handle(BeamFnApi.StateRequest request)
+            throws Exception {
+        BeamFnApi.StateKey.TypeCase typeCase = request.getStateKey().getTypeCase();
+        synchronized (operatorStateBackend) {
+            if (typeCase.equals(BeamFnApi.StateKey.TypeCase.BAG_USER_STATE)) {
+                return handleListState(request);
+            } else if (typeCase.equals(BeamFnApi.StateKey.TypeCase.MULTIMAP_SIDE_INPUT)) {
+                return handleBroadcastState(request);
+            } else {
+                throw new RuntimeException("Unsupported operator state type: " + typeCase);
+            }
+        }
+    }
+
+    private CompletionStage<BeamFnApi.StateResponse.Builder> handleListState(
+            BeamFnApi.StateRequest request) throws Exception {
+        BeamFnApi.StateKey.BagUserState bagUserState = request.getStateKey().getBagUserState();
+        ListState<byte[]> listState =
+                operatorStateBackend.getListState(
+                        new ListStateDescriptor<>(
+                                getStateName(bagUserState.getUserStateId()),
+                                BytePrimitiveArraySerializer.INSTANCE));
+        switch (request.getRequestCase()) {
+            case GET:
+                List<byte[]> elements = new ArrayList<>();
+                Iterable<byte[]> values = listState.get();
+                if (values != null) {
+                    values.forEach(elements::add);
+                }
+                baos.reset();
+                baosWrapper.writeInt(elements.size());
+                for (byte[] element : elements) {
+                    writeBytes(element);
+                }
+                return createGetResponse(request);
+            case APPEND:
+                checkUpdateRequest(bagUserState.getTransformId(), request);
+                readAppendData(request);
+                int count = baisWrapper.readInt();
+                List<byte[]> newElements = new ArrayList<>(count);
+                for (int i = 0; i < count; i++) {
+                    newElements.add(readBytes());
+                }
+                listState.update(newElements);
+                return createAppendResponse(request);
+            default:
+                throw new RuntimeException(
+                        String.format(
+                                "Unsupported request type %s for operator list state.",
+                                request.getRequestCase()));
+        }
+    }
+
+    private CompletionStage<BeamFnApi.StateResponse.Builder> handleBroadcastState(
+            BeamFnApi.StateRequest request) throws Exception {
+        BeamFnApi.StateKey.MultimapSideInput mapUserState =
+                request.getStateKey().getMultimapSideInput();
+        BroadcastState<ByteArrayWrapper, byte[]> broadcastState =
+                operatorStateBackend.getBroadcastState(
+                        new MapStateDescriptor<>(
+                                getStateName(mapUserState.getSideInputId()),
+                                ByteArrayWrapperSerializer.INSTANCE,
+                                BytePrimitiveArraySerializer.INSTANCE));
+        switch (request.getRequestCase()) {
+            case GET:
+                List<Map.Entry<ByteArrayWrapper, byte[]>> entries = new ArrayList<>();
+                broadcastState.entries().forEach(entries::add);
+                baos.reset();
+                baosWrapper.writeInt(entries.size());
+                for (Map.Entry<ByteArrayWrapper, byte[]> entry : entries) {
+                    ByteArrayWrapper key = entry.getKey();
+                    int keyLength = key.getLimit() - key.getOffset();
+                    baosWrapper.writeInt(keyLength);
+                    baosWrapper.write(key.getData(), key.getOffset(), keyLength);
+                    if (entry.getValue() == null) {
+                        baosWrapper.writeInt(NONE_VALUE_LENGTH);
+                    } else {
+                        writeBytes(entry.getValue());
+                    }
+                }
+                return createGetResponse(request);
+            case APPEND:
+                checkUpdateRequest(mapUserState.getTransformId(), request);
+                readAppendData(request);
+                broadcastState.clear();
+                int count = baisWrapper.readInt();
+                for (int i = 0; i < count; i++) {
+                    ByteArrayWrapper key = new ByteArrayWrapper(readBytes());
+                    int valueLength = baisWrapper.readInt();
+                    byte[] value = null;
+                    if (valueLength != NONE_VALUE_LENGTH) {
+                        value = new byte[valueLength];
+                        baisWrapper.readFully(value);
+                    }
+                    broadcastState.put(key, value);
+                }
+                return createAppendResponse(request);
+            default:
+                throw new RuntimeException(
+                        String.format(
+                                "Unsupported request type %s for broadcast state.",
+                                request.getRequestCase()));
+        }
+    }
+
+    private static String getStateName(String stateId) throws Exception {
+        byte[] data = Base64.getDecoder().decode(stateId);
+        return PYTHON_STATE_PREFIX + FlinkFnApi.StateDescriptor.parseFrom(data).getStateName();
+    }
+
+    private static void checkUpdateRequest(String transformId, BeamFnApi.StateRequest request) {
+        if (!UPDATE_MARK.equals(transformId)) {
+            throw new RuntimeException("Unsupported operator state append request: " + request);
+        }
+    }
+
+    private void readAppendData(BeamFnApi.StateRequest request) {
+        byte[] data = request.getAppend().getData().toByteArray();
+        bais.setBuffer(data, 0, data.length);
+    }
+
+    private byte[] readBytes() throws Exception {
+        byte[] bytes = new byte[baisWrapper.readInt()];
+        baisWrapper.readFully(bytes);
+        return bytes;
+    }
+
+    private void writeBytes(byte[] bytes) throws Exception {
+        baosWrapper.writeInt(bytes.length);
+        baosWrapper.write(bytes);
+    }
+
+    private CompletionStage<BeamFnApi.StateResponse.Builder> createGetResponse(
+            BeamFnApi.StateRequest request) {
+        return CompletableFuture.completedFuture(
+                BeamFnApi.StateResponse.newBuilder()
+                        .setId(request.getId())
+                        .setGet(
+                                BeamFnApi.StateGetResponse.newBuilder()
+                                        .setData(ByteString.copyFrom(baos.toByteArray()))));
+    }
+
+    private static CompletionStage<BeamFnApi.StateResponse.Builder> createAppendResponse(
+            BeamFnApi.StateRequest request) {
+        return CompletableFuture.completedFuture(
+                BeamFnApi.StateResponse.newBuilder()
+                        .setId(request.getId())
+                        .setAppend(BeamFnApi.StateAppendResponse.getDefaultInstance()));
+    }
+}
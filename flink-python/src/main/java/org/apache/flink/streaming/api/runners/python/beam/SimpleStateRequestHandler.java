@@ -51,12 +51,12 @@ import org.apache.beam.runners.fnexecution.state.StateRequestHandler;
 import org.apache.beam.vendor.grpc.v1p26p0.com.google.common.base.Charsets;
 import org.apache.beam.vendor.grpc.v1p26p0.com.google.protobuf.ByteString;
 
+import java.util.ArrayList;
 import java.util.Base64;
 import java.util.Collections;
 import java.util.HashMap;
 import java.util.HashSet;
 import java.util.Iterator;
-import java.util.LinkedList;
 import java.util.List;
 import java.util.Map;
 import java.util.Set;
@@ -72,12 +72,15 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
 
     private static final String CLEAR_CACHED_ITERATOR_MARK = "clear_iterators";
     private static final String MERGE_NAMESPACES_MARK = "merge_namespaces";
+    private static final String UPDATE_MARK = "update";
+    private static final String TOUCH_MARK = "touch";
     private static final String PYTHON_STATE_PREFIX = "python-state-";
 
     // map state GET request flags
     private static final byte GET_FLAG = 0;
     private static final byte ITERATE_FLAG = 1;
     private static final byte CHECK_EMPTY_FLAG = 2;
+    private static final byte GET_ALL_FLAG = 3;
 
     // map state GET response flags
     private static final byte EXIST_FLAG = 0;
@@ -90,6 +93,7 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
     private static final byte DELETE = 0;
     private static final byte SET_NONE = 1;
     private static final byte SET_VALUE = 2;
+    private static final byte CLEAR = 3;
 
     private static final BeamFnApi.StateGetResponse.Builder NOT_EXIST_RESPONSE =
             BeamFnApi.StateGetResponse.newBuilder()
@@ -124,11 +128,13 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
     /** The cache of the stateDescriptors. */
     private final Map<String, StateDescriptor> stateDescriptorCache;
 
-    /** The cache of the map state iterators. */
-    private final Map<ByteArrayWrapper, Iterator> mapStateIteratorCache;
+    /** The cache of the map state and list state iterators. */
+    private final Map<ByteArrayWrapper, Iterator> stateIteratorCache;
 
     private final int mapStateIterateResponseBatchSize;
 
+    private final int listStateIterateResponseBatchSize;
+
     private final ByteArrayWrapper reuseByteArrayWrapper = new ByteArrayWrapper(new byte[0]);
 
     /** Let StateRequestHandler for user state only use a single cache token. */
@@ -155,7 +161,7 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         baos = new ByteArrayOutputStreamWithPos();
         baosWrapper = new DataOutputViewStreamWrapper(baos);
         stateDescriptorCache = new HashMap<>();
-        mapStateIteratorCache = new HashMap<>();
+        stateIteratorCache = new HashMap<>();
         mapStateIterateResponseBatchSize =
                 Integer.valueOf(
                         config.getOrDefault(
@@ -169,6 +175,19 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
                             "The value of '%s' must be greater than 0!",
                             PythonOptions.MAP_STATE_ITERATE_RESPONSE_BATCH_SIZE.key()));
         }
+        listStateIterateResponseBatchSize =
+                Integer.valueOf(
+                        config.getOrDefault(
+                                PythonOptions.LIST_STATE_ITERATE_RESPONSE_BATCH_SIZE.key(),
+                                PythonOptions.LIST_STATE_ITERATE_RESPONSE_BATCH_SIZE
+                                        .defaultValue()
+                                        .toString()));
+        if (listStateIterateResponseBatchSize <= 0) {
+            throw new RuntimeException(
+                    String.format(
+                            "The value of '%s' must be greater than 0!",
+                            PythonOptions.LIST_STATE_ITERATE_RESPONSE_BATCH_SIZE.key()));
+        }
         cacheToken = createCacheToken();
     }
 
@@ -196,18 +215,7 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
             BeamFnApi.StateRequest request) throws Exception {
         if (request.getStateKey().hasBagUserState()) {
             BeamFnApi.StateKey.BagUserState bagUserState = request.getStateKey().getBagUserState();
-            // get key
-            byte[] keyBytes = bagUserState.getKey().toByteArray();
-            bais.setBuffer(keyBytes, 0, keyBytes.length);
-            Object key = keySerializer.deserialize(baisWrapper);
-            if (keyedStateBackend.getKeySerializer() instanceof RowDataSerializer) {
-                setCurrentKeyForStreaming(
-                        keyedStateBackend,
-                        ((RowDataSerializer) keyedStateBackend.getKeySerializer())
-                                .toBinaryRow((RowData) key));
-            } else {
-                setCurrentKeyForStreaming(keyedStateBackend, key);
-            }
+            setCurrentKey(bagUserState.getKey().toByteArray());
         } else {
             throw new RuntimeException("Unsupported bag state request: " + request);
         }
@@ -227,33 +235,79 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         }
     }
 
-    private List<ByteString> convertToByteString(ListState<byte[]> listState) throws Exception {
-        List<ByteString> ret = new LinkedList<>();
-        if (listState.get() == null) {
-            return ret;
-        }
-        for (byte[] v : listState.get()) {
-            ret.add(ByteString.copyFrom(v));
+    private void setCurrentKey(byte[] keyBytes) throws Exception {
+        bais.setBuffer(keyBytes, 0, keyBytes.length);
+        Object key = keySerializer.deserialize(baisWrapper);
+        if (keyedStateBackend.getKeySerializer() instanceof RowDataSerializer) {
+            setCurrentKeyForStreaming(
+                    keyedStateBackend,
+                    ((RowDataSerializer) keyedStateBackend.getKeySerializer())
+                            .toBinaryRow((RowData) key));
+        } else {
+            setCurrentKeyForStreaming(keyedStateBackend, key);
         }
-        return ret;
     }
 
     private CompletionStage<BeamFnApi.StateResponse.Builder> handleBagGetRequest(
             BeamFnApi.StateRequest request) throws Exception {
+        // The elements are sent in batches. The continuation token of the response represents an
+        // iterator over the remaining elements cached here, which is passed back by the following
+        // requests.
+        ByteString continuationToken = request.getGet().getContinuationToken();
+        ByteArrayWrapper iteratorToken;
+        Iterator<byte[]> iterator;
+        if (continuationToken.isEmpty()) {
+            iteratorToken = null;
+            Iterable<byte[]> values = getListState(request).get();
+            iterator = values == null ? Collections.emptyIterator() : values.iterator();
+        } else {
+            iteratorToken = new ByteArrayWrapper(continuationToken.toByteArray());
+            iterator = stateIteratorCache.get(iteratorToken);
+            if (iterator == null) {
+                throw new RuntimeException("The cached iterator does not exist!");
+            }
+        }
 
-        ListState<byte[]> partitionedState = getListState(request);
-        List<ByteString> byteStrings = convertToByteString(partitionedState);
+        baos.reset();
+        for (int i = 0; i < listStateIterateResponseBatchSize && iterator.hasNext(); i++) {
+            baosWrapper.write(iterator.next());
+        }
 
+        if (!iterator.hasNext()) {
+            if (iteratorToken != null) {
+                stateIteratorCache.remove(iteratorToken);
+            }
+            iteratorToken = null;
+        } else if (iteratorToken == null) {
+            // Copies the remaining elements as the list state may be modified before the
+            // iteration finishes.
+            List<byte[]> remaining = new ArrayList<>();
+            iterator.forEachRemaining(remaining::add);
+            iteratorToken = new ByteArrayWrapper(UUID.randomUUID().toString().getBytes());
+            stateIteratorCache.put(iteratorToken, remaining.iterator());
+        }
+
+        BeamFnApi.StateGetResponse.Builder responseBuilder =
+                BeamFnApi.StateGetResponse.newBuilder()
+                        .setData(ByteString.copyFrom(baos.toByteArray()));
+        if (iteratorToken != null) {
+            responseBuilder.setContinuationToken(
+                    ByteString.copyFrom(
+                            iteratorToken.getData(),
+                            iteratorToken.getOffset(),
+                            iteratorToken.getLimit() - iteratorToken.getOffset()));
+        }
         return CompletableFuture.completedFuture(
                 BeamFnApi.StateResponse.newBuilder()
                         .setId(request.getId())
-                        .setGet(
-                                BeamFnApi.StateGetResponse.newBuilder()
-                                        .setData(ByteString.copyFrom(byteStrings))));
+                        .setGet(responseBuilder));
     }
 
     private CompletionStage<BeamFnApi.StateResponse.Builder> handleBagAppendRequest(
             BeamFnApi.StateRequest request) throws Exception {
+        if (request.getStateKey().getBagUserState().getTransformId().equals(TOUCH_MARK)) {
+            return handleBagTouchRequest(request);
+        }
 
         ListState<byte[]> partitionedState = getListState(request);
         if (request.getStateKey()
@@ -273,6 +327,10 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
             bais.setBuffer(targetNamespaceByte, 0, targetNamespaceByte.length);
             Object targetNamespace = namespaceSerializer.deserialize(baisWrapper);
             ((InternalMergingState) partitionedState).mergeNamespaces(targetNamespace, namespaces);
+        } else if (request.getStateKey().getBagUserState().getTransformId().equals(UPDATE_MARK)) {
+            // replace the values, i.e. a clear request merged with an append request
+            byte[] valueBytes = request.getAppend().getData().toByteArray();
+            partitionedState.update(Collections.singletonList(valueBytes));
         } else {
             // get values
             byte[] valueBytes = request.getAppend().getData().toByteArray();
@@ -284,6 +342,32 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
                         .setAppend(BeamFnApi.StateAppendResponse.getDefaultInstance()));
     }
 
+    /**
+     * Refreshes the time-to-live of the list states of the keys and the windows contained in the
+     * request by accessing them. The Python worker serves the reads of the states whose
+     * time-to-live is updated on read from its cache and sends the accessed keys in batches.
+     */
+    private CompletionStage<BeamFnApi.StateResponse.Builder> handleBagTouchRequest(
+            BeamFnApi.StateRequest request) throws Exception {
+        String userStateId = request.getStateKey().getBagUserState().getUserStateId();
+        byte[] touchBytes = request.getAppend().getData().toByteArray();
+        DataInputViewStreamWrapper touchInput =
+                new DataInputViewStreamWrapper(new ByteArrayInputStreamWithPos(touchBytes));
+        int touchCount = touchInput.readInt();
+        for (int i = 0; i < touchCount; i++) {
+            byte[] keyBytes = new byte[touchInput.readInt()];
+            touchInput.readFully(keyBytes);
+            byte[] windowBytes = new byte[touchInput.readInt()];
+            touchInput.readFully(windowBytes);
+            setCurrentKey(keyBytes);
+            getListState(userStateId, windowBytes).get();
+        }
+        return CompletableFuture.completedFuture(
+                BeamFnApi.StateResponse.newBuilder()
+                        .setId(request.getId())
+                        .setAppend(BeamFnApi.StateAppendResponse.getDefaultInstance()));
+    }
+
     private CompletionStage<BeamFnApi.StateResponse.Builder> handleBagClearRequest(
             BeamFnApi.StateRequest request) throws Exception {
 
@@ -298,7 +382,13 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
 
     private ListState<byte[]> getListState(BeamFnApi.StateRequest request) throws Exception {
         BeamFnApi.StateKey.BagUserState bagUserState = request.getStateKey().getBagUserState();
-        byte[] data = Base64.getDecoder().decode(bagUserState.getUserStateId());
+        return getListState(
+                bagUserState.getUserStateId(), bagUserState.getWindow().toByteArray());
+    }
+
+    private ListState<byte[]> getListState(String userStateId, byte[] windowBytes)
+            throws Exception {
+        byte[] data = Base64.getDecoder().decode(userStateId);
         FlinkFnApi.StateDescriptor stateDescriptor = FlinkFnApi.StateDescriptor.parseFrom(data);
         String stateName = PYTHON_STATE_PREFIX + stateDescriptor.getStateName();
         ListStateDescriptor<byte[]> listStateDescriptor;
@@ -322,7 +412,6 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
                                     + "'%s' is used both as LIST state and '%s' state at the same time.",
                             stateName, cachedStateDescriptor.getType()));
         }
-        byte[] windowBytes = bagUserState.getWindow().toByteArray();
         if (windowBytes.length != 0) {
             bais.setBuffer(windowBytes, 0, windowBytes.length);
             Object namespace = namespaceSerializer.deserialize(baisWrapper);
@@ -345,18 +434,7 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         if (request.getStateKey().hasMultimapSideInput()) {
             BeamFnApi.StateKey.MultimapSideInput mapUserState =
                     request.getStateKey().getMultimapSideInput();
-            // get key
-            byte[] keyBytes = mapUserState.getKey().toByteArray();
-            bais.setBuffer(keyBytes, 0, keyBytes.length);
-            Object key = keySerializer.deserialize(baisWrapper);
-            if (keyedStateBackend.getKeySerializer() instanceof RowDataSerializer) {
-                setCurrentKeyForStreaming(
-                        keyedStateBackend,
-                        ((RowDataSerializer) keyedStateBackend.getKeySerializer())
-                                .toBinaryRow((RowData) key));
-            } else {
-                setCurrentKeyForStreaming(keyedStateBackend, key);
-            }
+            setCurrentKey(mapUserState.getKey().toByteArray());
         } else {
             throw new RuntimeException("Unsupported bag state request: " + request);
         }
@@ -381,6 +459,8 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         MapState<ByteArrayWrapper, byte[]> mapState = getMapState(request);
         // The continuation token structure of GET request is:
         // [flag (1 byte)][serialized map key]
+        // The continuation token structure of GET_ALL request is:
+        // [flag (1 byte)][number of map keys (int32)][map key length (int32)][map key]...
         // The continuation token structure of CHECK_EMPTY request is:
         // [flag (1 byte)]
         // The continuation token structure of ITERATE request is:
@@ -395,6 +475,9 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
                 reuseByteArrayWrapper.setLimit(getRequest.length);
                 response = handleMapGetValueRequest(reuseByteArrayWrapper, mapState);
                 break;
+            case GET_ALL_FLAG:
+                response = handleMapGetAllRequest(getRequest, mapState);
+                break;
             case CHECK_EMPTY_FLAG:
                 response = handleMapCheckEmptyRequest(mapState);
                 break;
@@ -431,12 +514,17 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         // [map value length (int32)][map value][append request flag (1 byte)][map key length
         // (int32)][map key]
         // ...
+        // The CLEAR request only consists of the append request flag.
         byte[] appendBytes = request.getAppend().getData().toByteArray();
         bais.setBuffer(appendBytes, 0, appendBytes.length);
         MapState<ByteArrayWrapper, byte[]> mapState = getMapState(request);
         int subRequestNum = baisWrapper.readInt();
         for (int i = 0; i < subRequestNum; i++) {
             byte requestFlag = baisWrapper.readByte();
+            if (requestFlag == CLEAR) {
+                mapState.clear();
+                continue;
+            }
             int keyLength = baisWrapper.readInt();
             reuseByteArrayWrapper.setData(appendBytes);
             reuseByteArrayWrapper.setOffset(bais.getPosition());
@@ -475,7 +563,7 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
                 .getMultimapSideInput()
                 .getTransformId()
                 .equals(CLEAR_CACHED_ITERATOR_MARK)) {
-            mapStateIteratorCache.clear();
+            stateIteratorCache.clear();
         } else {
             MapState<ByteArrayWrapper, byte[]> partitionedState = getMapState(request);
             partitionedState.clear();
@@ -504,6 +592,37 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         }
     }
 
+    private BeamFnApi.StateGetResponse.Builder handleMapGetAllRequest(
+            byte[] getRequest, MapState<ByteArrayWrapper, byte[]> mapState) throws Exception {
+        // The structure of the response bytes is:
+        // [response flag (1 byte)][map value length (int32)][map value][response flag (1 byte)]...
+        // The map value length and the map value only exist when the response flag is EXIST_FLAG.
+        bais.setBuffer(getRequest, 1, getRequest.length - 1);
+        int keyNum = baisWrapper.readInt();
+        baos.reset();
+        for (int i = 0; i < keyNum; i++) {
+            int keyLength = baisWrapper.readInt();
+            reuseByteArrayWrapper.setData(getRequest);
+            reuseByteArrayWrapper.setOffset(bais.getPosition());
+            reuseByteArrayWrapper.setLimit(bais.getPosition() + keyLength);
+            baisWrapper.skipBytesToRead(keyLength);
+            if (mapState.contains(reuseByteArrayWrapper)) {
+                byte[] value = mapState.get(reuseByteArrayWrapper);
+                if (value == null) {
+                    baosWrapper.writeByte(IS_NONE_FLAG);
+                } else {
+                    baosWrapper.writeByte(EXIST_FLAG);
+                    baosWrapper.writeInt(value.length);
+                    baosWrapper.write(value);
+                }
+            } else {
+                baosWrapper.writeByte(NOT_EXIST_FLAG);
+            }
+        }
+        return BeamFnApi.StateGetResponse.newBuilder()
+                .setData(ByteString.copyFrom(baos.toByteArray()));
+    }
+
     private BeamFnApi.StateGetResponse.Builder handleMapCheckEmptyRequest(
             MapState<ByteArrayWrapper, byte[]> mapState) throws Exception {
         if (mapState.isEmpty()) {
@@ -532,7 +651,7 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
                     throw new RuntimeException("Unsupported iterate type: " + iterateType);
             }
         } else {
-            iterator = mapStateIteratorCache.get(iteratorToken);
+            iterator = stateIteratorCache.get(iteratorToken);
             if (iterator == null) {
                 throw new RuntimeException("The cached iterator does not exist!");
             }
@@ -574,14 +693,14 @@ public class SimpleStateRequestHandler implements StateRequestHandler {
         }
         if (!iterator.hasNext()) {
             if (iteratorToken != null) {
-                mapStateIteratorCache.remove(iteratorToken);
+                stateIteratorCache.remove(iteratorToken);
             }
             iteratorToken = null;
         } else {
             if (iteratorToken == null) {
                 iteratorToken = new ByteArrayWrapper(UUID.randomUUID().toString().getBytes());
             }
-            mapStateIteratorCache.put(iteratorToken, iterator);
+            stateIteratorCache.put(iteratorToken, iterator);
         }
         BeamFnApi.StateGetResponse.Builder responseBuilder =
                 BeamFnApi.StateGetResponse.newBuilder()
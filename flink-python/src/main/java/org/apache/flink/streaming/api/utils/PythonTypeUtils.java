@@ -63,11 +63,16 @@ import org.apache.flink.table.runtime.typeutils.serializers.python.StringSeriali
 import org.apache.flink.table.runtime.typeutils.serializers.python.TimeSerializer;
 import org.apache.flink.table.runtime.typeutils.serializers.python.TimestampSerializer;
 import org.apache.flink.table.types.utils.LegacyTypeInfoDataTypeConverter;
+import org.apache.flink.types.Row;
 
 import org.apache.flink.shaded.guava30.com.google.common.collect.Sets;
 
+import java.io.Serializable;
+import java.lang.reflect.Array;
+import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.HashMap;
+import java.util.List;
 import java.util.Map;
 import java.util.Set;
 
@@ -555,4 +560,437 @@ public class PythonTypeUtils {
                             typeInformation.toString()));
         }
     }
+
+    /**
+     * Data Converter that converts the data to the java format data which can be used in PemJa,
+     * e.g. a {@link Row} is converted to an Object array as PemJa converts a Python list to an
+     * Object array.
+     */
+    public abstract static class DataConverter<IN, OUT> implements Serializable {
+
+        private static final long serialVersionUID = 1L;
+
+        public abstract IN toInternal(OUT value);
+
+        public abstract OUT toExternal(IN value);
+    }
+
+    /** Identity data converter. */
+    public static final class IdentityDataConverter<T> extends DataConverter<T, T> {
+
+        private static final long serialVersionUID = 1L;
+
+        @Override
+        public T toInternal(T value) {
+            return value;
+        }
+
+        @Override
+        public T toExternal(T value) {
+            return value;
+        }
+    }
+
+    /**
+     * Python Long will be converted to Long in PemJa, so we need ByteDataConverter to convert Java
+     * Long to internal Byte.
+     */
+    public static final class ByteDataConverter extends DataConverter<Byte, Long> {
+
+        private static final long serialVersionUID = 1L;
+
+        public static final ByteDataConverter INSTANCE = new ByteDataConverter();
+
+        @Override
+        public Byte toInternal(Long value) {
+            return value == null ? null : value.byteValue();
+        }
+
+        @Override
+        public Long toExternal(Byte value) {
+            return value == null ? null : value.longValue();
+        }
+    }
+
+    /**
+     * Python Long will be converted to Long in PemJa, so we need ShortDataConverter to convert Java
+     * Long to internal Short.
+     */
+    public static final class ShortDataConverter extends DataConverter<Short, Long> {
+
+        private static final long serialVersionUID = 1L;
+
+        public static final ShortDataConverter INSTANCE = new ShortDataConverter();
+
+        @Override
+        public Short toInternal(Long value) {
+            return value == null ? null : value.shortValue();
+        }
+
+        @Override
+        public Long toExternal(Short value) {
+            return value == null ? null : value.longValue();
+        }
+    }
+
+    /**
+     * Python Long will be converted to Long in PemJa, so we need IntDataConverter to convert Java
+     * Long to internal Integer.
+     */
+    public static final class IntDataConverter extends DataConverter<Integer, Long> {
+
+        private static final long serialVersionUID = 1L;
+
+        public static final IntDataConverter INSTANCE = new IntDataConverter();
+
+        @Override
+        public Integer toInternal(Long value) {
+            return value == null ? null : value.intValue();
+        }
+
+        @Override
+        public Long toExternal(Integer value) {
+            return value == null ? null : value.longValue();
+        }
+    }
+
+    /**
+     * Python Float will be converted to Double in PemJa, so we need FloatDataConverter to convert
+     * Java Double to internal Float.
+     */
+    public static final class FloatDataConverter extends DataConverter<Float, Double> {
+
+        private static final long serialVersionUID = 1L;
+
+        public static final FloatDataConverter INSTANCE = new FloatDataConverter();
+
+        @Override
+        public Float toInternal(Double value) {
+            return value == null ? null : value.floatValue();
+        }
+
+        @Override
+        public Double toExternal(Float value) {
+            return value == null ? null : value.doubleValue();
+        }
+    }
+
+    /**
+     * Python str will be converted to String in PemJa, so we need CharDataConverter to convert
+     * Java String to internal Character.
+     */
+    public static final class CharDataConverter extends DataConverter<Character, String> {
+
+        private static final long serialVersionUID = 1L;
+
+        public static final CharDataConverter INSTANCE = new CharDataConverter();
+
+        @Override
+        public Character toInternal(String value) {
+            return value == null ? null : value.charAt(0);
+        }
+
+        @Override
+        public String toExternal(Character value) {
+            return value == null ? null : String.valueOf(value);
+        }
+    }
+
+    /** Converts a {@link Row} from and to an Object array. */
+    public static final class RowDataConverter extends DataConverter<Row, Object[]> {
+
+        private static final long serialVersionUID = 1L;
+
+        private final DataConverter[] fieldDataConverters;
+
+        RowDataConverter(DataConverter[] fieldDataConverters) {
+            this.fieldDataConverters = fieldDataConverters;
+        }
+
+        @SuppressWarnings("unchecked")
+        @Override
+        public Row toInternal(Object[] value) {
+            if (value == null) {
+                return null;
+            }
+            Row row = new Row(fieldDataConverters.length);
+            for (int i = 0; i < fieldDataConverters.length; i++) {
+                row.setField(i, fieldDataConverters[i].toInternal(value[i]));
+            }
+            return row;
+        }
+
+        @SuppressWarnings("unchecked")
+        @Override
+        public Object[] toExternal(Row value) {
+            if (value == null) {
+                return null;
+            }
+            Object[] fields = new Object[fieldDataConverters.length];
+            for (int i = 0; i < fieldDataConverters.length; i++) {
+                fields[i] = fieldDataConverters[i].toExternal(value.getField(i));
+            }
+            return fields;
+        }
+    }
+
+    /** Converts a {@link Tuple} from and to an Object array. */
+    public static final class TupleDataConverter extends DataConverter<Tuple, Object[]> {
+
+        private static final long serialVersionUID = 1L;
+
+        private final DataConverter[] fieldDataConverters;
+
+        TupleDataConverter(DataConverter[] fieldDataConverters) {
+            this.fieldDataConverters = fieldDataConverters;
+        }
+
+        @SuppressWarnings("unchecked")
+        @Override
+        public Tuple toInternal(Object[] value) {
+            if (value == null) {
+                return null;
+            }
+            Tuple tuple = Tuple.newInstance(fieldDataConverters.length);
+            for (int i = 0; i < fieldDataConverters.length; i++) {
+                tuple.setField(fieldDataConverters[i].toInternal(value[i]), i);
+            }
+            return tuple;
+        }
+
+        @SuppressWarnings("unchecked")
+        @Override
+        public Object[] toExternal(Tuple value) {
+            if (value == null) {
+                return null;
+            }
+            Object[] fields = new Object[fieldDataConverters.length];
+            for (int i = 0; i < fieldDataConverters.length; i++) {
+                fields[i] = fieldDataConverters[i].toExternal(value.getField(i));
+            }
+            return fields;
+        }
+    }
+
+    /** Converts an array of objects from and to an Object array. */
+    public static final class ArrayDataConverter<T> extends DataConverter<T[], Object[]> {
+
+        private static final long serialVersionUID = 1L;
+
+        private final Class<T> componentClass;
+
+        private final DataConverter<T, Object> elementDataConverter;
+
+        ArrayDataConverter(Class<T> componentClass, DataConverter<T, Object> elementDataConverter) {
+            this.componentClass = componentClass;
+            this.elementDataConverter = elementDataConverter;
+        }
+
+        @SuppressWarnings("unchecked")
+        @Override
+        public T[] toInternal(Object[] value) {
+            if (value == null) {
+                return null;
+            }
+            T[] array = (T[]) Array.newInstance(componentClass, value.length);
+            for (int i = 0; i < value.length; i++) {
+                array[i] = elementDataConverter.toInternal(value[i]);
+            }
+            return array;
+        }
+
+        @Override
+        public Object[] toExternal(T[] value) {
+            if (value == null) {
+                return null;
+            }
+            Object[] array = new Object[value.length];
+            for (int i = 0; i < value.length; i++) {
+                array[i] = elementDataConverter.toExternal(value[i]);
+            }
+            return array;
+        }
+    }
+
+    /** Converts a {@link List} from and to an Object array. */
+    public static final class ListDataConverter<T> extends DataConverter<List<T>, Object[]> {
+
+        private static final long serialVersionUID = 1L;
+
+        private final DataConverter<T, Object> elementDataConverter;
+
+        ListDataConverter(DataConverter<T, Object> elementDataConverter) {
+            this.elementDataConverter = elementDataConverter;
+        }
+
+        @Override
+        public List<T> toInternal(Object[] value) {
+            if (value == null) {
+                return null;
+            }
+            List<T> list = new ArrayList<>(value.length);
+            for (Object element : value) {
+                list.add(elementDataConverter.toInternal(element));
+            }
+            return list;
+        }
+
+        @Override
+        public Object[] toExternal(List<T> value) {
+            if (value == null) {
+                return null;
+            }
+            Object[] array = new Object[value.size()];
+            int i = 0;
+            for (T element : value) {
+                array[i++] = elementDataConverter.toExternal(element);
+            }
+            return array;
+        }
+    }
+
+    /** Converts the keys and the values of a {@link Map}. */
+    public static final class MapDataConverter<K, V>
+            extends DataConverter<Map<K, V>, Map<Object, Object>> {
+
+        private static final long serialVersionUID = 1L;
+
+        private final DataConverter<K, Object> keyDataConverter;
+
+        private final DataConverter<V, Object> valueDataConverter;
+
+        MapDataConverter(
+                DataConverter<K, Object> keyDataConverter,
+                DataConverter<V, Object> valueDataConverter) {
+            this.keyDataConverter = keyDataConverter;
+            this.valueDataConverter = valueDataConverter;
+        }
+
+        @Override
+        public Map<K, V> toInternal(Map<Object, Object> value) {
+            if (value == null) {
+                return null;
+            }
+            Map<K, V> map = new HashMap<>(value.size());
+            for (Map.Entry<Object, Object> entry : value.entrySet()) {
+                map.put(
+                        keyDataConverter.toInternal(entry.getKey()),
+                        valueDataConverter.toInternal(entry.getValue()));
+            }
+            return map;
+        }
+
+        @Override
+        public Map<Object, Object> toExternal(Map<K, V> value) {
+            if (value == null) {
+                return null;
+            }
+            Map<Object, Object> map = new HashMap<>(value.size());
+            for (Map.Entry<K, V> entry : value.entrySet()) {
+                map.put(
+                        keyDataConverter.toExternal(entry.getKey()),
+                        valueDataConverter.toExternal(entry.getValue()));
+            }
+            return map;
+        }
+    }
+
+    /**
+     * Get the data converters which convert the data according to the given typeInformation to the
+     * java format data which can be used in PemJa. It's used in the embedded (thread) mode.
+     */
+    public static class TypeInfoToDataConverter {
+
+        private static final Set<TypeInformation<?>> identityTypeInfos =
+                Sets.newHashSet(
+                        BasicTypeInfo.BOOLEAN_TYPE_INFO,
+                        BasicTypeInfo.LONG_TYPE_INFO,
+                        BasicTypeInfo.DOUBLE_TYPE_INFO,
+                        BasicTypeInfo.STRING_TYPE_INFO,
+                        PrimitiveArrayTypeInfo.BYTE_PRIMITIVE_ARRAY_TYPE_INFO);
+
+        @SuppressWarnings("unchecked")
+        public static <IN, OUT> DataConverter<IN, OUT> typeInfoDataConverter(
+                TypeInformation<IN> typeInformation) {
+            if (identityTypeInfos.contains(typeInformation)
+                    || typeInformation instanceof PickledByteArrayTypeInfo) {
+                return new IdentityDataConverter();
+            }
+
+            if (typeInformation.equals(BasicTypeInfo.BYTE_TYPE_INFO)) {
+                return (DataConverter<IN, OUT>) ByteDataConverter.INSTANCE;
+            }
+
+            if (typeInformation.equals(BasicTypeInfo.SHORT_TYPE_INFO)) {
+                return (DataConverter<IN, OUT>) ShortDataConverter.INSTANCE;
+            }
+
+            if (typeInformation.equals(BasicTypeInfo.INT_TYPE_INFO)) {
+                return (DataConverter<IN, OUT>) IntDataConverter.INSTANCE;
+            }
+
+            if (typeInformation.equals(BasicTypeInfo.FLOAT_TYPE_INFO)) {
+                return (DataConverter<IN, OUT>) FloatDataConverter.INSTANCE;
+            }
+
+            if (typeInformation.equals(BasicTypeInfo.CHAR_TYPE_INFO)) {
+                return (DataConverter<IN, OUT>) CharDataConverter.INSTANCE;
+            }
+
+            if (typeInformation instanceof RowTypeInfo) {
+                DataConverter[] fieldDataConverters =
+                        Arrays.stream(((RowTypeInfo) typeInformation).getFieldTypes())
+                                .map(TypeInfoToDataConverter::typeInfoDataConverter)
+                                .toArray(DataConverter[]::new);
+                return (DataConverter<IN, OUT>) new RowDataConverter(fieldDataConverters);
+            }
+
+            if (typeInformation instanceof TupleTypeInfo) {
+                TupleTypeInfo<?> tupleTypeInfo = (TupleTypeInfo<?>) typeInformation;
+                DataConverter[] fieldDataConverters = new DataConverter[tupleTypeInfo.getArity()];
+                for (int idx = 0; idx < tupleTypeInfo.getArity(); idx++) {
+                    fieldDataConverters[idx] = typeInfoDataConverter(tupleTypeInfo.getTypeAt(idx));
+                }
+                return (DataConverter<IN, OUT>) new TupleDataConverter(fieldDataConverters);
+            }
+
+            if (typeInformation instanceof BasicArrayTypeInfo) {
+                BasicArrayTypeInfo<?, ?> basicArrayTypeInfo =
+                        (BasicArrayTypeInfo<?, ?>) typeInformation;
+                return (DataConverter<IN, OUT>)
+                        new ArrayDataConverter(
+                                basicArrayTypeInfo.getComponentTypeClass(),
+                                typeInfoDataConverter(basicArrayTypeInfo.getComponentInfo()));
+            }
+
+            if (typeInformation instanceof ObjectArrayTypeInfo) {
+                ObjectArrayTypeInfo<?, ?> objectArrayTypeInfo =
+                        (ObjectArrayTypeInfo<?, ?>) typeInformation;
+                return (DataConverter<IN, OUT>)
+                        new ArrayDataConverter(
+                                objectArrayTypeInfo.getComponentInfo().getTypeClass(),
+                                typeInfoDataConverter(objectArrayTypeInfo.getComponentInfo()));
+            }
+
+            if (typeInformation instanceof ListTypeInfo) {
+                return (DataConverter<IN, OUT>)
+                        new ListDataConverter(
+                                typeInfoDataConverter(
+                                        ((ListTypeInfo<?>) typeInformation).getElementTypeInfo()));
+            }
+
+            if (typeInformation instanceof MapTypeInfo) {
+                MapTypeInfo<?, ?> mapTypeInfo = (MapTypeInfo<?, ?>) typeInformation;
+                return (DataConverter<IN, OUT>)
+                        new MapDataConverter(
+                                typeInfoDataConverter(mapTypeInfo.getKeyTypeInfo()),
+                                typeInfoDataConverter(mapTypeInfo.getValueTypeInfo()));
+            }
+
+            throw new UnsupportedOperationException(
+                    String.format(
+                            "The type [%s] is not supported in the thread mode yet.",
+                            typeInformation.toString()));
+        }
+    }
 }
@@ -270,6 +270,9 @@ public abstract class AbstractPythonStreamAggregateOperator
         jobOptions.put(
                 PythonOptions.MAP_STATE_ITERATE_RESPONSE_BATCH_SIZE.key(),
                 String.valueOf(config.get(PythonOptions.MAP_STATE_ITERATE_RESPONSE_BATCH_SIZE)));
+        jobOptions.put(
+                PythonOptions.LIST_STATE_ITERATE_RESPONSE_BATCH_SIZE.key(),
+                String.valueOf(config.get(PythonOptions.LIST_STATE_ITERATE_RESPONSE_BATCH_SIZE)));
     }
 
     public FlinkFnApi.CoderInfoDescriptor createInputCoderInfoDescriptor(RowType runnerInputType) {
@@ -0,0 +1,72 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+package org.apache.flink.table.runtime.operators.python.aggregate;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.annotation.VisibleForTesting;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.table.functions.python.PythonAggregateFunctionInfo;
+import org.apache.flink.table.runtime.dataview.DataViewSpec;
+import org.apache.flink.table.types.logical.RowType;
+
+/**
+ * The Python AggregateFunction operator for the global phase of a two-phase aggregation. The
+ * input of each aggregate function is the serialized accumulator emitted by {@link
+ * PythonStreamLocalGroupAggregateOperator}, which is merged into the accumulator of the key kept
+ * in the state.
+ */
+@Internal
+public class PythonStreamGlobalGroupAggregateOperator extends PythonStreamGroupAggregateOperator {
+
+    private static final long serialVersionUID = 1L;
+
+    @VisibleForTesting
+    protected static final String STREAM_GLOBAL_GROUP_AGGREGATE_URN =
+            "flink:transform:stream_global_group_aggregate:v1";
+
+    public PythonStreamGlobalGroupAggregateOperator(
+            Configuration config,
+            RowType inputType,
+            RowType outputType,
+            PythonAggregateFunctionInfo[] aggregateFunctions,
+            DataViewSpec[][] dataViewSpecs,
+            int[] grouping,
+            int indexOfCountStar,
+            boolean countStarInserted,
+            boolean generateUpdateBefore,
+            long minRetentionTime,
+            long maxRetentionTime) {
+        super(
+                config,
+                inputType,
+                outputType,
+                aggregateFunctions,
+                dataViewSpecs,
+                grouping,
+                indexOfCountStar,
+                countStarInserted,
+                generateUpdateBefore,
+                minRetentionTime,
+                maxRetentionTime);
+    }
+
+    @Override
+    public String getFunctionUrn() {
+        return STREAM_GLOBAL_GROUP_AGGREGATE_URN;
+    }
+}
@@ -0,0 +1,194 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+package org.apache.flink.table.runtime.operators.python.aggregate;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.annotation.VisibleForTesting;
+import org.apache.flink.api.common.typeutils.TypeSerializer;
+import org.apache.flink.api.java.tuple.Tuple2;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.core.memory.ByteArrayInputStreamWithPos;
+import org.apache.flink.core.memory.ByteArrayOutputStreamWithPos;
+import org.apache.flink.core.memory.DataInputViewStreamWrapper;
+import org.apache.flink.core.memory.DataOutputViewStreamWrapper;
+import org.apache.flink.core.memory.ManagedMemoryUseCase;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.python.PythonFunctionRunner;
+import org.apache.flink.streaming.api.utils.ProtoUtils;
+import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.table.connector.Projection;
+import org.apache.flink.table.data.RowData;
+import org.apache.flink.table.functions.python.PythonAggregateFunctionInfo;
+import org.apache.flink.table.functions.python.PythonEnv;
+import org.apache.flink.table.runtime.operators.python.AbstractOneInputPythonFunctionOperator;
+import org.apache.flink.table.runtime.operators.python.utils.StreamRecordRowDataWrappingCollector;
+import org.apache.flink.table.runtime.runners.python.beam.BeamTablePythonFunctionRunner;
+import org.apache.flink.table.runtime.typeutils.PythonTypeUtils;
+import org.apache.flink.table.types.logical.RowType;
+import org.apache.flink.util.Preconditions;
+
+import java.util.Arrays;
+import java.util.stream.Collectors;
+
+import static org.apache.flink.streaming.api.utils.ProtoUtils.createRowTypeCoderInfoDescriptorProto;
+import static org.apache.flink.table.runtime.typeutils.PythonTypeUtils.toProtoType;
+
+/**
+ * The Python AggregateFunction operator for the local phase of a two-phase aggregation. The
+ * Python worker accumulates the input rows of each key within a bundle and emits the grouping
+ * keys followed by the serialized accumulators at the end of the bundle. It doesn't access any
+ * state, the accumulators are merged by {@link PythonStreamGlobalGroupAggregateOperator} after
+ * the shuffle.
+ */
+@Internal
+public class PythonStreamLocalGroupAggregateOperator
+        extends AbstractOneInputPythonFunctionOperator<RowData, RowData> {
+
+    private static final long serialVersionUID = 1L;
+
+    @VisibleForTesting
+    protected static final String STREAM_LOCAL_GROUP_AGGREGATE_URN =
+            "flink:transform:stream_local_group_aggregate:v1";
+
+    private final PythonAggregateFunctionInfo[] aggregateFunctions;
+
+    /** The input logical type. */
+    private final RowType inputType;
+
+    /** The output logical type. */
+    private final RowType outputType;
+
+    /** The array of the key indexes. */
+    private final int[] grouping;
+
+    /** The TypeSerializer for udf execution results. */
+    private transient TypeSerializer<RowData> udfOutputTypeSerializer;
+
+    /** The TypeSerializer for udf input elements. */
+    private transient TypeSerializer<RowData> udfInputTypeSerializer;
+
+    /** Reusable InputStream used to holding the execution results to be deserialized. */
+    private transient ByteArrayInputStreamWithPos bais;
+
+    /** InputStream Wrapper. */
+    private transient DataInputViewStreamWrapper baisWrapper;
+
+    /** Reusable OutputStream used to holding the serialized input elements. */
+    private transient ByteArrayOutputStreamWithPos baos;
+
+    /** OutputStream Wrapper. */
+    private transient DataOutputViewStreamWrapper baosWrapper;
+
+    /** The collector used to collect records. */
+    private transient StreamRecordRowDataWrappingCollector rowDataWrapper;
+
+    public PythonStreamLocalGroupAggregateOperator(
+            Configuration config,
+            RowType inputType,
+            RowType outputType,
+            PythonAggregateFunctionInfo[] aggregateFunctions,
+            int[] grouping) {
+        super(config);
+        this.inputType = Preconditions.checkNotNull(inputType);
+        this.outputType = Preconditions.checkNotNull(outputType);
+        this.aggregateFunctions = aggregateFunctions;
+        this.grouping = grouping;
+    }
+
+    @Override
+    public void open() throws Exception {
+        bais = new ByteArrayInputStreamWithPos();
+        baisWrapper = new DataInputViewStreamWrapper(bais);
+        baos = new ByteArrayOutputStreamWithPos();
+        baosWrapper = new DataOutputViewStreamWrapper(baos);
+        udfInputTypeSerializer = PythonTypeUtils.toInternalSerializer(inputType);
+        udfOutputTypeSerializer = PythonTypeUtils.toInternalSerializer(outputType);
+        rowDataWrapper = new StreamRecordRowDataWrappingCollector(output);
+        super.open();
+    }
+
+    @Override
+    public void processElement(StreamRecord<RowData> element) throws Exception {
+        udfInputTypeSerializer.serialize(element.getValue(), baosWrapper);
+        pythonFunctionRunner.process(baos.toByteArray());
+        baos.reset();
+        elementCount++;
+        checkInvokeFinishBundleByCount();
+        emitResults();
+    }
+
+    @Override
+    public void emitResult(Tuple2<byte[], Integer> resultTuple) throws Exception {
+        byte[] rawUdfResult = resultTuple.f0;
+        int length = resultTuple.f1;
+        bais.setBuffer(rawUdfResult, 0, length);
+        RowData udfResult = udfOutputTypeSerializer.deserialize(baisWrapper);
+        rowDataWrapper.collect(udfResult);
+    }
+
+    @Override
+    public PythonFunctionRunner createPythonFunctionRunner() throws Exception {
+        return BeamTablePythonFunctionRunner.stateless(
+                getRuntimeContext().getTaskName(),
+                createPythonEnvironmentManager(),
+                STREAM_LOCAL_GROUP_AGGREGATE_URN,
+                getUserDefinedFunctionsProto(),
+                jobOptions,
+                getFlinkMetricContainer(),
+                getContainingTask().getEnvironment().getMemoryManager(),
+                getOperatorConfig()
+                        .getManagedMemoryFractionOperatorUseCaseOfSlot(
+                                ManagedMemoryUseCase.PYTHON,
+                                getContainingTask()
+                                        .getEnvironment()
+                                        .getTaskManagerInfo()
+                                        .getConfiguration(),
+                                getContainingTask()
+                                        .getEnvironment()
+                                        .getUserCodeClassLoader()
+                                        .asClassLoader()),
+                createRowTypeCoderInfoDescriptorProto(
+                        inputType, FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE, false),
+                createRowTypeCoderInfoDescriptorProto(
+                        outputType, FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE, false));
+    }
+
+    @Override
+    public PythonEnv getPythonEnv() {
+        return aggregateFunctions[0].getPythonFunction().getPythonEnv();
+    }
+
+    /**
+     * Gets the proto representation of the Python user-defined aggregate functions to be executed.
+     */
+    @VisibleForTesting
+    FlinkFnApi.UserDefinedAggregateFunctions getUserDefinedFunctionsProto() {
+        FlinkFnApi.UserDefinedAggregateFunctions.Builder builder =
+                FlinkFnApi.UserDefinedAggregateFunctions.newBuilder();
+        builder.setMetricEnabled(pythonConfig.isMetricEnabled());
+        builder.setProfileEnabled(pythonConfig.isProfileEnabled());
+        builder.addAllGrouping(Arrays.stream(grouping).boxed().collect(Collectors.toList()));
+        builder.setIndexOfCountStar(-1);
+        builder.setKeyType(toProtoType((RowType) Projection.of(grouping).project(inputType)));
+        for (PythonAggregateFunctionInfo aggregateFunction : aggregateFunctions) {
+            builder.addUdfs(
+                    ProtoUtils.getUserDefinedAggregateFunctionProto(aggregateFunction, null));
+        }
+        return builder.build();
+    }
+}
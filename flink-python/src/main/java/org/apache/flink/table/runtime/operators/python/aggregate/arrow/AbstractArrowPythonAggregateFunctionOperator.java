@@ -91,11 +91,16 @@ public abstract class AbstractArrowPythonAggregateFunctionOperator
         udafInputProjection =
                 udafInputGeneratedProjection.newInstance(
                         Thread.currentThread().getContextClassLoader());
-        arrowSerializer = new ArrowSerializer(udfInputType, udfOutputType);
+        arrowSerializer = createArrowSerializer();
         arrowSerializer.open(bais, baos);
         currentBatchCount = 0;
     }
 
+    /** Creates the {@link ArrowSerializer} of the data exchanged with the Python worker. */
+    protected ArrowSerializer createArrowSerializer() {
+        return new ArrowSerializer(udfInputType, udfOutputType);
+    }
+
     @Override
     public void close() throws Exception {
         super.close();
@@ -19,16 +19,23 @@
 package org.apache.flink.table.runtime.operators.python.aggregate.arrow.stream;
 
 import org.apache.flink.annotation.Internal;
+import org.apache.flink.annotation.VisibleForTesting;
 import org.apache.flink.api.common.ExecutionConfig;
 import org.apache.flink.api.common.state.ListState;
 import org.apache.flink.api.common.state.ListStateDescriptor;
 import org.apache.flink.api.common.state.State;
 import org.apache.flink.api.common.state.StateDescriptor;
+import org.apache.flink.api.common.state.ValueState;
+import org.apache.flink.api.common.state.ValueStateDescriptor;
 import org.apache.flink.api.common.typeutils.TypeSerializer;
 import org.apache.flink.api.java.tuple.Tuple2;
+import org.apache.flink.api.java.tuple.Tuple3;
 import org.apache.flink.configuration.Configuration;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
 import org.apache.flink.metrics.MetricGroup;
+import org.apache.flink.python.PythonOptions;
 import org.apache.flink.runtime.state.internal.InternalListState;
+import org.apache.flink.runtime.state.internal.InternalValueState;
 import org.apache.flink.streaming.api.operators.InternalTimer;
 import org.apache.flink.streaming.api.operators.InternalTimerService;
 import org.apache.flink.streaming.api.operators.Triggerable;
@@ -39,8 +46,12 @@ import org.apache.flink.table.data.binary.BinaryRowData;
 import org.apache.flink.table.data.binary.BinaryRowDataUtil;
 import org.apache.flink.table.data.util.RowDataUtil;
 import org.apache.flink.table.data.utils.JoinedRowData;
+import org.apache.flink.table.data.utils.ProjectedRowData;
 import org.apache.flink.table.functions.AggregateFunction;
+import org.apache.flink.table.functions.python.PythonAggregateFunction;
+import org.apache.flink.table.functions.python.PythonFunction;
 import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.runtime.arrow.serializers.ArrowSerializer;
 import org.apache.flink.table.runtime.generated.GeneratedProjection;
 import org.apache.flink.table.runtime.groupwindow.NamedWindowProperty;
 import org.apache.flink.table.runtime.groupwindow.ProctimeAttribute;
@@ -55,13 +66,17 @@ import org.apache.flink.table.runtime.operators.window.internal.InternalWindowPr
 import org.apache.flink.table.runtime.operators.window.triggers.Trigger;
 import org.apache.flink.table.runtime.typeutils.RowDataSerializer;
 import org.apache.flink.table.types.logical.RowType;
+import org.apache.flink.table.types.logical.VarBinaryType;
 import org.apache.flink.types.RowKind;
 
 import java.time.ZoneId;
 import java.util.ArrayList;
 import java.util.Collection;
+import java.util.LinkedHashSet;
 import java.util.LinkedList;
 import java.util.List;
+import java.util.Set;
+import java.util.stream.IntStream;
 
 import static org.apache.flink.table.runtime.util.TimeWindowUtil.toEpochMills;
 import static org.apache.flink.table.runtime.util.TimeWindowUtil.toEpochMillsForTimer;
@@ -74,6 +89,12 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
 
     private static final long serialVersionUID = 1L;
 
+    @VisibleForTesting
+    static final String PANDAS_INCREMENTAL_AGGREGATE_FUNCTION_URN =
+            "flink:transform:incremental_aggregate_function:arrow:v1";
+
+    private static final String ACCUMULATORS_FIELD_NAME = "__accumulators";
+
     /** The Infos of the Window. */
     private WindowProperty[] namedProperties;
 
@@ -123,9 +144,51 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
 
     /**
      * The queue holding the input groupSet with the Window for which the execution results have not
-     * been received.
+     * been received, and whether the results are the accumulators of the buffered rows of the
+     * window instead of the window results to be emitted.
+     */
+    private transient LinkedList<Tuple3<RowData, W, Boolean>> inputKeyAndWindow;
+
+    /**
+     * Whether the buffered rows of the windows are aggregated incrementally into the accumulators
+     * of the Pandas UDAFs whenever a bundle is finished, instead of all at once when the windows
+     * fire.
+     */
+    private transient boolean incremental;
+
+    /**
+     * The input type of the Pandas UDAFs when aggregating incrementally, which is the udf input
+     * type followed by the pickled accumulators. The accumulators are only set in the first row of
+     * each batch.
+     */
+    private transient RowType incrementalInputType;
+
+    /**
+     * The output type of the Pandas UDAFs when aggregating incrementally, which is the udf output
+     * type followed by the pickled accumulators the results are computed from.
      */
-    private transient LinkedList<Tuple2<RowData, W>> inputKeyAndWindow;
+    private transient RowType incrementalOutputType;
+
+    /** Stores the accumulators and the results of the rows of the window aggregated so far. */
+    private transient InternalValueState<K, W, RowData> windowAccumulators;
+
+    /** The windows whose buffered rows have not been aggregated into the accumulators yet. */
+    private transient Set<Tuple2<RowData, W>> windowsToAccumulate;
+
+    /** The number of the buffered rows which have not been aggregated yet. */
+    private transient int rowsToAccumulate;
+
+    private transient RowDataSerializer accumulatorsSerializer;
+
+    /** The JoinedRowData reused holding the input of the Pandas UDAFs and the accumulators. */
+    private transient JoinedRowData incrementalInput;
+
+    private transient GenericRowData accumulatorsField;
+
+    private transient GenericRowData emptyAccumulatorsField;
+
+    /** The ProjectedRowData reused holding the results without the accumulators. */
+    private transient ProjectedRowData incrementalResult;
 
     /**
      * The GenericRowData reused holding the property of the window, such as window start, window
@@ -170,6 +233,13 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
 
     @Override
     public void open() throws Exception {
+        incremental =
+                config.get(PythonOptions.PANDAS_INCREMENTAL_WINDOW_AGGREGATE_ENABLED)
+                        && supportsIncrementalAggregation(pandasAggFunctions);
+        if (incremental) {
+            incrementalInputType = appendAccumulatorsField(udfInputType);
+            incrementalOutputType = appendAccumulatorsField(udfOutputType);
+        }
         super.open();
         windowSerializer = windowAssigner.getWindowSerializer(new ExecutionConfig());
 
@@ -192,12 +262,59 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
         windowProperty = new GenericRowData(namedProperties.length);
         windowAggResult = new JoinedRowData();
 
+        if (incremental) {
+            accumulatorsSerializer = new RowDataSerializer(incrementalOutputType);
+            StateDescriptor<ValueState<RowData>, RowData> accumulatorsStateDescriptor =
+                    new ValueStateDescriptor<>("window-accumulators", accumulatorsSerializer);
+            this.windowAccumulators =
+                    (InternalValueState<K, W, RowData>)
+                            getOrCreateKeyedState(windowSerializer, accumulatorsStateDescriptor);
+            windowsToAccumulate = new LinkedHashSet<>();
+            rowsToAccumulate = 0;
+            incrementalInput = new JoinedRowData();
+            accumulatorsField = new GenericRowData(1);
+            emptyAccumulatorsField = new GenericRowData(1);
+            incrementalResult =
+                    ProjectedRowData.from(
+                            IntStream.range(0, udfOutputType.getFieldCount()).toArray());
+        }
+
         WindowContext windowContext = new WindowContext();
         windowAssigner.open(windowContext);
     }
 
+    @Override
+    protected ArrowSerializer createArrowSerializer() {
+        if (incremental) {
+            return new ArrowSerializer(incrementalInputType, incrementalOutputType);
+        } else {
+            return super.createArrowSerializer();
+        }
+    }
+
+    @Override
+    public String getFunctionUrn() {
+        return incremental ? PANDAS_INCREMENTAL_AGGREGATE_FUNCTION_URN : super.getFunctionUrn();
+    }
+
+    @Override
+    public FlinkFnApi.CoderInfoDescriptor createInputCoderInfoDescriptor(RowType runnerInputType) {
+        return super.createInputCoderInfoDescriptor(
+                incremental ? incrementalInputType : runnerInputType);
+    }
+
+    @Override
+    public FlinkFnApi.CoderInfoDescriptor createOutputCoderInfoDescriptor(RowType runnerOutType) {
+        return super.createOutputCoderInfoDescriptor(
+                incremental ? incrementalOutputType : runnerOutType);
+    }
+
     @Override
     public void bufferInput(RowData input) throws Exception {
+        if (incremental && !RowDataUtil.isAccumulateMsg(input)) {
+            throw new UnsupportedOperationException(
+                    "The Pandas UDAFs could only aggregate insert-only input incrementally.");
+        }
         if (windowAssigner.isEventTime()) {
             timestamp = input.getLong(inputTimeFieldIndex);
         } else {
@@ -212,6 +329,10 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
             if (RowDataUtil.isAccumulateMsg(input)) {
                 windowAccumulateData.setCurrentNamespace(window);
                 windowAccumulateData.add(input);
+                if (incremental) {
+                    windowsToAccumulate.add(Tuple2.of((RowData) getCurrentKey(), window));
+                    rowsToAccumulate++;
+                }
             } else {
                 windowRetractData.setCurrentNamespace(window);
                 windowRetractData.add(input);
@@ -236,6 +357,24 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
             // register a clean up timer for the window
             registerCleanupTimer(window);
         }
+        if (incremental && rowsToAccumulate >= maxBundleSize) {
+            invokeFinishBundle();
+        }
+    }
+
+    @Override
+    protected void invokeFinishBundle() throws Exception {
+        if (incremental && !windowsToAccumulate.isEmpty()) {
+            Object currentKey = getCurrentKey();
+            accumulateBufferedRows();
+            super.invokeFinishBundle();
+            if (currentKey != null) {
+                // the current key is changed when the accumulators are received
+                setCurrentKey(currentKey);
+            }
+        } else {
+            super.invokeFinishBundle();
+        }
     }
 
     @Override
@@ -246,12 +385,17 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
         bais.setBuffer(udafResult, 0, length);
         int rowCount = arrowSerializer.load();
         for (int i = 0; i < rowCount; i++) {
-            Tuple2<RowData, W> input = inputKeyAndWindow.poll();
+            Tuple3<RowData, W, Boolean> input = inputKeyAndWindow.poll();
             RowData key = input.f0;
             W window = input.f1;
-            setWindowProperty(window);
-            windowAggResult.replace(key, arrowSerializer.read(i));
-            rowDataWrapper.collect(reuseJoinedRow.replace(windowAggResult, windowProperty));
+            if (input.f2) {
+                // the buffered rows of the window have been aggregated into the accumulators
+                setCurrentKey(key);
+                windowAccumulators.setCurrentNamespace(window);
+                windowAccumulators.update(accumulatorsSerializer.copy(arrowSerializer.read(i)));
+            } else {
+                emitWindowResult(key, window, arrowSerializer.read(i));
+            }
         }
         arrowSerializer.resetReader();
     }
@@ -340,6 +484,10 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
     }
 
     private void triggerWindowProcess(W window) throws Exception {
+        if (incremental) {
+            triggerIncrementalWindowProcess(window);
+            return;
+        }
         windowAccumulateData.setCurrentNamespace(window);
         windowRetractData.setCurrentNamespace(window);
         Iterable<RowData> currentWindowAccumulateData = windowAccumulateData.get();
@@ -353,18 +501,120 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
                 }
             }
             if (currentBatchCount > 0) {
-                inputKeyAndWindow.add(Tuple2.of((RowData) getCurrentKey(), window));
-                arrowSerializer.finishCurrentBatch();
-                pythonFunctionRunner.process(baos.toByteArray());
-                elementCount += currentBatchCount;
+                processCurrentBatch((RowData) getCurrentKey(), window, false);
                 checkInvokeFinishBundleByCount();
-                currentBatchCount = 0;
-                baos.reset();
-                arrowSerializer.resetWriter();
             }
         }
     }
 
+    /**
+     * Computes the results of the window from its accumulators and its buffered rows which have not
+     * been aggregated yet. The accumulators are left unchanged, the buffered rows are aggregated
+     * into them when the current bundle is finished.
+     */
+    private void triggerIncrementalWindowProcess(W window) throws Exception {
+        windowAccumulateData.setCurrentNamespace(window);
+        windowAccumulators.setCurrentNamespace(window);
+        RowData accumulators = windowAccumulators.value();
+        currentBatchCount = 0;
+        writeIncrementalInput(accumulators, windowAccumulateData.get());
+        if (currentBatchCount > 0) {
+            processCurrentBatch((RowData) getCurrentKey(), window, false);
+            checkInvokeFinishBundleByCount();
+        } else if (accumulators != null) {
+            // all the rows of the window have been aggregated, the results are up to date
+            emitWindowResult((RowData) getCurrentKey(), window, accumulators);
+        }
+    }
+
+    /** Sends the buffered rows of the windows to be aggregated into their accumulators. */
+    private void accumulateBufferedRows() throws Exception {
+        List<Tuple2<RowData, W>> keyAndWindows = new ArrayList<>(windowsToAccumulate);
+        windowsToAccumulate.clear();
+        rowsToAccumulate = 0;
+        for (Tuple2<RowData, W> keyAndWindow : keyAndWindows) {
+            setCurrentKey(keyAndWindow.f0);
+            W window = keyAndWindow.f1;
+            windowAccumulateData.setCurrentNamespace(window);
+            windowAccumulators.setCurrentNamespace(window);
+            currentBatchCount = 0;
+            writeIncrementalInput(windowAccumulators.value(), windowAccumulateData.get());
+            if (currentBatchCount > 0) {
+                processCurrentBatch(keyAndWindow.f0, window, true);
+                windowAccumulateData.clear();
+            }
+        }
+    }
+
+    /**
+     * Writes the given rows as the input of the Pandas UDAFs. The pickled accumulators the rows are
+     * aggregated into are written into the first row.
+     */
+    private void writeIncrementalInput(RowData accumulators, Iterable<RowData> rows) {
+        if (rows == null) {
+            return;
+        }
+        for (RowData row : rows) {
+            if (currentBatchCount == 0) {
+                accumulatorsField.setField(
+                        0,
+                        accumulators == null
+                                ? null
+                                : accumulators.getBinary(udfOutputType.getFieldCount()));
+                incrementalInput.replace(getFunctionInput(row), accumulatorsField);
+            } else {
+                incrementalInput.replace(getFunctionInput(row), emptyAccumulatorsField);
+            }
+            arrowSerializer.write(incrementalInput);
+            currentBatchCount++;
+        }
+    }
+
+    private void processCurrentBatch(RowData key, W window, boolean isAccumulation)
+            throws Exception {
+        inputKeyAndWindow.add(Tuple3.of(key, window, isAccumulation));
+        arrowSerializer.finishCurrentBatch();
+        pythonFunctionRunner.process(baos.toByteArray());
+        elementCount += currentBatchCount;
+        currentBatchCount = 0;
+        baos.reset();
+        arrowSerializer.resetWriter();
+    }
+
+    private void emitWindowResult(RowData key, W window, RowData udafResult) {
+        setWindowProperty(window);
+        if (incremental) {
+            udafResult = incrementalResult.replaceRow(udafResult);
+        }
+        windowAggResult.replace(key, udafResult);
+        rowDataWrapper.collect(reuseJoinedRow.replace(windowAggResult, windowProperty));
+    }
+
+    /**
+     * Returns whether all the given Pandas UDAFs could aggregate their input incrementally. The
+     * Pandas UDAFs defined with a Python function could only aggregate all the rows of a window at
+     * once.
+     */
+    private static boolean supportsIncrementalAggregation(PythonFunctionInfo[] aggFunctions) {
+        for (PythonFunctionInfo aggFunction : aggFunctions) {
+            PythonFunction pythonFunction = aggFunction.getPythonFunction();
+            if (pythonFunction instanceof PythonAggregateFunction
+                    && !((PythonAggregateFunction) pythonFunction)
+                            .supportsIncrementalAggregation()) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    private static RowType appendAccumulatorsField(RowType rowType) {
+        List<RowType.RowField> fields = new ArrayList<>(rowType.getFields());
+        fields.add(
+                new RowType.RowField(
+                        ACCUMULATORS_FIELD_NAME, new VarBinaryType(VarBinaryType.MAX_LENGTH)));
+        return new RowType(fields);
+    }
+
     private boolean hasRetractData(
             RowData accumulateData, Iterable<RowData> currentWindowRetractData) {
         BinaryRowData binaryAccumulateRowData = (BinaryRowData) accumulateData;
@@ -442,6 +692,10 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperator<K, W extends
             windowAccumulateData.clear();
             windowRetractData.setCurrentNamespace(window);
             windowRetractData.clear();
+            if (incremental) {
+                windowAccumulators.setCurrentNamespace(window);
+                windowAccumulators.clear();
+            }
             triggerContext.window = window;
             triggerContext.clear();
         }
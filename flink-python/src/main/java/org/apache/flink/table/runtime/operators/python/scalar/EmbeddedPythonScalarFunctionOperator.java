@@ -228,7 +228,7 @@ public class EmbeddedPythonScalarFunctionOperator
         // TODO: Support batches invoking.
     }
 
-    @Override
+    /** Gets the proto representation of the Python user-defined functions to be executed. */
     public FlinkFnApi.UserDefinedFunctions getUserDefinedFunctionsProto() {
         FlinkFnApi.UserDefinedFunctions.Builder builder =
                 FlinkFnApi.UserDefinedFunctions.newBuilder();
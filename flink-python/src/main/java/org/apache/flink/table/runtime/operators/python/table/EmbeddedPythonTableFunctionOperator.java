@@ -0,0 +1,202 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.table.runtime.operators.python.table;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.streaming.api.operators.BoundedOneInput;
+import org.apache.flink.streaming.api.operators.OneInputStreamOperator;
+import org.apache.flink.streaming.api.operators.python.AbstractEmbeddedPythonFunctionOperator;
+import org.apache.flink.streaming.api.utils.ProtoUtils;
+import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.table.data.GenericRowData;
+import org.apache.flink.table.data.RowData;
+import org.apache.flink.table.data.utils.JoinedRowData;
+import org.apache.flink.table.functions.TableFunction;
+import org.apache.flink.table.functions.python.PythonEnv;
+import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.runtime.operators.join.FlinkJoinType;
+import org.apache.flink.table.runtime.operators.python.utils.StreamRecordRowDataWrappingCollector;
+import org.apache.flink.table.runtime.typeutils.PythonTypeUtils;
+import org.apache.flink.table.types.logical.RowType;
+import org.apache.flink.util.Preconditions;
+
+import java.util.Map;
+
+/** The Python {@link TableFunction} operator in embedded Python environment. */
+@Internal
+public class EmbeddedPythonTableFunctionOperator
+        extends AbstractEmbeddedPythonFunctionOperator<RowData>
+        implements OneInputStreamOperator<RowData, RowData>, BoundedOneInput {
+
+    private static final long serialVersionUID = 1L;
+
+    /** The Python {@link TableFunction} to be executed. */
+    private final PythonFunctionInfo tableFunction;
+
+    /** The correlate join type. */
+    private final FlinkJoinType joinType;
+
+    /** The input logical type. */
+    private final RowType inputType;
+
+    /** The user-defined function input logical type. */
+    private final RowType udfInputType;
+
+    /** The user-defined function output logical type. */
+    private final RowType udfOutputType;
+
+    /** The offsets of user-defined function inputs. */
+    private final int[] udfInputOffsets;
+
+    /** The collector used to collect records. */
+    private transient StreamRecordRowDataWrappingCollector rowDataWrapper;
+
+    /** The JoinedRowData reused holding the execution result. */
+    private transient JoinedRowData reuseJoinedRow;
+
+    /** The GenericRowData reused holding the execution result of python udtf. */
+    private transient GenericRowData reuseResultRowData;
+
+    /** The GenericRowData holding nulls which is joined when there is no udtf result. */
+    private transient GenericRowData nullRowData;
+
+    private transient PythonTypeUtils.DataConverter[] userDefinedFunctionInputConverters;
+    private transient Object[] userDefinedFunctionInputArgs;
+    private transient PythonTypeUtils.DataConverter[] userDefinedFunctionOutputConverters;
+
+    public EmbeddedPythonTableFunctionOperator(
+            Configuration config,
+            PythonFunctionInfo tableFunction,
+            RowType inputType,
+            RowType udfInputType,
+            RowType udfOutputType,
+            FlinkJoinType joinType,
+            int[] udfInputOffsets) {
+        super(config);
+        this.tableFunction = Preconditions.checkNotNull(tableFunction);
+        this.inputType = Preconditions.checkNotNull(inputType);
+        this.udfInputType = Preconditions.checkNotNull(udfInputType);
+        this.udfOutputType = Preconditions.checkNotNull(udfOutputType);
+        this.udfInputOffsets = Preconditions.checkNotNull(udfInputOffsets);
+        Preconditions.checkArgument(
+                joinType == FlinkJoinType.INNER || joinType == FlinkJoinType.LEFT,
+                "The join type should be inner join or left join");
+        this.joinType = joinType;
+    }
+
+    @Override
+    public void open() throws Exception {
+        super.open();
+        rowDataWrapper = new StreamRecordRowDataWrappingCollector(output);
+        reuseJoinedRow = new JoinedRowData();
+        reuseResultRowData = new GenericRowData(udfOutputType.getFieldCount());
+        nullRowData = new GenericRowData(udfOutputType.getFieldCount());
+        userDefinedFunctionInputConverters =
+                udfInputType.getFields().stream()
+                        .map(RowType.RowField::getType)
+                        .map(PythonTypeUtils::toDataConverter)
+                        .toArray(PythonTypeUtils.DataConverter[]::new);
+        userDefinedFunctionInputArgs = new Object[udfInputOffsets.length];
+        userDefinedFunctionOutputConverters =
+                udfOutputType.getFields().stream()
+                        .map(RowType.RowField::getType)
+                        .map(PythonTypeUtils::toDataConverter)
+                        .toArray(PythonTypeUtils.DataConverter[]::new);
+    }
+
+    @Override
+    public void openPythonInterpreter(String pythonExecutable, Map<String, String> env) {
+        LOG.info("Create Operation in multi-threads.");
+
+        interpreter.exec(
+                "from pyflink.fn_execution.utils.operation_utils import create_table_operation_from_proto");
+        interpreter.set("proto", getUserDefinedFunctionsProto().toByteArray());
+
+        interpreter.exec("table_operation = create_table_operation_from_proto(proto)");
+
+        // invoke `open` method of TableFunctionOperation.
+        interpreter.invokeMethod("table_operation", "open");
+    }
+
+    @Override
+    public void endInput() {
+        if (interpreter != null) {
+            // invoke `close` method of TableFunctionOperation.
+            interpreter.invokeMethod("table_operation", "close");
+        }
+    }
+
+    @Override
+    public PythonEnv getPythonEnv() {
+        return tableFunction.getPythonFunction().getPythonEnv();
+    }
+
+    @SuppressWarnings("unchecked")
+    @Override
+    public void processElement(StreamRecord<RowData> element) {
+        RowData value = element.getValue();
+
+        for (int i = 0; i < userDefinedFunctionInputArgs.length; i++) {
+            userDefinedFunctionInputArgs[i] =
+                    userDefinedFunctionInputConverters[i].toExternal(value, udfInputOffsets[i]);
+        }
+        Object[] udtfResults = invokeProcessElement(userDefinedFunctionInputArgs);
+
+        reuseJoinedRow.setRowKind(value.getRowKind());
+        for (Object udtfResult : udtfResults) {
+            Object[] udtfResultFields = (Object[]) udtfResult;
+            for (int i = 0; i < udtfResultFields.length; i++) {
+                reuseResultRowData.setField(
+                        i, userDefinedFunctionOutputConverters[i].toInternal(udtfResultFields[i]));
+            }
+            rowDataWrapper.collect(reuseJoinedRow.replace(value, reuseResultRowData));
+        }
+
+        if (joinType == FlinkJoinType.LEFT && udtfResults.length == 0) {
+            rowDataWrapper.collect(reuseJoinedRow.replace(value, nullRowData));
+        }
+    }
+
+    /**
+     * Invokes the Python {@link TableFunction} with the converted arguments and returns the
+     * results, each of which is an array of the result fields.
+     */
+    protected Object[] invokeProcessElement(Object[] udfArgs) {
+        // the udtf input is passed as a single list argument
+        Object args = udfArgs;
+        return (Object[]) interpreter.invokeMethod("table_operation", "process_element", args);
+    }
+
+    @Override
+    protected void invokeFinishBundle() throws Exception {
+        // the elements are processed synchronously and so there is no bundle to finish
+    }
+
+    /** Gets the proto representation of the Python user-defined functions to be executed. */
+    public FlinkFnApi.UserDefinedFunctions getUserDefinedFunctionsProto() {
+        FlinkFnApi.UserDefinedFunctions.Builder builder =
+                FlinkFnApi.UserDefinedFunctions.newBuilder();
+        builder.addUdfs(ProtoUtils.getUserDefinedFunctionProto(tableFunction));
+        builder.setMetricEnabled(pythonConfig.isMetricEnabled());
+        builder.setProfileEnabled(pythonConfig.isProfileEnabled());
+        return builder.build();
+    }
+}
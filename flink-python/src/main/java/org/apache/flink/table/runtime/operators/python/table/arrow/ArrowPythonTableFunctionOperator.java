@@ -0,0 +1,222 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.table.runtime.operators.python.table.arrow;
+
+import org.apache.flink.annotation.Internal;
+import org.apache.flink.api.java.tuple.Tuple2;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.table.data.GenericRowData;
+import org.apache.flink.table.data.RowData;
+import org.apache.flink.table.data.utils.JoinedRowData;
+import org.apache.flink.table.data.utils.ProjectedRowData;
+import org.apache.flink.table.functions.TableFunction;
+import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.runtime.arrow.serializers.ArrowSerializer;
+import org.apache.flink.table.runtime.generated.GeneratedProjection;
+import org.apache.flink.table.runtime.operators.join.FlinkJoinType;
+import org.apache.flink.table.runtime.operators.python.table.PythonTableFunctionOperator;
+import org.apache.flink.table.runtime.operators.python.utils.StreamRecordRowDataWrappingCollector;
+import org.apache.flink.table.types.logical.IntType;
+import org.apache.flink.table.types.logical.RowType;
+
+import java.util.ArrayList;
+import java.util.LinkedList;
+import java.util.List;
+import java.util.stream.IntStream;
+
+import static org.apache.flink.streaming.api.utils.ProtoUtils.createArrowTypeCoderInfoDescriptorProto;
+
+/**
+ * Arrow Python {@link TableFunction} operator. The Pandas {@link TableFunction} is called once per
+ * arrow batch, and each result row carries the position of the input row within the batch it
+ * belongs to.
+ */
+@Internal
+public class ArrowPythonTableFunctionOperator extends PythonTableFunctionOperator {
+
+    private static final long serialVersionUID = 1L;
+
+    private static final String PANDAS_TABLE_FUNCTION_URN =
+            "flink:transform:table_function:arrow:v1";
+
+    private static final String PARENT_INDEX_FIELD_NAME = "__parent_index";
+
+    /**
+     * The output type of the Pandas {@link TableFunction}, which is the udtf output type followed
+     * by the position of the input row within the batch each result row belongs to.
+     */
+    private final RowType arrowOutputType;
+
+    /** The current number of elements to be included in an arrow batch. */
+    private transient int currentBatchCount;
+
+    /** Max number of elements to include in an arrow batch. */
+    private transient int maxArrowBatchSize;
+
+    private transient ArrowSerializer arrowSerializer;
+
+    /** The numbers of the input rows of the arrow batches whose results have not been received. */
+    private transient LinkedList<Integer> batchSizes;
+
+    /** The collector used to collect records. */
+    private transient StreamRecordRowDataWrappingCollector rowDataWrapper;
+
+    /** The JoinedRowData reused holding the execution result. */
+    private transient JoinedRowData reuseJoinedRow;
+
+    /** The ProjectedRowData reused holding the udtf result without the parent index. */
+    private transient ProjectedRowData udtfResult;
+
+    /** The udtf result joined with the input rows without results in case of left join. */
+    private transient GenericRowData nullUdtfResult;
+
+    public ArrowPythonTableFunctionOperator(
+            Configuration config,
+            PythonFunctionInfo tableFunction,
+            RowType inputType,
+            RowType udfInputType,
+            RowType udfOutputType,
+            FlinkJoinType joinType,
+            GeneratedProjection udtfInputGeneratedProjection) {
+        super(
+                config,
+                tableFunction,
+                inputType,
+                udfInputType,
+                udfOutputType,
+                joinType,
+                udtfInputGeneratedProjection);
+        List<RowType.RowField> fields = new ArrayList<>(udfOutputType.getFields());
+        fields.add(new RowType.RowField(PARENT_INDEX_FIELD_NAME, new IntType(false)));
+        this.arrowOutputType = new RowType(fields);
+    }
+
+    @Override
+    public void open() throws Exception {
+        super.open();
+        rowDataWrapper = new StreamRecordRowDataWrappingCollector(output);
+        reuseJoinedRow = new JoinedRowData();
+        udtfResult =
+                ProjectedRowData.from(IntStream.range(0, udfOutputType.getFieldCount()).toArray());
+        nullUdtfResult = new GenericRowData(udfOutputType.getFieldCount());
+        maxArrowBatchSize = Math.min(pythonConfig.getMaxArrowBatchSize(), maxBundleSize);
+        arrowSerializer = new ArrowSerializer(udfInputType, arrowOutputType);
+        arrowSerializer.open(bais, baos);
+        batchSizes = new LinkedList<>();
+        currentBatchCount = 0;
+    }
+
+    @Override
+    public String getFunctionUrn() {
+        return PANDAS_TABLE_FUNCTION_URN;
+    }
+
+    @Override
+    public FlinkFnApi.CoderInfoDescriptor createInputCoderInfoDescriptor(RowType runnerInputType) {
+        return createArrowTypeCoderInfoDescriptorProto(
+                runnerInputType, FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE, false);
+    }
+
+    @Override
+    public FlinkFnApi.CoderInfoDescriptor createOutputCoderInfoDescriptor(RowType runnerOutType) {
+        return createArrowTypeCoderInfoDescriptorProto(
+                arrowOutputType, FlinkFnApi.CoderInfoDescriptor.Mode.SINGLE, false);
+    }
+
+    @Override
+    protected void invokeFinishBundle() throws Exception {
+        invokeCurrentBatch();
+        super.invokeFinishBundle();
+    }
+
+    @Override
+    public void endInput() throws Exception {
+        invokeCurrentBatch();
+        super.endInput();
+    }
+
+    @Override
+    public void finish() throws Exception {
+        invokeCurrentBatch();
+        super.finish();
+    }
+
+    @Override
+    public void close() throws Exception {
+        super.close();
+        if (arrowSerializer != null) {
+            arrowSerializer.close();
+            arrowSerializer = null;
+        }
+    }
+
+    @Override
+    public void processElementInternal(RowData value) throws Exception {
+        arrowSerializer.write(getFunctionInput(value));
+        currentBatchCount++;
+        if (currentBatchCount >= maxArrowBatchSize) {
+            invokeCurrentBatch();
+        }
+    }
+
+    @Override
+    @SuppressWarnings("ConstantConditions")
+    public void emitResult(Tuple2<byte[], Integer> resultTuple) throws Exception {
+        byte[] rawUdtfResult = resultTuple.f0;
+        int length = resultTuple.f1;
+        bais.setBuffer(rawUdtfResult, 0, length);
+        int rowCount = arrowSerializer.load();
+        int batchSize = batchSizes.poll();
+        int parentIndexField = udfOutputType.getFieldCount();
+        // the result rows are ordered by the positions of the input rows they belong to
+        int resultIndex = 0;
+        for (int inputIndex = 0; inputIndex < batchSize; inputIndex++) {
+            RowData input = forwardedInputQueue.poll();
+            reuseJoinedRow.setRowKind(input.getRowKind());
+            boolean hasJoined = false;
+            while (resultIndex < rowCount) {
+                RowData result = arrowSerializer.read(resultIndex);
+                if (result.getInt(parentIndexField) != inputIndex) {
+                    break;
+                }
+                rowDataWrapper.collect(
+                        reuseJoinedRow.replace(input, udtfResult.replaceRow(result)));
+                hasJoined = true;
+                resultIndex++;
+            }
+            if (joinType == FlinkJoinType.LEFT && !hasJoined) {
+                rowDataWrapper.collect(reuseJoinedRow.replace(input, nullUdtfResult));
+            }
+        }
+        arrowSerializer.resetReader();
+    }
+
+    private void invokeCurrentBatch() throws Exception {
+        if (currentBatchCount > 0) {
+            batchSizes.add(currentBatchCount);
+            arrowSerializer.finishCurrentBatch();
+            currentBatchCount = 0;
+            pythonFunctionRunner.process(baos.toByteArray());
+            checkInvokeFinishBundleByCount();
+            baos.reset();
+            arrowSerializer.resetWriter();
+        }
+    }
+}
@@ -71,6 +71,15 @@ public class PythonConfigTest {
         assertThat(pythonConfig.getMaxBundleTimeMills(), is(equalTo(10L)));
     }
 
+    @Test
+    public void testBundleTargetLatencyMills() {
+        Configuration config = new Configuration();
+        assertThat(new PythonConfig(config).getBundleTargetLatencyMills().isPresent(), is(false));
+        config.set(PythonOptions.BUNDLE_TARGET_LATENCY_MILLS, 100L);
+        PythonConfig pythonConfig = new PythonConfig(config);
+        assertThat(pythonConfig.getBundleTargetLatencyMills().get(), is(equalTo(100L)));
+    }
+
     @Test
     public void testMaxArrowBatchSize() {
         Configuration config = new Configuration();
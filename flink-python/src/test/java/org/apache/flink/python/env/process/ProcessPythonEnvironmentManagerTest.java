@@ -19,6 +19,7 @@
 package org.apache.flink.python.env.process;
 
 import org.apache.flink.api.common.JobID;
+import org.apache.flink.python.PythonOptions;
 import org.apache.flink.python.env.PythonDependencyInfo;
 import org.apache.flink.util.FileUtils;
 import org.apache.flink.util.OperatingSystem;
@@ -44,6 +45,7 @@ import java.util.Map;
 import java.util.Set;
 import java.util.UUID;
 
+import static org.apache.flink.python.env.process.ProcessPythonEnvironmentManager.CACHED_ARCHIVES_CATEGORY;
 import static org.apache.flink.python.env.process.ProcessPythonEnvironmentManager.PYFLINK_GATEWAY_DISABLED;
 import static org.apache.flink.python.env.process.ProcessPythonEnvironmentManager.PYTHON_ARCHIVES_DIR;
 import static org.apache.flink.python.env.process.ProcessPythonEnvironmentManager.PYTHON_FILES_DIR;
@@ -297,6 +299,71 @@ public class ProcessPythonEnvironmentManagerTest {
         }
     }
 
+    @Test
+    public void testCachedArchives() throws Exception {
+        Map<String, String> archives = new LinkedHashMap<>();
+        archives.put(String.join(File.separator, tmpDir, "zip0"), "py27.zip");
+        archives.put(String.join(File.separator, tmpDir, "zip1"), "py37");
+        String cacheDir = String.join(File.separator, tmpDir, "env-cache");
+        PythonDependencyInfo dependencyInfo =
+                new PythonDependencyInfo(
+                        new HashMap<>(),
+                        null,
+                        null,
+                        archives,
+                        "python",
+                        PythonOptions.PYTHON_EXECUTION_MODE.defaultValue(),
+                        cacheDir);
+
+        try (ProcessPythonEnvironmentManager environmentManager0 =
+                        createBasicPythonEnvironmentManager(dependencyInfo);
+                ProcessPythonEnvironmentManager environmentManager1 =
+                        createBasicPythonEnvironmentManager(dependencyInfo)) {
+            environmentManager0.open();
+            environmentManager1.open();
+            String tmpBase0 = environmentManager0.getBaseDirectory();
+            String tmpBase1 = environmentManager1.getBaseDirectory();
+            assertFalse(tmpBase0.equals(tmpBase1));
+
+            Map<String, String> expected = getBasicExpectedEnv(environmentManager0);
+            expected.put(
+                    PYTHON_WORKING_DIR, String.join(File.separator, tmpBase0, PYTHON_ARCHIVES_DIR));
+            assertEquals(expected, environmentManager0.getPythonEnv());
+
+            // both jobs share the archives extracted into the cache
+            File cachedArchives = new File(cacheDir, CACHED_ARCHIVES_CATEGORY);
+            assertEquals(
+                    2,
+                    cachedArchives.listFiles(file -> file.getName().endsWith(".completed")).length);
+            for (String targetDir : new String[] {"py27.zip", "py37"}) {
+                File archive0 =
+                        new File(
+                                String.join(
+                                        File.separator, tmpBase0, PYTHON_ARCHIVES_DIR, targetDir));
+                File archive1 =
+                        new File(
+                                String.join(
+                                        File.separator, tmpBase1, PYTHON_ARCHIVES_DIR, targetDir));
+                assertEquals(archive0.getCanonicalPath(), archive1.getCanonicalPath());
+                assertTrue(
+                        archive0.getCanonicalPath().startsWith(cachedArchives.getCanonicalPath()));
+            }
+            assertFileEquals(
+                    new File(String.join(File.separator, tmpDir, "zipExpected0")),
+                    new File(
+                            String.join(
+                                    File.separator, tmpBase0, PYTHON_ARCHIVES_DIR, "py27.zip")),
+                    true);
+            assertFileEquals(
+                    new File(String.join(File.separator, tmpDir, "zipExpected1")),
+                    new File(String.join(File.separator, tmpBase1, PYTHON_ARCHIVES_DIR, "py37")),
+                    true);
+        }
+
+        // the cache survives the clean up of the working directories
+        assertTrue(new File(cacheDir, CACHED_ARCHIVES_CATEGORY).list().length > 0);
+    }
+
     @Test
     public void testPythonExecutable() throws Exception {
         PythonDependencyInfo dependencyInfo =
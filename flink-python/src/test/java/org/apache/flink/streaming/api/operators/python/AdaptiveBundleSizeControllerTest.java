@@ -0,0 +1,87 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.streaming.api.operators.python;
+
+import org.junit.Test;
+
+import static org.hamcrest.Matchers.equalTo;
+import static org.hamcrest.Matchers.is;
+import static org.junit.Assert.assertThat;
+
+/** Tests for {@link AdaptiveBundleSizeController}. */
+public class AdaptiveBundleSizeControllerTest {
+
+    @Test
+    public void testShrinkFullBundlesExceedingTargetLatency() {
+        AdaptiveBundleSizeController controller = new AdaptiveBundleSizeController(1000, 100);
+        assertThat(controller.getBundleSize(), is(equalTo(1000)));
+
+        // 1000 elements took 125ms, 800 elements are expected to take 100ms
+        controller.onBundleFinished(1000, 125, 10, true);
+        assertThat(controller.getBundleSize(), is(equalTo(800)));
+
+        // the bundle size is halved at most
+        controller.onBundleFinished(800, 1000, 10, true);
+        assertThat(controller.getBundleSize(), is(equalTo(400)));
+        assertThat(controller.getLastBundleLatencyMills(), is(equalTo(1000L)));
+        assertThat(controller.getLastFinishBundleDurationMills(), is(equalTo(10L)));
+    }
+
+    @Test
+    public void testGrowFullBundlesBelowTargetLatency() {
+        AdaptiveBundleSizeController controller = new AdaptiveBundleSizeController(1000, 100);
+        controller.setBundleSize(100);
+
+        // the bundle size is doubled at most
+        controller.onBundleFinished(100, 10, 1, true);
+        assertThat(controller.getBundleSize(), is(equalTo(200)));
+
+        controller.onBundleFinished(200, 80, 1, true);
+        assertThat(controller.getBundleSize(), is(equalTo(250)));
+
+        // the bundle size doesn't exceed the configured max bundle size
+        controller.setBundleSize(900);
+        controller.onBundleFinished(900, 10, 1, true);
+        assertThat(controller.getBundleSize(), is(equalTo(1000)));
+    }
+
+    @Test
+    public void testBundlesWhichAreNotFull() {
+        AdaptiveBundleSizeController controller = new AdaptiveBundleSizeController(1000, 100);
+
+        // a bundle finished by the timer doesn't tell whether a larger bundle is possible
+        controller.onBundleFinished(10, 1000, 10, false);
+        assertThat(controller.getBundleSize(), is(equalTo(1000)));
+
+        // finishing the bundle alone exceeded the target latency, e.g. for a checkpoint
+        controller.onBundleFinished(600, 700, 200, false);
+        assertThat(controller.getBundleSize(), is(equalTo(500)));
+
+        controller.onBundleFinished(100, 700, 200, false);
+        assertThat(controller.getBundleSize(), is(equalTo(250)));
+    }
+
+    @Test
+    public void testMinBundleSize() {
+        AdaptiveBundleSizeController controller = new AdaptiveBundleSizeController(1000, 100);
+        controller.setBundleSize(1);
+        controller.onBundleFinished(1, 1000, 1000, true);
+        assertThat(controller.getBundleSize(), is(equalTo(1)));
+    }
+}
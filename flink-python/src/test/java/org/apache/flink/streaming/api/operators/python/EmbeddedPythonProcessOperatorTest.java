@@ -0,0 +1,120 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.streaming.api.operators.python;
+
+import org.apache.flink.api.common.typeinfo.TypeInformation;
+import org.apache.flink.api.common.typeinfo.Types;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.core.memory.ManagedMemoryUseCase;
+import org.apache.flink.streaming.api.functions.python.DataStreamPythonFunction;
+import org.apache.flink.streaming.api.functions.python.DataStreamPythonFunctionInfo;
+import org.apache.flink.streaming.api.watermark.Watermark;
+import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.streaming.util.OneInputStreamOperatorTestHarness;
+import org.apache.flink.streaming.util.TestHarnessUtil;
+
+import org.junit.Test;
+
+import java.util.concurrent.ConcurrentLinkedQueue;
+
+/**
+ * Tests for {@link EmbeddedPythonProcessOperator}. The Python ProcessFunction is replaced by a
+ * function which emits the input element together with the timestamp and the current watermark.
+ */
+public class EmbeddedPythonProcessOperatorTest {
+
+    @Test
+    public void testProcessElement() throws Exception {
+        OneInputStreamOperatorTestHarness<Integer, String> testHarness = getTestHarness();
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(1, 1L));
+        testHarness.processElement(new StreamRecord<>(2, 2L));
+        // the results are emitted synchronously with the timestamp of the input element
+        expectedOutput.add(new StreamRecord<>("1,1," + Long.MIN_VALUE, 1L));
+        expectedOutput.add(new StreamRecord<>("2,2," + Long.MIN_VALUE, 2L));
+        TestHarnessUtil.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.close();
+    }
+
+    @Test
+    public void testWatermark() throws Exception {
+        OneInputStreamOperatorTestHarness<Integer, String> testHarness = getTestHarness();
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(1, 1L));
+        // the watermark is forwarded immediately as there are no buffered elements
+        testHarness.processWatermark(new Watermark(5L));
+        // the current watermark is passed to the Python function
+        testHarness.processElement(new StreamRecord<>(2, 6L));
+        expectedOutput.add(new StreamRecord<>("1,1," + Long.MIN_VALUE, 1L));
+        expectedOutput.add(new Watermark(5L));
+        expectedOutput.add(new StreamRecord<>("2,6,5", 6L));
+        TestHarnessUtil.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.close();
+    }
+
+    private OneInputStreamOperatorTestHarness<Integer, String> getTestHarness() throws Exception {
+        EmbeddedPythonProcessOperator<Integer, String> operator =
+                new PassThroughEmbeddedPythonProcessOperator(
+                        new Configuration(),
+                        new DataStreamPythonFunctionInfo(
+                                new DataStreamPythonFunction(new byte[0], null), -1),
+                        Types.INT,
+                        Types.STRING);
+
+        OneInputStreamOperatorTestHarness<Integer, String> testHarness =
+                new OneInputStreamOperatorTestHarness<>(operator);
+        testHarness
+                .getStreamConfig()
+                .setManagedMemoryFractionOperatorOfUseCase(ManagedMemoryUseCase.PYTHON, 0.5);
+        return testHarness;
+    }
+
+    private static class PassThroughEmbeddedPythonProcessOperator
+            extends EmbeddedPythonProcessOperator<Integer, String> {
+
+        PassThroughEmbeddedPythonProcessOperator(
+                Configuration config,
+                DataStreamPythonFunctionInfo pythonFunctionInfo,
+                TypeInformation<Integer> inputTypeInfo,
+                TypeInformation<String> outputTypeInfo) {
+            super(config, pythonFunctionInfo, inputTypeInfo, outputTypeInfo);
+        }
+
+        @Override
+        protected void createPythonInterpreter() {
+            // the Python function is executed by invokeProcessElement directly
+        }
+
+        @Override
+        protected Object[] invokeProcessElement(long timestamp, long watermark, Object value) {
+            // the INT input is passed to Python as a Long
+            return new Object[] {(Long) value + "," + timestamp + "," + watermark};
+        }
+    }
+}
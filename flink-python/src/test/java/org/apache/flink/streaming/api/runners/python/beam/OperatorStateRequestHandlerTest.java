@@ -0,0 +1,315 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.streaming.api.runners.python.beam;
+
+import org.apache.flink.api.common.ExecutionConfig;
+import org.apache.flink.core.fs.CloseableRegistry;
+import org.apache.flink.core.memory.ByteArrayInputStreamWithPos;
+import org.apache.flink.core.memory.ByteArrayOutputStreamWithPos;
+import org.apache.flink.core.memory.DataInputViewStreamWrapper;
+import org.apache.flink.core.memory.DataOutputViewStreamWrapper;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.runtime.checkpoint.CheckpointOptions;
+import org.apache.flink.runtime.state.DefaultOperatorStateBackendBuilder;
+import org.apache.flink.runtime.state.OperatorStateBackend;
+import org.apache.flink.runtime.state.OperatorStateHandle;
+import org.apache.flink.runtime.state.SnapshotResult;
+import org.apache.flink.runtime.state.memory.MemCheckpointStreamFactory;
+import org.apache.flink.util.concurrent.FutureUtils;
+
+import org.apache.beam.model.fnexecution.v1.BeamFnApi;
+import org.apache.beam.vendor.grpc.v1p26p0.com.google.protobuf.ByteString;
+import org.junit.After;
+import org.junit.Before;
+import org.junit.Test;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Base64;
+import java.util.Collection;
+import java.util.Collections;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.RunnableFuture;
+
+import static org.junit.Assert.assertArrayEquals;
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertNull;
+import static org.junit.Assert.assertTrue;
+import static org.junit.Assert.fail;
+
+/** Tests for {@link OperatorStateRequestHandler}. */
+public class OperatorStateRequestHandlerTest {
+
+    private static final String UPDATE_MARK = "update";
+
+    private OperatorStateBackend operatorStateBackend;
+
+    private OperatorStateRequestHandler handler;
+
+    @Before
+    public void setUp() throws Exception {
+        operatorStateBackend = createOperatorStateBackend(Collections.emptyList());
+        handler = new OperatorStateRequestHandler(operatorStateBackend);
+    }
+
+    @After
+    public void tearDown() throws Exception {
+        operatorStateBackend.close();
+        operatorStateBackend.dispose();
+    }
+
+    @Test
+    public void testListState() throws Exception {
+        assertEquals(Collections.emptyList(), getList("list"));
+
+        appendList("list", UPDATE_MARK, bytes(1), bytes(2, 3));
+        assertListEquals(Arrays.asList(bytes(1), bytes(2, 3)), getList("list"));
+        assertTrue(operatorStateBackend.getRegisteredStateNames().contains("python-state-list"));
+
+        // the state is replaced by the appended elements
+        appendList("list", UPDATE_MARK, bytes(4));
+        assertListEquals(Collections.singletonList(bytes(4)), getList("list"));
+
+        // the state is cleared by an update without elements
+        appendList("list", UPDATE_MARK);
+        assertEquals(Collections.emptyList(), getList("list"));
+    }
+
+    @Test
+    public void testBroadcastState() throws Exception {
+        assertEquals(Collections.emptyMap(), getBroadcast("broadcast"));
+
+        Map<String, byte[]> entries = new LinkedHashMap<>();
+        entries.put("a", bytes(1));
+        entries.put("b", null);
+        appendBroadcast("broadcast", UPDATE_MARK, entries);
+        Map<String, byte[]> actual = getBroadcast("broadcast");
+        assertEquals(2, actual.size());
+        assertArrayEquals(bytes(1), actual.get("a"));
+        assertTrue(actual.containsKey("b"));
+        assertNull(actual.get("b"));
+        assertTrue(
+                operatorStateBackend
+                        .getRegisteredBroadcastStateNames()
+                        .contains("python-state-broadcast"));
+
+        // the state is replaced by the appended entries
+        appendBroadcast("broadcast", UPDATE_MARK, Collections.singletonMap("c", bytes(2)));
+        actual = getBroadcast("broadcast");
+        assertEquals(1, actual.size());
+        assertArrayEquals(bytes(2), actual.get("c"));
+
+        // the state is cleared by an update without entries
+        appendBroadcast("broadcast", UPDATE_MARK, Collections.emptyMap());
+        assertEquals(Collections.emptyMap(), getBroadcast("broadcast"));
+    }
+
+    @Test
+    public void testAppendWithoutUpdateMark() throws Exception {
+        try {
+            appendList("list", "unknown", bytes(1));
+            fail("The append request without the update mark should fail.");
+        } catch (RuntimeException e) {
+            assertTrue(e.getMessage().startsWith("Unsupported operator state append request"));
+        }
+        try {
+            appendBroadcast("broadcast", "unknown", Collections.singletonMap("a", bytes(1)));
+            fail("The append request without the update mark should fail.");
+        } catch (RuntimeException e) {
+            assertTrue(e.getMessage().startsWith("Unsupported operator state append request"));
+        }
+        assertEquals(Collections.emptyList(), getList("list"));
+        assertEquals(Collections.emptyMap(), getBroadcast("broadcast"));
+    }
+
+    @Test
+    public void testSnapshotAndRestore() throws Exception {
+        appendList("list", UPDATE_MARK, bytes(1), bytes(2, 3));
+        appendBroadcast("broadcast", UPDATE_MARK, Collections.singletonMap("a", bytes(4)));
+
+        RunnableFuture<SnapshotResult<OperatorStateHandle>> snapshot =
+                operatorStateBackend.snapshot(
+                        1L,
+                        1L,
+                        new MemCheckpointStreamFactory(4096),
+                        CheckpointOptions.forCheckpointWithDefaultLocation());
+        OperatorStateHandle stateHandle =
+                FutureUtils.runIfNotDoneAndGet(snapshot).getJobManagerOwnedSnapshot();
+
+        operatorStateBackend.close();
+        operatorStateBackend.dispose();
+        operatorStateBackend = createOperatorStateBackend(Collections.singletonList(stateHandle));
+        handler = new OperatorStateRequestHandler(operatorStateBackend);
+
+        assertListEquals(Arrays.asList(bytes(1), bytes(2, 3)), getList("list"));
+        Map<String, byte[]> entries = getBroadcast("broadcast");
+        assertEquals(1, entries.size());
+        assertArrayEquals(bytes(4), entries.get("a"));
+    }
+
+    // ------------------------------------------------------------------------------------------
+
+    private static OperatorStateBackend createOperatorStateBackend(
+            Collection<OperatorStateHandle> stateHandles) throws Exception {
+        return new DefaultOperatorStateBackendBuilder(
+                        OperatorStateRequestHandlerTest.class.getClassLoader(),
+                        new ExecutionConfig(),
+                        false,
+                        stateHandles,
+                        new CloseableRegistry())
+                .build();
+    }
+
+    private List<byte[]> getList(String name) throws Exception {
+        DataInputViewStreamWrapper in = handle(createGetRequest(createListStateKey(name, "")));
+        int count = in.readInt();
+        List<byte[]> elements = new ArrayList<>(count);
+        for (int i = 0; i < count; i++) {
+            elements.add(readBytes(in));
+        }
+        return elements;
+    }
+
+    private void appendList(String name, String transformId, byte[]... elements)
+            throws Exception {
+        ByteArrayOutputStreamWithPos baos = new ByteArrayOutputStreamWithPos();
+        DataOutputViewStreamWrapper out = new DataOutputViewStreamWrapper(baos);
+        out.writeInt(elements.length);
+        for (byte[] element : elements) {
+            writeBytes(out, element);
+        }
+        handle(createAppendRequest(createListStateKey(name, transformId), baos.toByteArray()));
+    }
+
+    private Map<String, byte[]> getBroadcast(String name) throws Exception {
+        DataInputViewStreamWrapper in =
+                handle(createGetRequest(createBroadcastStateKey(name, "")));
+        int count = in.readInt();
+        Map<String, byte[]> entries = new LinkedHashMap<>();
+        for (int i = 0; i < count; i++) {
+            String key = new String(readBytes(in));
+            int valueLength = in.readInt();
+            byte[] value = null;
+            if (valueLength != -1) {
+                value = new byte[valueLength];
+                in.readFully(value);
+            }
+            entries.put(key, value);
+        }
+        return entries;
+    }
+
+    private void appendBroadcast(String name, String transformId, Map<String, byte[]> entries)
+            throws Exception {
+        ByteArrayOutputStreamWithPos baos = new ByteArrayOutputStreamWithPos();
+        DataOutputViewStreamWrapper out = new DataOutputViewStreamWrapper(baos);
+        out.writeInt(entries.size());
+        for (Map.Entry<String, byte[]> entry : entries.entrySet()) {
+            writeBytes(out, entry.getKey().getBytes());
+            if (entry.getValue() == null) {
+                out.writeInt(-1);
+            } else {
+                writeBytes(out, entry.getValue());
+            }
+        }
+        handle(
+                createAppendRequest(
+                        createBroadcastStateKey(name, transformId), baos.toByteArray()));
+    }
+
+    private DataInputViewStreamWrapper handle(BeamFnApi.StateRequest request) throws Exception {
+        BeamFnApi.StateResponse response =
+                handler.handle(request).toCompletableFuture().get().build();
+        byte[] data = response.getGet().getData().toByteArray();
+        return new DataInputViewStreamWrapper(new ByteArrayInputStreamWithPos(data));
+    }
+
+    private static BeamFnApi.StateKey createListStateKey(String name, String transformId) {
+        return BeamFnApi.StateKey.newBuilder()
+                .setBagUserState(
+                        BeamFnApi.StateKey.BagUserState.newBuilder()
+                                .setTransformId(transformId)
+                                .setUserStateId(encodeStateId(name)))
+                .build();
+    }
+
+    private static BeamFnApi.StateKey createBroadcastStateKey(String name, String transformId) {
+        return BeamFnApi.StateKey.newBuilder()
+                .setMultimapSideInput(
+                        BeamFnApi.StateKey.MultimapSideInput.newBuilder()
+                                .setTransformId(transformId)
+                                .setSideInputId(encodeStateId(name)))
+                .build();
+    }
+
+    private static String encodeStateId(String name) {
+        return Base64.getEncoder()
+                .encodeToString(
+                        FlinkFnApi.StateDescriptor.newBuilder()
+                                .setStateName(name)
+                                .build()
+                                .toByteArray());
+    }
+
+    private static BeamFnApi.StateRequest createGetRequest(BeamFnApi.StateKey stateKey) {
+        return BeamFnApi.StateRequest.newBuilder()
+                .setStateKey(stateKey)
+                .setGet(BeamFnApi.StateGetRequest.getDefaultInstance())
+                .build();
+    }
+
+    private static BeamFnApi.StateRequest createAppendRequest(
+            BeamFnApi.StateKey stateKey, byte[] data) {
+        return BeamFnApi.StateRequest.newBuilder()
+                .setStateKey(stateKey)
+                .setAppend(
+                        BeamFnApi.StateAppendRequest.newBuilder()
+                                .setData(ByteString.copyFrom(data)))
+                .build();
+    }
+
+    private static byte[] readBytes(DataInputViewStreamWrapper in) throws Exception {
+        byte[] bytes = new byte[in.readInt()];
+        in.readFully(bytes);
+        return bytes;
+    }
+
+    private static void writeBytes(DataOutputViewStreamWrapper out, byte[] bytes)
+            throws Exception {
+        out.writeInt(bytes.length);
+        out.write(bytes);
+    }
+
+    private static byte[] bytes(int... values) {
+        byte[] bytes = new byte[values.length];
+        for (int i = 0; i < values.length; i++) {
+            bytes[i] = (byte) values[i];
+        }
+        return bytes;
+    }
+
+    private static void assertListEquals(List<byte[]> expected, List<byte[]> actual) {
+        assertEquals(expected.size(), actual.size());
+        for (int i = 0; i < expected.size(); i++) {
+            assertArrayEquals(expected.get(i), actual.get(i));
+        }
+    }
+}
@@ -0,0 +1,288 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.table.runtime.operators.python.aggregate;
+
+import org.apache.flink.api.common.typeutils.TypeSerializer;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.core.memory.DataInputDeserializer;
+import org.apache.flink.core.memory.DataOutputSerializer;
+import org.apache.flink.core.memory.ManagedMemoryUseCase;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.python.PythonFunctionRunner;
+import org.apache.flink.python.PythonOptions;
+import org.apache.flink.python.env.process.ProcessPythonEnvironmentManager;
+import org.apache.flink.python.metric.FlinkMetricContainer;
+import org.apache.flink.streaming.api.watermark.Watermark;
+import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.streaming.util.OneInputStreamOperatorTestHarness;
+import org.apache.flink.table.data.GenericRowData;
+import org.apache.flink.table.data.RowData;
+import org.apache.flink.table.data.StringData;
+import org.apache.flink.table.functions.python.PythonAggregateFunctionInfo;
+import org.apache.flink.table.runtime.operators.python.scalar.PythonScalarFunctionOperatorTestBase;
+import org.apache.flink.table.runtime.runners.python.beam.BeamTablePythonFunctionRunner;
+import org.apache.flink.table.runtime.typeutils.PythonTypeUtils;
+import org.apache.flink.table.runtime.typeutils.RowDataSerializer;
+import org.apache.flink.table.runtime.util.RowDataHarnessAssertor;
+import org.apache.flink.table.runtime.utils.PythonTestUtils;
+import org.apache.flink.table.types.logical.BigIntType;
+import org.apache.flink.table.types.logical.LogicalType;
+import org.apache.flink.table.types.logical.RowType;
+import org.apache.flink.table.types.logical.VarCharType;
+
+import com.google.protobuf.GeneratedMessageV3;
+import org.apache.beam.runners.fnexecution.control.JobBundleFactory;
+import org.apache.beam.vendor.grpc.v1p26p0.com.google.protobuf.Struct;
+import org.junit.Test;
+
+import java.io.IOException;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.concurrent.ConcurrentLinkedQueue;
+
+import static org.apache.flink.streaming.api.utils.ProtoUtils.createRowTypeCoderInfoDescriptorProto;
+import static org.apache.flink.table.runtime.util.StreamRecordUtils.row;
+import static org.junit.Assert.assertEquals;
+
+/** Tests for {@link PythonStreamLocalGroupAggregateOperator}. */
+public class PythonStreamLocalGroupAggregateOperatorTest {
+
+    private static final RowType ROW_TYPE =
+            new RowType(
+                    Arrays.asList(
+                            new RowType.RowField("f1", new VarCharType()),
+                            new RowType.RowField("f2", new BigIntType())));
+
+    private final RowDataHarnessAssertor assertor =
+            new RowDataHarnessAssertor(new LogicalType[] {new VarCharType(), new BigIntType()});
+
+    @Test
+    public void testFinishBundleTriggeredByCount() throws Exception {
+        Configuration conf = new Configuration();
+        conf.setInteger(PythonOptions.MAX_BUNDLE_SIZE, 4);
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness = getTestHarness(conf);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(row("c1", 1L)));
+        testHarness.processElement(new StreamRecord<>(row("c2", 2L)));
+        testHarness.processElement(new StreamRecord<>(row("c1", 3L)));
+        assertor.assertOutputEquals(
+                "FinishBundle should not be triggered.", expectedOutput, testHarness.getOutput());
+
+        // the rows of a key are only pre-aggregated within a bundle
+        testHarness.processElement(new StreamRecord<>(row("c2", 4L)));
+        expectedOutput.add(new StreamRecord<>(row("c1", 4L)));
+        expectedOutput.add(new StreamRecord<>(row("c2", 6L)));
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.processElement(new StreamRecord<>(row("c1", 5L)));
+        testHarness.close();
+        expectedOutput.add(new StreamRecord<>(row("c1", 5L)));
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    @Test
+    public void testFinishBundleTriggeredOnCheckpoint() throws Exception {
+        Configuration conf = new Configuration();
+        conf.setInteger(PythonOptions.MAX_BUNDLE_SIZE, 10);
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness = getTestHarness(conf);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(row("c1", 1L)));
+        testHarness.processElement(new StreamRecord<>(row("c1", 2L)));
+        testHarness.processElement(new StreamRecord<>(row("c2", 3L)));
+        // checkpoint trigger finishBundle
+        testHarness.prepareSnapshotPreBarrier(0L);
+
+        expectedOutput.add(new StreamRecord<>(row("c1", 3L)));
+        expectedOutput.add(new StreamRecord<>(row("c2", 3L)));
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.close();
+    }
+
+    @Test
+    public void testWatermarkProcessedOnFinishBundle() throws Exception {
+        Configuration conf = new Configuration();
+        conf.setInteger(PythonOptions.MAX_BUNDLE_SIZE, 10);
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness = getTestHarness(conf);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(row("c1", 1L), 1L));
+        testHarness.processElement(new StreamRecord<>(row("c1", 2L), 2L));
+        testHarness.processWatermark(2L);
+        assertor.assertOutputEquals(
+                "Watermark has been processed", expectedOutput, testHarness.getOutput());
+
+        // checkpoint trigger finishBundle
+        testHarness.prepareSnapshotPreBarrier(0L);
+
+        expectedOutput.add(new StreamRecord<>(row("c1", 3L)));
+        expectedOutput.add(new Watermark(2L));
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.close();
+    }
+
+    @Test
+    public void testUserDefinedFunctionsProto() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(new Configuration());
+        testHarness.open();
+
+        FlinkFnApi.UserDefinedAggregateFunctions proto =
+                ((PythonStreamLocalGroupAggregateOperator) testHarness.getOperator())
+                        .getUserDefinedFunctionsProto();
+        assertEquals(Collections.singletonList(0), proto.getGroupingList());
+        assertEquals(-1, proto.getIndexOfCountStar());
+        assertEquals(1, proto.getUdfsCount());
+        assertEquals(1, proto.getKeyType().getRowSchema().getFieldsCount());
+        assertEquals("f1", proto.getKeyType().getRowSchema().getFields(0).getName());
+
+        testHarness.close();
+    }
+
+    private OneInputStreamOperatorTestHarness<RowData, RowData> getTestHarness(
+            Configuration config) throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                new OneInputStreamOperatorTestHarness<>(
+                        new SumPerKeyPythonStreamLocalGroupAggregateOperator(config));
+        testHarness
+                .getStreamConfig()
+                .setManagedMemoryFractionOperatorOfUseCase(ManagedMemoryUseCase.PYTHON, 0.5);
+        testHarness.setup(new RowDataSerializer(ROW_TYPE));
+        return testHarness;
+    }
+
+    private static PythonAggregateFunctionInfo[] getAggregateFunctions() {
+        return new PythonAggregateFunctionInfo[] {
+            new PythonAggregateFunctionInfo(
+                    PythonScalarFunctionOperatorTestBase.DummyPythonFunction.INSTANCE,
+                    new Integer[] {1},
+                    -1,
+                    false)
+        };
+    }
+
+    /**
+     * A {@link PythonStreamLocalGroupAggregateOperator} whose Python function runner sums the
+     * second field of the rows of each key within a bundle.
+     */
+    private static class SumPerKeyPythonStreamLocalGroupAggregateOperator
+            extends PythonStreamLocalGroupAggregateOperator {
+
+        SumPerKeyPythonStreamLocalGroupAggregateOperator(Configuration config) {
+            super(config, ROW_TYPE, ROW_TYPE, getAggregateFunctions(), new int[] {0});
+        }
+
+        @Override
+        public PythonFunctionRunner createPythonFunctionRunner() {
+            return new SumPerKeyPythonFunctionRunner(
+                    getRuntimeContext().getTaskName(),
+                    PythonTestUtils.createTestProcessEnvironmentManager(),
+                    STREAM_LOCAL_GROUP_AGGREGATE_URN,
+                    getUserDefinedFunctionsProto(),
+                    new HashMap<>(),
+                    PythonTestUtils.createMockFlinkMetricContainer());
+        }
+    }
+
+    /**
+     * A runner which sums the second field of the input rows of each key and emits the sums at
+     * the end of a bundle, like the Python worker pre-aggregates the input of a bundle.
+     */
+    private static class SumPerKeyPythonFunctionRunner extends BeamTablePythonFunctionRunner {
+
+        private final TypeSerializer<RowData> serializer;
+
+        private final Map<String, Long> sums;
+
+        SumPerKeyPythonFunctionRunner(
+                String taskName,
+                ProcessPythonEnvironmentManager environmentManager,
+                String functionUrn,
+                GeneratedMessageV3 userDefinedFunctionProto,
+                Map<String, String> jobOptions,
+                FlinkMetricContainer flinkMetricContainer) {
+            super(
+                    taskName,
+                    environmentManager,
+                    functionUrn,
+                    userDefinedFunctionProto,
+                    jobOptions,
+                    flinkMetricContainer,
+                    null,
+                    null,
+                    null,
+                    null,
+                    0.0,
+                    createRowTypeCoderInfoDescriptorProto(
+                            ROW_TYPE, FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE, false),
+                    createRowTypeCoderInfoDescriptorProto(
+                            ROW_TYPE, FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE, false));
+            this.serializer = PythonTypeUtils.toInternalSerializer(ROW_TYPE);
+            this.sums = new LinkedHashMap<>();
+        }
+
+        @Override
+        protected void startBundle() {
+            super.startBundle();
+            this.mainInputReceiver =
+                    input -> {
+                        RowData row =
+                                serializer.deserialize(
+                                        new DataInputDeserializer(input.getValue()));
+                        sums.merge(row.getString(0).toString(), row.getLong(1), Long::sum);
+                    };
+        }
+
+        @Override
+        public void flush() throws Exception {
+            super.flush();
+            for (Map.Entry<String, Long> sum : sums.entrySet()) {
+                resultBuffer.add(serialize(sum.getKey(), sum.getValue()));
+            }
+            sums.clear();
+        }
+
+        @Override
+        public JobBundleFactory createJobBundleFactory(Struct pipelineOptions) {
+            return PythonTestUtils.createMockJobBundleFactory();
+        }
+
+        private byte[] serialize(String key, long sum) throws IOException {
+            DataOutputSerializer output = new DataOutputSerializer(1);
+            serializer.serialize(GenericRowData.of(StringData.fromString(key), sum), output);
+            return output.getCopyOfBuffer();
+        }
+    }
+}
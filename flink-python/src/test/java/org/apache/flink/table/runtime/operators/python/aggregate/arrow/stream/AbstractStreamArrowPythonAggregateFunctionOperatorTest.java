@@ -39,17 +39,23 @@ public abstract class AbstractStreamArrowPythonAggregateFunctionOperatorTest
 
     public OneInputStreamOperatorTestHarness<RowData, RowData> getTestHarness(Configuration config)
             throws Exception {
+        return getTestHarness(
+                config,
+                new PythonFunctionInfo[] {
+                    new PythonFunctionInfo(
+                            PythonScalarFunctionOperatorTestBase.DummyPythonFunction.INSTANCE,
+                            new Integer[] {0})
+                });
+    }
+
+    public OneInputStreamOperatorTestHarness<RowData, RowData> getTestHarness(
+            Configuration config, PythonFunctionInfo[] pandasAggregateFunctions) throws Exception {
         RowType inputType = getInputType();
         RowType outputType = getOutputType();
         AbstractArrowPythonAggregateFunctionOperator operator =
                 getTestOperator(
                         config,
-                        new PythonFunctionInfo[] {
-                            new PythonFunctionInfo(
-                                    PythonScalarFunctionOperatorTestBase.DummyPythonFunction
-                                            .INSTANCE,
-                                    new Integer[] {0})
-                        },
+                        pandasAggregateFunctions,
                         inputType,
                         outputType,
                         new int[] {0},
@@ -19,44 +19,71 @@
 package org.apache.flink.table.runtime.operators.python.aggregate.arrow.stream;
 
 import org.apache.flink.configuration.Configuration;
+import org.apache.flink.core.memory.ByteArrayInputStreamWithPos;
+import org.apache.flink.core.memory.ByteArrayOutputStreamWithPos;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.python.PythonConfig;
 import org.apache.flink.python.PythonFunctionRunner;
 import org.apache.flink.python.PythonOptions;
+import org.apache.flink.python.env.process.ProcessPythonEnvironmentManager;
+import org.apache.flink.python.metric.FlinkMetricContainer;
 import org.apache.flink.streaming.api.watermark.Watermark;
 import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.streaming.util.KeyedOneInputStreamOperatorTestHarness;
 import org.apache.flink.streaming.util.OneInputStreamOperatorTestHarness;
 import org.apache.flink.table.api.DataTypes;
 import org.apache.flink.table.connector.Projection;
+import org.apache.flink.table.data.GenericRowData;
 import org.apache.flink.table.data.RowData;
 import org.apache.flink.table.data.TimestampData;
+import org.apache.flink.table.functions.python.PythonAggregateFunction;
+import org.apache.flink.table.functions.python.PythonEnv;
 import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.functions.python.PythonFunctionKind;
 import org.apache.flink.table.planner.codegen.CodeGeneratorContext;
 import org.apache.flink.table.planner.codegen.ProjectionCodeGenerator;
+import org.apache.flink.table.runtime.arrow.serializers.ArrowSerializer;
 import org.apache.flink.table.runtime.generated.GeneratedProjection;
 import org.apache.flink.table.runtime.groupwindow.NamedWindowProperty;
 import org.apache.flink.table.runtime.groupwindow.WindowEnd;
 import org.apache.flink.table.runtime.groupwindow.WindowStart;
 import org.apache.flink.table.runtime.operators.python.aggregate.arrow.AbstractArrowPythonAggregateFunctionOperator;
+import org.apache.flink.table.runtime.operators.window.TimeWindow;
 import org.apache.flink.table.runtime.operators.window.Window;
 import org.apache.flink.table.runtime.operators.window.assigners.SlidingWindowAssigner;
 import org.apache.flink.table.runtime.operators.window.assigners.WindowAssigner;
 import org.apache.flink.table.runtime.operators.window.triggers.EventTimeTriggers;
 import org.apache.flink.table.runtime.operators.window.triggers.Trigger;
+import org.apache.flink.table.runtime.runners.python.beam.BeamTablePythonFunctionRunner;
 import org.apache.flink.table.runtime.utils.PassThroughPythonAggregateFunctionRunner;
 import org.apache.flink.table.runtime.utils.PythonTestUtils;
+import org.apache.flink.table.types.DataType;
 import org.apache.flink.table.types.logical.BigIntType;
 import org.apache.flink.table.types.logical.LogicalType;
 import org.apache.flink.table.types.logical.RowType;
 import org.apache.flink.table.types.logical.TimestampType;
+import org.apache.flink.table.types.logical.VarBinaryType;
 import org.apache.flink.table.types.logical.VarCharType;
 
+import org.apache.beam.runners.fnexecution.control.JobBundleFactory;
+import org.apache.beam.vendor.grpc.v1p26p0.com.google.protobuf.Struct;
 import org.junit.Test;
 
+import java.nio.ByteBuffer;
 import java.time.Duration;
 import java.time.ZoneId;
+import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.Collections;
 import java.util.HashMap;
+import java.util.LinkedList;
+import java.util.List;
+import java.util.Map;
 import java.util.concurrent.ConcurrentLinkedQueue;
 
+import static org.apache.flink.streaming.api.utils.ProtoUtils.createArrowTypeCoderInfoDescriptorProto;
+import static org.junit.Assert.assertEquals;
+
 /**
  * Test for {@link StreamArrowPythonGroupWindowAggregateFunctionOperator}. These test that:
  *
@@ -66,6 +93,8 @@ import java.util.concurrent.ConcurrentLinkedQueue;
  *   <li>FinishBundle is called when bundled element count reach to max bundle size
  *   <li>FinishBundle is called when bundled time reach to max bundle time
  *   <li>Watermarks are buffered and only sent to downstream when finishedBundle is triggered
+ *   <li>The buffered rows are aggregated into the accumulators incrementally when enabled
+ *   <li>The Pandas UDAFs defined with a Python function are not aggregated incrementally
  * </ul>
  */
 public class StreamArrowPythonGroupWindowAggregateFunctionOperatorTest
@@ -410,6 +439,236 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperatorTest
         testHarness.close();
     }
 
+    @Test
+    public void testIncrementalAggregateAcrossBundles() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(getIncrementalConfiguration(10));
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c2", 1L, 0L), 1L));
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c4", 2L, 1000L), 2L));
+        // the buffered rows of both windows are aggregated when the bundle is finished
+        testHarness.prepareSnapshotPreBarrier(0L);
+        assertEquals(Arrays.asList("null:1,2", "null:1,2"), getPythonInputBatches(testHarness));
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c6", 4L, 2000L), 3L));
+        // the first window fires with the accumulators and the row not aggregated yet
+        testHarness.processWatermark(new Watermark(5000L));
+        expectedOutput.add(new Watermark(5000L));
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        // the row is only aggregated into the accumulators of the window not fired
+        testHarness.prepareSnapshotPreBarrier(1L);
+        assertEquals(
+                Arrays.asList("null:1,2", "null:1,2", "3:4", "3:4"),
+                getPythonInputBatches(testHarness));
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                7L,
+                                TimestampData.fromEpochMillis(-5000L),
+                                TimestampData.fromEpochMillis(5000L))));
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        // the second window emits its accumulated results without calling Python
+        testHarness.processWatermark(Long.MAX_VALUE);
+        testHarness.close();
+
+        assertEquals(
+                Arrays.asList("null:1,2", "null:1,2", "3:4", "3:4"),
+                getPythonInputBatches(testHarness));
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                7L,
+                                TimestampData.fromEpochMillis(0L),
+                                TimestampData.fromEpochMillis(10000L))));
+        expectedOutput.add(new Watermark(Long.MAX_VALUE));
+
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    @Test
+    public void testIncrementalAggregateTriggeredByCount() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(getIncrementalConfiguration(4));
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c2", 1L, 0L), 1L));
+        assertEquals(Collections.emptyList(), getPythonInputBatches(testHarness));
+
+        // each row is buffered for two windows, so the bundle is full after the second row and
+        // the rows are aggregated synchronously
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c4", 2L, 1000L), 2L));
+        assertEquals(Arrays.asList("null:1,2", "null:1,2"), getPythonInputBatches(testHarness));
+        // only the accumulators of the two windows are kept in state
+        assertEquals(
+                2,
+                ((KeyedOneInputStreamOperatorTestHarness<?, ?, ?>) testHarness)
+                        .numKeyedStateEntries());
+
+        // the windows fire with the accumulated results without calling Python
+        testHarness.processWatermark(Long.MAX_VALUE);
+        testHarness.close();
+
+        assertEquals(Arrays.asList("null:1,2", "null:1,2"), getPythonInputBatches(testHarness));
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                3L,
+                                TimestampData.fromEpochMillis(-5000L),
+                                TimestampData.fromEpochMillis(5000L))));
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                3L,
+                                TimestampData.fromEpochMillis(0L),
+                                TimestampData.fromEpochMillis(10000L))));
+        expectedOutput.add(new Watermark(Long.MAX_VALUE));
+
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    @Test
+    public void testIncrementalAggregateAccumulatorsCleanup() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(getIncrementalConfiguration(10));
+        KeyedOneInputStreamOperatorTestHarness<?, ?, ?> keyedTestHarness =
+                (KeyedOneInputStreamOperatorTestHarness<?, ?, ?>) testHarness;
+        TimeWindow firstWindow = TimeWindow.of(-5000L, 5000L);
+        TimeWindow secondWindow = TimeWindow.of(0L, 10000L);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c2", 1L, 0L), 1L));
+        testHarness.prepareSnapshotPreBarrier(0L);
+        assertEquals(1, keyedTestHarness.numKeyedStateEntries(firstWindow));
+        assertEquals(1, keyedTestHarness.numKeyedStateEntries(secondWindow));
+
+        // the accumulators are cleared together with the fired window
+        testHarness.processWatermark(new Watermark(5000L));
+        assertEquals(0, keyedTestHarness.numKeyedStateEntries(firstWindow));
+        assertEquals(1, keyedTestHarness.numKeyedStateEntries(secondWindow));
+
+        testHarness.processWatermark(Long.MAX_VALUE);
+        assertEquals(0, keyedTestHarness.numKeyedStateEntries());
+        testHarness.close();
+
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                1L,
+                                TimestampData.fromEpochMillis(-5000L),
+                                TimestampData.fromEpochMillis(5000L))));
+        expectedOutput.add(new Watermark(5000L));
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                1L,
+                                TimestampData.fromEpochMillis(0L),
+                                TimestampData.fromEpochMillis(10000L))));
+        expectedOutput.add(new Watermark(Long.MAX_VALUE));
+
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    @Test
+    public void testNonIncrementalAggregateFunction() throws Exception {
+        PythonAggregateFunction aggregateFunction =
+                new PythonAggregateFunction(
+                        "pandasFunc",
+                        new byte[0],
+                        new DataType[] {DataTypes.BIGINT()},
+                        DataTypes.BIGINT(),
+                        DataTypes.NULL(),
+                        PythonFunctionKind.PANDAS,
+                        true,
+                        false,
+                        false,
+                        false,
+                        new PythonEnv(PythonEnv.ExecType.PROCESS));
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(
+                        getIncrementalConfiguration(10),
+                        new PythonFunctionInfo[] {
+                            new PythonFunctionInfo(aggregateFunction, new Integer[] {0})
+                        });
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        // the Pandas UDAF defined with a Python function aggregates the rows when the windows fire
+        assertEquals(
+                "flink:transform:aggregate_function:arrow:v1",
+                ((StreamArrowPythonGroupWindowAggregateFunctionOperator<?, ?>)
+                                testHarness.getOperator())
+                        .getFunctionUrn());
+
+        testHarness.processElement(
+                new StreamRecord<>(newBinaryRow(true, "c1", "c2", 1L, 0L), 1L));
+        testHarness.processWatermark(Long.MAX_VALUE);
+        testHarness.close();
+
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                1L,
+                                TimestampData.fromEpochMillis(-5000L),
+                                TimestampData.fromEpochMillis(5000L))));
+        expectedOutput.add(
+                new StreamRecord<>(
+                        newRow(
+                                true,
+                                "c1",
+                                1L,
+                                TimestampData.fromEpochMillis(0L),
+                                TimestampData.fromEpochMillis(10000L))));
+        expectedOutput.add(new Watermark(Long.MAX_VALUE));
+
+        assertOutputEquals("Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    private static Configuration getIncrementalConfiguration(int maxBundleSize) {
+        Configuration conf = new Configuration();
+        conf.setInteger(PythonOptions.MAX_BUNDLE_SIZE, maxBundleSize);
+        conf.set(PythonOptions.PANDAS_INCREMENTAL_WINDOW_AGGREGATE_ENABLED, true);
+        return conf;
+    }
+
+    private static List<String> getPythonInputBatches(
+            OneInputStreamOperatorTestHarness<RowData, RowData> testHarness) {
+        return ((PassThroughStreamArrowPythonGroupWindowAggregateFunctionOperator)
+                        testHarness.getOperator())
+                .incrementalRunner
+                .inputBatches;
+    }
+
     @Override
     public LogicalType[] getOutputLogicalType() {
         return new LogicalType[] {
@@ -484,6 +743,8 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperatorTest
     private static class PassThroughStreamArrowPythonGroupWindowAggregateFunctionOperator
             extends StreamArrowPythonGroupWindowAggregateFunctionOperator {
 
+        private IncrementalSumPythonAggregateFunctionRunner incrementalRunner;
+
         PassThroughStreamArrowPythonGroupWindowAggregateFunctionOperator(
                 Configuration config,
                 PythonFunctionInfo[] pandasAggFunctions,
@@ -514,6 +775,19 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperatorTest
 
         @Override
         public PythonFunctionRunner createPythonFunctionRunner() {
+            if (PANDAS_INCREMENTAL_AGGREGATE_FUNCTION_URN.equals(getFunctionUrn())) {
+                incrementalRunner =
+                        new IncrementalSumPythonAggregateFunctionRunner(
+                                getRuntimeContext().getTaskName(),
+                                PythonTestUtils.createTestProcessEnvironmentManager(),
+                                udfInputType,
+                                udfOutputType,
+                                getFunctionUrn(),
+                                getUserDefinedFunctionsProto(),
+                                new HashMap<>(),
+                                PythonTestUtils.createMockFlinkMetricContainer());
+                return incrementalRunner;
+            }
             return new PassThroughPythonAggregateFunctionRunner(
                     getRuntimeContext().getTaskName(),
                     PythonTestUtils.createTestProcessEnvironmentManager(),
@@ -526,4 +800,119 @@ public class StreamArrowPythonGroupWindowAggregateFunctionOperatorTest
                     false);
         }
     }
+
+    /**
+     * A runner which sums up the rows of each batch together with the accumulators set in the
+     * first row, and returns the sum as both the result and the accumulators. The input batches
+     * are recorded as the accumulators followed by the aggregated values, e.g. "3:4,5".
+     */
+    private static class IncrementalSumPythonAggregateFunctionRunner
+            extends BeamTablePythonFunctionRunner {
+
+        private final List<String> inputBatches = new ArrayList<>();
+
+        private final List<byte[]> buffer = new LinkedList<>();
+
+        private final ArrowSerializer arrowSerializer;
+
+        private transient ByteArrayInputStreamWithPos bais;
+
+        private transient ByteArrayOutputStreamWithPos baos;
+
+        IncrementalSumPythonAggregateFunctionRunner(
+                String taskName,
+                ProcessPythonEnvironmentManager environmentManager,
+                RowType udfInputType,
+                RowType udfOutputType,
+                String functionUrn,
+                FlinkFnApi.UserDefinedFunctions userDefinedFunctions,
+                Map<String, String> jobOptions,
+                FlinkMetricContainer flinkMetricContainer) {
+            super(
+                    taskName,
+                    environmentManager,
+                    functionUrn,
+                    userDefinedFunctions,
+                    jobOptions,
+                    flinkMetricContainer,
+                    null,
+                    null,
+                    null,
+                    null,
+                    0.0,
+                    createArrowTypeCoderInfoDescriptorProto(
+                            appendAccumulatorsField(udfInputType),
+                            FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE,
+                            false),
+                    createArrowTypeCoderInfoDescriptorProto(
+                            appendAccumulatorsField(udfOutputType),
+                            FlinkFnApi.CoderInfoDescriptor.Mode.SINGLE,
+                            false));
+            arrowSerializer =
+                    new ArrowSerializer(
+                            appendAccumulatorsField(udfInputType),
+                            appendAccumulatorsField(udfOutputType));
+        }
+
+        @Override
+        public void open(PythonConfig config) throws Exception {
+            super.open(config);
+            bais = new ByteArrayInputStreamWithPos();
+            baos = new ByteArrayOutputStreamWithPos();
+            arrowSerializer.open(bais, baos);
+        }
+
+        @Override
+        protected void startBundle() {
+            super.startBundle();
+            this.mainInputReceiver =
+                    input -> {
+                        byte[] data = input.getValue();
+                        bais.setBuffer(data, 0, data.length);
+                        int rowCount = arrowSerializer.load();
+                        RowData firstRow = arrowSerializer.read(0);
+                        Long accumulators =
+                                firstRow.isNullAt(1)
+                                        ? null
+                                        : ByteBuffer.wrap(firstRow.getBinary(1)).getLong();
+                        long sum = accumulators == null ? 0L : accumulators;
+                        List<String> values = new ArrayList<>();
+                        for (int i = 0; i < rowCount; i++) {
+                            long value = arrowSerializer.read(i).getLong(0);
+                            values.add(String.valueOf(value));
+                            sum += value;
+                        }
+                        inputBatches.add(accumulators + ":" + String.join(",", values));
+                        arrowSerializer.resetReader();
+
+                        arrowSerializer.write(
+                                GenericRowData.of(
+                                        sum, ByteBuffer.allocate(8).putLong(sum).array()));
+                        arrowSerializer.finishCurrentBatch();
+                        buffer.add(baos.toByteArray());
+                        baos.reset();
+                        arrowSerializer.resetWriter();
+                    };
+        }
+
+        @Override
+        public void flush() throws Exception {
+            super.flush();
+            resultBuffer.addAll(buffer);
+            buffer.clear();
+        }
+
+        @Override
+        public JobBundleFactory createJobBundleFactory(Struct pipelineOptions) {
+            return PythonTestUtils.createMockJobBundleFactory();
+        }
+
+        private static RowType appendAccumulatorsField(RowType rowType) {
+            List<RowType.RowField> fields = new ArrayList<>(rowType.getFields());
+            fields.add(
+                    new RowType.RowField(
+                            "__accumulators", new VarBinaryType(VarBinaryType.MAX_LENGTH)));
+            return new RowType(fields);
+        }
+    }
 }
@@ -0,0 +1,216 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.table.runtime.operators.python.table;
+
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.core.memory.ManagedMemoryUseCase;
+import org.apache.flink.streaming.api.watermark.Watermark;
+import org.apache.flink.streaming.runtime.streamrecord.StreamRecord;
+import org.apache.flink.streaming.util.OneInputStreamOperatorTestHarness;
+import org.apache.flink.table.api.DataTypes;
+import org.apache.flink.table.data.RowData;
+import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.runtime.operators.join.FlinkJoinType;
+import org.apache.flink.table.runtime.operators.python.scalar.PythonScalarFunctionOperatorTestBase;
+import org.apache.flink.table.runtime.util.RowDataHarnessAssertor;
+import org.apache.flink.table.types.logical.BigIntType;
+import org.apache.flink.table.types.logical.LogicalType;
+import org.apache.flink.table.types.logical.RowType;
+import org.apache.flink.table.types.logical.VarCharType;
+import org.apache.flink.types.RowKind;
+
+import org.junit.Test;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.List;
+import java.util.concurrent.ConcurrentLinkedQueue;
+
+import static org.apache.flink.table.runtime.util.StreamRecordUtils.row;
+import static org.junit.Assert.assertEquals;
+
+/**
+ * Tests for {@link EmbeddedPythonTableFunctionOperator}. The Python table function is replaced by
+ * a function which emits the BIGINT argument as many times as its value.
+ */
+public class EmbeddedPythonTableFunctionOperatorTest {
+
+    private final RowDataHarnessAssertor assertor =
+            new RowDataHarnessAssertor(
+                    new LogicalType[] {
+                        DataTypes.STRING().getLogicalType(),
+                        DataTypes.STRING().getLogicalType(),
+                        DataTypes.BIGINT().getLogicalType(),
+                        DataTypes.BIGINT().getLogicalType()
+                    });
+
+    @Test
+    public void testRetractionFieldKept() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(FlinkJoinType.INNER);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(newRow(true, "c1", "c2", 1L), 1L));
+        testHarness.processElement(new StreamRecord<>(newRow(false, "c3", "c4", 2L), 2L));
+        testHarness.processElement(new StreamRecord<>(newRow(false, "c5", "c6", 0L), 3L));
+        testHarness.close();
+
+        expectedOutput.add(new StreamRecord<>(newRow(true, "c1", "c2", 1L, 1L)));
+        expectedOutput.add(new StreamRecord<>(newRow(false, "c3", "c4", 2L, 2L)));
+        expectedOutput.add(new StreamRecord<>(newRow(false, "c3", "c4", 2L, 2L)));
+
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    @Test
+    public void testLeftJoin() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(FlinkJoinType.LEFT);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        testHarness.processElement(new StreamRecord<>(newRow(true, "c1", "c2", 1L), 1L));
+        testHarness.processElement(new StreamRecord<>(newRow(false, "c3", "c4", 0L), 2L));
+        testHarness.processElement(new StreamRecord<>(newRow(true, "c5", "c6", 2L), 3L));
+        testHarness.close();
+
+        expectedOutput.add(new StreamRecord<>(newRow(true, "c1", "c2", 1L, 1L)));
+        expectedOutput.add(new StreamRecord<>(newRow(false, "c3", "c4", 0L, null)));
+        expectedOutput.add(new StreamRecord<>(newRow(true, "c5", "c6", 2L, 2L)));
+        expectedOutput.add(new StreamRecord<>(newRow(true, "c5", "c6", 2L, 2L)));
+
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+    }
+
+    @Test
+    public void testElementsProcessedSynchronously() throws Exception {
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                getTestHarness(FlinkJoinType.INNER);
+        ConcurrentLinkedQueue<Object> expectedOutput = new ConcurrentLinkedQueue<>();
+
+        testHarness.open();
+
+        // the results are emitted without waiting for the end of a bundle
+        testHarness.processElement(new StreamRecord<>(newRow(true, "c1", "c2", 1L), 1L));
+        expectedOutput.add(new StreamRecord<>(newRow(true, "c1", "c2", 1L, 1L)));
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        // the watermark is forwarded immediately as there are no buffered elements
+        testHarness.processWatermark(new Watermark(2L));
+        expectedOutput.add(new Watermark(2L));
+        assertor.assertOutputEquals(
+                "Output was not correct.", expectedOutput, testHarness.getOutput());
+
+        testHarness.close();
+
+        assertEquals(
+                Collections.singletonList(1L),
+                ((PassThroughEmbeddedPythonTableFunctionOperator) testHarness.getOperator())
+                        .invokedArguments);
+    }
+
+    private OneInputStreamOperatorTestHarness<RowData, RowData> getTestHarness(
+            FlinkJoinType joinType) throws Exception {
+        RowType inputType =
+                new RowType(
+                        Arrays.asList(
+                                new RowType.RowField("f1", new VarCharType()),
+                                new RowType.RowField("f2", new VarCharType()),
+                                new RowType.RowField("f3", new BigIntType())));
+        RowType udfInputType =
+                new RowType(
+                        Collections.singletonList(new RowType.RowField("f3", new BigIntType())));
+        RowType udfOutputType =
+                new RowType(
+                        Collections.singletonList(new RowType.RowField("f4", new BigIntType())));
+        EmbeddedPythonTableFunctionOperator operator =
+                new PassThroughEmbeddedPythonTableFunctionOperator(
+                        new Configuration(),
+                        new PythonFunctionInfo(
+                                PythonScalarFunctionOperatorTestBase.DummyPythonFunction.INSTANCE,
+                                new Integer[] {0}),
+                        inputType,
+                        udfInputType,
+                        udfOutputType,
+                        joinType,
+                        new int[] {2});
+
+        OneInputStreamOperatorTestHarness<RowData, RowData> testHarness =
+                new OneInputStreamOperatorTestHarness<>(operator);
+        testHarness
+                .getStreamConfig()
+                .setManagedMemoryFractionOperatorOfUseCase(ManagedMemoryUseCase.PYTHON, 0.5);
+        return testHarness;
+    }
+
+    private static RowData newRow(boolean accumulateMsg, Object... fields) {
+        RowData row = row(fields);
+        if (!accumulateMsg) {
+            row.setRowKind(RowKind.DELETE);
+        }
+        return row;
+    }
+
+    private static class PassThroughEmbeddedPythonTableFunctionOperator
+            extends EmbeddedPythonTableFunctionOperator {
+
+        private final List<Long> invokedArguments = new ArrayList<>();
+
+        PassThroughEmbeddedPythonTableFunctionOperator(
+                Configuration config,
+                PythonFunctionInfo tableFunction,
+                RowType inputType,
+                RowType udfInputType,
+                RowType udfOutputType,
+                FlinkJoinType joinType,
+                int[] udfInputOffsets) {
+            super(
+                    config,
+                    tableFunction,
+                    inputType,
+                    udfInputType,
+                    udfOutputType,
+                    joinType,
+                    udfInputOffsets);
+        }
+
+        @Override
+        protected void createPythonInterpreter() {
+            // the Python functions are executed by invokeProcessElement directly
+        }
+
+        @Override
+        protected Object[] invokeProcessElement(Object[] udfArgs) {
+            long value = (Long) udfArgs[0];
+            invokedArguments.add(value);
+            Object[] results = new Object[(int) value];
+            for (int i = 0; i < value; i++) {
+                results[i] = new Object[] {value};
+            }
+            return results;
+        }
+    }
+}
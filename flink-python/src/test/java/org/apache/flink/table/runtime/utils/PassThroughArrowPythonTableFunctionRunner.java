@@ -0,0 +1,141 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.table.runtime.utils;
+
+import org.apache.flink.core.memory.ByteArrayInputStreamWithPos;
+import org.apache.flink.core.memory.ByteArrayOutputStreamWithPos;
+import org.apache.flink.fnexecution.v1.FlinkFnApi;
+import org.apache.flink.python.PythonConfig;
+import org.apache.flink.python.env.process.ProcessPythonEnvironmentManager;
+import org.apache.flink.python.metric.FlinkMetricContainer;
+import org.apache.flink.table.data.GenericRowData;
+import org.apache.flink.table.runtime.arrow.serializers.ArrowSerializer;
+import org.apache.flink.table.runtime.runners.python.beam.BeamTablePythonFunctionRunner;
+import org.apache.flink.table.types.logical.IntType;
+import org.apache.flink.table.types.logical.RowType;
+
+import org.apache.beam.runners.fnexecution.control.JobBundleFactory;
+import org.apache.beam.vendor.grpc.v1p26p0.com.google.protobuf.Struct;
+
+import java.util.ArrayList;
+import java.util.LinkedList;
+import java.util.List;
+import java.util.Map;
+
+import static org.apache.flink.streaming.api.utils.ProtoUtils.createArrowTypeCoderInfoDescriptorProto;
+
+/**
+ * A {@link BeamTablePythonFunctionRunner} that emits the first field of each input element of an
+ * arrow batch together with the position of the input element, and emits nothing for the input
+ * elements when certain test conditions are met.
+ */
+public class PassThroughArrowPythonTableFunctionRunner extends BeamTablePythonFunctionRunner {
+
+    private int num = 0;
+
+    private final List<byte[]> buffer;
+
+    private final ArrowSerializer arrowSerializer;
+
+    /** Reusable InputStream used to holding the input elements to be deserialized. */
+    private transient ByteArrayInputStreamWithPos bais;
+
+    /** Reusable OutputStream used to holding the serialized execution results. */
+    private transient ByteArrayOutputStreamWithPos baos;
+
+    public PassThroughArrowPythonTableFunctionRunner(
+            String taskName,
+            ProcessPythonEnvironmentManager environmentManager,
+            RowType inputType,
+            RowType outputType,
+            String functionUrn,
+            FlinkFnApi.UserDefinedFunctions userDefinedFunctions,
+            Map<String, String> jobOptions,
+            FlinkMetricContainer flinkMetricContainer) {
+        super(
+                taskName,
+                environmentManager,
+                functionUrn,
+                userDefinedFunctions,
+                jobOptions,
+                flinkMetricContainer,
+                null,
+                null,
+                null,
+                null,
+                0.0,
+                createArrowTypeCoderInfoDescriptorProto(
+                        inputType, FlinkFnApi.CoderInfoDescriptor.Mode.MULTIPLE, false),
+                createArrowTypeCoderInfoDescriptorProto(
+                        appendParentIndexField(outputType),
+                        FlinkFnApi.CoderInfoDescriptor.Mode.SINGLE,
+                        false));
+        this.buffer = new LinkedList<>();
+        this.arrowSerializer = new ArrowSerializer(inputType, appendParentIndexField(outputType));
+    }
+
+    @Override
+    public void open(PythonConfig config) throws Exception {
+        super.open(config);
+        bais = new ByteArrayInputStreamWithPos();
+        baos = new ByteArrayOutputStreamWithPos();
+        arrowSerializer.open(bais, baos);
+    }
+
+    @Override
+    protected void startBundle() {
+        super.startBundle();
+        this.mainInputReceiver =
+                input -> {
+                    byte[] data = input.getValue();
+                    bais.setBuffer(data, 0, data.length);
+                    int rowCount = arrowSerializer.load();
+                    for (int i = 0; i < rowCount; i++) {
+                        this.num++;
+                        if (num != 6 && num != 8) {
+                            arrowSerializer.write(
+                                    GenericRowData.of(arrowSerializer.read(i).getLong(0), i));
+                        }
+                    }
+                    arrowSerializer.resetReader();
+                    arrowSerializer.finishCurrentBatch();
+                    buffer.add(baos.toByteArray());
+                    baos.reset();
+                    arrowSerializer.resetWriter();
+                };
+    }
+
+    @Override
+    public void flush() throws Exception {
+        super.flush();
+        resultBuffer.addAll(buffer);
+        buffer.clear();
+    }
+
+    @Override
+    public JobBundleFactory createJobBundleFactory(Struct pipelineOptions) {
+        return PythonTestUtils.createMockJobBundleFactory();
+    }
+
+    private static RowType appendParentIndexField(RowType rowType) {
+        List<RowType.RowField> fields = new ArrayList<>(rowType.getFields());
+        fields.add(new RowType.RowField("__parent_index", new IntType(false)));
+        return new RowType(fields);
+    }
+}
@@ -42,6 +42,8 @@ public class PythonAggregateFunction extends AggregateFunction implements Python
     private final boolean deterministic;
     private final PythonEnv pythonEnv;
     private final boolean takesRowAsInput;
+    private final boolean supportsMerge;
+    private final boolean supportsIncrementalAggregation;
 
     public PythonAggregateFunction(
             String name,
@@ -53,6 +55,56 @@ public class PythonAggregateFunction extends AggregateFunction implements Python
             boolean deterministic,
             boolean takesRowAsInput,
             PythonEnv pythonEnv) {
+        this(
+                name,
+                serializedAggregateFunction,
+                inputTypes,
+                resultType,
+                accumulatorType,
+                pythonFunctionKind,
+                deterministic,
+                takesRowAsInput,
+                false,
+                pythonEnv);
+    }
+
+    public PythonAggregateFunction(
+            String name,
+            byte[] serializedAggregateFunction,
+            DataType[] inputTypes,
+            DataType resultType,
+            DataType accumulatorType,
+            PythonFunctionKind pythonFunctionKind,
+            boolean deterministic,
+            boolean takesRowAsInput,
+            boolean supportsMerge,
+            PythonEnv pythonEnv) {
+        this(
+                name,
+                serializedAggregateFunction,
+                inputTypes,
+                resultType,
+                accumulatorType,
+                pythonFunctionKind,
+                deterministic,
+                takesRowAsInput,
+                supportsMerge,
+                true,
+                pythonEnv);
+    }
+
+    public PythonAggregateFunction(
+            String name,
+            byte[] serializedAggregateFunction,
+            DataType[] inputTypes,
+            DataType resultType,
+            DataType accumulatorType,
+            PythonFunctionKind pythonFunctionKind,
+            boolean deterministic,
+            boolean takesRowAsInput,
+            boolean supportsMerge,
+            boolean supportsIncrementalAggregation,
+            PythonEnv pythonEnv) {
         this.name = name;
         this.serializedAggregateFunction = serializedAggregateFunction;
         this.inputTypes = inputTypes;
@@ -62,6 +114,8 @@ public class PythonAggregateFunction extends AggregateFunction implements Python
         this.deterministic = deterministic;
         this.pythonEnv = pythonEnv;
         this.takesRowAsInput = takesRowAsInput;
+        this.supportsMerge = supportsMerge;
+        this.supportsIncrementalAggregation = supportsIncrementalAggregation;
     }
 
     public void accumulate(Object accumulator, Object... args) {
@@ -99,6 +153,23 @@ public class PythonAggregateFunction extends AggregateFunction implements Python
         return takesRowAsInput;
     }
 
+    /**
+     * Returns whether the Python aggregate function implements merge, i.e. whether the partial
+     * accumulators of a local aggregation could be merged by a global aggregation.
+     */
+    public boolean supportsMerge() {
+        return supportsMerge;
+    }
+
+    /**
+     * Returns whether the Python aggregate function could accumulate its input row by row. It's
+     * false for the Pandas aggregate functions defined with a Python function, which could only
+     * aggregate all the input at once.
+     */
+    public boolean supportsIncrementalAggregation() {
+        return supportsIncrementalAggregation;
+    }
+
     @Override
     public boolean isDeterministic() {
         return deterministic;
@@ -28,6 +28,7 @@ import org.apache.flink.table.api.TableException;
 import org.apache.flink.table.connector.Projection;
 import org.apache.flink.table.data.RowData;
 import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.functions.python.PythonFunctionKind;
 import org.apache.flink.table.planner.codegen.CodeGeneratorContext;
 import org.apache.flink.table.planner.codegen.ProjectionCodeGenerator;
 import org.apache.flink.table.planner.delegation.PlannerBase;
@@ -40,6 +41,7 @@ import org.apache.flink.table.planner.plan.nodes.exec.InputProperty;
 import org.apache.flink.table.planner.plan.nodes.exec.SingleTransformationTranslator;
 import org.apache.flink.table.planner.plan.nodes.exec.utils.CommonPythonUtil;
 import org.apache.flink.table.planner.plan.nodes.exec.utils.ExecNodeUtil;
+import org.apache.flink.table.planner.plan.utils.PythonUtil;
 import org.apache.flink.table.runtime.generated.GeneratedProjection;
 import org.apache.flink.table.runtime.operators.join.FlinkJoinType;
 import org.apache.flink.table.runtime.typeutils.InternalTypeInfo;
@@ -62,6 +64,14 @@ public abstract class CommonExecPythonCorrelate extends ExecNodeBase<RowData>
     private static final String PYTHON_TABLE_FUNCTION_OPERATOR_NAME =
             "org.apache.flink.table.runtime.operators.python.table.PythonTableFunctionOperator";
 
+    private static final String EMBEDDED_PYTHON_TABLE_FUNCTION_OPERATOR_NAME =
+            "org.apache.flink.table.runtime.operators.python.table."
+                    + "EmbeddedPythonTableFunctionOperator";
+
+    private static final String ARROW_PYTHON_TABLE_FUNCTION_OPERATOR_NAME =
+            "org.apache.flink.table.runtime.operators.python.table.arrow."
+                    + "ArrowPythonTableFunctionOperator";
+
     private final FlinkJoinType joinType;
 
     private final RexCall invocation;
@@ -146,7 +156,18 @@ public abstract class CommonExecPythonCorrelate extends ExecNodeBase<RowData>
             InternalTypeInfo<RowData> outputRowType,
             PythonFunctionInfo pythonFunctionInfo,
             int[] udtfInputOffsets) {
-        Class clazz = CommonPythonUtil.loadClass(PYTHON_TABLE_FUNCTION_OPERATOR_NAME);
+        // the Pandas table functions are always executed in a separate Python process
+        boolean isArrow = PythonUtil.isPythonCall(invocation, PythonFunctionKind.PANDAS);
+        boolean isInProcessMode =
+                isArrow || CommonPythonUtil.isPythonWorkerInProcessMode(pythonConfig);
+        Class clazz;
+        if (isArrow) {
+            clazz = CommonPythonUtil.loadClass(ARROW_PYTHON_TABLE_FUNCTION_OPERATOR_NAME);
+        } else if (isInProcessMode) {
+            clazz = CommonPythonUtil.loadClass(PYTHON_TABLE_FUNCTION_OPERATOR_NAME);
+        } else {
+            clazz = CommonPythonUtil.loadClass(EMBEDDED_PYTHON_TABLE_FUNCTION_OPERATOR_NAME);
+        }
 
         final RowType inputType = inputRowType.toRowType();
         final RowType outputType = outputRowType.toRowType();
@@ -157,29 +178,50 @@ public abstract class CommonExecPythonCorrelate extends ExecNodeBase<RowData>
                                 .project(outputType);
 
         try {
-            Constructor ctor =
-                    clazz.getConstructor(
-                            Configuration.class,
-                            PythonFunctionInfo.class,
-                            RowType.class,
-                            RowType.class,
-                            RowType.class,
-                            FlinkJoinType.class,
-                            GeneratedProjection.class);
-            return (OneInputStreamOperator<RowData, RowData>)
-                    ctor.newInstance(
-                            pythonConfig,
-                            pythonFunctionInfo,
-                            inputType,
-                            udfInputType,
-                            udfOutputType,
-                            joinType,
-                            ProjectionCodeGenerator.generateProjection(
-                                    CodeGeneratorContext.apply(config),
-                                    "UdtfInputProjection",
-                                    inputType,
-                                    udfInputType,
-                                    udtfInputOffsets));
+            if (isInProcessMode) {
+                Constructor ctor =
+                        clazz.getConstructor(
+                                Configuration.class,
+                                PythonFunctionInfo.class,
+                                RowType.class,
+                                RowType.class,
+                                RowType.class,
+                                FlinkJoinType.class,
+                                GeneratedProjection.class);
+                return (OneInputStreamOperator<RowData, RowData>)
+                        ctor.newInstance(
+                                pythonConfig,
+                                pythonFunctionInfo,
+                                inputType,
+                                udfInputType,
+                                udfOutputType,
+                                joinType,
+                                ProjectionCodeGenerator.generateProjection(
+                                        CodeGeneratorContext.apply(config),
+                                        "UdtfInputProjection",
+                                        inputType,
+                                        udfInputType,
+                                        udtfInputOffsets));
+            } else {
+                Constructor ctor =
+                        clazz.getConstructor(
+                                Configuration.class,
+                                PythonFunctionInfo.class,
+                                RowType.class,
+                                RowType.class,
+                                RowType.class,
+                                FlinkJoinType.class,
+                                int[].class);
+                return (OneInputStreamOperator<RowData, RowData>)
+                        ctor.newInstance(
+                                pythonConfig,
+                                pythonFunctionInfo,
+                                inputType,
+                                udfInputType,
+                                udfOutputType,
+                                joinType,
+                                udtfInputOffsets);
+            }
         } catch (Exception e) {
             throw new TableException("Python Table Function Operator constructed failed.", e);
         }
@@ -0,0 +1,160 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+package org.apache.flink.table.planner.plan.nodes.exec.stream;
+
+import org.apache.flink.api.dag.Transformation;
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.core.memory.ManagedMemoryUseCase;
+import org.apache.flink.streaming.api.operators.OneInputStreamOperator;
+import org.apache.flink.streaming.api.transformations.OneInputTransformation;
+import org.apache.flink.table.api.TableException;
+import org.apache.flink.table.data.RowData;
+import org.apache.flink.table.functions.python.PythonAggregateFunctionInfo;
+import org.apache.flink.table.planner.delegation.PlannerBase;
+import org.apache.flink.table.planner.plan.nodes.exec.ExecEdge;
+import org.apache.flink.table.planner.plan.nodes.exec.ExecNode;
+import org.apache.flink.table.planner.plan.nodes.exec.ExecNodeConfig;
+import org.apache.flink.table.planner.plan.nodes.exec.ExecNodeContext;
+import org.apache.flink.table.planner.plan.nodes.exec.InputProperty;
+import org.apache.flink.table.planner.plan.nodes.exec.utils.CommonPythonUtil;
+import org.apache.flink.table.planner.plan.nodes.exec.utils.ExecNodeUtil;
+import org.apache.flink.table.planner.plan.utils.AggregateInfoList;
+import org.apache.flink.table.planner.plan.utils.AggregateUtil;
+import org.apache.flink.table.planner.utils.JavaScalaConversionUtil;
+import org.apache.flink.table.runtime.typeutils.InternalTypeInfo;
+import org.apache.flink.table.types.logical.RowType;
+
+import org.apache.flink.shaded.jackson2.com.fasterxml.jackson.annotation.JsonCreator;
+
+import org.apache.calcite.rel.core.AggregateCall;
+
+import java.lang.reflect.Constructor;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.List;
+
+import static org.apache.flink.util.Preconditions.checkNotNull;
+
+/**
+ * Stream {@link ExecNode} for Python unbounded local group aggregate, which pre-aggregates the
+ * input per key within each bundle and emits the serialized accumulators.
+ */
+public class StreamExecPythonLocalGroupAggregate extends StreamExecAggregateBase {
+
+    private static final String PYTHON_STREAM_LOCAL_AGGREGATE_OPERATOR_NAME =
+            "org.apache.flink.table.runtime.operators.python.aggregate.PythonStreamLocalGroupAggregateOperator";
+
+    private final int[] grouping;
+
+    private final AggregateCall[] aggCalls;
+
+    public StreamExecPythonLocalGroupAggregate(
+            int[] grouping,
+            AggregateCall[] aggCalls,
+            InputProperty inputProperty,
+            RowType outputType,
+            String description) {
+        this(
+                ExecNodeContext.newNodeId(),
+                ExecNodeContext.newContext(StreamExecPythonLocalGroupAggregate.class),
+                grouping,
+                aggCalls,
+                Collections.singletonList(inputProperty),
+                outputType,
+                description);
+    }
+
+    @JsonCreator
+    public StreamExecPythonLocalGroupAggregate(
+            int id,
+            ExecNodeContext context,
+            int[] grouping,
+            AggregateCall[] aggCalls,
+            List<InputProperty> inputProperties,
+            RowType outputType,
+            String description) {
+        super(id, context, inputProperties, outputType, description);
+        this.grouping = checkNotNull(grouping);
+        this.aggCalls = checkNotNull(aggCalls);
+    }
+
+    @SuppressWarnings("unchecked")
+    @Override
+    protected Transformation<RowData> translateToPlanInternal(
+            PlannerBase planner, ExecNodeConfig config) {
+        final ExecEdge inputEdge = getInputEdges().get(0);
+        final Transformation<RowData> inputTransform =
+                (Transformation<RowData>) inputEdge.translateToPlan(planner);
+        final RowType inputRowType = (RowType) inputEdge.getOutputType();
+
+        final AggregateInfoList aggInfoList =
+                AggregateUtil.transformToStreamAggregateInfoList(
+                        inputRowType,
+                        JavaScalaConversionUtil.toScala(Arrays.asList(aggCalls)),
+                        new boolean[aggCalls.length],
+                        false, // needRetraction
+                        false, // isStateBackendDataViews
+                        true); // needDistinctInfo
+        final PythonAggregateFunctionInfo[] pythonFunctionInfos =
+                CommonPythonUtil.extractPythonAggregateFunctionInfos(aggInfoList, aggCalls).f0;
+        Configuration pythonConfig =
+                CommonPythonUtil.getMergedConfig(planner.getExecEnv(), config.getTableConfig());
+        final OneInputStreamOperator<RowData, RowData> operator =
+                getPythonLocalAggregateFunctionOperator(
+                        pythonConfig,
+                        inputRowType,
+                        InternalTypeInfo.of(getOutputType()).toRowType(),
+                        pythonFunctionInfos);
+        OneInputTransformation<RowData, RowData> transform =
+                ExecNodeUtil.createOneInputTransformation(
+                        inputTransform,
+                        createTransformationName(config),
+                        createTransformationDescription(config),
+                        operator,
+                        InternalTypeInfo.of(getOutputType()),
+                        inputTransform.getParallelism());
+
+        if (CommonPythonUtil.isPythonWorkerUsingManagedMemory(pythonConfig)) {
+            transform.declareManagedMemoryUseCaseAtSlotScope(ManagedMemoryUseCase.PYTHON);
+        }
+        return transform;
+    }
+
+    @SuppressWarnings("unchecked")
+    private OneInputStreamOperator<RowData, RowData> getPythonLocalAggregateFunctionOperator(
+            Configuration config,
+            RowType inputType,
+            RowType outputType,
+            PythonAggregateFunctionInfo[] aggregateFunctions) {
+        Class<?> clazz = CommonPythonUtil.loadClass(PYTHON_STREAM_LOCAL_AGGREGATE_OPERATOR_NAME);
+        try {
+            Constructor<?> ctor =
+                    clazz.getConstructor(
+                            Configuration.class,
+                            RowType.class,
+                            RowType.class,
+                            PythonAggregateFunctionInfo[].class,
+                            int[].class);
+            return (OneInputStreamOperator<RowData, RowData>)
+                    ctor.newInstance(config, inputType, outputType, aggregateFunctions, grouping);
+        } catch (Exception e) {
+            throw new TableException(
+                    "Python Stream Local Aggregate Function Operator constructed failed.", e);
+        }
+    }
+}
@@ -30,9 +30,11 @@ import org.apache.flink.table.api.dataview.MapView;
 import org.apache.flink.table.functions.FunctionDefinition;
 import org.apache.flink.table.functions.UserDefinedFunction;
 import org.apache.flink.table.functions.python.BuiltInPythonAggregateFunction;
+import org.apache.flink.table.functions.python.PythonAggregateFunction;
 import org.apache.flink.table.functions.python.PythonAggregateFunctionInfo;
 import org.apache.flink.table.functions.python.PythonFunction;
 import org.apache.flink.table.functions.python.PythonFunctionInfo;
+import org.apache.flink.table.functions.python.PythonFunctionKind;
 import org.apache.flink.table.planner.functions.aggfunctions.AvgAggFunction;
 import org.apache.flink.table.planner.functions.aggfunctions.Count1AggFunction;
 import org.apache.flink.table.planner.functions.aggfunctions.CountAggFunction;
@@ -236,16 +238,8 @@ public class CommonPythonUtil {
                     inputNodes.put(arg, inputOffset);
                 }
             }
-            PythonFunction pythonFunction = null;
-            SqlAggFunction aggregateFunction = aggregateCall.getAggregation();
-            if (aggregateFunction instanceof AggSqlFunction) {
-                pythonFunction =
-                        (PythonFunction) ((AggSqlFunction) aggregateFunction).aggregateFunction();
-            } else if (aggregateFunction instanceof BridgingSqlAggFunction) {
-                pythonFunction =
-                        (PythonFunction)
-                                ((BridgingSqlAggFunction) aggregateFunction).getDefinition();
-            }
+            PythonFunction pythonFunction =
+                    (PythonFunction) getAggregateFunctionDefinition(aggregateCall);
             PythonFunctionInfo pythonFunctionInfo =
                     new PythonAggregateFunctionInfo(
                             pythonFunction,
@@ -258,6 +252,63 @@ public class CommonPythonUtil {
         return Tuple2.of(udafInputOffsets, pythonFunctionInfos.toArray(new PythonFunctionInfo[0]));
     }
 
+    /**
+     * Extracts the Python aggregate functions of a global aggregation which merges the partial
+     * accumulators of a local aggregation. The partial accumulator of the i-th aggregate call is
+     * the input field at the index accumulatorOffset + i.
+     */
+    public static PythonAggregateFunctionInfo[] extractPythonGlobalAggregateFunctionInfos(
+            AggregateCall[] aggCalls, int accumulatorOffset) {
+        PythonAggregateFunctionInfo[] pythonFunctionInfos =
+                new PythonAggregateFunctionInfo[aggCalls.length];
+        for (int i = 0; i < aggCalls.length; i++) {
+            pythonFunctionInfos[i] =
+                    new PythonAggregateFunctionInfo(
+                            (PythonFunction) getAggregateFunctionDefinition(aggCalls[i]),
+                            new Integer[] {accumulatorOffset + i},
+                            -1,
+                            false);
+        }
+        return pythonFunctionInfos;
+    }
+
+    /**
+     * Returns whether the specified aggregate call could be split into a local and a global
+     * aggregation, i.e. it's a general Python aggregate function which implements merge, isn't
+     * distinct and whose accumulator doesn't contain DataViews.
+     */
+    public static boolean isMergeablePythonAggregate(AggregateCall aggCall) {
+        FunctionDefinition function = getAggregateFunctionDefinition(aggCall);
+        if (!(function instanceof PythonAggregateFunction) || aggCall.isDistinct()) {
+            return false;
+        }
+        PythonAggregateFunction pythonFunction = (PythonAggregateFunction) function;
+        if (pythonFunction.getPythonFunctionKind() != PythonFunctionKind.GENERAL
+                || !pythonFunction.supportsMerge()) {
+            return false;
+        }
+        DataType accType =
+                pythonFunction
+                        .getTypeInference(null)
+                        .getAccumulatorTypeStrategy()
+                        .get()
+                        .inferType(null)
+                        .get();
+        return extractDataViewSpecs(0, accType).length == 0;
+    }
+
+    /**
+     * Returns whether the specified aggregate call is a Pandas aggregate function which could not
+     * accumulate its input row by row, i.e. it's defined with a Python function.
+     */
+    public static boolean isNonIncrementalPandasAggregate(AggregateCall aggCall) {
+        FunctionDefinition function = getAggregateFunctionDefinition(aggCall);
+        return function instanceof PythonAggregateFunction
+                && ((PythonAggregateFunction) function).getPythonFunctionKind()
+                        == PythonFunctionKind.PANDAS
+                && !((PythonAggregateFunction) function).supportsIncrementalAggregation();
+    }
+
     public static DataViewSpec[] extractDataViewSpecs(int index, DataType accType) {
         if (!(accType instanceof FieldsDataType)) {
             return new DataViewSpec[0];
@@ -445,6 +496,16 @@ public class CommonPythonUtil {
         return new PythonFunctionInfo((PythonFunction) functionDefinition, inputs.toArray());
     }
 
+    private static FunctionDefinition getAggregateFunctionDefinition(AggregateCall aggCall) {
+        SqlAggFunction aggregateFunction = aggCall.getAggregation();
+        if (aggregateFunction instanceof AggSqlFunction) {
+            return ((AggSqlFunction) aggregateFunction).aggregateFunction();
+        } else if (aggregateFunction instanceof BridgingSqlAggFunction) {
+            return ((BridgingSqlAggFunction) aggregateFunction).getDefinition();
+        }
+        return null;
+    }
+
     private static StreamExecutionEnvironment getRealEnvironment(StreamExecutionEnvironment env)
             throws NoSuchFieldException, IllegalAccessException {
         Field realExecEnvField =
@@ -21,6 +21,7 @@ package org.apache.flink.table.planner.plan.rules.physical.stream;
 import org.apache.flink.table.api.TableException;
 import org.apache.flink.table.functions.python.PythonFunctionKind;
 import org.apache.flink.table.planner.plan.nodes.FlinkConventions;
+import org.apache.flink.table.planner.plan.nodes.exec.utils.CommonPythonUtil;
 import org.apache.flink.table.planner.plan.nodes.logical.FlinkLogicalAggregate;
 import org.apache.flink.table.planner.plan.nodes.physical.stream.StreamPhysicalPythonGroupAggregate;
 import org.apache.flink.table.planner.plan.trait.FlinkRelDistribution;
@@ -76,14 +77,16 @@ public class StreamPhysicalPythonGroupAggregateRule extends ConverterRule {
                                         !PythonUtil.isPythonAggregate(x, null)
                                                 && !PythonUtil.isBuiltInAggregate(x));
         if (existPandasFunction || existGeneralPythonFunction) {
-            if (existPandasFunction) {
-                throw new TableException(
-                        "Pandas UDAFs are not supported in streaming mode currently.");
-            }
             if (existJavaUserDefinedFunction) {
                 throw new TableException(
                         "Python UDAF and Java/Scala UDAF cannot be used together.");
             }
+            if (aggCalls.stream().anyMatch(CommonPythonUtil::isNonIncrementalPandasAggregate)) {
+                throw new TableException(
+                        "The Pandas UDAFs defined with a Python function are not supported in "
+                                + "the streaming group aggregation, please define them as "
+                                + "AggregateFunctions instead.");
+            }
             return true;
         } else {
             return false;
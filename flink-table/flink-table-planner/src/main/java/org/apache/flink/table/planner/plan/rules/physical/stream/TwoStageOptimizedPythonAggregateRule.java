@@ -0,0 +1,156 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+package org.apache.flink.table.planner.plan.rules.physical.stream;
+
+import org.apache.flink.table.api.TableConfig;
+import org.apache.flink.table.api.config.ExecutionConfigOptions;
+import org.apache.flink.table.planner.plan.nodes.FlinkConventions;
+import org.apache.flink.table.planner.plan.nodes.exec.utils.CommonPythonUtil;
+import org.apache.flink.table.planner.plan.nodes.physical.stream.StreamPhysicalExchange;
+import org.apache.flink.table.planner.plan.nodes.physical.stream.StreamPhysicalPythonGlobalGroupAggregate;
+import org.apache.flink.table.planner.plan.nodes.physical.stream.StreamPhysicalPythonGroupAggregate;
+import org.apache.flink.table.planner.plan.nodes.physical.stream.StreamPhysicalPythonLocalGroupAggregate;
+import org.apache.flink.table.planner.plan.nodes.physical.stream.StreamPhysicalRel;
+import org.apache.flink.table.planner.plan.rules.physical.FlinkExpandConversionRule;
+import org.apache.flink.table.planner.plan.trait.FlinkRelDistribution;
+import org.apache.flink.table.planner.plan.trait.FlinkRelDistributionTraitDef;
+import org.apache.flink.table.planner.plan.trait.ModifyKindSetTrait;
+import org.apache.flink.table.planner.plan.trait.UpdateKindTrait;
+import org.apache.flink.table.planner.plan.utils.ChangelogPlanUtils;
+import org.apache.flink.table.planner.utils.AggregatePhaseStrategy;
+import org.apache.flink.table.planner.utils.JavaScalaConversionUtil;
+
+import org.apache.calcite.plan.RelOptRule;
+import org.apache.calcite.plan.RelOptRuleCall;
+import org.apache.calcite.plan.RelTraitSet;
+import org.apache.calcite.rel.RelNode;
+
+import java.util.stream.IntStream;
+
+import static org.apache.flink.table.planner.utils.ShortcutUtils.unwrapContext;
+import static org.apache.flink.table.planner.utils.TableConfigUtils.getAggPhaseStrategy;
+
+/**
+ * Rule that matches {@link StreamPhysicalPythonGroupAggregate} on {@link StreamPhysicalExchange}
+ * with following condition:
+ *
+ * <ul>
+ *   <li>mini-batch is enabled in given TableConfig.
+ *   <li>two-phase aggregation is enabled in given TableConfig.
+ *   <li>the input of the aggregation is insert-only.
+ *   <li>all aggregate functions are general Python aggregate functions which implement merge, are
+ *       not distinct and don't use DataViews in their accumulators.
+ *   <li>the input of exchange does not satisfy the shuffle distribution
+ * </ul>
+ *
+ * <p>It splits the aggregation into a {@link StreamPhysicalPythonLocalGroupAggregate} which
+ * pre-aggregates the input of each key within a bundle before the shuffle, and a {@link
+ * StreamPhysicalPythonGlobalGroupAggregate} which merges the partial accumulators after the
+ * shuffle. This reduces the data-shuffling of hot keys considerably.
+ */
+public class TwoStageOptimizedPythonAggregateRule extends RelOptRule {
+
+    public static final TwoStageOptimizedPythonAggregateRule INSTANCE =
+            new TwoStageOptimizedPythonAggregateRule();
+
+    private TwoStageOptimizedPythonAggregateRule() {
+        super(
+                operand(
+                        StreamPhysicalPythonGroupAggregate.class,
+                        operand(StreamPhysicalExchange.class, operand(RelNode.class, any()))),
+                "TwoStageOptimizedPythonAggregateRule");
+    }
+
+    @Override
+    public boolean matches(RelOptRuleCall call) {
+        final StreamPhysicalPythonGroupAggregate agg = call.rel(0);
+        final RelNode realInput = call.rel(2);
+        final TableConfig tableConfig = unwrapContext(call.getPlanner()).getTableConfig();
+
+        // the two-phase optimization must be enabled
+        if (!tableConfig.get(ExecutionConfigOptions.TABLE_EXEC_MINIBATCH_ENABLED)
+                || getAggPhaseStrategy(tableConfig) == AggregatePhaseStrategy.ONE_PHASE) {
+            return false;
+        }
+
+        // the partial accumulators can't be retracted
+        if (!ChangelogPlanUtils.isInsertOnly((StreamPhysicalRel) realInput)) {
+            return false;
+        }
+
+        if (!JavaScalaConversionUtil.toJava(agg.aggCalls()).stream()
+                .allMatch(CommonPythonUtil::isMergeablePythonAggregate)) {
+            return false;
+        }
+
+        return !isInputSatisfyRequiredDistribution(realInput, agg.grouping());
+    }
+
+    @Override
+    public void onMatch(RelOptRuleCall call) {
+        final StreamPhysicalPythonGroupAggregate agg = call.rel(0);
+        final RelNode realInput = call.rel(2);
+
+        // local agg only produces insert only messages
+        RelTraitSet localTraitSet =
+                realInput
+                        .getTraitSet()
+                        .plus(ModifyKindSetTrait.INSERT_ONLY())
+                        .plus(UpdateKindTrait.NONE());
+        StreamPhysicalPythonLocalGroupAggregate localAgg =
+                new StreamPhysicalPythonLocalGroupAggregate(
+                        agg.getCluster(), localTraitSet, realInput, agg.grouping(), agg.aggCalls());
+
+        // grouping keys is forwarded by local agg, use indices instead of groupings
+        int[] globalGrouping = IntStream.range(0, agg.grouping().length).toArray();
+        FlinkRelDistribution globalDistribution = createDistribution(globalGrouping);
+        // create exchange if needed
+        RelNode newInput =
+                FlinkExpandConversionRule.satisfyDistribution(
+                        FlinkConventions.STREAM_PHYSICAL(), localAgg, globalDistribution);
+
+        StreamPhysicalPythonGlobalGroupAggregate globalAgg =
+                new StreamPhysicalPythonGlobalGroupAggregate(
+                        agg.getCluster(),
+                        agg.getTraitSet(),
+                        newInput,
+                        agg.getRowType(),
+                        globalGrouping,
+                        agg.aggCalls(),
+                        realInput.getRowType());
+
+        call.transformTo(globalAgg);
+    }
+
+    // ------------------------------------------------------------------------------------------
+
+    private boolean isInputSatisfyRequiredDistribution(RelNode input, int[] keys) {
+        FlinkRelDistribution requiredDistribution = createDistribution(keys);
+        FlinkRelDistribution inputDistribution =
+                input.getTraitSet().getTrait(FlinkRelDistributionTraitDef.INSTANCE());
+        return inputDistribution.satisfies(requiredDistribution);
+    }
+
+    private FlinkRelDistribution createDistribution(int[] keys) {
+        if (keys.length > 0) {
+            return FlinkRelDistribution.hash(keys, true);
+        } else {
+            return FlinkRelDistribution.SINGLETON();
+        }
+    }
+}
@@ -0,0 +1,93 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+package org.apache.flink.table.planner.plan.nodes.physical.stream
+
+import org.apache.flink.table.planner.calcite.FlinkTypeFactory
+import org.apache.flink.table.planner.plan.nodes.exec.stream.StreamExecPythonGlobalGroupAggregate
+import org.apache.flink.table.planner.plan.nodes.exec.{InputProperty, ExecNode}
+import org.apache.flink.table.planner.plan.utils._
+
+import org.apache.calcite.plan.{RelOptCluster, RelTraitSet}
+import org.apache.calcite.rel.`type`.RelDataType
+import org.apache.calcite.rel.core.AggregateCall
+import org.apache.calcite.rel.{RelNode, RelWriter}
+
+import java.util
+
+/**
+  * Stream physical RelNode for Python unbounded global group aggregate, which merges the
+  * accumulators produced by a [[StreamPhysicalPythonLocalGroupAggregate]].
+  *
+  * @see [[StreamPhysicalGroupAggregateBase]] for more info.
+  */
+class StreamPhysicalPythonGlobalGroupAggregate(
+    cluster: RelOptCluster,
+    traitSet: RelTraitSet,
+    inputRel: RelNode,
+    outputRowType: RelDataType,
+    val grouping: Array[Int],
+    val aggCalls: Seq[AggregateCall],
+    val localAggInputRowType: RelDataType)
+  extends StreamPhysicalGroupAggregateBase(cluster, traitSet, inputRel) {
+
+  private lazy val aggInfoList = AggregateUtil.transformToStreamAggregateInfoList(
+    FlinkTypeFactory.toLogicalRowType(localAggInputRowType),
+    aggCalls,
+    aggCalls.map(_ => false).toArray,
+    needInputCount = false,
+    isStateBackendDataViews = true)
+
+  override def requireWatermark: Boolean = false
+
+  override def deriveRowType(): RelDataType = outputRowType
+
+  override def copy(traitSet: RelTraitSet, inputs: util.List[RelNode]): RelNode = {
+    new StreamPhysicalPythonGlobalGroupAggregate(
+      cluster,
+      traitSet,
+      inputs.get(0),
+      outputRowType,
+      grouping,
+      aggCalls,
+      localAggInputRowType)
+  }
+
+  override def explainTerms(pw: RelWriter): RelWriter = {
+    super.explainTerms(pw)
+      .itemIf("groupBy",
+        RelExplainUtil.fieldToString(grouping, inputRel.getRowType), grouping.nonEmpty)
+      .item("select", RelExplainUtil.streamGroupAggregationToString(
+        inputRel.getRowType,
+        getRowType,
+        aggInfoList,
+        grouping,
+        isGlobal = true))
+  }
+
+  override def translateToExecNode(): ExecNode[_] = {
+    val generateUpdateBefore = ChangelogPlanUtils.generateUpdateBefore(this)
+    new StreamExecPythonGlobalGroupAggregate(
+      grouping,
+      aggCalls.toArray,
+      generateUpdateBefore,
+      InputProperty.DEFAULT,
+      FlinkTypeFactory.toLogicalRowType(getRowType),
+      getRelDetailedDescription
+    )
+  }
+}
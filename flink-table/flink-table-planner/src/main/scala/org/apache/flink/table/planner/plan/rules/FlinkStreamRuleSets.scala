@@ -501,6 +501,7 @@ object FlinkStreamRuleSets {
   val PHYSICAL_REWRITE: RuleSet = RuleSets.ofList(
     // optimize agg rule
     TwoStageOptimizedAggregateRule.INSTANCE,
+    TwoStageOptimizedPythonAggregateRule.INSTANCE,
     // incremental agg rule
     IncrementalAggregateRule.INSTANCE,
     // optimize window agg rule
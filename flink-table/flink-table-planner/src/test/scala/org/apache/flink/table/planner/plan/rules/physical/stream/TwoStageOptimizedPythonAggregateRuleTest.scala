@@ -0,0 +1,141 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.flink.table.planner.plan.rules.physical.stream
+
+import org.apache.flink.api.scala._
+import org.apache.flink.table.api._
+import org.apache.flink.table.api.config.{ExecutionConfigOptions, OptimizerConfigOptions}
+import org.apache.flink.table.api.dataview.ListView
+import org.apache.flink.table.functions.python.{PythonAggregateFunction, PythonEnv, PythonFunctionKind}
+import org.apache.flink.table.planner.utils.{AggregatePhaseStrategy, StreamTableTestUtil, TableTestBase}
+import org.apache.flink.table.types.DataType
+
+import java.time.Duration
+
+import org.junit.{Before, Test}
+
+/**
+ * Tests for [[TwoStageOptimizedPythonAggregateRule]].
+ */
+class TwoStageOptimizedPythonAggregateRuleTest extends TableTestBase {
+
+  private val util: StreamTableTestUtil = streamTestUtil()
+
+  private val twoPhaseNodes = Seq("PythonLocalGroupAggregate", "PythonGlobalGroupAggregate")
+
+  @Before
+  def setup(): Unit = {
+    util.tableEnv.getConfig
+      .set(ExecutionConfigOptions.TABLE_EXEC_MINIBATCH_ALLOW_LATENCY, Duration.ofSeconds(1))
+      .set(ExecutionConfigOptions.TABLE_EXEC_MINIBATCH_ENABLED, Boolean.box(true))
+      .set(ExecutionConfigOptions.TABLE_EXEC_MINIBATCH_SIZE, Long.box(3))
+      .set(
+        OptimizerConfigOptions.TABLE_OPTIMIZER_AGG_PHASE_STRATEGY,
+        AggregatePhaseStrategy.TWO_PHASE.toString)
+    util.addTableSource[(Int, Long, String)]("MyTable", 'a, 'b, 'c)
+    util.addTemporarySystemFunction("pyFunc", createPythonAggregateFunction())
+  }
+
+  @Test
+  def testPythonGroupAggregate(): Unit = {
+    util.verifyRelPlanExpected(
+      "SELECT a, pyFunc(b) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testPythonGroupAggregateWithoutKeys(): Unit = {
+    util.verifyRelPlanExpected("SELECT pyFunc(b) FROM MyTable", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testMiniBatchDisabled(): Unit = {
+    util.tableEnv.getConfig
+      .set(ExecutionConfigOptions.TABLE_EXEC_MINIBATCH_ENABLED, Boolean.box(false))
+    util.verifyRelPlanNotExpected(
+      "SELECT a, pyFunc(b) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testOnePhaseStrategy(): Unit = {
+    util.tableEnv.getConfig.set(
+      OptimizerConfigOptions.TABLE_OPTIMIZER_AGG_PHASE_STRATEGY,
+      AggregatePhaseStrategy.ONE_PHASE.toString)
+    util.verifyRelPlanNotExpected(
+      "SELECT a, pyFunc(b) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testRetractInput(): Unit = {
+    // the input of the Python aggregation is the updating result of the inner aggregation
+    util.verifyRelPlanNotExpected(
+      """
+        |SELECT c, pyFunc(cnt)
+        |FROM (SELECT a, c, COUNT(b) AS cnt FROM MyTable GROUP BY a, c)
+        |GROUP BY c
+        |""".stripMargin,
+      twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testDistinctCall(): Unit = {
+    util.verifyRelPlanNotExpected(
+      "SELECT a, pyFunc(DISTINCT b) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testDataViewAccumulator(): Unit = {
+    util.addTemporarySystemFunction(
+      "pyDataViewFunc",
+      createPythonAggregateFunction(
+        accumulatorType = DataTypes.ROW(
+          DataTypes.FIELD("f0", ListView.newListViewDataType(DataTypes.BIGINT())))))
+    util.verifyRelPlanNotExpected(
+      "SELECT a, pyDataViewFunc(b) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testFunctionWithoutMerge(): Unit = {
+    util.addTemporarySystemFunction(
+      "pyNoMergeFunc", createPythonAggregateFunction(supportsMerge = false))
+    util.verifyRelPlanNotExpected(
+      "SELECT a, pyNoMergeFunc(b) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  @Test
+  def testMixedWithBuiltInAggregate(): Unit = {
+    util.verifyRelPlanNotExpected(
+      "SELECT a, pyFunc(b), COUNT(c) FROM MyTable GROUP BY a", twoPhaseNodes: _*)
+  }
+
+  private def createPythonAggregateFunction(
+      accumulatorType: DataType = DataTypes.ROW(DataTypes.FIELD("f0", DataTypes.BIGINT())),
+      supportsMerge: Boolean = true): PythonAggregateFunction = {
+    new PythonAggregateFunction(
+      "pyFunc",
+      new Array[Byte](0),
+      Array(DataTypes.BIGINT()),
+      DataTypes.BIGINT(),
+      accumulatorType,
+      PythonFunctionKind.GENERAL,
+      true,
+      false,
+      supportsMerge,
+      new PythonEnv(PythonEnv.ExecType.PROCESS))
+  }
+}
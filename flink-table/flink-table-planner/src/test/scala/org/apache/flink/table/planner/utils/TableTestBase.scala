@@ -603,6 +603,28 @@ abstract class TableTestUtilBase(test: TableTestBase, isStreamingMode: Boolean)
     assertTrue(message, result)
   }
 
+  /**
+   * Verify whether the optimized rel plan for the given SELECT query
+   * contains all the `expected` strings.
+   */
+  def verifyRelPlanExpected(query: String, expected: String*): Unit = {
+    verifyRelPlanExpected(getTableEnv.sqlQuery(query), expected: _*)
+  }
+
+  /**
+   * Verify whether the optimized rel plan for the given [[Table]]
+   * contains all the `expected` strings.
+   */
+  def verifyRelPlanExpected(table: Table, expected: String*): Unit = {
+    require(expected.nonEmpty)
+    val relNode = TableTestUtil.toRelNode(table)
+    val optimizedRel = getPlanner.optimize(relNode)
+    val optimizedPlan = getOptimizedRelPlan(Array(optimizedRel), Array.empty, withRowType = false)
+    val result = expected.forall(optimizedPlan.contains(_))
+    val message = s"\nactual plan:\n$optimizedPlan\nexpected:\n${expected.mkString(", ")}"
+    assertTrue(message, result)
+  }
+
   /**
    * Verify the AST (abstract syntax tree) and the optimized exec plan for the given SELECT query.
    * Note: An exception will be thrown if the given sql can't be translated to exec plan.